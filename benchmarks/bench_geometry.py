@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from benchmarks.generators import (
+    component_with_transformation_chain,
+    cylinder_mesh,
+    plane_geometry,
+    write_off_file,
+    write_stl_file,
+)
+from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.instrument_view.off_renderer import QtOFFGeometry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+
+pytestmark = pytest.mark.benchmark(group="geometry")
+
+
+def buffer_bytes(qt_geometry: QtOFFGeometry) -> int:
+    """
+    :return: The size of the buffers which are uploaded to the GPU for the geometry
+    """
+    return sum(
+        attribute.buffer().data().size() for attribute in qt_geometry.attributes()
+    )
+
+
+def unindexed_buffer_bytes(qt_geometry: QtOFFGeometry) -> int:
+    """
+    :return: The size the buffers would be if each corner of each triangle had its own position and normal
+    """
+    return qt_geometry.vertex_count * 2 * 3 * np.dtype(np.float32).itemsize
+
+
+def test_load_off_geometry(benchmark, mesh, tmp_path):
+    filename = str(tmp_path / "mesh.off")
+    write_off_file(filename, *mesh)
+
+    geometry = benchmark(lambda: load_geometry(filename, "m", OFFGeometryNoNexus()))
+
+    assert len(geometry.faces) == len(mesh[1])
+
+
+def test_load_stl_geometry(benchmark, mesh, tmp_path):
+    filename = str(tmp_path / "mesh.stl")
+    write_stl_file(filename, *mesh)
+
+    geometry = benchmark(lambda: load_geometry(filename, "m", OFFGeometryNoNexus()))
+
+    assert len(geometry.faces) == 2 * len(mesh[1])
+
+
+def test_build_qt_off_geometry_buffers(benchmark, mesh):
+    geometry = OFFGeometryNoNexus(*mesh)
+
+    qt_geometry = benchmark(QtOFFGeometry, geometry)
+    benchmark.extra_info["buffer_bytes"] = buffer_bytes(qt_geometry)
+    benchmark.extra_info["unindexed_buffer_bytes"] = unindexed_buffer_bytes(qt_geometry)
+
+    assert qt_geometry.vertex_count == 3 * 2 * len(mesh[1])
+
+
+@pytest.mark.parametrize("segments", [100, 316], ids=lambda size: f"{size ** 2}_faces")
+def test_build_qt_off_geometry_buffers_for_curved_mesh(benchmark, segments):
+    # Every face has a different normal, so vertices are only shared by smoothing
+    geometry = OFFGeometryNoNexus(*cylinder_mesh(segments, segments))
+
+    qt_geometry = benchmark(QtOFFGeometry, geometry)
+    benchmark.extra_info["buffer_bytes"] = buffer_bytes(qt_geometry)
+    benchmark.extra_info["unindexed_buffer_bytes"] = unindexed_buffer_bytes(qt_geometry)
+
+    assert qt_geometry.vertex_count == 3 * 2 * segments ** 2
+
+
+@pytest.mark.parametrize(
+    "pixel_grid_size", [32, 128], ids=lambda size: f"{size}x{size}"
+)
+def test_build_qt_off_geometry_buffers_for_pixel_grid(benchmark, pixel_grid_size):
+    pixel_shape = plane_geometry(1)
+    x, y = np.meshgrid(np.arange(pixel_grid_size), np.arange(pixel_grid_size))
+    positions = np.column_stack((x.flatten(), y.flatten(), np.zeros(x.size)))
+
+    qt_geometry = benchmark(QtOFFGeometry, pixel_shape, positions)
+    benchmark.extra_info["buffer_bytes"] = buffer_bytes(qt_geometry)
+
+    assert qt_geometry.vertex_count == 3 * 2 * pixel_grid_size ** 2
+
+
+@pytest.mark.parametrize("depth", [10, 100], ids=lambda depth: f"depth_{depth}")
+def test_component_transform_matrix(benchmark, depth):
+    component = component_with_transformation_chain("component", depth)
+
+    matrix = benchmark(lambda: component.transform_matrix)
+
+    assert matrix.shape == (4, 4)
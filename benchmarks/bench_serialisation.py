@@ -0,0 +1,61 @@
+import json
+
+import pytest
+
+from benchmarks.generators import instrument_model
+from nexus_constructor.common_attrs import CommonKeys
+from nexus_constructor.create_forwarder_config import create_forwarder_config
+from nexus_constructor.json.load_from_json import JSONReader, _find_shape_information
+from nexus_constructor.json.shape_reader import ShapeReader
+from nexus_constructor.model.component import Component
+
+pytestmark = pytest.mark.benchmark(group="serialisation")
+
+
+def test_model_as_dict(benchmark, model):
+    model_dict = benchmark(model.as_dict)
+
+    assert model_dict[CommonKeys.CHILDREN]
+
+
+def test_load_model_from_json(benchmark, model, tmp_path):
+    filename = str(tmp_path / "instrument.json")
+    with open(filename, "w") as file:
+        json.dump(model.as_dict(), file)
+
+    def load():
+        reader = JSONReader()
+        reader.load_model_from_json(filename)
+        return reader
+
+    reader = benchmark(load)
+
+    assert not reader.warnings
+    assert len(reader.entry.instrument.component_list) == len(
+        model.entry.instrument.component_list
+    )
+
+
+@pytest.mark.parametrize(
+    "quads_per_side", [10, 100], ids=lambda size: f"{size ** 2}_faces"
+)
+def test_shape_reader_validation(benchmark, quads_per_side):
+    model = instrument_model(1, quads_per_side=quads_per_side)
+    component = model.entry.instrument.component_list[-1]
+    shape_info = _find_shape_information(component.as_dict()[CommonKeys.CHILDREN])
+
+    def read_shape():
+        new_component = Component(component.name)
+        reader = ShapeReader(new_component, shape_info)
+        reader.add_shape_to_component()
+        return reader
+
+    reader = benchmark(read_shape)
+
+    assert not reader.warnings
+
+
+def test_create_forwarder_config(benchmark, model):
+    config = benchmark(create_forwarder_config, model, "pva")
+
+    assert config
@@ -0,0 +1,18 @@
+import pytest
+
+from benchmarks.generators import instrument_model, plane_mesh
+
+# Number of faces along each side of the synthetic meshes, giving 10^4 and 10^5 faces
+MESH_SIZES = [100, 316]
+
+
+@pytest.fixture(params=MESH_SIZES, ids=lambda size: f"{size ** 2}_faces")
+def mesh(request):
+    return plane_mesh(request.param)
+
+
+@pytest.fixture(
+    params=[10, 100], ids=lambda number: f"{number}_components", scope="module"
+)
+def model(request):
+    return instrument_model(request.param, pixel_grid_size=32)
@@ -0,0 +1,145 @@
+"""
+Generators of synthetic instruments and geometry, sized to exercise the hot paths in the benchmarks.
+"""
+from typing import List, Tuple
+
+import numpy as np
+from stl import mesh
+
+from nexus_constructor.geometry.pixel_data import PixelGrid
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.stream import F142Stream, StreamGroup
+
+
+def plane_mesh(quads_per_side: int) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Creates a unit square in the XY plane divided into a grid of quadrilateral faces.
+    :param quads_per_side: The number of faces along each side of the square.
+    :return: The (N, 3) array of vertices and the list of faces.
+    """
+    points_per_side = quads_per_side + 1
+    x, y = np.meshgrid(
+        np.linspace(0.0, 1.0, points_per_side), np.linspace(0.0, 1.0, points_per_side)
+    )
+    vertices = np.column_stack((x.flatten(), y.flatten(), np.zeros(x.size)))
+    corners = (
+        np.arange(points_per_side * quads_per_side).reshape(
+            quads_per_side, points_per_side
+        )[:, :quads_per_side]
+    ).flatten()
+    faces = np.column_stack(
+        (
+            corners,
+            corners + 1,
+            corners + points_per_side + 1,
+            corners + points_per_side,
+        )
+    )
+    return vertices, faces.tolist()
+
+
+def cylinder_mesh(segments: int, rings: int) -> Tuple[np.ndarray, List[List[int]]]:
+    """
+    Creates the curved side of a unit cylinder along the Z axis, divided into quadrilateral faces.
+    :param segments: The number of faces around the cylinder.
+    :param rings: The number of faces along the cylinder.
+    :return: The (N, 3) array of vertices and the list of faces.
+    """
+    angles = np.linspace(0.0, 2 * np.pi, segments, endpoint=False)
+    heights = np.linspace(0.0, 1.0, rings + 1)
+    angle, height = np.meshgrid(angles, heights)
+    vertices = np.column_stack(
+        (np.cos(angle).flatten(), np.sin(angle).flatten(), height.flatten())
+    )
+    ring, segment = np.meshgrid(np.arange(rings), np.arange(segments), indexing="ij")
+    corners = (ring * segments + segment).flatten()
+    next_corners = (ring * segments + (segment + 1) % segments).flatten()
+    faces = np.column_stack(
+        (corners, next_corners, next_corners + segments, corners + segments)
+    )
+    return vertices, faces.tolist()
+
+
+def plane_geometry(quads_per_side: int) -> OFFGeometryNoNexus:
+    vertices, faces = plane_mesh(quads_per_side)
+    return OFFGeometryNoNexus(vertices=vertices, faces=faces)
+
+
+def write_off_file(filename: str, vertices: np.ndarray, faces: List[List[int]]):
+    with open(filename, "w") as file:
+        file.write("OFF\n")
+        file.write(f"{len(vertices)} {len(faces)} 0\n")
+        for vertex in vertices:
+            file.write(" ".join(str(coordinate) for coordinate in vertex) + "\n")
+        for face in faces:
+            file.write(f"{len(face)} " + " ".join(str(index) for index in face) + "\n")
+
+
+def write_stl_file(filename: str, vertices: np.ndarray, faces: List[List[int]]):
+    """
+    Writes the mesh to a binary STL file, splitting each quadrilateral face into two triangles.
+    """
+    quads = np.asarray(faces)
+    triangles = np.concatenate((quads[:, [0, 1, 2]], quads[:, [0, 2, 3]]))
+    stl_mesh = mesh.Mesh(np.zeros(len(triangles), dtype=mesh.Mesh.dtype))
+    stl_mesh.vectors = vertices[triangles]
+    stl_mesh.save(filename)
+
+
+def component_with_transformation_chain(name: str, depth: int) -> Component:
+    """
+    Creates a component which depends on a chain of alternating translations and rotations.
+    :param name: The name of the component.
+    :param depth: The number of transformations in the chain.
+    """
+    component = Component(name)
+    depends_on = None
+    for i in range(depth):
+        if i % 2:
+            depends_on = component.add_rotation(
+                (0.0, 1.0, 0.0), 1.0, name=f"rotation_{i}", depends_on=depends_on
+            )
+        else:
+            depends_on = component.add_translation(
+                (0.0, 0.0, 1.0), name=f"translation_{i}", depends_on=depends_on
+            )
+            depends_on.ui_value = 0.1
+    component.depends_on = depends_on
+    return component
+
+
+def instrument_model(
+    number_of_components: int,
+    transformation_chain_depth: int = 4,
+    quads_per_side: int = 10,
+    pixel_grid_size: int = 0,
+) -> Model:
+    """
+    Creates a model of an instrument in which every component has a mesh shape, a chain of transformations and a
+    stream.
+    :param number_of_components: The number of components in the instrument.
+    :param transformation_chain_depth: The number of transformations each component depends on.
+    :param quads_per_side: The size of each component's mesh, see plane_mesh.
+    :param pixel_grid_size: The number of rows and columns of pixels in each component, or 0 for no pixels.
+    """
+    model = Model()
+    instrument = model.entry.instrument
+    shape = plane_geometry(quads_per_side)
+    for i in range(number_of_components):
+        component = component_with_transformation_chain(
+            f"detector_{i}", transformation_chain_depth
+        )
+        component.nx_class = "NXdetector"
+        component.parent_node = instrument
+        pixel_grid = None
+        if pixel_grid_size:
+            pixel_grid = PixelGrid(rows=pixel_grid_size, columns=pixel_grid_size)
+            component.record_pixel_grid(pixel_grid)
+        component.set_off_shape(shape, units="m", pixel_data=pixel_grid)
+        stream_group = StreamGroup(f"temperature_{i}")
+        stream_group["f142"] = F142Stream("motion", f"DET{i}:Temp", "double")
+        component[stream_group.name] = stream_group
+        instrument.component_list.append(component)
+    return model
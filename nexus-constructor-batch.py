@@ -0,0 +1,15 @@
+"""
+Entry script for converting and validating instrument descriptions without the GUI.
+Requires Python 3.6+
+
+Example, regenerating file-writer JSON and forwarder configuration for several instruments using four processes:
+    python nexus-constructor-batch.py instruments/*.json -o build -f json forwarder -j 4
+"""
+import logging
+import sys
+
+from nexus_constructor.batch import main
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
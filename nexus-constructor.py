@@ -2,18 +2,28 @@
 Entry script for the nexus constructor application.
 Requires Python 3.6+
 """
-import argparse
-import logging
-import os
-import sys
+from nexus_constructor.startup_trace import (
+    DEFINITIONS_PHASE,
+    IMPORTS_PHASE,
+    MODEL_PHASE,
+    STARTUP_TRACE_ENV_VAR,
+    UI_SETUP_PHASE,
+    startup_tracer,
+)
 
-from PySide2 import QtCore
-from PySide2.QtGui import QIcon
-from PySide2.QtWidgets import QApplication, QMainWindow
+with startup_tracer.phase(IMPORTS_PHASE):
+    import argparse
+    import logging
+    import os
+    import sys
 
-from nexus_constructor.component_type import make_dictionary_of_class_definitions
-from nexus_constructor.main_window import MainWindow
-from nexus_constructor.model.model import Model
+    from PySide2 import QtCore
+    from PySide2.QtGui import QIcon
+    from PySide2.QtWidgets import QApplication, QMainWindow
+
+    from nexus_constructor.component_type import make_dictionary_of_class_definitions
+    from nexus_constructor.main_window import MainWindow
+    from nexus_constructor.model.model import Model
 
 if getattr(sys, "frozen", False):
     # frozen
@@ -23,17 +33,38 @@ else:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Nexus Constructor")
-    if "help" in parser.parse_args():
-        exit(0)
+    parser.add_argument(
+        "--startup-trace",
+        metavar="FILE",
+        help="Write timings of the startup phases to FILE in the Chrome trace event format. "
+        f"Can also be enabled with the {STARTUP_TRACE_ENV_VAR} environment variable.",
+    )
+    args = parser.parse_args()
+    if args.startup_trace:
+        startup_tracer.output_filename = args.startup_trace
     logging.basicConfig(level=logging.INFO)
     QApplication.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(os.path.join("ui", "icon.png")))
     window = QMainWindow()
     definitions_dir = os.path.abspath(os.path.join(root_dir, "definitions"))
-    _, nx_component_classes = make_dictionary_of_class_definitions(definitions_dir)
-    model = Model()
-    ui = MainWindow(model, nx_component_classes)
-    ui.setupUi(window)
-    window.showMaximized()
+    with startup_tracer.phase(DEFINITIONS_PHASE):
+        _, nx_component_classes = make_dictionary_of_class_definitions(definitions_dir)
+    with startup_tracer.phase(MODEL_PHASE):
+        model = Model()
+    with startup_tracer.phase(UI_SETUP_PHASE):
+        ui = MainWindow(model, nx_component_classes)
+        ui.setupUi(window)
+        window.showMaximized()
+    ui.set_up_autosave(
+        os.path.join(
+            QtCore.QStandardPaths.writableLocation(
+                QtCore.QStandardPaths.GenericDataLocation
+            ),
+            "nexus-constructor",
+            "autosave",
+        )
+    )
+    # In case the 3D view never renders a frame, for example without OpenGL support
+    app.aboutToQuit.connect(startup_tracer.write)
     sys.exit(app.exec_())
@@ -2,12 +2,23 @@
 import PySide2
 import os
 
+from nexus_constructor.component_type import (
+    CLASS_DEFINITIONS_CACHE_FILE,
+    NXDL_VERSION_FILE,
+    build_class_definitions_cache,
+)
+
 block_cipher = None
 
+# Ship the parsed class definitions so that the NXDL doesn't need to be parsed at startup
+build_class_definitions_cache("definitions")
+
 added_files = [
     ("ui/*.png", "ui"),
     ("ui/*.svg", "ui"),
     ("definitions/base_classes/*.nxdl.xml", "definitions/base_classes"),
+    (os.path.join("definitions", NXDL_VERSION_FILE), "definitions"),
+    (os.path.join("definitions", CLASS_DEFINITIONS_CACHE_FILE), "definitions"),
 ]
 
 if os.path.isdir(os.path.join(PySide2.__path__[0], "Qt", "plugins", "renderers")):
@@ -4,13 +4,15 @@ from functools import partial
 from typing import List
 
 from PySide2.QtCore import QObject, Qt, QUrl, Signal
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QListWidget, QListWidgetItem
 
 from nexus_constructor.common_attrs import SHAPE_GROUP_NAME, CommonAttrs
 from nexus_constructor.component_tree_model import ComponentTreeModel
 from nexus_constructor.component_type import CHOPPER_CLASS_NAME, PIXEL_COMPONENT_TYPES
-from nexus_constructor.field_utils import get_fields_with_update_functions
+from nexus_constructor.field_utils import (
+    add_fields_to_component,
+    get_fields_with_update_functions,
+)
 from nexus_constructor.field_widget import FieldWidget
 from nexus_constructor.geometry.disk_chopper.disk_chopper_checker import ChopperChecker
 from nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator import (
@@ -18,7 +20,7 @@ from nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator impor
 )
 from nexus_constructor.geometry.geometry_loader import load_geometry
 from nexus_constructor.geometry.pixel_data import PixelData, PixelGrid, PixelMapping
-from nexus_constructor.model.component import Component, add_fields_to_component
+from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import (
     CylindricalGeometry,
     NoShapeGeometry,
@@ -121,14 +123,12 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         self.noShapeRadioButton.setChecked(True)
         self.show_no_geometry_fields()
 
-        component_list = self.instrument.component_list.copy()
-
-        if self.component_to_edit:
-            for item in component_list:
-                if item.name == self.component_to_edit.name:
-                    component_list.remove(item)
-
-        name_validator = NameValidator(component_list)
+        name_validator = NameValidator(
+            self.instrument.component_list,
+            current_name=self.component_to_edit.name
+            if self.component_to_edit
+            else None,
+        )
         self.nameLineEdit.setValidator(name_validator)
         self.nameLineEdit.validator().is_valid.connect(
             partial(
@@ -288,9 +288,10 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
                 self.CylinderRadioButton.setChecked(True)
                 self.cylinderHeightLineEdit.setValue(component_shape.height)
                 self.cylinderRadiusLineEdit.setValue(component_shape.radius)
-                self.cylinderXLineEdit.setValue(component_shape.axis_direction.x())
-                self.cylinderYLineEdit.setValue(component_shape.axis_direction.y())
-                self.cylinderZLineEdit.setValue(component_shape.axis_direction.z())
+                axis_x, axis_y, axis_z = component_shape.axis_direction
+                self.cylinderXLineEdit.setValue(axis_x)
+                self.cylinderYLineEdit.setValue(axis_y)
+                self.cylinderZLineEdit.setValue(axis_z)
                 self.unitsLineEdit.setText(component_shape.units)
 
     def create_new_ui_field(self, field):
@@ -373,7 +374,7 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
         if self.CylinderRadioButton.isChecked():
 
             component.set_cylinder_shape(
-                QVector3D(
+                (
                     self.cylinderXLineEdit.value(),
                     self.cylinderYLineEdit.value(),
                     self.cylinderZLineEdit.value(),
@@ -496,7 +497,7 @@ class AddComponentDialog(Ui_AddComponentDialog, QObject):
 
         # remove previous fields
         if self.component_to_edit:
-            self.component_to_edit.children = []
+            self.component_to_edit.children.clear()
             self.component_to_edit.name = component_name
             self.component_to_edit.nx_class = nx_class
             self.component_to_edit.description = description
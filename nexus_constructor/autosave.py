@@ -0,0 +1,461 @@
+"""
+Saving the model as it is changed, so that work which hasn't been saved isn't lost if the application crashes.
+
+Whenever the model's signals say it has changed, the components which were added, changed or removed since the last
+change are appended to a journal as a line of JSON. Only the JSON of the components which changed is created, and the
+JSON of the others is cached, so recording a change costs in proportion to it. Undoing and redoing replace the entry,
+but with the components which differ, so they are saved in the same way. Every CHECKPOINT_INTERVAL changes, and
+whenever the entry is replaced otherwise, the whole model is written as a checkpoint and the journal is started again.
+Changes to the entry and instrument themselves, rather than to their components, are only saved by checkpoints.
+
+The files are written on a background thread, so that the GUI never waits for the disk. The JSON text of each
+component is kept there until the component changes, so a checkpoint only encodes the components which changed since
+the last one, one at a time so that the GUI isn't held up for long. Each line of the journal is synced to the disk
+before the next is written, and checkpoints are written to a temporary file which then replaces the last checkpoint,
+so a crash can at most lose the line being written.
+
+Each process saves to its own directory in the directory of autosaves, which it holds a lock file in, so an autosave is
+only offered to be restored once the process which wrote it is no longer running.
+
+The model is restored from the latest checkpoint, with the changes in the journal after it applied.
+"""
+import json
+import logging
+import os
+import queue
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+from PySide2.QtCore import QLockFile
+
+from nexus_constructor.common_attrs import INSTRUMENT_NAME, CommonKeys
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.transaction import (
+    ChangeSet,
+    component_states,
+    find_changes,
+)
+
+CHECKPOINT_FILENAME = "checkpoint.json"
+JOURNAL_FILENAME = "journal.jsonl"
+LOCK_FILENAME = "lock"
+CHECKPOINT_INTERVAL = 100
+
+# Keys of the checkpoint and of each line of the journal, in which the generation identifies the checkpoint
+GENERATION = "generation"
+MODEL = "model"
+CHANGES = "changes"
+# Keys of each change in a line of the journal
+COMPONENT = "component"
+PREVIOUS_NAME = "previous_name"
+REMOVED = "removed"
+SAMPLE = "sample"
+
+
+# The text of the JSON of a dictionary, and the dictionary, which is kept so that the objects in it are not replaced
+# by others with the same ids
+EncodedDict = Tuple[Dict[str, Any], str]
+
+
+def _write_checkpoint(directory: str, checkpoint: str):
+    path = os.path.join(directory, CHECKPOINT_FILENAME)
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "w") as file:
+        file.write(checkpoint)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
+
+
+def _encode_with(dictionary: Dict[str, Any], key: str, text: str) -> str:
+    """
+    :return: The JSON of a dictionary, with the JSON text given for one of its keys.
+    """
+    rest = json.dumps(
+        {name: value for name, value in dictionary.items() if name != key}
+    )
+    item = f"{json.dumps(key)}: {text}"
+    return f"{rest[:-1]}, {item}}}" if len(rest) > 2 else f"{{{item}}}"
+
+
+def _encode_list(texts: Iterable[str]) -> str:
+    return f"[{', '.join(texts)}]"
+
+
+def _parts_key(dictionary: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    :return: The ids of the objects a dictionary is made of. The dictionaries of components which haven't changed are
+    made of the same objects each time, see Component.as_dict, apart from the list of children, so the ids of the
+    children are used rather than the id of the list.
+    """
+    return tuple(
+        (key, id(value))
+        for key, value in dictionary.items()
+        if key != CommonKeys.CHILDREN
+    ) + tuple(id(child) for child in dictionary.get(CommonKeys.CHILDREN, ()))
+
+
+class JournalWriter:
+    def __init__(self, directory: str):
+        """
+        Writes the checkpoints and journal on a background thread, in the order they are queued.
+        :param directory: The directory to write the files in, which is created if it doesn't exist.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._queue: "queue.Queue[Optional[Tuple[str, str, Any]]]" = queue.Queue()
+        self._journal: Optional[TextIO] = None
+        # The JSON of the components in the last checkpoint and in the journal after it, keyed by _parts_key
+        self._encoded: Dict[Tuple[Any, ...], EncodedDict] = {}
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def append(self, generation: str, changes: List[Dict[str, Any]]):
+        self._queue.put((JOURNAL_FILENAME, generation, changes))
+
+    def checkpoint(self, generation: str, model_dict: Dict[str, Any]):
+        self._queue.put((CHECKPOINT_FILENAME, generation, model_dict))
+
+    def flush(self):
+        """
+        Waits for everything queued to be written.
+        """
+        self._queue.join()
+
+    def close(self):
+        """
+        Writes everything queued and stops the thread.
+        """
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    if self._journal is not None:
+                        self._journal.close()
+                    return
+                self._write(*task)
+            except Exception:
+                # Caught whatever it is, as the thread must keep going for flush and close not to wait forever
+                logging.exception("Unable to write autosave")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, filename: str, generation: str, contents: Any):
+        journal_path = os.path.join(self.directory, JOURNAL_FILENAME)
+        if filename == CHECKPOINT_FILENAME:
+            encoded: Dict[Tuple[Any, ...], EncodedDict] = {}
+            model_text = self._encode_model(contents, encoded)
+            # Only the components in the checkpoint can be in the next one without having changed
+            self._encoded = encoded
+            _write_checkpoint(
+                self.directory,
+                _encode_with({GENERATION: generation}, MODEL, model_text),
+            )
+            # The lines of the journal from before are for the last checkpoint, so are no longer needed
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(journal_path, "w")
+            return
+        if self._journal is None:
+            self._journal = open(journal_path, "a")
+        changes = [
+            _encode_with(
+                change,
+                COMPONENT,
+                self._encode_component(change[COMPONENT], self._encoded),
+            )
+            if COMPONENT in change
+            else json.dumps(change)
+            for change in contents
+        ]
+        self._journal.write(
+            _encode_with({GENERATION: generation}, CHANGES, _encode_list(changes))
+        )
+        self._journal.write("\n")
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _encode_component(
+        self, dictionary: Dict[str, Any], encoded: Dict[Tuple[Any, ...], EncodedDict],
+    ) -> str:
+        """
+        Encodes the dictionary of a component, or takes its JSON from before if it hasn't changed.
+        :param encoded: Where to put the JSON, to keep it for the next checkpoint.
+        """
+        key = _parts_key(dictionary)
+        encoded_dict = self._encoded.get(key)
+        if encoded_dict is None:
+            encoded_dict = (dictionary, json.dumps(dictionary))
+        encoded[key] = encoded_dict
+        return encoded_dict[1]
+
+    def _encode_model(
+        self, model_dict: Dict[str, Any], encoded: Dict[Tuple[Any, ...], EncodedDict]
+    ) -> str:
+        # The groups in the entry and the components in the instrument are encoded one at a time, so those which
+        # haven't changed can be taken from before, and so that the GUI thread can run in between
+        entry = model_dict[CommonKeys.CHILDREN][0]
+        entry_children = [
+            _encode_with(
+                child,
+                CommonKeys.CHILDREN,
+                _encode_list(
+                    self._encode_component(component, encoded)
+                    for component in child[CommonKeys.CHILDREN]
+                ),
+            )
+            if child.get(CommonKeys.NAME) == INSTRUMENT_NAME
+            else self._encode_component(child, encoded)
+            for child in entry[CommonKeys.CHILDREN]
+        ]
+        return _encode_with(
+            model_dict,
+            CommonKeys.CHILDREN,
+            _encode_list(
+                [_encode_with(entry, CommonKeys.CHILDREN, _encode_list(entry_children))]
+            ),
+        )
+
+
+class Autosave:
+    def __init__(self, model: Model, directory: str):
+        """
+        Saves the model to a directory whenever it changes, starting with a checkpoint of it as it is now. The
+        directory is locked until the autosave is closed.
+        :param model: The model to save.
+        :param directory: The directory to save it in, such as from new_autosave_directory, which any autosave already
+        there is replaced in.
+        """
+        self.model = model
+        self._writer = JournalWriter(directory)
+        self._lock = _lock(directory)
+        if self._lock is None:
+            self._writer.close()
+            raise ValueError(f"Another process is saving to {directory}")
+        self._changes_since_checkpoint = 0
+        self.checkpoint()
+
+        signals = model.signals
+        signals.component_added.connect(self.record)
+        signals.components_added.connect(self.record)
+        signals.component_removed.connect(self.record)
+        signals.transformation_changed.connect(self.record)
+        signals.changes_committed.connect(self.record)
+
+    @property
+    def directory(self) -> str:
+        return self._writer.directory
+
+    def checkpoint(self):
+        """
+        Queues the whole model to be written, after which the journal starts again.
+        """
+        self._entry = self.model.entry
+        self._states = component_states(self._entry.instrument.component_list)
+        # Unique, so that lines left in the journal by an earlier checkpoint are never taken to be after this one
+        self._generation = uuid.uuid4().hex
+        self._changes_since_checkpoint = 0
+        self._writer.checkpoint(self._generation, self.model.as_dict())
+
+    def record(self, *args: Any) -> bool:
+        """
+        Queues the components which have changed since the last change to be appended to the journal.
+        :param args: The arguments of whichever of the model's signals the autosave is connected to, of which only
+        the change set emitted when the entry is replaced is used.
+        :return: Whether anything had changed.
+        """
+        if self.model.in_transaction:
+            return False
+        if self.model.entry is not self._entry:
+            changes = next(
+                (arg for arg in args if isinstance(arg, ChangeSet)), ChangeSet()
+            )
+            if not changes.only_components_changed:
+                self.checkpoint()
+                return True
+            # Changes to the entry which was replaced are saved first, as the changes are from it as it was
+            self._record_changes(
+                find_changes(self._states, self._entry.instrument.component_list)
+            )
+            # Unless that was saved with a checkpoint, which is of the entry which replaced it
+            if self.model.entry is not self._entry:
+                self._entry = self.model.entry
+                self._record_changes(changes)
+            return True
+        return self._record_changes(
+            find_changes(self._states, self._entry.instrument.component_list)
+        )
+
+    def _record_changes(self, changes: ChangeSet) -> bool:
+        if not changes:
+            return False
+        instrument = self._entry.instrument
+        self._states = component_states(instrument.component_list)
+        self._changes_since_checkpoint += 1
+        if self._changes_since_checkpoint >= CHECKPOINT_INTERVAL:
+            self.checkpoint()
+            return True
+        journal_changes: List[Dict[str, Any]] = [
+            {REMOVED: name} for name in changes.removed
+        ]
+        for component, previous_name in zip(changes.changed, changes.previous_names):
+            journal_changes.append(
+                {
+                    COMPONENT: component.as_dict(),
+                    PREVIOUS_NAME: previous_name,
+                    SAMPLE: component is instrument.sample,
+                }
+            )
+        journal_changes.extend(
+            {COMPONENT: component.as_dict(), SAMPLE: component is instrument.sample}
+            for component in changes.added
+        )
+        self._writer.append(self._generation, journal_changes)
+        return True
+
+    def flush(self):
+        self._writer.flush()
+
+    def close(self, discard: bool = False):
+        """
+        Stops saving the model, and unlocks the directory.
+        :param discard: Whether to delete what has been saved, such as when the application exits normally.
+        """
+        self._writer.close()
+        if discard:
+            discard_autosave(self.directory, self._lock)
+        else:
+            self._lock.unlock()
+
+
+def _lock(directory: str) -> Optional[QLockFile]:
+    """
+    :return: The lock of an autosave directory, or None if another process which is still running holds it.
+    """
+    lock = QLockFile(os.path.join(directory, LOCK_FILENAME))
+    # A lock is only taken over from a process which is no longer running, however long it has been held for
+    lock.setStaleLockTime(0)
+    return lock if lock.tryLock(0) else None
+
+
+def new_autosave_directory(autosaves_directory: str) -> str:
+    """
+    :param autosaves_directory: The directory which the autosaves of every process are saved in.
+    :return: A directory in it for an Autosave of this process to save in.
+    """
+    return os.path.join(autosaves_directory, uuid.uuid4().hex)
+
+
+def claim_orphaned_autosave(
+    autosaves_directory: str,
+) -> Optional[Tuple[str, QLockFile]]:
+    """
+    Finds the latest autosave left by a process which didn't exit normally, and locks it so that no other process
+    offers to restore it too.
+    :param autosaves_directory: The directory which the autosaves of every process are saved in.
+    :return: The directory of the autosave and its lock, to pass to discard_autosave once it has been restored, or
+    None if there isn't one.
+    """
+    try:
+        names = os.listdir(autosaves_directory)
+    except OSError:
+        return None
+    directories = [
+        os.path.join(autosaves_directory, name)
+        for name in names
+        if has_autosave(os.path.join(autosaves_directory, name))
+    ]
+    directories.sort(
+        key=lambda directory: os.path.getmtime(
+            os.path.join(directory, CHECKPOINT_FILENAME)
+        ),
+        reverse=True,
+    )
+    for directory in directories:
+        lock = _lock(directory)
+        if lock is not None:
+            return directory, lock
+    return None
+
+
+def has_autosave(directory: str) -> bool:
+    return os.path.exists(os.path.join(directory, CHECKPOINT_FILENAME))
+
+
+def discard_autosave(directory: str, lock: Optional[QLockFile] = None):
+    """
+    Deletes an autosave, and the directory it is in if nothing else is.
+    :param lock: The lock of the directory, which is unlocked.
+    """
+    for filename in (CHECKPOINT_FILENAME, JOURNAL_FILENAME):
+        try:
+            os.remove(os.path.join(directory, filename))
+        except FileNotFoundError:
+            pass
+    if lock is not None:
+        lock.unlock()
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+def load_autosave(directory: str) -> Optional[Dict[str, Any]]:
+    """
+    Restores the model from the latest checkpoint and the changes in the journal after it.
+    :param directory: The directory the model was saved in.
+    :return: The model in the file-writer JSON format, or None if there isn't a checkpoint.
+    """
+    try:
+        with open(os.path.join(directory, CHECKPOINT_FILENAME)) as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError):
+        return None
+    model_dict = checkpoint[MODEL]
+    try:
+        with open(os.path.join(directory, JOURNAL_FILENAME)) as file:
+            lines = file.readlines()
+    except OSError:
+        lines = []
+    for line in lines:
+        try:
+            journal_line = json.loads(line)
+        except ValueError:
+            # The line being written when the application stopped
+            break
+        # Lines left from before the checkpoint, if it stopped before the journal was started again
+        if journal_line[GENERATION] == checkpoint[GENERATION]:
+            _apply_changes(model_dict, journal_line[CHANGES])
+    return model_dict
+
+
+def _apply_changes(model_dict: Dict[str, Any], changes: List[Dict[str, Any]]):
+    entry_children = model_dict[CommonKeys.CHILDREN][0][CommonKeys.CHILDREN]
+    instrument_children = next(
+        child[CommonKeys.CHILDREN]
+        for child in entry_children
+        if child.get(CommonKeys.NAME) == INSTRUMENT_NAME
+    )
+    for change in changes:
+        if REMOVED in change:
+            instrument_children[:] = [
+                child
+                for child in instrument_children
+                if child.get(CommonKeys.NAME) != change[REMOVED]
+            ]
+            continue
+        component = change[COMPONENT]
+        name = change.get(PREVIOUS_NAME, component[CommonKeys.NAME])
+        # The sample is written in the entry rather than in the instrument, see Entry.as_dict
+        children = entry_children if change[SAMPLE] else instrument_children
+        for index, child in enumerate(children):
+            if child.get(CommonKeys.NAME) == name:
+                children[index] = component
+                break
+        else:
+            children.append(component)
@@ -0,0 +1,329 @@
+"""
+Headless conversion and validation of instrument descriptions.
+
+Nothing in this module may import PySide2 widgets, so that it can be used from scripts and CI without a display and
+run for many instruments in parallel processes.
+"""
+import argparse
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import attr
+import h5py
+
+from nexus_constructor.create_forwarder_config import (
+    create_forwarder_config,
+    provider_str_to_enum,
+)
+from nexus_constructor.geometry.geometry_loader import load_geometry
+from nexus_constructor.json.json_warnings import JsonWarningsContainer
+from nexus_constructor.json.load_from_json import JSONReader
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.model import Model
+from nexus_constructor.nexus_file import (
+    idf_to_json_dict,
+    nexus_file_to_json_dict,
+    write_nexus_file,
+)
+
+JSON_FORMAT = "json"
+FORWARDER_FORMAT = "forwarder"
+NEXUS_FORMAT = "nexus"
+
+# File extensions match those offered by the file dialogs in the main window
+OUTPUT_FORMAT_EXTENSIONS = {
+    JSON_FORMAT: "json",
+    FORWARDER_FORMAT: "flat",
+    NEXUS_FORMAT: "nxs",
+}
+IDF_EXTENSIONS = [".xml"]
+NEXUS_EXTENSIONS = [".nxs", ".nex", ".nx5", ".hdf5", ".h5"]
+
+
+@attr.s(frozen=True)
+class GeometryFile:
+    """
+    An OFF or STL file to use as the shape of a named component
+    """
+
+    component_name = attr.ib(type=str)
+    filename = attr.ib(type=str)
+    units = attr.ib(type=str, default="m")
+
+
+@attr.s
+class ConversionResult:
+    """
+    Outcome of converting a single input file. Only contains builtin types so that it can be returned from a worker
+    process.
+    """
+
+    input_filename = attr.ib(type=str)
+    output_filenames = attr.ib(factory=list, type=List[str])
+    warnings = attr.ib(factory=list, type=List[str])
+    error = attr.ib(default=None, type=Optional[str])
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+def load_model(filename: str) -> Tuple[Model, JsonWarningsContainer]:
+    """
+    Loads a model from a file-writer JSON file, a Mantid IDF or a NeXus file, chosen by file extension.
+    :param filename: The file to load.
+    :return: The loaded model and any warnings encountered while loading it.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    reader = JSONReader()
+    if extension in IDF_EXTENSIONS:
+        success = reader.load_model_from_dict(idf_to_json_dict(filename))
+    elif extension in NEXUS_EXTENSIONS:
+        with h5py.File(filename, "r") as nexus_file:
+            success = reader.load_model_from_dict(nexus_file_to_json_dict(nexus_file))
+    else:
+        success = reader.load_model_from_json(filename)
+    if not success:
+        raise ValueError(
+            "\n".join(json_warning.message for json_warning in reader.warnings)
+        )
+    model = Model()
+    model.entry = reader.entry
+    return model, reader.warnings
+
+
+def _find_component(model: Model, component_name: str) -> Component:
+    for component in model.entry.instrument.component_list:
+        if component.name == component_name:
+            return component
+    raise ValueError(f"No component named {component_name} in the instrument")
+
+
+def attach_geometry(model: Model, geometry_file: GeometryFile):
+    """
+    Loads an OFF or STL file and sets it as the shape of a component in the model.
+    :param model: The model containing the component.
+    :param geometry_file: The geometry file and the component to attach it to.
+    """
+    component = _find_component(model, geometry_file.component_name)
+    geometry = load_geometry(
+        geometry_file.filename, geometry_file.units, OFFGeometryNoNexus()
+    )
+    geometry.units = geometry_file.units
+    geometry.file_path = geometry_file.filename
+    component.set_off_shape(
+        geometry, units=geometry_file.units, filename=geometry_file.filename
+    )
+
+
+def write_outputs(
+    model: Model,
+    output_stem: str,
+    output_formats: Sequence[str],
+    provider_type: str = "pva",
+    link_shared_shapes: bool = False,
+) -> List[str]:
+    """
+    Writes the model in each of the requested formats.
+    :param model: The model to write.
+    :param output_stem: Output file path without an extension, the extension of each format is appended to it.
+    :param output_formats: Any of "json", "forwarder" and "nexus".
+    :param provider_type: The EPICS provider type used in forwarder configuration.
+    :param link_shared_shapes: Whether to write shapes which are the same as an earlier shape as links to it.
+    :return: The names of the files which were written.
+    """
+    output_filenames = []
+    for output_format in output_formats:
+        filename = f"{output_stem}.{OUTPUT_FORMAT_EXTENSIONS[output_format]}"
+        if output_format == JSON_FORMAT:
+            with open(filename, "w") as file:
+                json.dump(model.as_dict(link_shared_shapes), file, indent=2)
+        elif output_format == FORWARDER_FORMAT:
+            with open(filename, "wb") as flat_file:
+                flat_file.write(create_forwarder_config(model, provider_type))
+        elif output_format == NEXUS_FORMAT:
+            write_nexus_file(model, filename, link_shared_shapes)
+        output_filenames.append(filename)
+    return output_filenames
+
+
+def convert_instrument(
+    input_filename: str,
+    output_dir: Optional[str],
+    output_formats: Sequence[str],
+    provider_type: str = "pva",
+    geometry_files: Sequence[GeometryFile] = (),
+    link_shared_shapes: bool = False,
+) -> ConversionResult:
+    """
+    Loads an instrument, attaches any geometry files to it and writes it out in the requested formats.
+    Never raises, any problem is reported in the returned result so that one bad file does not stop a batch.
+    :param input_filename: JSON, IDF or NeXus file describing the instrument.
+    :param output_dir: Directory to write to, if None the outputs are only validated, not written.
+    :param output_formats: Any of "json", "forwarder" and "nexus".
+    :param provider_type: The EPICS provider type used in forwarder configuration.
+    :param geometry_files: Geometry files to attach to components of the instrument.
+    :param link_shared_shapes: Whether to write shapes which are the same as an earlier shape as links to it.
+    :return: Result describing the files written and any warnings or error.
+    """
+    result = ConversionResult(input_filename)
+    try:
+        model, warnings = load_model(input_filename)
+        result.warnings = [json_warning.message for json_warning in warnings]
+        for geometry_file in geometry_files:
+            attach_geometry(model, geometry_file)
+        if output_dir is None:
+            # Still serialise, so that problems which would only show up on export are reported
+            json.dumps(model.as_dict())
+            create_forwarder_config(model, provider_type)
+        else:
+            stem = os.path.splitext(os.path.basename(input_filename))[0]
+            result.output_filenames = write_outputs(
+                model,
+                os.path.join(output_dir, stem),
+                output_formats,
+                provider_type,
+                link_shared_shapes,
+            )
+    except Exception as error:
+        logging.debug("Conversion failed", exc_info=True)
+        result.error = f"{type(error).__name__}: {error}"
+    return result
+
+
+def _parse_geometry_file(argument: str) -> GeometryFile:
+    try:
+        component_name, filename = argument.split("=", 1)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"Expected COMPONENT=FILE[:UNITS] but found {argument}"
+        )
+    units = "m"
+    if ":" in filename and not os.path.exists(filename):
+        filename, units = filename.rsplit(":", 1)
+    return GeometryFile(component_name, filename, units)
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Convert and validate instrument descriptions without starting the NeXus Constructor GUI"
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="File-writer JSON (.json), Mantid IDF (.xml) or NeXus files to load",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="Directory to write outputs to, if not given the inputs are only validated",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="formats",
+        nargs="+",
+        choices=list(OUTPUT_FORMAT_EXTENSIONS.keys()),
+        default=[JSON_FORMAT],
+        help="Output formats to write (default: json)",
+    )
+    parser.add_argument(
+        "--provider",
+        choices=list(provider_str_to_enum.keys()),
+        default="pva",
+        help="EPICS provider type for PVs in the forwarder configuration (default: pva)",
+    )
+    parser.add_argument(
+        "-g",
+        "--geometry",
+        dest="geometry_files",
+        action="append",
+        type=_parse_geometry_file,
+        default=[],
+        metavar="COMPONENT=FILE[:UNITS]",
+        help="Use an OFF or STL file as the shape of a component, units default to m. Can be repeated.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of instruments to convert in parallel processes (default: 1)",
+    )
+    parser.add_argument(
+        "--strict",
+        action="store_true",
+        help="Treat warnings encountered while loading as failures",
+    )
+    parser.add_argument(
+        "--link-shared-shapes",
+        action="store_true",
+        help="Write shapes which are the same as an earlier component's shape as links to it",
+    )
+    return parser
+
+
+def run(
+    input_filenames: Sequence[str],
+    output_dir: Optional[str],
+    output_formats: Sequence[str],
+    provider_type: str = "pva",
+    geometry_files: Sequence[GeometryFile] = (),
+    jobs: int = 1,
+    link_shared_shapes: bool = False,
+) -> List[ConversionResult]:
+    """
+    Converts each of the input files, in parallel processes if more than one job is requested.
+    """
+    arguments = [
+        (
+            filename,
+            output_dir,
+            output_formats,
+            provider_type,
+            geometry_files,
+            link_shared_shapes,
+        )
+        for filename in input_filenames
+    ]
+    if jobs <= 1 or len(arguments) <= 1:
+        return [convert_instrument(*argument) for argument in arguments]
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(convert_instrument, *zip(*arguments)))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Entry point for the command line.
+    :return: Exit code, zero if every input was converted (and had no warnings if --strict was given).
+    """
+    args = _create_parser().parse_args(argv)
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    results = run(
+        args.inputs,
+        args.output_dir,
+        args.formats,
+        args.provider,
+        args.geometry_files,
+        args.jobs,
+        args.link_shared_shapes,
+    )
+
+    exit_code = 0
+    for result in results:
+        for message in result.warnings:
+            logging.warning(f"{result.input_filename}: {message}")
+        if not result.succeeded:
+            logging.error(f"{result.input_filename}: {result.error}")
+            exit_code = 1
+        elif args.strict and result.warnings:
+            exit_code = 1
+        for filename in result.output_filenames:
+            logging.info(f"{result.input_filename}: wrote {filename}")
+    return exit_code
@@ -1,8 +1,8 @@
 import logging
+from typing import Dict, List
 
 import PySide2.QtGui
 from PySide2.QtCore import QAbstractItemModel, QModelIndex, Qt
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QMessageBox
 
 from nexus_constructor.common_attrs import TransformationType
@@ -10,6 +10,7 @@ from nexus_constructor.link_transformation import LinkTransformation
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.model import Model
+from nexus_constructor.model.transaction import ChangeSet
 from nexus_constructor.model.transformation import Transformation
 from nexus_constructor.model.value_type import ValueTypes
 from nexus_constructor.transformations_list import TransformationsList
@@ -27,6 +28,72 @@ class ComponentTreeModel(QAbstractItemModel):
         super().__init__(parent)
         self.model = model
         self.components = self.model.entry.instrument.component_list
+        # Row of each component, keyed by its id as components aren't hashable
+        self._component_rows: Dict[int, int] = {}
+        self._index_component_rows()
+        self.model.signals.transformation_changed.connect(
+            self._invalidate_linked_components
+        )
+        self.model.signals.changes_committed.connect(self._reset_components)
+
+    def _index_component_rows(self, first_row: int = 0):
+        """
+        Records the rows of the components from first_row onwards.
+        """
+        for row in range(first_row, len(self.components)):
+            self._component_rows[id(self.components[row])] = row
+
+    def row_of_component(self, component: Component) -> int:
+        """
+        :param component: A component in the tree.
+        :return: The row of the component.
+        :raises ValueError: If the component isn't in the tree.
+        """
+        row = self._component_rows.get(id(component))
+        if (
+            row is None
+            or row >= len(self.components)
+            or self.components[row] is not component
+        ):
+            # The component list has been changed without going through the model
+            self._component_rows.clear()
+            self._index_component_rows()
+            row = self._component_rows.get(id(component))
+            if row is None:
+                raise ValueError(f"{component.name} is not in the component tree")
+        return row
+
+    def _invalidate_linked_components(self):
+        """
+        Forgets the component each transformation list links to, as a transformation may have changed it.
+        """
+        for component in self.components:
+            if component.stored_transforms is not None:
+                component.stored_transforms.link.invalidate_linked_component()
+
+    def _reset_components(self, changes: ChangeSet):
+        """
+        Shows the changes made in a transaction, which may not have gone through the tree model, as one reset.
+        """
+        for component in changes.changed:
+            # Created again from the component's transformations when it is next expanded
+            component.stored_transforms = None
+        self.beginResetModel()
+        self.components = self.model.entry.instrument.component_list
+        self._component_rows.clear()
+        self._index_component_rows()
+        self.endResetModel()
+
+    @staticmethod
+    def _fetch_component_children(component: Component):
+        """
+        Creates the children of a component the first time they are asked for, rather than for every component when
+        the tree is set up, because finding its transformations means following its depends_on chain.
+        """
+        if component.component_info is None:
+            component.component_info = ComponentInfo(component)
+        if component.stored_transforms is None:
+            component.stored_transforms = component.transforms
 
     def columnCount(self, parent: QModelIndex) -> int:
         return 1
@@ -80,9 +147,35 @@ class ComponentTreeModel(QAbstractItemModel):
             target_index = self.parent(node)
         return target_index, transformation_list
 
+    def index_of_component(self, name: str) -> QModelIndex:
+        """
+        :param name: The name of a component.
+        :return: The index of the component's row, which is invalid if there is no component with that name.
+        """
+        for row, component in enumerate(self.components):
+            if component.name == name:
+                return self.index(row, 0, QModelIndex())
+        return QModelIndex()
+
     def add_component(self, new_component: Component):
         self.beginInsertRows(QModelIndex(), len(self.components), len(self.components))
         self.components.append(new_component)
+        self._component_rows[id(new_component)] = len(self.components) - 1
+        self.endInsertRows()
+
+    def add_components(self, new_components: List[Component]):
+        """
+        Adds several components, such as the copies in a component array, as one insertion so that views only update
+        once.
+        """
+        if not new_components:
+            return
+        first_row = len(self.components)
+        self.beginInsertRows(
+            QModelIndex(), first_row, first_row + len(new_components) - 1
+        )
+        self.components.extend(new_components)
+        self._index_component_rows(first_row)
         self.endInsertRows()
 
     def _remove_link(self, index: QModelIndex):
@@ -99,15 +192,12 @@ class ComponentTreeModel(QAbstractItemModel):
         self.model.signals.transformation_changed.emit()
 
     def __update_link_rows(self):
-        nr_of_components = self.rowCount(QModelIndex())
-        for i in range(nr_of_components):
-            component_index = self.index(i, 0, QModelIndex())
-            transformations_index = self.index(1, 0, component_index)
-            transformations = transformations_index.internalPointer()
-            if transformations.has_link:
-                transformation_rows = self.rowCount(transformations_index)
-                link_index = self.index(
-                    transformation_rows - 1, 0, transformations_index
+        for component in self.components:
+            # Components which haven't been expanded don't have any link rows yet
+            transformations = component.stored_transforms
+            if transformations is not None and transformations.has_link:
+                link_index = self.createIndex(
+                    len(transformations), 0, transformations.link
                 )
                 self.dataChanged.emit(link_index, link_index)
 
@@ -146,12 +236,15 @@ class ComponentTreeModel(QAbstractItemModel):
                     pass
                 elif reply == QMessageBox.No:
                     return
-        remove_index = self.components.index(index.internalPointer())
+        remove_index = self.row_of_component(component)
         self.beginRemoveRows(QModelIndex(), remove_index, remove_index)
         for transform in transforms:
             transform.remove_from_dependee_chain()
-        self.components.remove(component)
+        self.components.pop(remove_index)
+        del self._component_rows[id(component)]
+        self._index_component_rows(remove_index)
         self.endRemoveRows()
+        self._invalidate_linked_components()
         self.model.signals.component_removed.emit(component.name)
 
     def remove_node(self, node: QModelIndex):
@@ -182,7 +275,7 @@ class ComponentTreeModel(QAbstractItemModel):
             transformation_list,
         )
         new_transformation = self._create_new_transformation(
-            parent_component, transformation_list, transformation_type
+            parent_component, transformation_type
         )
 
         new_transformation.parent_component = parent_component
@@ -204,24 +297,24 @@ class ComponentTreeModel(QAbstractItemModel):
         self.model.signals.transformation_changed.emit()
 
     @staticmethod
-    def _create_new_transformation(
-        parent_component, transformation_list, transformation_type
-    ):
+    def _create_new_transformation(parent_component, transformation_type):
         values = Dataset(name="", type=ValueTypes.DOUBLE, size=[1], values="")
         if transformation_type == TransformationType.TRANSLATION:
             new_transformation = parent_component.add_translation(
                 name=generate_unique_name(
-                    TransformationType.TRANSLATION, transformation_list
+                    TransformationType.TRANSLATION,
+                    parent_component.get_transforms_group().children,
                 ),
-                vector=QVector3D(0, 0, 1.0),  # default to beam direction
+                vector=(0, 0, 1.0),  # default to beam direction
                 values=values,
             )
         elif transformation_type == TransformationType.ROTATION:
             new_transformation = parent_component.add_rotation(
                 name=generate_unique_name(
-                    TransformationType.ROTATION, transformation_list
+                    TransformationType.ROTATION,
+                    parent_component.get_transforms_group().children,
                 ),
-                axis=QVector3D(1.0, 0, 0),
+                axis=(1.0, 0, 0),
                 angle=0.0,
                 values=values,
             )
@@ -247,8 +340,7 @@ class ComponentTreeModel(QAbstractItemModel):
         :param transformation_list: transformation list of parent_component
         """
         if isinstance(parent_item, Component):
-            if parent_item.stored_transforms is None:
-                parent_item.stored_transforms = parent_item.transforms
+            self._fetch_component_children(parent_item)
             transformation_list = parent_item.stored_transforms
             parent_component = parent_item
             target_pos = len(transformation_list)
@@ -284,13 +376,10 @@ class ComponentTreeModel(QAbstractItemModel):
         parent_item = parent.internalPointer()
 
         if isinstance(parent_item, Component):
+            self._fetch_component_children(parent_item)
             if row == 0:
-                if parent_item.component_info is None:
-                    parent_item.component_info = ComponentInfo(parent_item)
                 return self.createIndex(0, 0, parent_item.component_info)
             elif row == 1:
-                if parent_item.stored_transforms is None:
-                    parent_item.stored_transforms = parent_item.transforms
                 return self.createIndex(1, 0, parent_item.stored_transforms)
             else:
                 return QModelIndex()
@@ -309,7 +398,7 @@ class ComponentTreeModel(QAbstractItemModel):
         elif isinstance(parent_item, TransformationsList):
             try:
                 return self.createIndex(
-                    self.components.index(parent_item.parent_component),
+                    self.row_of_component(parent_item.parent_component),
                     0,
                     parent_item.parent_component,
                 )
@@ -317,7 +406,7 @@ class ComponentTreeModel(QAbstractItemModel):
                 logging.error(e)
         elif isinstance(parent_item, ComponentInfo):
             return self.createIndex(
-                self.components.index(parent_item.parent), 0, parent_item.parent
+                self.row_of_component(parent_item.parent), 0, parent_item.parent
             )
         elif isinstance(parent_item, Transformation):
             return self.createIndex(
@@ -1,5 +1,8 @@
+import hashlib
+import json
+import logging
 import os
-from typing import Dict, List
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
 import xmltodict
 
@@ -42,40 +45,179 @@ COMPONENT_TYPES = {
 CHOPPER_CLASS_NAME = "NXdisk_chopper"
 
 
+NXDL_VERSION_FILE = "NXDL_VERSION"
+CLASS_DEFINITIONS_CACHE_FILE = "class_definitions_cache.json"
+NXDL_EXTENSION = ".nxdl.xml"
+
+# Keys in the class definitions cache file
+NXDL_VERSION_KEY = "nxdl_version"
+CLASSES_KEY = "classes"
+HASH_KEY = "hash"
+FIELDS_KEY = "fields"
+
+
 def __list_base_class_files(file_list):
     for file in file_list:
-        if file.endswith(".nxdl.xml"):
+        if file.endswith(NXDL_EXTENSION):
             yield file
 
 
+def _find_base_class_files(base_class_dir: str) -> Dict[str, str]:
+    """
+    :return: The path of each definition file in the directory, keyed by class name.
+    """
+    return {
+        base_class_file[: -len(NXDL_EXTENSION)]: os.path.join(
+            base_class_dir, base_class_file
+        )
+        for base_class_file in sorted(
+            __list_base_class_files(os.listdir(base_class_dir))
+        )
+    }
+
+
+def _read_nxdl_version(repo_directory: str) -> str:
+    try:
+        with open(os.path.join(repo_directory, NXDL_VERSION_FILE)) as version_file:
+            return version_file.read().strip()
+    except OSError:
+        return ""
+
+
+def _hash_file(filename: str) -> str:
+    with open(filename, "rb") as file:
+        return hashlib.sha1(file.read()).hexdigest()
+
+
+class ClassDefinitions(Mapping[str, List[str]]):
+    """
+    Mapping of NeXus base class name to the names of the fields in its definition.
+
+    The definitions are only parsed from NXDL when they are first looked up, and the parsed fields are kept in a JSON
+    cache file keyed by NXDL version and the hash of each definition file, so that unchanged definitions are never
+    parsed again.
+    """
+
+    def __init__(
+        self,
+        repo_directory: str,
+        cache_filename: Optional[str] = None,
+        black_list: List[str] = None,
+    ):
+        """
+        :param repo_directory: The nexus definitions directory, containing base_classes.
+        :param cache_filename: JSON file to read cached definitions from and save them to, None to not use a cache.
+        :param black_list: Names of classes to leave out.
+        """
+        self._cache_filename = cache_filename
+        self._nxdl_version = _read_nxdl_version(repo_directory)
+        self._files = _find_base_class_files(
+            os.path.join(repo_directory, "base_classes")
+        )
+        for class_name in black_list or []:
+            self._files.pop(class_name, None)
+        self._hashes = {
+            class_name: _hash_file(filename)
+            for class_name, filename in self._files.items()
+        }
+        self._fields: Dict[str, List[str]] = {}
+        self._modified = False
+        self._load_cache()
+
+    def _load_cache(self):
+        if self._cache_filename is None:
+            return
+        try:
+            with open(self._cache_filename) as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if cache.get(NXDL_VERSION_KEY) != self._nxdl_version:
+            return
+        for class_name, cached_class in cache.get(CLASSES_KEY, {}).items():
+            if self._hashes.get(class_name) == cached_class[HASH_KEY]:
+                self._fields[class_name] = cached_class[FIELDS_KEY]
+
+    def save_cache(self):
+        """
+        Writes the definitions parsed so far to the cache file, if any were parsed since it was loaded.
+        Failing to write the cache, for example if the definitions are installed in a read-only location, is not an
+        error as it only means that they will be parsed again next time.
+        """
+        if self._cache_filename is None or not self._modified:
+            return
+        cache = {
+            NXDL_VERSION_KEY: self._nxdl_version,
+            CLASSES_KEY: {
+                class_name: {HASH_KEY: self._hashes[class_name], FIELDS_KEY: fields}
+                for class_name, fields in self._fields.items()
+            },
+        }
+        try:
+            with open(self._cache_filename, "w") as cache_file:
+                json.dump(cache, cache_file, indent=1)
+            self._modified = False
+        except OSError as error:
+            logging.info(f"Unable to write NXDL class definition cache: {error}")
+
+    def __getitem__(self, class_name: str) -> List[str]:
+        if class_name not in self._fields:
+            with open(self._files[class_name]) as def_file:
+                _, self._fields[class_name] = _parse_base_class(def_file.read())
+            self._modified = True
+        return self._fields[class_name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._files)
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+
 def make_dictionary_of_class_definitions(
-    repo_directory="nexus_definitions", black_list: List[str] = None
-):
-    base_class_dir = os.path.join(repo_directory, "base_classes")
-
-    component_definitions: Dict[str, List] = {}
-    all_class_definitions: Dict[str, List] = {}
-    for base_class_file in __list_base_class_files(os.listdir(base_class_dir)):
-        with open(os.path.join(base_class_dir, base_class_file)) as def_file:
-            _create_base_class_dict(
-                def_file.read(),
-                black_list,
-                all_class_definitions,
-                component_definitions,
-            )
+    repo_directory="nexus_definitions",
+    black_list: List[str] = None,
+    use_cache: bool = True,
+) -> Tuple[ClassDefinitions, Dict[str, List[str]]]:
+    """
+    Finds the NeXus base class definitions. Only the component classes are parsed up front, any other class is parsed
+    when it is first looked up.
+    :param repo_directory: The nexus definitions directory, containing base_classes.
+    :param black_list: Names of classes to leave out.
+    :param use_cache: Whether to use and update the parsed definitions cache file in repo_directory.
+    :return: All class definitions, and the definitions of classes which are components.
+    """
+    cache_filename = (
+        os.path.join(repo_directory, CLASS_DEFINITIONS_CACHE_FILE)
+        if use_cache
+        else None
+    )
+    all_class_definitions = ClassDefinitions(repo_directory, cache_filename, black_list)
+    component_definitions = {
+        class_name: all_class_definitions[class_name]
+        for class_name in sorted(COMPONENT_TYPES)
+        if class_name in all_class_definitions
+    }
+    all_class_definitions.save_cache()
     return all_class_definitions, component_definitions
 
 
-def _create_base_class_dict(
-    xml_text, black_list, class_definitions, component_definitions
-):
-    if black_list is None:
-        black_list = []
+def build_class_definitions_cache(repo_directory: str):
+    """
+    Parses every base class definition and writes them all to the cache file, used when packaging the application so
+    that the first start doesn't need to parse any NXDL.
+    :param repo_directory: The nexus definitions directory, containing base_classes.
+    """
+    class_definitions = ClassDefinitions(
+        repo_directory, os.path.join(repo_directory, CLASS_DEFINITIONS_CACHE_FILE)
+    )
+    # Converting to a dict looks up, and so parses, every class
+    dict(class_definitions)
+    class_definitions.save_cache()
+
 
+def _parse_base_class(xml_text: str) -> Tuple[str, List[str]]:
     xml_definition = xmltodict.parse(xml_text)["definition"]
-    nx_class_name = xml_definition["@name"]
-    if nx_class_name in black_list:
-        return
     class_fields = []
     try:
         fields = xml_definition["field"]
@@ -86,6 +228,4 @@ def _create_base_class_dict(
             class_fields.append(fields["@name"])
     except KeyError:
         pass
-    class_definitions[nx_class_name] = class_fields
-    if nx_class_name in COMPONENT_TYPES:
-        component_definitions[nx_class_name] = class_fields
+    return xml_definition["@name"], class_fields
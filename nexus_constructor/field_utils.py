@@ -9,10 +9,11 @@ from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.link import Link
 from nexus_constructor.model.stream import StreamGroup
+from nexus_constructor.ui_utils import show_warning_dialog
 from nexus_constructor.validators import FieldType
 
 if TYPE_CHECKING:
-    from PySide2.QtWidgets import QFrame  # noqa: F401
+    from PySide2.QtWidgets import QFrame, QListWidget  # noqa: F401
 
     from nexus_constructor.model.value_type import ValueType  # noqa: F401
     from nexus_constructor.stream_fields_widget import StreamFieldsWidget  # noqa: F401
@@ -97,3 +98,22 @@ def find_field_type(item: "ValueType") -> Callable:
             f"Object {item} not handled as field - could be used for other parts of UI instead"
         )
         return None
+
+
+def add_fields_to_component(component: Component, fields_widget: "QListWidget"):
+    """
+    Adds fields from a list widget to a component.
+    :param component: Component to add the field to.
+    :param fields_widget: The field list widget to extract field information such the name and value of each field.
+    """
+    for i in range(fields_widget.count()):
+        widget = fields_widget.itemWidget(fields_widget.item(i))
+        try:
+            component[widget.name] = widget.value
+        except ValueError as error:
+            show_warning_dialog(
+                f"Warning: field {widget.name} not added",
+                title="Field invalid",
+                additional_info=str(error),
+                parent=fields_widget.parent().parent(),
+            )
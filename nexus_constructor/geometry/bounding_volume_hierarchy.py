@@ -0,0 +1,460 @@
+"""
+Spatial indexes for finding what a ray, for example from the camera through the mouse cursor, hits first.
+"""
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.geometry.vector_math import transform_points
+
+# Maximum number of primitives in a leaf of the tree, which are then tested against a ray all at once
+LEAF_SIZE = 8
+
+NO_CHILD = -1
+
+NO_HIT = (np.inf, -1)
+
+
+def ray_box_distances(
+    origin: np.ndarray, direction: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> np.ndarray:
+    """
+    Slab test of a ray against axis-aligned boxes.
+    :param origin: The start of the ray.
+    :param direction: The direction of the ray, which does not need to be a unit vector.
+    :param lower: The (N, 3) array of the minimum corner of each box.
+    :param upper: The (N, 3) array of the maximum corner of each box.
+    :return: For each box, the multiple of direction along the ray at which it enters the box, or 0 if it starts inside
+    the box. Infinity if the ray misses the box.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse_direction = 1.0 / direction
+        to_lower = (lower - origin) * inverse_direction
+        to_upper = (upper - origin) * inverse_direction
+    # A ray parallel to a slab and within it gives nan, which must not affect the result
+    near = np.nanmax(
+        np.where(np.isnan(to_lower), -np.inf, np.minimum(to_lower, to_upper)), axis=-1
+    )
+    far = np.nanmin(
+        np.where(np.isnan(to_upper), np.inf, np.maximum(to_lower, to_upper)), axis=-1
+    )
+    near = np.maximum(near, 0.0)
+    return np.where(near <= far, near, np.inf)
+
+
+def ray_triangle_distances(
+    origin: np.ndarray,
+    direction: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    third: np.ndarray,
+) -> np.ndarray:
+    """
+    Moller-Trumbore intersection of a ray with triangles, from either side.
+    :param origin: The start of the ray.
+    :param direction: The direction of the ray, which does not need to be a unit vector.
+    :param first: The (N, 3) array of the first corner of each triangle.
+    :param second: The (N, 3) array of the second corner of each triangle.
+    :param third: The (N, 3) array of the third corner of each triangle.
+    :return: For each triangle, the multiple of direction along the ray at which it hits the triangle, or infinity if
+    it misses.
+    """
+    edge_1 = second - first
+    edge_2 = third - first
+    p = np.cross(direction, edge_2)
+    determinant = np.einsum("ij,ij->i", edge_1, p)
+    parallel = np.abs(determinant) < 1e-12
+    inverse_determinant = 1.0 / np.where(parallel, 1.0, determinant)
+    t_vector = origin - first
+    u = np.einsum("ij,ij->i", t_vector, p) * inverse_determinant
+    q = np.cross(t_vector, edge_1)
+    v = (q @ direction) * inverse_determinant
+    distance = np.einsum("ij,ij->i", edge_2, q) * inverse_determinant
+    hit = (~parallel) & (u >= 0) & (v >= 0) & (u + v <= 1) & (distance >= 0)
+    return np.where(hit, distance, np.inf)
+
+
+class BoundingVolumeHierarchy:
+    def __init__(self, lower: np.ndarray, upper: np.ndarray):
+        """
+        A binary tree of axis-aligned bounding boxes over primitives, each node split at the median of the primitives
+        along its longest axis.
+        :param lower: The (N, 3) array of the minimum corner of the bounding box of each primitive.
+        :param upper: The (N, 3) array of the maximum corner of the bounding box of each primitive.
+        """
+        self.lower = np.array(lower, dtype=float).reshape(-1, 3)
+        self.upper = np.array(upper, dtype=float).reshape(-1, 3)
+        # Primitives ordered so that those in each leaf are contiguous
+        self.order = np.arange(len(self.lower))
+        node_lower: List[np.ndarray] = []
+        node_upper: List[np.ndarray] = []
+        children: List[Tuple[int, int]] = []
+        ranges: List[Tuple[int, int]] = []
+        parents: List[int] = []
+
+        if len(self.lower):
+            stack = [(0, len(self.lower), NO_CHILD, 0)]
+            while stack:
+                start, end, parent, side = stack.pop()
+                node = len(children)
+                primitives = self.order[start:end]
+                node_lower.append(self.lower[primitives].min(axis=0))
+                node_upper.append(self.upper[primitives].max(axis=0))
+                children.append((NO_CHILD, NO_CHILD))
+                ranges.append((start, end))
+                parents.append(parent)
+                if parent != NO_CHILD:
+                    siblings = list(children[parent])
+                    siblings[side] = node
+                    children[parent] = (siblings[0], siblings[1])
+                if end - start <= LEAF_SIZE:
+                    continue
+                centres = (self.lower[primitives] + self.upper[primitives]) / 2
+                axis = np.argmax(centres.max(axis=0) - centres.min(axis=0))
+                middle = (end - start) // 2
+                split = np.argpartition(centres[:, axis], middle)
+                self.order[start:end] = primitives[split]
+                stack.append((start + middle, end, node, 1))
+                stack.append((start, start + middle, node, 0))
+
+        self.node_lower = np.array(node_lower).reshape(-1, 3)
+        self.node_upper = np.array(node_upper).reshape(-1, 3)
+        self.node_children = np.array(children, dtype=int).reshape(-1, 2)
+        self.node_ranges = np.array(ranges, dtype=int).reshape(-1, 2)
+        self.node_parents = np.array(parents, dtype=int)
+        self.primitive_leaves = np.empty(len(self.lower), dtype=int)
+        for node in np.flatnonzero(self.node_children[:, 0] == NO_CHILD):
+            start, end = self.node_ranges[node]
+            self.primitive_leaves[self.order[start:end]] = node
+
+    def __len__(self) -> int:
+        return len(self.lower)
+
+    def leaf_primitives(self, node: int) -> np.ndarray:
+        start, end = self.node_ranges[node]
+        return self.order[start:end]
+
+    def update_primitive(self, primitive: int, lower: np.ndarray, upper: np.ndarray):
+        """
+        Changes the bounding box of a primitive, refitting the boxes of the nodes containing it without rebuilding the
+        tree.
+        """
+        self.lower[primitive] = lower
+        self.upper[primitive] = upper
+        node = self.primitive_leaves[primitive]
+        primitives = self.leaf_primitives(node)
+        self.node_lower[node] = self.lower[primitives].min(axis=0)
+        self.node_upper[node] = self.upper[primitives].max(axis=0)
+        node = self.node_parents[node]
+        while node != NO_CHILD:
+            children = self.node_children[node]
+            self.node_lower[node] = self.node_lower[children].min(axis=0)
+            self.node_upper[node] = self.node_upper[children].max(axis=0)
+            node = self.node_parents[node]
+
+    def ray_cast(
+        self,
+        origin: np.ndarray,
+        direction: np.ndarray,
+        intersect_primitives: Callable[[np.ndarray], Tuple[float, int]],
+    ) -> Tuple[float, int]:
+        """
+        Finds the first primitive hit by a ray, visiting nodes from nearest to furthest so that those further than the
+        nearest hit so far are skipped.
+        :param origin: The start of the ray.
+        :param direction: The direction of the ray, which does not need to be a unit vector.
+        :param intersect_primitives: Given the indices of the primitives in a leaf, returns the multiple of direction
+        at which the ray first hits one of them and which one, or NO_HIT.
+        :return: The multiple of direction at which the ray hits the first primitive and which one, or NO_HIT.
+        """
+        if not len(self):
+            return NO_HIT
+        origin = np.asarray(origin, dtype=float)
+        direction = np.asarray(direction, dtype=float)
+        best = NO_HIT
+        root_distance = ray_box_distances(
+            origin, direction, self.node_lower[:1], self.node_upper[:1]
+        )[0]
+        queue = [(root_distance, 0)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance >= best[0]:
+                break
+            children = self.node_children[node]
+            if children[0] == NO_CHILD:
+                hit = intersect_primitives(self.leaf_primitives(node))
+                if hit[0] < best[0]:
+                    best = hit
+                continue
+            child_distances = ray_box_distances(
+                origin, direction, self.node_lower[children], self.node_upper[children]
+            )
+            for child, child_distance in zip(children, child_distances):
+                if child_distance < best[0]:
+                    heapq.heappush(queue, (child_distance, child))
+        return best
+
+
+class TriangleMeshIndex:
+    def __init__(self, vertices: np.ndarray, triangles: np.ndarray):
+        """
+        Finds where rays hit a triangle mesh.
+        :param vertices: The (N, 3) array of vertices in the mesh.
+        :param triangles: The (M, 3) array of indices into vertices of each triangle.
+        """
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        triangles = np.asarray(triangles, dtype=int).reshape(-1, 3)
+        self.corners = vertices[triangles]
+        self.tree = BoundingVolumeHierarchy(
+            self.corners.min(axis=1), self.corners.max(axis=1)
+        )
+
+    def ray_cast(self, origin: np.ndarray, direction: np.ndarray) -> float:
+        """
+        :return: The multiple of direction along the ray at which it first hits the mesh, or infinity if it misses.
+        """
+
+        def intersect_triangles(triangles: np.ndarray) -> Tuple[float, int]:
+            distances = ray_triangle_distances(
+                origin, direction, *self.corners[triangles].transpose(1, 0, 2)
+            )
+            nearest = np.argmin(distances)
+            return distances[nearest], triangles[nearest]
+
+        return self.tree.ray_cast(origin, direction, intersect_triangles)[0]
+
+
+class RepeatedMeshIndex:
+    def __init__(
+        self, vertices: np.ndarray, triangles: np.ndarray, positions: np.ndarray
+    ):
+        """
+        Finds where rays hit a triangle mesh repeated at many positions, such as the shape of each pixel of a detector.
+        The mesh is indexed once, and a tree over the copies finds which ones the ray reaches, so that the triangles of
+        every copy are not stored.
+        :param vertices: The (N, 3) array of vertices in the mesh.
+        :param triangles: The (M, 3) array of indices into vertices of each triangle.
+        :param positions: The (P, 3) array of the position of each copy of the mesh.
+        """
+        self.mesh_index = TriangleMeshIndex(vertices, triangles)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        lower, upper = self.mesh_index.tree.node_lower, self.mesh_index.tree.node_upper
+        self.tree = BoundingVolumeHierarchy(
+            self.positions + (lower[0] if len(lower) else np.zeros(3)),
+            self.positions + (upper[0] if len(upper) else np.zeros(3)),
+        )
+
+    def ray_cast(self, origin: np.ndarray, direction: np.ndarray) -> float:
+        """
+        :return: The multiple of direction along the ray at which it first hits a copy of the mesh, or infinity if it
+        misses them all.
+        """
+        if not len(self.mesh_index.tree):
+            return NO_HIT[0]
+
+        def intersect_copies(copies: np.ndarray) -> Tuple[float, int]:
+            best = NO_HIT
+            for copy in copies:
+                # Each copy is only moved, so moving the ray the other way puts it in the mesh's coordinates
+                distance = self.mesh_index.ray_cast(
+                    origin - self.positions[copy], direction
+                )
+                if distance < best[0]:
+                    best = (distance, copy)
+            return best
+
+        return self.tree.ray_cast(origin, direction, intersect_copies)[0]
+
+
+def transform_bounds(
+    matrix: np.ndarray, lower: np.ndarray, upper: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    :param matrix: A 4x4 transformation matrix.
+    :param lower: The minimum corner of an axis-aligned box.
+    :param upper: The maximum corner of an axis-aligned box.
+    :return: The minimum and maximum corners of the axis-aligned box containing the transformed box.
+    """
+    corners = np.array(
+        [
+            [x, y, z]
+            for x in (lower[0], upper[0])
+            for y in (lower[1], upper[1])
+            for z in (lower[2], upper[2])
+        ]
+    )
+    transformed_corners = transform_points(matrix, corners)
+    return transformed_corners.min(axis=0), transformed_corners.max(axis=0)
+
+
+class ComponentSpatialIndex:
+    """
+    Axis-aligned bounding boxes of the components' meshes, and which component a ray hits first.
+
+    Each component's bounding box is found once in its own coordinates when its mesh is set, and the box in world
+    coordinates is updated when its transformation changes. The mesh is indexed in the component's own coordinates, and
+    rays are transformed into them, so that moving a component only updates its box in the tree over all of the
+    components. The tree over a mesh's triangles is only built the first time a ray reaches the mesh's bounding box,
+    and a shape repeated at many positions is indexed once, under a tree over its positions.
+    """
+
+    def __init__(self):
+        # Vertices, faces and positions of the mesh of each component, which are only triangulated when needed
+        self._meshes: Dict[str, Tuple[np.ndarray, List[List[int]], np.ndarray]] = {}
+        self._mesh_indexes: Dict[str, Union[TriangleMeshIndex, RepeatedMeshIndex]] = {}
+        self._local_bounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._world_bounds: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._transforms: Dict[str, np.ndarray] = {}
+        self._inverse_transforms: Dict[str, np.ndarray] = {}
+        # Component of each primitive in the tree, and the reverse
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._tree: Optional[BoundingVolumeHierarchy] = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._meshes
+
+    def set_mesh(
+        self,
+        name: str,
+        vertices: np.ndarray,
+        faces: List[List[int]],
+        positions: Optional[np.ndarray] = None,
+    ):
+        """
+        Adds or replaces the mesh of a component, initially without a transformation.
+        :param name: The name of the component.
+        :param vertices: The (N, 3) array of vertices in the component's coordinates.
+        :param faces: The indices into vertices of the corners of each polygon.
+        :param positions: (M, 3) array, mesh is repeated at each of these positions
+        """
+        vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+        positions = (
+            np.zeros((1, 3))
+            if positions is None
+            else np.asarray(positions, dtype=float).reshape(-1, 3)
+        )
+        if not len(vertices) or not len(positions):
+            self.remove(name)
+            return
+        self._meshes[name] = (vertices, faces, positions)
+        self._mesh_indexes.pop(name, None)
+        self._local_bounds[name] = (
+            vertices.min(axis=0) + positions.min(axis=0),
+            vertices.max(axis=0) + positions.max(axis=0),
+        )
+        self._world_bounds[name] = self._local_bounds[name]
+        self._transforms[name] = np.identity(4)
+        self._inverse_transforms[name] = np.identity(4)
+        self._tree = None
+
+    def remove(self, name: str):
+        if name in self._meshes:
+            del self._meshes[name]
+            self._mesh_indexes.pop(name, None)
+            del self._local_bounds[name]
+            del self._world_bounds[name]
+            del self._transforms[name]
+            del self._inverse_transforms[name]
+            self._tree = None
+
+    def clear(self):
+        for name in list(self._meshes):
+            self.remove(name)
+
+    def set_transform(self, name: str, transform_matrix: np.ndarray):
+        """
+        :param name: The name of the component.
+        :param transform_matrix: 4x4 matrix from the component's coordinates to world coordinates.
+        """
+        if name not in self._meshes:
+            return
+        self._transforms[name] = np.asarray(transform_matrix, dtype=float)
+        self._inverse_transforms[name] = np.linalg.inv(self._transforms[name])
+        self._world_bounds[name] = transform_bounds(
+            self._transforms[name], *self._local_bounds[name]
+        )
+        if self._tree is not None:
+            self._tree.update_primitive(self._rows[name], *self._world_bounds[name])
+
+    def reset_transforms(self):
+        for name in self._meshes:
+            self.set_transform(name, np.identity(4))
+
+    def local_bounds(self, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        :return: The minimum and maximum corners of the bounding box of the component's mesh in its own coordinates, or
+        None if it has no mesh.
+        """
+        return self._local_bounds.get(name)
+
+    def world_bounds(self, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        :return: The minimum and maximum corners of the bounding box of the component's mesh in world coordinates, or
+        None if it has no mesh.
+        """
+        return self._world_bounds.get(name)
+
+    def scene_bounds(self) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        :return: The minimum and maximum corners of the bounding box of all of the components in world coordinates, or
+        None if there are none.
+        """
+        tree = self._get_tree()
+        if not len(tree):
+            return None
+        return tree.node_lower[0].copy(), tree.node_upper[0].copy()
+
+    def _get_tree(self) -> BoundingVolumeHierarchy:
+        if self._tree is None:
+            self._names = list(self._meshes)
+            self._rows = {name: row for row, name in enumerate(self._names)}
+            self._tree = BoundingVolumeHierarchy(
+                [self._world_bounds[name][0] for name in self._names],
+                [self._world_bounds[name][1] for name in self._names],
+            )
+        return self._tree
+
+    def _mesh_index(self, name: str) -> Union[TriangleMeshIndex, RepeatedMeshIndex]:
+        if name not in self._mesh_indexes:
+            vertices, faces, positions = self._meshes[name]
+            triangles = np.asarray(
+                convert_faces_into_triangles(faces), dtype=int
+            ).reshape(-1, 3)
+            if len(positions) == 1:
+                self._mesh_indexes[name] = TriangleMeshIndex(
+                    vertices + positions[0], triangles
+                )
+            else:
+                self._mesh_indexes[name] = RepeatedMeshIndex(
+                    vertices, triangles, positions
+                )
+        return self._mesh_indexes[name]
+
+    def pick(self, origin: np.ndarray, direction: np.ndarray) -> Optional[str]:
+        """
+        :param origin: The start of the ray in world coordinates.
+        :param direction: The direction of the ray in world coordinates.
+        :return: The name of the first component hit by the ray, or None if it misses them all.
+        """
+        tree = self._get_tree()
+        origin = np.asarray(origin, dtype=float)
+        direction = np.asarray(direction, dtype=float)
+
+        def intersect_components(components: np.ndarray) -> Tuple[float, int]:
+            best = NO_HIT
+            for component in components:
+                name = self._names[component]
+                inverse = self._inverse_transforms[name]
+                # Distances along the ray are the same in either coordinates as the transformation is affine
+                distance = self._mesh_index(name).ray_cast(
+                    transform_points(inverse, origin)[0], inverse[:3, :3] @ direction
+                )
+                if distance < best[0]:
+                    best = (distance, component)
+            return best
+
+        distance, component = tree.ray_cast(origin, direction, intersect_components)
+        return self._names[component] if component != NO_HIT[1] else None
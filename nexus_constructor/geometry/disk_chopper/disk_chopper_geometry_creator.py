@@ -1,7 +1,6 @@
 from typing import List, Tuple
 
 import numpy as np
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.common_attrs import SHAPE_GROUP_NAME
 from nexus_constructor.geometry.disk_chopper.chopper_details import ChopperDetails
@@ -30,11 +29,11 @@ class Point:
 
         self.id = index
 
-    def point_to_qvector3d(self) -> QVector3D:
+    def point_to_numpy_array(self) -> np.ndarray:
         """
-        Create a QVector3D from the point.
+        Create a numpy array from the point.
         """
-        return QVector3D(self.x, self.y, self.z)
+        return np.array([self.x, self.y, self.z], dtype=float)
 
     def __eq__(self, other):
         """
@@ -398,6 +397,6 @@ class DiskChopperGeometryCreator:
         self.convert_chopper_details_to_off()
 
         # Add the point information to the string
-        vertices = [point.point_to_qvector3d() for point in self.points]
+        vertices = [point.point_to_numpy_array() for point in self.points]
 
         return OFFGeometryNoNexus(vertices, self.faces, SHAPE_GROUP_NAME)
@@ -1,8 +1,8 @@
 import logging
 from typing import BinaryIO, TextIO, Union
 
+import numpy as np
 from nexusutils.readwriteoff import parse_off_file
-from PySide2.QtGui import QVector3D
 from stl import mesh
 
 from nexus_constructor.model.geometry import OFFGeometry, OFFGeometryNoNexus
@@ -85,10 +85,7 @@ def _load_off_geometry(
     """
     vertices, faces = parse_off_file(file)
 
-    geometry.vertices = [
-        QVector3D(x * mult_factor, y * mult_factor, z * mult_factor)
-        for x, y, z in (vertex for vertex in vertices)
-    ]
+    geometry.vertices = np.asarray(vertices, dtype=float) * mult_factor
     geometry.faces = [face.tolist()[1:] for face in faces]
     logging.info("OFF loaded")
     return geometry
@@ -109,16 +106,8 @@ def _load_stl_geometry(
     :return: An OFFGeometry instance containing that file's geometry.
     """
     mesh_data = mesh.Mesh.from_file("", fh=file, calculate_normals=False)
-    # numpy-stl loads numbers as python decimals, not floats, which aren't valid in json
-    geometry.vertices = [
-        QVector3D(
-            float(corner[0]) * mult_factor,
-            float(corner[1]) * mult_factor,
-            float(corner[2]) * mult_factor,
-        )
-        for triangle in mesh_data.vectors
-        for corner in triangle
-    ]
+    # numpy-stl loads numbers as 32-bit floats, convert them so the corners of each triangle become the vertices
+    geometry.vertices = mesh_data.vectors.reshape(-1, 3).astype(float) * mult_factor
     geometry.faces = [
         [i * 3, (i * 3) + 1, (i * 3) + 2] for i in range(len(mesh_data.vectors))
     ]
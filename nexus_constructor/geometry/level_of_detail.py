@@ -0,0 +1,124 @@
+"""
+Simplified versions of dense meshes, for drawing components which are far from the camera.
+
+These are only used by the 3D view. The geometry stored in the model, and written to files, is always full resolution.
+"""
+from typing import List, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.model.geometry import OFFGeometry
+
+# Meshes with fewer triangles than this are cheap enough to always draw at full resolution
+MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL = 10000
+
+# Sizes of the vertex clustering grid cells, as fractions of the diagonal of the mesh's bounding box, from finest to
+# coarsest
+CELL_SIZE_FRACTIONS = (1 / 256, 1 / 64, 1 / 16)
+
+# A simplified level is only worth drawing if it has at most this fraction of the triangles of the previous level
+MAX_TRIANGLE_FRACTION_PER_LEVEL = 0.5
+
+# Angle subtended by a couple of pixels in the 3D view, which has a 45 degree vertical field of view and is around 1000
+# pixels high. A level is drawn once its grid cells are smaller than this from the camera, so that the detail which
+# has been removed is not noticeable.
+MAX_CELL_ANGLE = 2 * np.deg2rad(45) / 1000
+
+
+@attr.s
+class SimplifiedMesh:
+    """
+    A simplified version of a mesh, to be drawn instead of it when the camera is at least min_distance away
+    """
+
+    vertices = attr.ib(type=np.ndarray)
+    triangles = attr.ib(type=np.ndarray)
+    min_distance = attr.ib(type=float)
+
+
+def decimate_by_vertex_clustering(
+    vertices: np.ndarray, triangles: np.ndarray, cell_size: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Simplifies a mesh by merging all of the vertices in each cell of a regular grid into their mean position.
+    Triangles which collapse to a line or a point are removed, as are duplicates of the same triangle.
+    :param vertices: The (N, 3) array of vertices in the mesh.
+    :param triangles: The (M, 3) array of indices into vertices of each triangle.
+    :param cell_size: The length of the sides of the grid cells.
+    :return: The vertices and triangles of the simplified mesh.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+    cell_keys = np.ravel_multi_index(cells.T, cells.max(axis=0) + 1)
+    _, clusters, cluster_sizes = np.unique(
+        cell_keys, return_inverse=True, return_counts=True
+    )
+    clustered_vertices = np.column_stack(
+        [
+            np.bincount(clusters, weights=vertices[:, axis]) / cluster_sizes
+            for axis in range(3)
+        ]
+    )
+
+    clustered_triangles = clusters[triangles]
+    first, second, third = clustered_triangles.T
+    clustered_triangles = clustered_triangles[
+        (first != second) & (second != third) & (third != first)
+    ]
+    # Sorting the corners finds duplicates whatever their winding, but the original winding is kept
+    _, unique_triangles = np.unique(
+        np.sort(clustered_triangles, axis=1), axis=0, return_index=True
+    )
+    clustered_triangles = clustered_triangles[np.sort(unique_triangles)]
+
+    # Remove the clusters which are no longer used by any triangle
+    used_clusters, remapped_triangles = np.unique(
+        clustered_triangles, return_inverse=True
+    )
+    return (
+        clustered_vertices[used_clusters],
+        remapped_triangles.reshape(-1, 3),
+    )
+
+
+def create_levels_of_detail(geometry: OFFGeometry) -> List[SimplifiedMesh]:
+    """
+    Creates progressively simpler versions of a dense mesh.
+    :param geometry: The full resolution mesh, which is not modified.
+    :return: The simplified meshes, ordered by the distance from which each should be drawn. Empty if the mesh is not
+    dense enough to need simplifying.
+    """
+    triangles = np.asarray(
+        convert_faces_into_triangles(geometry.faces), dtype=np.int64
+    ).reshape(-1, 3)
+    if len(triangles) < MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL:
+        return []
+    vertices = np.asarray(geometry.vertices, dtype=float).reshape(-1, 3)
+    diagonal = np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0))
+    if diagonal == 0:
+        return []
+
+    levels: List[SimplifiedMesh] = []
+    triangle_count = len(triangles)
+    for fraction in CELL_SIZE_FRACTIONS:
+        cell_size = diagonal * fraction
+        simplified_vertices, simplified_triangles = decimate_by_vertex_clustering(
+            vertices, triangles, cell_size
+        )
+        if (
+            len(simplified_triangles) == 0
+            or len(simplified_triangles)
+            > triangle_count * MAX_TRIANGLE_FRACTION_PER_LEVEL
+        ):
+            continue
+        levels.append(
+            SimplifiedMesh(
+                simplified_vertices, simplified_triangles, cell_size / MAX_CELL_ANGLE
+            )
+        )
+        triangle_count = len(simplified_triangles)
+    return levels
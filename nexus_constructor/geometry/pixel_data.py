@@ -1,7 +1,9 @@
 from abc import ABC
 from enum import Enum
+from typing import Optional, Sequence, Union
 
 import attr
+import numpy as np
 
 
 class CountDirection(Enum):
@@ -54,17 +56,49 @@ class PixelGrid(PixelData):
     initial_count_corner = attr.ib(default=Corner.BOTTOM_LEFT, type=Corner)
 
 
-@attr.s
+def masked_pixel_ids(
+    pixel_ids: Union[Sequence[Optional[int]], np.ndarray]
+) -> np.ma.MaskedArray:
+    """
+    Converts pixel IDs to a 1D int64 masked array, which is masked where there is no ID.
+    :param pixel_ids: A masked or unmasked array of IDs, or a sequence of IDs with None where there is no ID.
+    :return: The masked array of IDs.
+    """
+    if isinstance(pixel_ids, np.ndarray):
+        return np.ma.array(
+            pixel_ids.ravel(),
+            dtype=np.int64,
+            mask=np.ma.getmaskarray(pixel_ids).ravel(),
+        )
+    missing = np.fromiter(
+        (pixel_id is None for pixel_id in pixel_ids), dtype=bool, count=len(pixel_ids)
+    )
+    values = np.array(
+        [0 if pixel_id is None else pixel_id for pixel_id in pixel_ids], dtype=np.int64
+    )
+    return np.ma.array(values, mask=missing)
+
+
+@attr.s(eq=False)
 class PixelMapping(PixelData):
     """
     Maps faces in a 3D geometry to the detector id's
 
     To be used in conjunction with an OFFGeometry instance. This classes pixel_ids attribute should be the same length
-    as the geometry's faces list. The value of this list at any given index should be the detector id number that the
-    face is part of, or None if it isn't part of any detecting face or volume.
+    as the geometry's faces list. The value of this array at any given index should be the detector id number that the
+    face is part of, or masked if it isn't part of any detecting face or volume. The IDs can also be given as a list
+    with None for faces which aren't part of a detector.
 
     Used to populate the detector_faces dataset of the NXoff_geometry class.
     See http://download.nexusformat.org/sphinx/classes/base_classes/NXoff_geometry.html
     """
 
-    pixel_ids = attr.ib(default=[], type=list)
+    _pixel_ids = attr.ib(factory=list, converter=masked_pixel_ids)
+
+    @property
+    def pixel_ids(self) -> np.ma.MaskedArray:
+        return self._pixel_ids
+
+    @pixel_ids.setter
+    def pixel_ids(self, pixel_ids: Union[Sequence[Optional[int]], np.ndarray]):
+        self._pixel_ids = masked_pixel_ids(pixel_ids)
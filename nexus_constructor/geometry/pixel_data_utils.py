@@ -1,4 +1,4 @@
-from typing import List, Tuple, Union
+from typing import Union
 
 import numpy as np
 
@@ -25,29 +25,21 @@ PIXEL_FIELDS = [
 ]
 
 
-def get_detector_faces_from_pixel_mapping(
-    mapping: PixelMapping,
-) -> List[Tuple[int, int]]:
+def get_detector_faces_from_pixel_mapping(mapping: PixelMapping) -> np.ndarray:
     """
-    Returns a list of tuples. Each tuple contains a face ID followed by the face's detector ID.
+    Returns an (M, 2) array. Each row contains a face ID followed by the face's detector ID.
     Corresponds to the detector_faces dataset structure of the NXoff_geometry class.
     """
-    detector_faces: List[Tuple[int, int]] = []
-    idx: Tuple[int, int]
-    for idx in enumerate(mapping.pixel_ids):
-        if idx[1] is not None:
-            detector_faces.append((idx[0], idx[1]))
+    faces = np.flatnonzero(~np.ma.getmaskarray(mapping.pixel_ids))
+    return np.column_stack((faces, mapping.pixel_ids.data[faces])).astype(np.int64)
 
-    return detector_faces
 
-
-def get_detector_number_from_pixel_mapping(mapping: PixelMapping,) -> List[int]:
+def get_detector_number_from_pixel_mapping(mapping: PixelMapping) -> np.ndarray:
     """
-    Returns a list of pixel IDs. Used for writing information to the detector_number field in NXdetector and
+    Returns an array of pixel IDs. Used for writing information to the detector_number field in NXdetector and
     NXcylindrical_geometry.
     """
-    detector_numbers = [id for id in mapping.pixel_ids if id is not None]
-    return detector_numbers
+    return mapping.pixel_ids.compressed()
 
 
 def get_x_offsets_from_pixel_grid(grid: PixelGrid) -> Union[np.ndarray, float]:
@@ -82,6 +74,21 @@ def get_z_offsets_from_pixel_grid(grid: PixelGrid) -> Union[np.ndarray, float]:
     return np.zeros((grid.rows, grid.columns))
 
 
+def get_pixel_offsets_from_pixel_grid(grid: PixelGrid) -> np.ndarray:
+    """
+    Returns an (N, 3) array of the position of each pixel instance defined in the PixelGrid, in the same order as the
+    flattened x and y offset arrays, without creating the offset arrays.
+    """
+    x_offsets = (
+        np.linspace(-1, 1, grid.columns) * grid.col_width * (grid.columns - 1) / 2
+    )
+    y_offsets = np.linspace(1, -1, grid.rows) * grid.row_height * (grid.rows - 1) / 2
+    positions = np.zeros((grid.rows, grid.columns, 3))
+    positions[:, :, 0] = x_offsets
+    positions[:, :, 1] = y_offsets[:, np.newaxis]
+    return positions.reshape(-1, 3)
+
+
 def get_detector_ids_from_pixel_grid(grid: PixelGrid) -> Union[np.ndarray, int]:
     """
     Returns an array of detector IDs. Starts with a 1D array of numbers and reorders them depending on the count
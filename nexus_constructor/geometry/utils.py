@@ -1,18 +1,34 @@
 import numpy as np
-from PySide2.QtGui import QVector3D
 
 
-def validate_nonzero_qvector(value: QVector3D):
-    if value.x() == 0 and value.y() == 0 and value.z() == 0:
+def validate_nonzero_vector(value: np.ndarray):
+    if not np.any(np.asarray(value)):
         raise ValueError("Vector is zero length")
 
 
-def get_an_orthogonal_unit_vector(input_vector: QVector3D) -> QVector3D:
+def get_an_orthogonal_unit_vector(input_vector: np.ndarray) -> np.ndarray:
     """
     Return a unit vector which is orthogonal to the input vector
     There are infinite valid solutions, just one is returned
     """
-    if np.abs(input_vector.z()) < np.abs(input_vector.x()):
-        vector = QVector3D(input_vector.y(), -input_vector.x(), 0.0)
-        return vector.normalized()
-    return QVector3D(0.0, -input_vector.z(), input_vector.y()).normalized()
+    x, y, z = np.asarray(input_vector, dtype=float)
+    if np.abs(z) < np.abs(x):
+        vector = np.array([y, -x, 0.0])
+    else:
+        vector = np.array([0.0, -z, y])
+    return vector / np.linalg.norm(vector)
+
+
+def convert_faces_into_triangles(faces):
+    """
+    Converts the faces into a list of triangles
+    :param faces: List of faces containing the triangles
+    :return: A list of the triangles that make a face
+    """
+    triangles = []
+    for face in faces:
+        triangles_in_face = len(face) - 2
+        triangles.extend(
+            [[face[0], face[i + 1], face[i + 2]] for i in range(triangles_in_face)]
+        )
+    return triangles
@@ -0,0 +1,146 @@
+"""
+Vector, quaternion and 4x4 matrix operations used by the model.
+
+Vectors are numpy arrays of shape (3,), quaternions are numpy arrays of shape (4,) in (w, x, y, z) order and matrices
+are numpy arrays of shape (4, 4) which act on column vectors, matching the conventions of QMatrix4x4 so that
+conversion to Qt types at the rendering boundary is a straight copy.
+"""
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+
+from nexus_constructor.geometry.utils import get_an_orthogonal_unit_vector
+
+VectorLike = Union[np.ndarray, Sequence[float]]
+
+
+def to_vector(vector: VectorLike) -> np.ndarray:
+    """
+    :param vector: Any sequence of three numbers.
+    :return: The vector as a float numpy array of shape (3,).
+    """
+    return np.asarray(vector, dtype=float).reshape(3)
+
+
+def vector_length(vector: VectorLike) -> float:
+    return float(np.linalg.norm(to_vector(vector)))
+
+
+def normalise(vector: VectorLike) -> Tuple[np.ndarray, float]:
+    """
+    Normalise to unit vector
+
+    :param vector: Input vector
+    :return: Unit vector, magnitude. A zero vector is returned unchanged with magnitude 0.
+    """
+    vector = to_vector(vector)
+    magnitude = float(np.linalg.norm(vector))
+    if magnitude == 0:
+        return np.zeros(3), 0.0
+    return vector / magnitude, magnitude
+
+
+def quaternion_from_axis_and_angle(axis: VectorLike, angle: float) -> np.ndarray:
+    """
+    :param axis: The rotation axis, does not need to be a unit vector.
+    :param angle: The rotation angle in degrees.
+    :return: The unit quaternion (w, x, y, z) describing the rotation.
+    """
+    unit_axis, _ = normalise(axis)
+    half_angle = np.radians(angle) / 2.0
+    return np.concatenate(([np.cos(half_angle)], unit_axis * np.sin(half_angle)))
+
+
+def quaternion_to_matrix(quaternion: np.ndarray) -> np.ndarray:
+    """
+    :param quaternion: A unit quaternion in (w, x, y, z) order.
+    :return: The 4x4 rotation matrix equivalent to the quaternion.
+    """
+    w, x, y, z = quaternion
+    matrix = np.identity(4)
+    matrix[:3, :3] = [
+        [1 - 2 * (y * y + z * z), 2 * (x * y - w * z), 2 * (x * z + w * y)],
+        [2 * (x * y + w * z), 1 - 2 * (x * x + z * z), 2 * (y * z - w * x)],
+        [2 * (x * z - w * y), 2 * (y * z + w * x), 1 - 2 * (x * x + y * y)],
+    ]
+    return matrix
+
+
+def rotation_matrix(axis: VectorLike, angle: float) -> np.ndarray:
+    """
+    :param axis: The rotation axis, does not need to be a unit vector.
+    :param angle: The rotation angle in degrees, positive angles are anticlockwise looking down the axis.
+    :return: The 4x4 matrix of the rotation.
+    """
+    return quaternion_to_matrix(quaternion_from_axis_and_angle(axis, angle))
+
+
+def translation_matrix(vector: VectorLike) -> np.ndarray:
+    """
+    :param vector: The translation.
+    :return: The 4x4 matrix of the translation.
+    """
+    matrix = np.identity(4)
+    matrix[:3, 3] = to_vector(vector)
+    return matrix
+
+
+def rotation_matrix_between(source: VectorLike, target: VectorLike) -> np.ndarray:
+    """
+    :param source: The direction to rotate from.
+    :param target: The direction to rotate to.
+    :return: The 4x4 matrix of the smallest rotation which takes source onto the direction of target.
+    """
+    from_unit, _ = normalise(source)
+    to_unit, _ = normalise(target)
+    axis = np.cross(from_unit, to_unit)
+    cosine = np.clip(np.dot(from_unit, to_unit), -1.0, 1.0)
+    if np.linalg.norm(axis) < 1e-12:
+        if cosine > 0:
+            return np.identity(4)
+        # Antiparallel, any perpendicular axis gives a half turn
+        axis = get_an_orthogonal_unit_vector(from_unit)
+    return rotation_matrix(axis, np.degrees(np.arccos(cosine)))
+
+
+def transform_points(matrix: np.ndarray, points: np.ndarray) -> np.ndarray:
+    """
+    :param matrix: A 4x4 transformation matrix.
+    :param points: An (N, 3) array of points.
+    :return: The (N, 3) array of transformed points.
+    """
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+def triangle_normals(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """
+    :param vertices: An (N, 3) array of vertices.
+    :param triangles: An (M, 3) array of indices into vertices, wound anticlockwise.
+    :return: An (M, 3) array of the unit normal of each triangle.
+    """
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    triangles = np.asarray(triangles, dtype=int).reshape(-1, 3)
+    first, second, third = (vertices[triangles[:, i]] for i in range(3))
+    normals = np.cross(second - first, third - first)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    return np.divide(normals, lengths, out=np.zeros_like(normals), where=lengths > 0)
+
+
+def ray_through_screen_point(
+    view_matrix: np.ndarray, projection_matrix: np.ndarray, x: float, y: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The ray from a camera through a point on the screen, such as the mouse cursor.
+    :param view_matrix: 4x4 matrix from world coordinates to the camera's coordinates.
+    :param projection_matrix: 4x4 matrix from the camera's coordinates to clip coordinates.
+    :param x: Horizontal position of the point, from -1 at the left edge of the screen to 1 at the right.
+    :param y: Vertical position of the point, from -1 at the bottom edge of the screen to 1 at the top.
+    :return: The point where the ray meets the near plane, and the unit direction of the ray, in world coordinates.
+    """
+    inverse = np.linalg.inv(projection_matrix @ view_matrix)
+    near, far = (inverse @ np.array([x, y, depth, 1.0]) for depth in (-1.0, 1.0))
+    near = near[:3] / near[3]
+    far = far[:3] / far[3]
+    direction, _ = normalise(far - near)
+    return near, direction
@@ -0,0 +1,269 @@
+"""
+Drawing many static components which share a material with a single draw call.
+
+The meshes of the components are transformed into world coordinates on the CPU and concatenated into one set of
+buffers. The ranges of the buffers belonging to each component are kept so that it can be moved or hidden without
+building or uploading the buffers of the other components again.
+"""
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DRender import Qt3DRender
+from PySide2.QtCore import QTimer
+
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.geometry.vector_math import transform_points
+from nexus_constructor.instrument_view.off_renderer import (
+    IndexedGeometry,
+    create_indexed_buffers,
+    create_repeated_indexed_buffers,
+)
+from nexus_constructor.instrument_view.qentity_utils import create_qentity
+from nexus_constructor.model.geometry import OFFGeometry
+
+
+class MeshBatch:
+    """
+    The meshes of several components, combined into the buffers for a single indexed mesh in world coordinates.
+    Once built, moving a component only transforms its own range of the vertices, and hiding it only zeroes its range
+    of the indices so that its triangles are degenerate and not drawn.
+    """
+
+    def __init__(self):
+        # Indexed buffers of each component's mesh in its own coordinates, in the order they were added
+        self._meshes: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self._transforms: Dict[str, np.ndarray] = {}
+        self._hidden: Set[str] = set()
+        # Start and length of the range of the combined index buffer belonging to each component
+        self.index_ranges: Dict[str, Tuple[int, int]] = {}
+        # Start and length of the range of the combined vertex buffers belonging to each component
+        self._vertex_ranges: Dict[str, Tuple[int, int]] = {}
+        self.positions = np.empty((0, 3))
+        self.normals = np.empty((0, 3))
+        self.indices = np.empty(0, dtype=np.uint32)
+        self.needs_build = True
+        # Components which have moved or been shown or hidden since the buffers were last built or updated
+        self._moved: Set[str] = set()
+        self._visibility_changed: Set[str] = set()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._meshes
+
+    def __len__(self) -> int:
+        return len(self._meshes)
+
+    @property
+    def has_visible_components(self) -> bool:
+        return len(self._hidden) < len(self._meshes)
+
+    def add(self, name: str, vertices: np.ndarray, triangles: np.ndarray):
+        """
+        Adds or replaces the mesh of a component, initially without a transformation.
+        :param name: The name of the component.
+        :param vertices: The (N, 3) array of vertices in the component's coordinates.
+        :param triangles: The (M, 3) array of indices into vertices of each triangle.
+        """
+        self.add_buffers(name, *create_indexed_buffers(vertices, triangles))
+
+    def add_buffers(
+        self, name: str, positions: np.ndarray, normals: np.ndarray, indices: np.ndarray
+    ):
+        """
+        Adds or replaces the mesh of a component from its indexed buffers, initially without a transformation.
+        :param name: The name of the component.
+        :param positions: The (N, 3) array of vertex positions in the component's coordinates.
+        :param normals: The (N, 3) array of vertex normals in the component's coordinates.
+        :param indices: The index into positions and normals of each corner of each triangle.
+        """
+        self._meshes[name] = (positions, normals, indices)
+        self._transforms[name] = np.identity(4)
+        self.needs_build = True
+
+    def remove(self, name: str):
+        del self._meshes[name]
+        del self._transforms[name]
+        self._hidden.discard(name)
+        self.needs_build = True
+
+    def set_transform(self, name: str, transform_matrix: np.ndarray):
+        """
+        :param name: The name of the component.
+        :param transform_matrix: 4x4 matrix from the component's coordinates to world coordinates.
+        """
+        self._transforms[name] = np.asarray(transform_matrix, dtype=float)
+        self._moved.add(name)
+
+    def reset_transforms(self):
+        for name in self._transforms:
+            self._transforms[name] = np.identity(4)
+        self._moved.update(self._transforms)
+
+    def set_visible(self, name: str, visible: bool):
+        if visible:
+            self._hidden.discard(name)
+        else:
+            self._hidden.add(name)
+        self._visibility_changed.add(name)
+
+    def build(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Combines the meshes of all of the components, and records the vertex and index ranges of each.
+        :return: The positions and normals of the vertices, in world coordinates, and the indices of the triangles.
+        """
+        self.index_ranges = {}
+        self._vertex_ranges = {}
+        vertex_offset = 0
+        index_offset = 0
+        for name, (positions, _, indices) in self._meshes.items():
+            self._vertex_ranges[name] = (vertex_offset, len(positions))
+            self.index_ranges[name] = (index_offset, len(indices))
+            vertex_offset += len(positions)
+            index_offset += len(indices)
+        self.positions = np.empty((vertex_offset, 3))
+        self.normals = np.empty((vertex_offset, 3))
+        self.indices = np.empty(index_offset, dtype=np.uint32)
+        self.needs_build = False
+        self._moved = set(self._meshes)
+        self._visibility_changed = set(self._meshes)
+        self.update_transforms()
+        self.update_visibility()
+        return self.positions, self.normals, self.indices
+
+    def update_transforms(self) -> List[Tuple[int, int]]:
+        """
+        Transforms the vertices of the components which have moved since the buffers were built or last updated.
+        :return: The start and length of each range of the vertex buffers which has changed.
+        """
+        changed_ranges = []
+        for name in self._moved:
+            positions, normals, _ = self._meshes[name]
+            start, length = self._vertex_ranges[name]
+            transform = self._transforms[name]
+            self.positions[start : start + length] = transform_points(
+                transform, positions
+            )
+            # Component transformations are rigid, so the rotation alone transforms the normals
+            self.normals[start : start + length] = normals @ transform[:3, :3].T
+            changed_ranges.append((start, length))
+        self._moved = set()
+        return _merge_ranges(changed_ranges)
+
+    def update_visibility(self) -> List[Tuple[int, int]]:
+        """
+        Zeroes the indices of the components which have been hidden since the buffers were built or last updated, and
+        restores those of the components which have been shown.
+        :return: The start and length of each range of the index buffer which has changed.
+        """
+        changed_ranges = []
+        for name in self._visibility_changed:
+            start, length = self.index_ranges[name]
+            if name in self._hidden:
+                self.indices[start : start + length] = 0
+            else:
+                self.indices[start : start + length] = (
+                    self._meshes[name][2] + self._vertex_ranges[name][0]
+                )
+            changed_ranges.append((start, length))
+        self._visibility_changed = set()
+        return _merge_ranges(changed_ranges)
+
+
+def _merge_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    :param ranges: The start and length of each range.
+    :return: The ranges in order, with those which are next to each other joined into one.
+    """
+    merged: List[Tuple[int, int]] = []
+    for start, length in sorted(ranges):
+        if merged and sum(merged[-1]) == start:
+            merged[-1] = (merged[-1][0], merged[-1][1] + length)
+        else:
+            merged.append((start, length))
+    return merged
+
+
+class ComponentBatch:
+    def __init__(self, parent: Qt3DCore.QEntity, material: Qt3DRender.QMaterial):
+        """
+        Draws the components in a MeshBatch in a single entity. Changes are applied together the next time the event
+        loop runs, so that changing every component only rebuilds the buffers once.
+        :param parent: The entity to create the batch's entity under.
+        :param material: The material shared by all of the components.
+        """
+        self.mesh_batch = MeshBatch()
+        self.renderer = Qt3DRender.QGeometryRenderer(parent)
+        self.geometry = IndexedGeometry(self.renderer)
+        self.renderer.setPrimitiveType(Qt3DRender.QGeometryRenderer.Triangles)
+        self.renderer.setGeometry(self.geometry)
+        self.entity = create_qentity([self.renderer, material], parent)
+        self._update_scheduled = False
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.mesh_batch
+
+    def add_component(
+        self, name: str, geometry: OFFGeometry, positions: Optional[np.ndarray]
+    ):
+        """
+        :param name: The name of the component.
+        :param geometry: The shape of the component.
+        :param positions: (N, 3) array, mesh is repeated at each of these positions
+        """
+        if positions is None:
+            self.mesh_batch.add(
+                name, geometry.vertices, convert_faces_into_triangles(geometry.faces)
+            )
+        else:
+            self.mesh_batch.add_buffers(
+                name, *create_repeated_indexed_buffers(geometry, positions)
+            )
+        self.schedule_update()
+
+    def remove_component(self, name: str):
+        self.mesh_batch.remove(name)
+        self.schedule_update()
+
+    def set_transform(self, name: str, transform_matrix: np.ndarray):
+        self.mesh_batch.set_transform(name, transform_matrix)
+        self.schedule_update()
+
+    def reset_transforms(self):
+        self.mesh_batch.reset_transforms()
+        self.schedule_update()
+
+    def set_visible(self, name: str, visible: bool):
+        self.mesh_batch.set_visible(name, visible)
+        self.schedule_update()
+
+    def schedule_update(self):
+        if not self._update_scheduled:
+            self._update_scheduled = True
+            QTimer.singleShot(0, self.update)
+
+    def update(self):
+        """
+        Applies the changes to the meshes, transformations and visibility of the components. Only the ranges of the
+        buffers belonging to components which have moved or been shown or hidden are uploaded again, unless components
+        have been added or removed.
+        """
+        self._update_scheduled = False
+        mesh_batch = self.mesh_batch
+        if mesh_batch.needs_build:
+            self.geometry.set_buffers(*mesh_batch.build())
+            self.renderer.setVertexCount(self.geometry.vertex_count)
+        else:
+            for start, length in mesh_batch.update_transforms():
+                self.geometry.update_vertices(
+                    start,
+                    mesh_batch.positions[start : start + length],
+                    mesh_batch.normals[start : start + length],
+                )
+            for start, length in mesh_batch.update_visibility():
+                self.geometry.update_indices(
+                    start, mesh_batch.indices[start : start + length]
+                )
+        self.entity.setEnabled(mesh_batch.has_visible_components)
+
+    def delete(self):
+        self.entity.setParent(None)
@@ -1,29 +1,64 @@
 import logging
-from typing import List, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
+import numpy as np
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DExtras import Qt3DExtras
+from PySide2.Qt3DLogic import Qt3DLogic
 from PySide2.Qt3DRender import Qt3DRender
-from PySide2.QtCore import QRectF
+from PySide2.QtCore import QRectF, QThreadPool, Signal
 from PySide2.QtGui import QColor, QVector3D
 from PySide2.QtWidgets import QVBoxLayout, QWidget
 
+from nexus_constructor.geometry.bounding_volume_hierarchy import ComponentSpatialIndex
+from nexus_constructor.geometry.level_of_detail import (
+    MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL,
+    SimplifiedMesh,
+)
+from nexus_constructor.instrument_view.batched_mesh import ComponentBatch
 from nexus_constructor.instrument_view.gnomon import Gnomon
 from nexus_constructor.instrument_view.instrument_view_axes import InstrumentViewAxes
 from nexus_constructor.instrument_view.instrument_zooming_3d_window import (
     InstrumentZooming3DWindow,
 )
-from nexus_constructor.instrument_view.off_renderer import OffMesh
-from nexus_constructor.instrument_view.qentity_utils import (
-    create_material,
-    create_qentity,
+from nexus_constructor.instrument_view.level_of_detail import (
+    LevelOfDetailSignals,
+    LevelOfDetailWorker,
+    add_levels_of_detail,
+    create_level_geometries,
+)
+from nexus_constructor.instrument_view.off_renderer import (
+    GeometryPool,
+    OffMesh,
+    QtOFFGeometry,
+    geometry_key,
+)
+from nexus_constructor.instrument_view.qentity_utils import MaterialPool, create_qentity
+from nexus_constructor.instrument_view.qt_conversions import (
+    numpy_array_to_qvector3d,
+    numpy_matrix_to_qtransform,
+    qvector3d_to_numpy_array,
 )
 from nexus_constructor.model.geometry import (
     CylindricalGeometry,
     NoShapeGeometry,
+    OFFGeometry,
     OFFGeometryNexus,
 )
 from nexus_constructor.model.instrument import SAMPLE_NAME
+from nexus_constructor.startup_trace import FIRST_FRAME_EVENT, startup_tracer
+
+# Clipping planes of the camera when the components fit between them, a small near plane and large far plane allow
+# the camera to see a large distance
+DEFAULT_NEAR_PLANE = 0.01
+DEFAULT_FAR_PLANE = 1000
+
+# Factor by which the clipping planes are moved beyond the bounds of the components when they do not fit between the
+# default planes
+CLIPPING_PLANE_MARGIN = 2
+
+# Smallest radius of the sphere the camera frames, so that a component without any extent can still be zoomed to
+MIN_FRAMING_RADIUS = 0.01
 
 
 class InstrumentView(QWidget):
@@ -34,6 +69,9 @@ class InstrumentView(QWidget):
                    argument in order to appease Qt Designer.
     """
 
+    # Name of the component clicked on in the 3D view
+    component_picked = Signal(str)
+
     def delete(self):
         """
         Fixes Qt3D segfault - this needs to be called when the program closes otherwise Qt tries to draw objects as python is cleaning them up.
@@ -57,11 +95,18 @@ class InstrumentView(QWidget):
 
         # Create the 3DWindow and place it in a widget with a layout
         lay = QVBoxLayout(self)
-        self.view = InstrumentZooming3DWindow(self.component_root_entity)
-        self.view.defaultFrameGraph().setClearColor(QColor("lightgrey"))
-        self.view.setRootEntity(self.root_entity)
-        container = QWidget.createWindowContainer(self.view)
-        lay.addWidget(container)
+        with startup_tracer.phase("qt3d_window"):
+            self.view = InstrumentZooming3DWindow()
+            self.view.defaultFrameGraph().setClearColor(QColor("lightgrey"))
+            self.view.setRootEntity(self.root_entity)
+            container = QWidget.createWindowContainer(self.view)
+            lay.addWidget(container)
+        self.view.ray_cast.connect(self.pick_component)
+        self.view.frame_all_requested.connect(self.frame_all)
+
+        # Qt3DWindow has no frameSwapped signal, so record when the first frame is processed instead
+        self.first_frame_action = Qt3DLogic.QFrameAction(self.root_entity)
+        self.first_frame_action.triggered.connect(self._on_first_frame)
 
         # Set the properties of the instrument camera controller
         camera_entity = self.view.camera()
@@ -69,8 +114,9 @@ class InstrumentView(QWidget):
         cam_controller.setLinearSpeed(20)
         cam_controller.setCamera(camera_entity)
 
-        # Enable the camera to see a large distance by giving it a small nearView and large farView
-        self.view.camera().lens().setPerspectiveProjection(45, 16 / 9, 0.01, 1000)
+        self.view.camera().lens().setPerspectiveProjection(
+            45, 16 / 9, DEFAULT_NEAR_PLANE, DEFAULT_FAR_PLANE
+        )
 
         # Set the camera view centre as the origin and position the camera so that it looks down at the initial sample
         self.view.camera().setPosition(QVector3D(6, 8, 30))
@@ -96,16 +142,53 @@ class InstrumentView(QWidget):
         self.component_entities = {}
         self.transformations = {}
 
+        # Materials are shared between components with the same appearance
+        self.material_pool = MaterialPool(self.component_root_entity)
+        # As are the buffers of components with the same shape, keyed by the shape's content hash and positions
+        self.geometry_pool = GeometryPool(self.component_root_entity)
+        self._component_geometry_keys: Dict[str, bytes] = {}
+
+        # If batching is enabled, small opaque components are merged into one mesh per material to reduce the number
+        # of draw calls, see batched_mesh.py
+        self.batching_enabled = False
+        self._batches: Dict[Qt3DRender.QMaterial, ComponentBatch] = {}
+        self._batched_components: Dict[str, ComponentBatch] = {}
+
+        # Simplified versions of dense meshes are created in the background and drawn when the camera is far away.
+        # Like the buffers of the full resolution meshes they are keyed by geometry key, so components with the same
+        # mesh share one request and the buffers of each level. The components waiting for each request are kept.
+        self.level_of_detail_signals = LevelOfDetailSignals()
+        self.level_of_detail_signals.levels_ready.connect(self._add_levels_of_detail)
+        self._level_of_detail_requests: Dict[bytes, Set[str]] = {}
+        self._levels_of_detail: Dict[
+            bytes, Tuple[List[SimplifiedMesh], List[QtOFFGeometry]]
+        ] = {}
+        self._component_meshes: Dict[
+            str, Tuple[Qt3DRender.QGeometryRenderer, Qt3DRender.QMaterial]
+        ] = {}
+
+        # Bounding boxes and meshes of the components in world coordinates, for framing them with the camera and
+        # finding which one is clicked on
+        self.spatial_index = ComponentSpatialIndex()
+
         # Create layers in order to allow one camera to only see the gnomon and one camera to only see the
         # components and axis lines
-        self.create_layers()
-        self.initialise_view()
+        with startup_tracer.phase("gnomon_and_neutrons"):
+            self.create_layers()
+            self.initialise_view()
 
-        # Insert the beam cylinder last. This ensures that the semi-transparency works correctly.
-        self.gnomon.setup_beam_cylinder()
+            # Insert the beam cylinder last. This ensures that the semi-transparency works correctly.
+            self.gnomon.setup_beam_cylinder()
 
         # Move the gnomon when the camera view changes
         self.view.camera().viewVectorChanged.connect(self.gnomon.update_gnomon)
+        self.view.camera().positionChanged.connect(self.fit_clipping_planes)
+
+    def _on_first_frame(self, _):
+        self.first_frame_action.triggered.disconnect(self._on_first_frame)
+        self.first_frame_action.setEnabled(False)
+        startup_tracer.mark(FIRST_FRAME_EVENT)
+        startup_tracer.write()
 
     def create_layers(self):
         """
@@ -200,28 +283,128 @@ class InstrumentView(QWidget):
         self,
         name: str,
         geometry: Union[NoShapeGeometry, CylindricalGeometry, OFFGeometryNexus],
-        positions: List[QVector3D] = None,
+        positions: np.ndarray = None,
     ):
         """
         Add a component to the instrument view given a name and its geometry.
         :param name: The name of the component.
         :param geometry: The geometry information of the component that is used to create a mesh.
-        :param positions: Mesh is repeated at each of these positions
+        :param positions: (N, 3) array, mesh is repeated at each of these positions
         """
         if geometry is None:
             return
 
-        mesh = OffMesh(geometry.off_geometry, self.component_root_entity, positions)
-        material = create_material(
+        off_geometry = geometry.off_geometry
+        material = self.material_pool.get_material(
             QColor("black") if name != SAMPLE_NAME else QColor("red"),
             QColor("grey"),
-            self.component_root_entity,
             alpha=0.5 if name == SAMPLE_NAME else None,
         )
+        self.spatial_index.set_mesh(
+            name, off_geometry.vertices, off_geometry.faces, positions
+        )
 
+        # Semi-transparent components are not batched as their triangles would not be sorted by depth
+        if (
+            self.batching_enabled
+            and name != SAMPLE_NAME
+            and _triangle_count(off_geometry, positions)
+            < MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL
+        ):
+            self._add_component_to_batch(name, off_geometry, positions, material)
+            return
+
+        key = geometry_key(geometry, positions)
+        mesh = OffMesh(
+            off_geometry,
+            self.component_root_entity,
+            positions,
+            self.geometry_pool.acquire(key, off_geometry, positions),
+        )
+        self._component_geometry_keys[name] = key
         self.component_entities[name] = create_qentity(
             [mesh, material], self.component_root_entity
         )
+        self._component_meshes[name] = (mesh, material)
+
+        # Repeated pixel shapes are not simplified as each copy is already small
+        if positions is None and isinstance(geometry, OFFGeometryNexus):
+            self._request_levels_of_detail(name, key, off_geometry)
+
+    def _add_component_to_batch(
+        self,
+        name: str,
+        geometry: OFFGeometry,
+        positions: Optional[np.ndarray],
+        material: Qt3DRender.QMaterial,
+    ):
+        if material not in self._batches:
+            self._batches[material] = ComponentBatch(
+                self.component_root_entity, material
+            )
+        batch = self._batches[material]
+        batch.add_component(name, geometry, positions)
+        self._batched_components[name] = batch
+
+    def set_batching_enabled(self, enabled: bool):
+        """
+        Sets whether components added from now on which are small and opaque are drawn in batches. Components which
+        have already been added are not affected.
+        """
+        self.batching_enabled = enabled
+
+    def _request_levels_of_detail(self, name: str, key: bytes, geometry: OFFGeometry):
+        if key in self._levels_of_detail:
+            self._add_levels_to_component(name, key)
+            return
+        if key not in self._level_of_detail_requests:
+            self._level_of_detail_requests[key] = set()
+            QThreadPool.globalInstance().start(
+                LevelOfDetailWorker(name, key, geometry, self.level_of_detail_signals)
+            )
+        self._level_of_detail_requests[key].add(name)
+
+    def _add_levels_of_detail(self, key: bytes, levels: List[SimplifiedMesh]):
+        names = self._level_of_detail_requests.pop(key, set())
+        if key not in self.geometry_pool:
+            # Every component drawn with the mesh has been removed since the levels were requested
+            return
+        self._levels_of_detail[key] = (
+            levels,
+            create_level_geometries(levels, self.component_root_entity),
+        )
+        for name in names:
+            # Unless the component has been removed or its mesh replaced since the levels were requested
+            if self._component_geometry_keys.get(name) == key:
+                self._add_levels_to_component(name, key)
+
+    def _add_levels_to_component(self, name: str, key: bytes):
+        levels, level_geometries = self._levels_of_detail[key]
+        mesh, material = self._component_meshes[name]
+        add_levels_of_detail(
+            self.component_entities[name],
+            mesh,
+            material,
+            levels,
+            self.view.camera(),
+            level_geometries,
+        )
+
+    def _release_geometry(self, key: bytes):
+        self.geometry_pool.release(key)
+        if key not in self.geometry_pool and key in self._levels_of_detail:
+            for level_geometry in self._levels_of_detail.pop(key)[1]:
+                level_geometry.setParent(None)
+
+    def pick_component(self, origin: np.ndarray, direction: np.ndarray):
+        """
+        Emits the name of the first component hit by a ray, if any.
+        :param origin: The start of the ray in world coordinates.
+        :param direction: The direction of the ray in world coordinates.
+        """
+        name = self.spatial_index.pick(origin, direction)
+        if name is not None:
+            self.component_picked.emit(name)
 
     def get_entity(self, component_name: str) -> Qt3DCore.QEntity:
         """
@@ -234,6 +417,69 @@ class InstrumentView(QWidget):
                 f"Unable to retrieve component {component_name} because it doesn't exist."
             )
 
+    def zoom_to_component_by_name(self, component_name: str):
+        """
+        Instructs the camera to zoom in on a component, whether or not it is drawn in a batch.
+        :param component_name: The name of the component.
+        """
+        bounds = self.spatial_index.world_bounds(component_name)
+        if bounds is not None:
+            self._frame_bounds(*bounds)
+            return
+        entity = self.get_entity(component_name)
+        if entity is not None:
+            self.zoom_to_component(entity, self.view.camera())
+
+    def frame_all(self):
+        """
+        Instructs the camera to zoom out to show all of the components.
+        """
+        bounds = self.spatial_index.scene_bounds()
+        if bounds is not None:
+            self._frame_bounds(*bounds)
+
+    def _frame_bounds(self, lower: np.ndarray, upper: np.ndarray):
+        centre = (lower + upper) / 2
+        radius = max(float(np.linalg.norm(upper - lower)) / 2, MIN_FRAMING_RADIUS)
+        self.view.camera().viewSphere(numpy_array_to_qvector3d(centre), radius)
+        self.fit_clipping_planes()
+
+    def fit_clipping_planes(self):
+        """
+        Moves the camera's clipping planes out from the defaults if the components do not all fit between them, so
+        that large instruments are not cut off, using the cached bounding boxes of the components.
+        """
+        bounds = self.spatial_index.scene_bounds()
+        if bounds is None:
+            return
+        lower, upper = bounds
+        camera = self.view.camera()
+        radius = float(np.linalg.norm(upper - lower)) / 2
+        distance = float(
+            np.linalg.norm(
+                qvector3d_to_numpy_array(camera.position()) - (lower + upper) / 2
+            )
+        )
+        far_plane = max(DEFAULT_FAR_PLANE, (distance + radius) * CLIPPING_PLANE_MARGIN)
+        # The ratio of the planes determines the precision of the depth buffer, so is kept the same
+        camera.setNearPlane(far_plane * DEFAULT_NEAR_PLANE / DEFAULT_FAR_PLANE)
+        camera.setFarPlane(far_plane)
+
+    def set_component_visible(self, component_name: str, visible: bool):
+        """
+        Shows or hides a component, whether or not it is drawn in a batch.
+        :param component_name: The name of the component.
+        :param visible: Whether the component should be drawn.
+        """
+        if component_name in self._batched_components:
+            self._batched_components[component_name].set_visible(
+                component_name, visible
+            )
+            return
+        entity = self.get_entity(component_name)
+        if entity is not None:
+            entity.setEnabled(visible)
+
     @staticmethod
     def zoom_to_component(entity: Qt3DCore.QEntity, camera: Qt3DRender.QCamera):
         """
@@ -250,15 +496,34 @@ class InstrumentView(QWidget):
         for component in self.component_entities.keys():
             self.component_entities[component].setParent(None)
         self.component_entities = dict()
+        for batch in self._batches.values():
+            batch.delete()
+        self._batches = dict()
+        self._batched_components = dict()
+        self._component_meshes = dict()
+        self._level_of_detail_requests = dict()
+        for _, level_geometries in self._levels_of_detail.values():
+            for level_geometry in level_geometries:
+                level_geometry.setParent(None)
+        self._levels_of_detail = dict()
+        self.geometry_pool.clear()
+        self._component_geometry_keys = dict()
+        self.spatial_index.clear()
 
     def delete_component(self, name: str):
         """
         Delete a component from the InstrumentView by removing the components and entity from the dictionaries.
         :param name: The name of the component.
         """
+        self.spatial_index.remove(name)
+        if name in self._batched_components:
+            self._batched_components.pop(name).remove_component(name)
+            return
         try:
             self.component_entities[name].setParent(None)
             self.component_entities.pop(name)
+            self._component_meshes.pop(name)
+            self._release_geometry(self._component_geometry_keys.pop(name))
         except KeyError:
             logging.error(
                 f"Unable to delete component {name} because it doesn't exist."
@@ -268,13 +533,20 @@ class InstrumentView(QWidget):
         except KeyError:
             pass  # no problem if there are no transformations to remove
 
-    def add_transformation(
-        self, component_name: str, transformation: Qt3DCore.QTransform
-    ):
+    def add_transformation(self, component_name: str, transform_matrix: np.ndarray):
         """
         Add a transformation to a component, each component has a single transformation which contains
         the resultant transformation for its entire depends_on chain of translations and rotations
+        :param component_name: The name of the component.
+        :param transform_matrix: 4x4 matrix of the resultant transformation.
         """
+        self.spatial_index.set_transform(component_name, transform_matrix)
+        if component_name in self._batched_components:
+            self._batched_components[component_name].set_transform(
+                component_name, transform_matrix
+            )
+            return
+        transformation = numpy_matrix_to_qtransform(transform_matrix)
         self.transformations[component_name] = transformation
         component = self.component_entities[component_name]
         component.addComponent(transformation)
@@ -286,6 +558,9 @@ class InstrumentView(QWidget):
         for component_name, transformation in self.transformations.items():
             self.component_entities[component_name].removeComponent(transformation)
         self.transformations = {}
+        for batch in self._batches.values():
+            batch.reset_transforms()
+        self.spatial_index.reset_transforms()
 
     @staticmethod
     def set_cube_mesh_dimensions(
@@ -309,3 +584,8 @@ class InstrumentView(QWidget):
         """
         self.gnomon.create_gnomon()
         self.gnomon.setup_neutrons()
+
+
+def _triangle_count(geometry: OFFGeometry, positions: Optional[np.ndarray]) -> int:
+    copies = 1 if positions is None else len(positions)
+    return copies * sum(len(face) - 2 for face in geometry.faces)
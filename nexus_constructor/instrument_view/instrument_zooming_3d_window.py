@@ -1,24 +1,67 @@
 from PySide2 import QtGui
 from PySide2.Qt3DExtras import Qt3DExtras
-from PySide2.QtCore import Qt
+from PySide2.QtCore import QPoint, Qt, Signal
+from PySide2.QtGui import QGuiApplication
+
+from nexus_constructor.geometry.vector_math import ray_through_screen_point
+from nexus_constructor.instrument_view.qt_conversions import qmatrix_to_numpy_matrix
 
 
 class InstrumentZooming3DWindow(Qt3DExtras.Qt3DWindow):
-    def __init__(self, component_root_entity):
+    # Origin and direction of the ray from the camera through the point clicked, as numpy arrays in world coordinates
+    ray_cast = Signal("QVariant", "QVariant")
+    frame_all_requested = Signal()
+
+    def __init__(self):
         """
-        A custom 3D window that only zooms in on the instrument components when the escape key is pressed.
+        A custom 3D window that asks for the instrument components to be framed when the escape key is pressed, and
+        casts a ray into the scene when it is clicked without dragging.
         """
         super().__init__()
-        self.component_root_entity = component_root_entity
+        self._press_position = None
 
     def keyReleaseEvent(self, event: QtGui.QKeyEvent):
         """
-        Changes the behaviour of the Escape button by having this lead to the camera viewing all the components of a
-        certain entity rather than simply calling `viewAll`. Allows the superclass method to interpret the other key
-        releases.
+        Changes the behaviour of the Escape button by having this emit frame_all_requested, so that the camera views
+        the components using their cached bounds, rather than simply calling `viewAll`. Allows the superclass method to
+        interpret the other key releases.
         :param event: The key event.
         """
         if event.key() == Qt.Key.Key_Escape:
-            self.camera().viewEntity(self.component_root_entity)
+            self.frame_all_requested.emit()
             return
         super().keyReleaseEvent(event)
+
+    def mousePressEvent(self, event: QtGui.QMouseEvent):
+        if event.button() == Qt.LeftButton:
+            self._press_position = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseReleaseEvent(self, event: QtGui.QMouseEvent):
+        """
+        Casts a ray if the left button is released where it was pressed. Dragging with the left button moves the camera
+        instead, so is ignored.
+        :param event: The mouse event.
+        """
+        if event.button() == Qt.LeftButton and self._press_position is not None:
+            moved = (event.pos() - self._press_position).manhattanLength()
+            self._press_position = None
+            if moved < QGuiApplication.styleHints().startDragDistance():
+                self.cast_ray(event.pos())
+        super().mouseReleaseEvent(event)
+
+    def cast_ray(self, position: QPoint):
+        """
+        Emits the ray from the camera through a point in the window.
+        :param position: The point, in pixels from the top left of the window.
+        """
+        if self.width() <= 0 or self.height() <= 0:
+            return
+        camera = self.camera()
+        origin, direction = ray_through_screen_point(
+            qmatrix_to_numpy_matrix(camera.viewMatrix()),
+            qmatrix_to_numpy_matrix(camera.projectionMatrix()),
+            2 * position.x() / self.width() - 1,
+            1 - 2 * position.y() / self.height(),
+        )
+        self.ray_cast.emit(origin, direction)
@@ -0,0 +1,129 @@
+"""
+Switching between simplified versions of dense meshes in the 3D view depending on the distance to the camera.
+
+The simplified meshes are created by a worker in the global thread pool so that the view is not blocked, the full
+resolution mesh is drawn until they are ready. Components drawn with the same mesh share the request and the buffers
+of each level.
+"""
+import logging
+import sys
+from typing import List, Optional
+
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DRender import Qt3DRender
+from PySide2.QtCore import QObject, QRunnable, Signal
+
+from nexus_constructor.geometry.level_of_detail import (
+    SimplifiedMesh,
+    create_levels_of_detail,
+)
+from nexus_constructor.instrument_view.off_renderer import (
+    IndexedGeometry,
+    OffMesh,
+    QtOFFGeometry,
+)
+from nexus_constructor.instrument_view.qentity_utils import create_qentity
+from nexus_constructor.model.geometry import OFFGeometry, OFFGeometryNoNexus
+
+
+class LevelOfDetailSignals(QObject):
+    """
+    Signals from the workers creating levels of detail. Must be created in the main thread so that the levels are
+    received there.
+    """
+
+    # Key of the mesh, as returned by geometry_key, and the list of SimplifiedMesh
+    levels_ready = Signal("QVariant", "QVariant")
+
+
+class LevelOfDetailWorker(QRunnable):
+    def __init__(
+        self,
+        component_name: str,
+        key: bytes,
+        geometry: OFFGeometry,
+        signals: LevelOfDetailSignals,
+    ):
+        """
+        Creates the levels of detail of a mesh in a thread pool.
+        :param component_name: The name of the first component drawn with the mesh, for logging.
+        :param key: The key of the mesh, as returned by geometry_key, which the levels are emitted with so that every
+        component drawn with the mesh can use them.
+        :param geometry: The full resolution mesh. Must not be part of the model, so that the model is not accessed
+        from another thread.
+        :param signals: Emits the levels when they are ready.
+        """
+        super().__init__()
+        self.component_name = component_name
+        self.key = key
+        self.geometry = geometry
+        self.signals = signals
+
+    def run(self):
+        try:
+            levels = create_levels_of_detail(self.geometry)
+        except Exception:
+            logging.exception(
+                f"Unable to create levels of detail for {self.component_name}"
+            )
+            return
+        if levels:
+            self.signals.levels_ready.emit(self.key, levels)
+
+
+def create_level_geometries(
+    levels: List[SimplifiedMesh], parent: Qt3DCore.QNode
+) -> List[QtOFFGeometry]:
+    """
+    Creates the buffers of each level of detail, which can be shared by every component drawn with the mesh.
+    :param levels: The simplified meshes.
+    :param parent: The node which owns the buffers, so they outlive the components using them.
+    :return: The buffers of each level.
+    """
+    return [
+        QtOFFGeometry(
+            OFFGeometryNoNexus(level.vertices, level.triangles.tolist()), None, parent
+        )
+        for level in levels
+    ]
+
+
+def add_levels_of_detail(
+    entity: Qt3DCore.QEntity,
+    full_resolution_mesh: Qt3DRender.QGeometryRenderer,
+    material: Qt3DRender.QMaterial,
+    levels: List[SimplifiedMesh],
+    camera: Qt3DRender.QCamera,
+    level_geometries: Optional[List[IndexedGeometry]] = None,
+) -> Qt3DRender.QLevelOfDetailSwitch:
+    """
+    Replaces the mesh of an entity with a child entity for each level of detail, only one of which is enabled at a
+    time depending on the distance from the camera.
+    :param entity: The entity of the component, which keeps its material and transformation.
+    :param full_resolution_mesh: The mesh currently drawn by the entity.
+    :param material: The material of the entity, which is shared with the child entities.
+    :param levels: The simplified meshes, ordered by the distance from which they should be drawn.
+    :param camera: The camera to measure the distance from.
+    :param level_geometries: Buffers already created for the levels by create_level_geometries, to draw instead of
+    creating them again.
+    :return: The component which switches between the levels.
+    """
+    entity.removeComponent(full_resolution_mesh)
+    create_qentity([full_resolution_mesh, material], entity)
+    if level_geometries is None:
+        level_geometries = create_level_geometries(levels, entity)
+    for level_geometry in level_geometries:
+        level_entity = create_qentity([material], entity)
+        level_entity.addComponent(
+            OffMesh(None, level_entity, qt_geometry=level_geometry)
+        )
+
+    switch = Qt3DRender.QLevelOfDetailSwitch(entity)
+    switch.setCamera(camera)
+    switch.setThresholdType(Qt3DRender.QLevelOfDetail.DistanceToCameraThreshold)
+    # Qt3D chooses the first level whose threshold is greater than the distance, or the last level if there are none
+    switch.setThresholds(
+        [level.min_distance for level in levels] + [sys.float_info.max]
+    )
+    entity.addComponent(switch)
+    return switch
@@ -5,25 +5,22 @@ Based off of a qml custom mesh example at https://github.com/iLya84a/qt3d/blob/m
 and a PyQt5 example from
 https://github.com/geehalel/npindi/blob/57c092200dd9cb259ac1c730a1258a378a1a6342/apps/mount3D/world3D-starspheres.py#L86
 """
-import itertools
+import hashlib
 import logging
-import struct
-from typing import List, Tuple
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DRender import Qt3DRender
-from PySide2.QtGui import QVector3D
 
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.geometry.vector_math import triangle_normals
+from nexus_constructor.model.content_hash import DIGEST_SIZE, content_hash
 from nexus_constructor.model.geometry import OFFGeometry
 
-
-def flatten(list_to_flatten):
-    """
-    Flattens a list of lists into a single list
-    :param list_to_flatten: The list of lists
-    :return: A single list containing all values
-    """
-    return itertools.chain.from_iterable(list_to_flatten)
+# Normals which only differ beyond this precision are treated as the same when sharing vertices between triangles
+NORMAL_DECIMAL_PLACES = 6
+NORMAL_COMPONENT_RANGE = 2 * 10 ** NORMAL_DECIMAL_PLACES + 1
 
 
 def convert_to_bytes(vectors):
@@ -32,137 +29,188 @@ def convert_to_bytes(vectors):
     :param vectors: The list of vectors to convert
     :return: The byte representation
     """
-    return struct.pack(f"{len(vectors)}f", *vectors)
-
-
-def convert_faces_into_triangles(faces):
-    """
-    Converts the faces into a list of triangles
-    :param faces: List of faces containing the triangles
-    :return: A list of the triangles that make a face
-    """
-    triangles = []
-    for face in faces:
-        triangles_in_face = len(face) - 2
-        triangles.extend(
-            [[face[0], face[i + 1], face[i + 2]] for i in range(triangles_in_face)]
-        )
-    return triangles
+    return np.asarray(vectors, dtype=np.float32).tobytes()
 
 
-def create_vertex_buffer(vertices, triangles):
+def create_indexed_buffers(
+    vertices, triangles
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    For each point in each triangle in each face, add its points to the vertices list.
-    To do this we:
-    Separate faces into triangles (with them starting at the 0th point)
-    Get the vertices that are in the triangles
-    Adding them into a flat list of points
-    :param vertices: The vertices in the mesh
+    Creates the buffers for drawing the triangles as an indexed mesh.
+    Vertices are only shared by triangles which also share a normal, so that each face is still shaded flat. A vertex
+    at the corner of several faces pointing in different directions is therefore repeated once per direction.
+    :param vertices: The (N, 3) array of vertices in the mesh
     :param triangles: A list of the triangles that make up each face in the mesh
-    :return: A list of the points in the faces
+    :return: The (M, 3) arrays of unique vertex positions and their normals, and the index into them of each corner of
+    each triangle
     """
-    flattened_triangles = flatten(triangles)
-
-    return flatten(
-        vertices[point_index].toTuple() for point_index in flattened_triangles
+    triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+    vertices = np.asarray(vertices, dtype=float).reshape(-1, 3)
+    normals = triangle_normals(vertices, triangles)
+    # Identify normals, and then each corner of each triangle by its vertex and normal, with single integers so that
+    # the unique ones can be found with fast one dimensional sorts. Normals are unit vectors so each quantised
+    # component fits in NORMAL_COMPONENT_RANGE.
+    quantised = np.rint(normals * 10 ** NORMAL_DECIMAL_PLACES).astype(np.int64)
+    quantised += 10 ** NORMAL_DECIMAL_PLACES
+    normal_keys = (
+        quantised[:, 0] * NORMAL_COMPONENT_RANGE + quantised[:, 1]
+    ) * NORMAL_COMPONENT_RANGE + quantised[:, 2]
+    unique_normal_keys, first_triangles, normal_ids = np.unique(
+        normal_keys, return_index=True, return_inverse=True
+    )
+    number_of_normals = len(unique_normal_keys)
+    corner_keys = triangles * number_of_normals + normal_ids.reshape(-1, 1)
+    unique_corner_keys, indices = np.unique(corner_keys.flatten(), return_inverse=True)
+    return (
+        vertices[unique_corner_keys // number_of_normals],
+        normals[first_triangles][unique_corner_keys % number_of_normals],
+        indices.astype(np.uint32),
     )
 
 
-def create_normal_buffer(vertices, triangles):
+def create_repeated_indexed_buffers(
+    model: OFFGeometry, positions: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Creates normal vectors for each vertex on the mesh.
-    Qt requires each vertex to have it's own normal.
-    :param vertices: The vertices for the mesh
-    :param triangles: A list of the triangles that make up each face in the mesh
-    :return: A list of the normal points for the faces
+    Creates the buffers for drawing a copy of a mesh at each of a number of positions, such as the pixels of a
+    detector. The buffers of the mesh are only created once, and then copied to each position.
+    :param model: The mesh to copy.
+    :param positions: The (N, 3) array of positions to copy the mesh to.
+    :return: The positions and normals of the vertices, and the indices of the triangles, of all of the copies.
     """
-    normal_buffer_values = []
-    for triangle in triangles:
-        # Get the vertices of each triangle
-        points = [vertices[p] for p in triangle]
-        # Convert our vector objects into Qt Vectors
-        # Calculate the normal, leveraging Qt
-        normal = QVector3D.normal(*points)
-        # Need to have a normal for each vector
-        normal_buffer_values.extend(normal.toTuple() * 3)
-    return normal_buffer_values
-
-
-def repeat_shape_over_positions(
-    model: OFFGeometry, positions: List[QVector3D]
-) -> Tuple[List[List[int]], List[QVector3D]]:
-    faces = []
-    vertices = []
-    for i, position in enumerate(positions):
-        vertices.extend([vertex + position for vertex in model.vertices])
-        faces.extend(
-            [
-                [vertex + i * len(model.vertices) for vertex in face]
-                for face in model.faces
-            ]
-        )
-    return faces, vertices
+    shape_positions, shape_normals, shape_indices = create_indexed_buffers(
+        model.vertices, convert_faces_into_triangles(model.faces)
+    )
+    positions = np.asarray(positions, dtype=np.float32).reshape(-1, 3)
+    offsets = np.arange(len(positions), dtype=np.uint32) * len(shape_positions)
+    return (
+        (positions[:, np.newaxis, :] + shape_positions).reshape(-1, 3),
+        np.tile(shape_normals, (len(positions), 1)),
+        (offsets[:, np.newaxis] + shape_indices).reshape(-1),
+    )
 
 
-class QtOFFGeometry(Qt3DRender.QGeometry):
+class IndexedGeometry(Qt3DRender.QGeometry):
     """
-    Builds vertex and normal buffers from arbitrary OFF geometry files that contain the faces in the geometry - these
-    need to be converted to a list of triangles so they can be rendered in Qt3d by an OffMesh.
+    Vertex, normal and index buffers for drawing a triangle mesh in Qt3D, which can be replaced after creation.
     """
 
     q_attribute = Qt3DRender.QAttribute
 
-    def __init__(
-        self, model: OFFGeometry, positions: List[QVector3D] = None, parent=None
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.position_attribute = self.create_attribute(
+            self.q_attribute.defaultPositionAttributeName()
+        )
+        self.normal_attribute = self.create_attribute(
+            self.q_attribute.defaultNormalAttributeName()
+        )
+        self.index_attribute = self.create_index_attribute()
+        for attribute in [
+            self.position_attribute,
+            self.normal_attribute,
+            self.index_attribute,
+        ]:
+            self.addAttribute(attribute)
+        # Number of vertices drawn, which is the number of indices as the mesh is indexed
+        self.vertex_count = 0
+
+    def set_buffers(
+        self, positions: np.ndarray, normals: np.ndarray, indices: np.ndarray
     ):
         """
-        Creates the geometry for the OFF to be displayed in Qt3D.
-        :param model: The geometry to render
-        :param positions: The posit
-        :param parent: A list of positions to copy the mesh into. If None specified a single mesh is
-        produced at the origin.
+        Replaces the mesh, as returned by create_indexed_buffers.
+        :param positions: The (M, 3) array of vertex positions.
+        :param normals: The (M, 3) array of vertex normals.
+        :param indices: The index into positions and normals of each corner of each triangle.
         """
-        super().__init__(parent)
-
-        if positions is None:
-            positions = [QVector3D(0, 0, 0)]
-
-        faces, vertices = repeat_shape_over_positions(model, positions)
-
-        triangles = convert_faces_into_triangles(faces)
-        vertex_buffer_values = list(create_vertex_buffer(vertices, triangles))
-        normal_buffer_values = create_normal_buffer(vertices, triangles)
-
-        positionAttribute = self.create_attribute(
-            vertex_buffer_values, self.q_attribute.defaultPositionAttributeName()
+        for attribute, values in [
+            (self.position_attribute, positions),
+            (self.normal_attribute, normals),
+        ]:
+            attribute.buffer().setData(convert_to_bytes(values))
+            attribute.setCount(len(values))
+        self.index_attribute.buffer().setData(
+            np.asarray(indices, dtype=np.uint32).tobytes()
         )
-        normalAttribute = self.create_attribute(
-            normal_buffer_values, self.q_attribute.defaultNormalAttributeName()
-        )
-
-        self.addAttribute(positionAttribute)
-        self.addAttribute(normalAttribute)
-        self.vertex_count = len(vertex_buffer_values) // 3
+        self.index_attribute.setCount(len(indices))
+        self.vertex_count = len(indices)
 
-        logging.info("Qt mesh built")
+    def update_vertices(self, start: int, positions: np.ndarray, normals: np.ndarray):
+        """
+        Replaces a range of the vertices, leaving the rest of the mesh as it is.
+        :param start: The index of the first vertex to replace.
+        :param positions: The (M, 3) array of the new vertex positions.
+        :param normals: The (M, 3) array of the new vertex normals.
+        """
+        for attribute, values in [
+            (self.position_attribute, positions),
+            (self.normal_attribute, normals),
+        ]:
+            attribute.buffer().updateData(
+                start * attribute.byteStride(), convert_to_bytes(values)
+            )
+
+    def update_indices(self, start: int, indices: np.ndarray):
+        """
+        Replaces a range of the indices, leaving the rest of the mesh as it is.
+        :param start: The position in the index buffer of the first index to replace.
+        :param indices: The new indices.
+        """
+        self.index_attribute.buffer().updateData(
+            start * np.dtype(np.uint32).itemsize,
+            np.asarray(indices, dtype=np.uint32).tobytes(),
+        )
 
-    def create_attribute(self, buffer_values, name):
+    def create_attribute(self, name: str):
         SIZE_OF_FLOAT_IN_STRUCT = 4
         POINTS_IN_VECTOR = 3
 
-        buffer = Qt3DRender.QBuffer(self)
-        buffer.setData(convert_to_bytes(buffer_values))
-
         attribute = self.q_attribute(self)
         attribute.setAttributeType(self.q_attribute.VertexAttribute)
-        attribute.setBuffer(buffer)
+        attribute.setBuffer(Qt3DRender.QBuffer(self))
+        attribute.setVertexBaseType(self.q_attribute.Float)
         attribute.setDataSize(POINTS_IN_VECTOR)
         attribute.setByteOffset(0)
         attribute.setByteStride(POINTS_IN_VECTOR * SIZE_OF_FLOAT_IN_STRUCT)
-        attribute.setCount(len(buffer_values))
         attribute.setName(name)
         return attribute
 
+    def create_index_attribute(self):
+        attribute = self.q_attribute(self)
+        attribute.setAttributeType(self.q_attribute.IndexAttribute)
+        attribute.setBuffer(Qt3DRender.QBuffer(self))
+        attribute.setVertexBaseType(self.q_attribute.UnsignedInt)
+        return attribute
+
+
+class QtOFFGeometry(IndexedGeometry):
+    """
+    Builds vertex and normal buffers from arbitrary OFF geometry files that contain the faces in the geometry - these
+    need to be converted to a list of triangles so they can be rendered in Qt3d by an OffMesh.
+    """
+
+    def __init__(self, model: OFFGeometry, positions: np.ndarray = None, parent=None):
+        """
+        Creates the geometry for the OFF to be displayed in Qt3D.
+        :param model: The geometry to render
+        :param positions: A list of positions to copy the mesh into. If None specified a single mesh is
+        produced at the origin.
+        :param parent: The parent node
+        """
+        super().__init__(parent)
+
+        if positions is None:
+            self.set_buffers(
+                *create_indexed_buffers(
+                    model.vertices, convert_faces_into_triangles(model.faces)
+                )
+            )
+        else:
+            self.set_buffers(*create_repeated_indexed_buffers(model, positions))
+
+        logging.info("Qt mesh built")
+
 
 class OffMesh(Qt3DRender.QGeometryRenderer):
     """
@@ -173,21 +221,86 @@ class OffMesh(Qt3DRender.QGeometryRenderer):
         self,
         geometry: OFFGeometry,
         parent: Qt3DCore.QEntity,
-        positions: List[QVector3D] = None,
+        positions: np.ndarray = None,
+        qt_geometry: Optional[IndexedGeometry] = None,
     ):
         """
         Creates a geometry renderer for OFF geometry.
-        :param geometry: The geometry to render
+        :param geometry: The geometry to render, unused if qt_geometry is given.
         :param parent: The parent entity to attach the mesh to.
         :param positions: A list of positions to copy the mesh into. If None specified a single mesh is
         produced at the origin.
+        :param qt_geometry: Buffers already created for the geometry and positions, such as ones from a GeometryPool,
+        to draw instead of creating them again.
         """
         super().__init__(parent)
 
         self.setInstanceCount(1)
-        qt_geometry = QtOFFGeometry(geometry, positions, self)
+        if qt_geometry is None:
+            qt_geometry = QtOFFGeometry(geometry, positions, self)
         self.setVertexCount(qt_geometry.vertex_count)
         self.setFirstVertex(0)
         self.setPrimitiveType(Qt3DRender.QGeometryRenderer.Triangles)
         self.setFirstInstance(0)
         self.setGeometry(qt_geometry)
+
+
+def geometry_key(geometry: Any, positions: Optional[np.ndarray] = None) -> bytes:
+    """
+    :param geometry: The shape of a component in the model.
+    :param positions: The positions the shape is copied to, if any.
+    :return: A key which is the same for every component drawn with the same buffers.
+    """
+    hasher = hashlib.blake2b(content_hash(geometry), digest_size=DIGEST_SIZE)
+    if positions is not None:
+        hasher.update(np.ascontiguousarray(positions, dtype=np.float32))
+    return hasher.digest()
+
+
+class GeometryPool:
+    def __init__(self, parent: Qt3DCore.QNode):
+        """
+        Shares the buffers of identical meshes between the components drawing them, instead of creating them for each
+        component. Each geometry is kept until the last component using it is removed.
+        :param parent: The node which owns all of the geometries, so they outlive the meshes using them.
+        """
+        self._parent = parent
+        self._geometries: Dict[bytes, QtOFFGeometry] = {}
+        self._users: Dict[bytes, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._geometries)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._geometries
+
+    def acquire(
+        self, key: bytes, model: OFFGeometry, positions: np.ndarray = None
+    ) -> QtOFFGeometry:
+        """
+        Returns the geometry with the given key, creating it the first time it is needed. See QtOFFGeometry.
+        :param key: The key of the geometry, as returned by geometry_key.
+        """
+        if key not in self._geometries:
+            self._geometries[key] = QtOFFGeometry(model, positions, self._parent)
+            self._users[key] = 0
+        self._users[key] += 1
+        return self._geometries[key]
+
+    def release(self, key: bytes):
+        """
+        Called when a component using the geometry with the given key is removed, deleting the geometry once no
+        component uses it.
+        """
+        if key not in self._users:
+            return
+        self._users[key] -= 1
+        if self._users[key] == 0:
+            del self._users[key]
+            self._geometries.pop(key).setParent(None)
+
+    def clear(self):
+        for geometry in self._geometries.values():
+            geometry.setParent(None)
+        self._geometries = {}
+        self._users = {}
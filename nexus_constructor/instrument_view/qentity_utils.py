@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Tuple
 
 from PySide2.Qt3DCore import Qt3DCore
 from PySide2.Qt3DExtras import Qt3DExtras
@@ -49,3 +49,30 @@ def create_qentity(
     for component in components:
         entity.addComponent(component)
     return entity
+
+
+class MaterialPool:
+    def __init__(self, parent: Qt3DCore.QNode):
+        """
+        Shares materials between entities instead of creating one for each entity.
+        :param parent: The node which owns all of the materials, so they outlive the entities using them.
+        """
+        self._parent = parent
+        self._materials: Dict[Tuple, Qt3DRender.QMaterial] = {}
+
+    def get_material(
+        self,
+        ambient: QColor,
+        diffuse: QColor,
+        alpha: float = None,
+        remove_shininess: bool = False,
+    ) -> Qt3DRender.QMaterial:
+        """
+        Returns the material with the given properties, creating it the first time it is needed. See create_material.
+        """
+        key = (ambient.rgba(), diffuse.rgba(), alpha, remove_shininess)
+        if key not in self._materials:
+            self._materials[key] = create_material(
+                ambient, diffuse, self._parent, alpha, remove_shininess
+            )
+        return self._materials[key]
@@ -0,0 +1,44 @@
+"""
+Conversion of the numpy vectors and matrices used by the model to Qt types, for use in the 3D view only.
+"""
+import numpy as np
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.QtGui import QMatrix4x4, QVector3D
+
+
+def qvector3d_to_numpy_array(input_vector: QVector3D) -> np.ndarray:
+    return np.array([input_vector.x(), input_vector.y(), input_vector.z()]).astype(
+        float
+    )
+
+
+def numpy_array_to_qvector3d(input_array: np.ndarray) -> QVector3D:
+    return QVector3D(input_array[0], input_array[1], input_array[2])
+
+
+def numpy_matrix_to_qmatrix(matrix: np.ndarray) -> QMatrix4x4:
+    """
+    :param matrix: A 4x4 matrix acting on column vectors.
+    :return: The equivalent QMatrix4x4.
+    """
+    # The QMatrix4x4 constructor takes values in row-major order
+    return QMatrix4x4(*np.asarray(matrix, dtype=float).flatten())
+
+
+def numpy_matrix_to_qtransform(matrix: np.ndarray) -> Qt3DCore.QTransform:
+    """
+    :param matrix: A 4x4 matrix acting on column vectors.
+    :return: A Qt3DCore.QTransform which can be added to an entity in the 3D view.
+    """
+    transform = Qt3DCore.QTransform()
+    transform.setMatrix(numpy_matrix_to_qmatrix(matrix))
+    return transform
+
+
+def qmatrix_to_numpy_matrix(matrix: QMatrix4x4) -> np.ndarray:
+    """
+    :param matrix: A QMatrix4x4.
+    :return: The equivalent 4x4 matrix acting on column vectors.
+    """
+    # QMatrix4x4.data() returns the values in column-major order
+    return np.array(matrix.data(), dtype=float).reshape(4, 4).T
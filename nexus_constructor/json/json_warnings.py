@@ -39,6 +39,11 @@ class NXClassAttributeMissing:
     message = attr.ib(type=str)
 
 
+@attr.s
+class LinkTargetMissing:
+    message = attr.ib(type=str)
+
+
 JsonWarning = Union[
     InvalidJson,
     InvalidShape,
@@ -46,6 +51,7 @@ JsonWarning = Union[
     TransformDependencyMissing,
     NameFieldMissing,
     NXClassAttributeMissing,
+    LinkTargetMissing,
 ]
 
 
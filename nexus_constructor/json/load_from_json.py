@@ -14,6 +14,7 @@ from nexus_constructor.component_type import COMPONENT_TYPES
 from nexus_constructor.json.json_warnings import (
     InvalidJson,
     JsonWarningsContainer,
+    LinkTargetMissing,
     NameFieldMissing,
     NXClassAttributeMissing,
     TransformDependencyMissing,
@@ -35,6 +36,7 @@ from nexus_constructor.model.entry import Entry
 from nexus_constructor.model.group import TRANSFORMS_GROUP_NAME, Group
 from nexus_constructor.model.instrument import Instrument
 from nexus_constructor.model.link import TARGET, Link
+from nexus_constructor.model.path_index import join_path
 from nexus_constructor.model.stream import (
     ADC_PULSE_DEBUG,
     ARRAY_SIZE,
@@ -230,22 +232,26 @@ class JSONReader:
         self.warnings = JsonWarningsContainer()
 
         # key: TransformId for transform which has a depends on
-        # value: the Transformation object itself and the TransformId for the Transformation which it depends on
+        # value: the Transformation object itself and the path of the Transformation which it depends on
         # Populated while loading the transformations so that depends_on property of each Transformation can be set
         # to the appropriate Transformation after all the Transformations have been created, otherwise they would
         # need to be created in a particular order
         self._transforms_depends_on: Dict[
-            TransformId, Tuple[Transformation, Optional[TransformId]]
+            TransformId, Tuple[Transformation, Optional[str]]
         ] = {}
 
         # key: name of the component (uniquely identifies Component)
-        # value: the Component object itself and the TransformId for the Transformation which it depends on
+        # value: the Component object itself and the path of the Transformation which it depends on
         # Populated while loading the components so that depends_on property of each Component can be set to the
         # appropriate Transformation after all the Transformations have been created, otherwise they would
         # need to be created in a particular order
-        self._components_depends_on: Dict[
-            str, Tuple[Component, Optional[TransformId]]
-        ] = {}
+        self._components_depends_on: Dict[str, Tuple[Component, Optional[str]]] = {}
+
+        # key: the name of a component and of its shape group, such as "detector_1/pixel_shape"
+        # value: the shape group in the JSON
+        # Shapes which are the same as a shape before them can be written as links to that shape, see
+        # Model.as_dict, so each shape is kept to be read again for the components linking to it
+        self._shapes_read: Dict[str, Dict] = {}
 
     def load_model_from_json(self, filename: str) -> bool:
         """
@@ -269,6 +275,15 @@ class JSONReader:
 
             return self._load_from_json_dict(json_dict)
 
+    def load_model_from_dict(self, json_dict: Dict) -> bool:
+        """
+        Tries to load a model from a dictionary in the file-writer JSON format, for example one converted from a NeXus
+        file rather than read from a JSON file.
+        :param json_dict: The dictionary to load.
+        :return: True if the model was loaded without problems, False otherwise.
+        """
+        return self._load_from_json_dict(json_dict)
+
     def _load_from_json_dict(self, json_dict: Dict) -> bool:
         children_list = _retrieve_children_list(json_dict)
 
@@ -279,9 +294,57 @@ class JSONReader:
 
         self._set_transforms_depends_on()
         self._set_components_depends_on()
+        self._check_link_targets()
 
         return True
 
+    def _find_transformation(
+        self, depends_on_path: str, relative_to: Group
+    ) -> Optional[Transformation]:
+        """
+        Finds the transformation a depends_on path points to.
+        :param depends_on_path: The absolute path of the transformation, or its path relative to the group containing
+        the depends_on.
+        :param relative_to: The group containing the depends_on.
+        :return: The transformation, or None if it was not loaded.
+        """
+        path_index = self.entry.instrument.path_index
+        transformation = path_index.resolve(depends_on_path, relative_to)
+        if not isinstance(transformation, Transformation):
+            # Components which aren't in the instrument in the file, such as the sample, are loaded into it, so fall
+            # back to finding the transformation by the names of its component and itself
+            try:
+                component_name, transform_name = get_component_and_transform_name(
+                    depends_on_path
+                )
+            except IndexError:
+                return None
+            transformation = path_index.resolve(
+                f"{component_name}/{TRANSFORMS_GROUP_NAME}/{transform_name}"
+            )
+        return transformation if isinstance(transformation, Transformation) else None
+
+    def _check_link_targets(self):
+        """
+        Warns about links to paths in the instrument which nothing was loaded at. Links to paths outside of the
+        instrument can't be checked, as only the instrument is loaded.
+        """
+        instrument = self.entry.instrument
+        instrument_path = f"{instrument.absolute_path}/"
+        for path, node in instrument.path_index.items():
+            if not isinstance(node, Link):
+                continue
+            target_path = join_path(path.rsplit("/", 1)[0], node.target)
+            if (
+                target_path.startswith(instrument_path)
+                and target_path not in instrument.path_index
+            ):
+                self.warnings.append(
+                    LinkTargetMissing(
+                        f"Link {path} points to {node.target}, but nothing was loaded at that path"
+                    )
+                )
+
     def _set_components_depends_on(self):
         """
         Once all transformations have been loaded we should be able to set each component's depends_on property without
@@ -289,18 +352,20 @@ class JSONReader:
         """
         for (
             component_name,
-            (component, depends_on_id,),
+            (component, depends_on_path,),
         ) in self._components_depends_on.items():
-            try:
-                # If it has a dependency then find the corresponding Transformation and assign it to
-                # the depends_on property
-                if depends_on_id is not None:
-                    component.depends_on = self._transforms_depends_on[depends_on_id][0]
-            except KeyError:
+            # If it has a dependency then find the corresponding Transformation and assign it to
+            # the depends_on property
+            if depends_on_path is None:
+                continue
+            depends_on = self._find_transformation(depends_on_path, component)
+            if depends_on is not None:
+                component.depends_on = depends_on
+            else:
                 self.warnings.append(
                     TransformDependencyMissing(
-                        f"Component {component_name} depends on {depends_on_id.transform_name} in component "
-                        f"{depends_on_id.component_name}, but that transform was not successfully loaded from the JSON"
+                        f"Component {component_name} depends on {depends_on_path}, but that transform was not "
+                        f"successfully loaded from the JSON"
                     )
                 )
 
@@ -311,19 +376,22 @@ class JSONReader:
         """
         for (
             transform_id,
-            (transform, depends_on_id,),
+            (transform, depends_on_path,),
         ) in self._transforms_depends_on.items():
-            try:
-                # If it has a dependency then find the corresponding Transformation and assign it to
-                # the depends_on property
-                if depends_on_id is not None:
-                    transform.depends_on = self._transforms_depends_on[depends_on_id][0]
-            except KeyError:
+            # If it has a dependency then find the corresponding Transformation and assign it to
+            # the depends_on property
+            if depends_on_path is None:
+                continue
+            depends_on = self._find_transformation(
+                depends_on_path, transform.parent_node
+            )
+            if depends_on is not None:
+                transform.depends_on = depends_on
+            else:
                 self.warnings.append(
                     TransformDependencyMissing(
                         f"Transformation {transform_id.transform_name} in component {transform_id.component_name} "
-                        f"depends on {depends_on_id.transform_name} in component {depends_on_id.component_name}, "
-                        f"but that transform was not successfully loaded from the JSON"
+                        f"depends on {depends_on_path}, but that transform was not successfully loaded from the JSON"
                     )
                 )
 
@@ -378,27 +446,48 @@ class JSONReader:
             CommonAttrs.DEPENDS_ON, children
         )
 
-        if depends_on_path not in DEPENDS_ON_IGNORE:
-            depends_on_id = TransformId(
-                *get_component_and_transform_name(depends_on_path)
-            )
-            self._components_depends_on[name] = (component, depends_on_id)
-        else:
-            self._components_depends_on[name] = (component, None)
+        self._components_depends_on[name] = (
+            component,
+            None if depends_on_path in DEPENDS_ON_IGNORE else depends_on_path,
+        )
 
         shape_info = _find_shape_information(children)
+        if shape_info and shape_info.get(CommonKeys.TYPE) == NodeType.LINK:
+            shape_link = shape_info
+            shape_info = self._find_linked_shape(name, shape_link)
+            children = [shape_info if item is shape_link else item for item in children]
         if shape_info:
+            self._shapes_read[f"{name}/{shape_info[CommonKeys.NAME]}"] = shape_info
             shape_reader = ShapeReader(component, shape_info)
             shape_reader.add_shape_to_component()
             try:
-                shape_reader.add_pixel_data_to_component(
-                    json_object[CommonKeys.CHILDREN]
-                )
+                shape_reader.add_pixel_data_to_component(children)
             except TypeError:
                 # Will fail if not a detector shape
                 pass
             self.warnings += shape_reader.warnings
 
+    def _find_linked_shape(self, name: str, shape_link: Dict) -> Optional[Dict]:
+        """
+        Finds the shape a component's shape links to, which must be the shape of a component read before it.
+        :param name: The name of the component.
+        :param shape_link: The link in place of the component's shape.
+        :return: The shape group in the JSON, or None if it was not found.
+        """
+        target = shape_link.get(TARGET, "")
+        shape_info = self._shapes_read.get("/".join(target.rsplit("/", 2)[-2:]))
+        if shape_info is None or shape_info[CommonKeys.NAME] != shape_link.get(
+            CommonKeys.NAME
+        ):
+            self.warnings.append(
+                LinkTargetMissing(
+                    f"The shape of component {name} links to {target}, but that is not the shape of a component "
+                    f"loaded before it"
+                )
+            )
+            return None
+        return shape_info
+
     def _validate_nx_class(self, name: str, nx_class: str) -> bool:
         """
         Validates the NXclass by checking if it was found, and if it matches known NXclasses for components.
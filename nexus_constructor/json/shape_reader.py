@@ -1,7 +1,6 @@
 from typing import Any, Dict, List, Union
 
 import numpy as np
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.common_attrs import (
     CYLINDRICAL_GEOMETRY_NX_CLASS,
@@ -29,6 +28,7 @@ from nexus_constructor.model.geometry import (
     CylindricalGeometry,
     OFFGeometryNexus,
 )
+from nexus_constructor.model.shape_pool import intern_shape
 from nexus_constructor.model.value_type import FLOAT_TYPES, INT_TYPES, VALUE_TYPE_TO_NP
 from nexus_constructor.unit_utils import (
     METRES,
@@ -38,15 +38,6 @@ from nexus_constructor.unit_utils import (
 )
 
 
-def _convert_vertices_to_qvector3d(vertices: List[List[float]],) -> List[QVector3D]:
-    """
-    Converts a list of vertices to QVector3D
-    :param vertices: The list of vertices.
-    :return: The list of QVector3D vertices.
-    """
-    return [QVector3D(*vertex) for vertex in vertices]
-
-
 class ShapeReader:
     def __init__(self, component: Component, shape_info: Dict):
         self.component = component
@@ -142,7 +133,6 @@ class ShapeReader:
         )
         if not vertices:
             return
-        vertices = _convert_vertices_to_qvector3d(vertices)
 
         winding_order_dtype = self._find_and_validate_data_type(
             winding_order_dataset, INT_TYPES, WINDING_ORDER
@@ -162,7 +152,7 @@ class ShapeReader:
             winding_order,
             winding_order_dtype,
         )
-        self.component[name] = off_geometry
+        self.component[name] = intern_shape(off_geometry)
         self.shape = off_geometry
 
     @staticmethod
@@ -232,7 +222,7 @@ class ShapeReader:
         cylindrical_geometry = self.__create_cylindrical_geometry(
             cylinders_dtype, cylinders_list, name, units, vertices, vertices_dtype
         )
-        self.component[name] = cylindrical_geometry
+        self.component[name] = intern_shape(cylindrical_geometry)
         self.shape = cylindrical_geometry
 
     @staticmethod
@@ -597,6 +587,9 @@ class ShapeReader:
         )
         if not pixel_offset:
             return
+        if offset_name == Z_PIXEL_OFFSET and not np.any(pixel_offset):
+            # All zero z offsets are the same as none, so are not kept in the model
+            return
 
         self.component.set_field_value(
             offset_name, np.array(pixel_offset), pixel_offset_dtype
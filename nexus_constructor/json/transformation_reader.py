@@ -1,7 +1,5 @@
 from typing import Any, Dict, Optional, Tuple, Union
 
-from PySide2.QtGui import QVector3D
-
 from nexus_constructor.common_attrs import (
     NX_TRANSFORMATIONS,
     CommonAttrs,
@@ -72,14 +70,14 @@ class TransformationReader:
         parent_component: Component,
         children: list,
         transforms_with_dependencies: Dict[
-            TransformId, Tuple[Transformation, Optional[TransformId]]
+            TransformId, Tuple[Transformation, Optional[str]]
         ],
     ):
         """
         Reads transformations from a JSON dictionary
         :param parent_component: The parent component that the transformations should be added to
         :param children: The children of the component entry
-        :param transforms_with_dependencies: TransformationReader appends transforms and depends_on details to
+        :param transforms_with_dependencies: TransformationReader appends transforms and their depends_on paths to
          this dictionary so that depends_on can be set to the correct Transformation object after all
          transformations have been loaded
         """
@@ -267,19 +265,11 @@ class TransformationReader:
                 transformation_type=transformation_type,
                 angle_or_magnitude=angle_or_magnitude,
                 units=units,
-                vector=QVector3D(*vector),
+                vector=vector,
                 depends_on=temp_depends_on,
                 values=values,
             )
 
-            if depends_on not in DEPENDS_ON_IGNORE:
-                depends_on_id = TransformId(
-                    *get_component_and_transform_name(depends_on)
-                )
-                self._transforms_with_dependencies[
-                    TransformId(self.parent_component.name, name)
-                ] = (transform, depends_on_id)
-            else:
-                self._transforms_with_dependencies[
-                    TransformId(self.parent_component.name, name)
-                ] = (transform, None)
+            self._transforms_with_dependencies[
+                TransformId(self.parent_component.name, name)
+            ] = (transform, None if depends_on in DEPENDS_ON_IGNORE else depends_on)
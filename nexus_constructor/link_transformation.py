@@ -14,6 +14,12 @@ class LinkTransformation:
     def __init__(self, parent: TransformationsList):
         super().__init__()
         self.parent = parent
+        # Following the depends_on chain to the linked component is slow, so it is kept until a transformation changes
+        self._linked_component: Optional[Component] = None
+        self._linked_component_is_cached = False
+
+    def invalidate_linked_component(self):
+        self._linked_component_is_cached = False
 
     def _find_linked_component(self) -> Optional[Component]:
         for transformation in self.parent:
@@ -28,12 +34,19 @@ class LinkTransformation:
     def linked_component(self) -> Optional[Component]:
         if not self.parent.has_link:
             return None
-        if self._has_direct_component_link():
-            return self.parent.parent_component.depends_on.parent_component
-        return self._find_linked_component()
+        if not self._linked_component_is_cached:
+            if self._has_direct_component_link():
+                self._linked_component = (
+                    self.parent.parent_component.depends_on.parent_component
+                )
+            else:
+                self._linked_component = self._find_linked_component()
+            self._linked_component_is_cached = True
+        return self._linked_component
 
     @linked_component.setter
     def linked_component(self, value: Component):
+        self.invalidate_linked_component()
         parent_component = self.parent.parent_component
         if len(parent_component.transforms) == 0:
             target = parent_component
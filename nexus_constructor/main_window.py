@@ -1,9 +1,7 @@
 import json
-import uuid
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from weakref import WeakKeyDictionary
 
-from nexusutils.nexusbuilder import NexusBuilder
 from PySide2.QtCore import QSettings, Qt
 from PySide2.QtWidgets import (
     QAction,
@@ -15,10 +13,21 @@ from PySide2.QtWidgets import (
 )
 
 from nexus_constructor.add_component_window import AddComponentDialog
+from nexus_constructor.autosave import (
+    Autosave,
+    claim_orphaned_autosave,
+    discard_autosave,
+    load_autosave,
+    new_autosave_directory,
+)
 from nexus_constructor.create_forwarder_config import create_forwarder_config
 from nexus_constructor.json.load_from_json import JSONReader
 from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
 from nexus_constructor.model.model import Model
+from nexus_constructor.model.transaction import ChangeSet
+from nexus_constructor.model.undo import UndoHistory
+from nexus_constructor.nexus_file import idf_to_json_dict, write_nexus_file
 from nexus_constructor.ui_utils import file_dialog, show_warning_dialog
 from ui.main_window import Ui_MainWindow
 
@@ -53,17 +62,34 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self.show_action_labels.triggered.connect(
             lambda: self.on_show_action_labels(self.show_action_labels.isChecked())
         )
+        self.batch_components_action.triggered.connect(
+            lambda: self.on_batch_components(self.batch_components_action.isChecked())
+        )
         self.about_window.triggered.connect(lambda: self.onOpenAboutWindow(AboutWindow))
         # Clear the 3d view when closed
         QApplication.instance().aboutToQuit.connect(self.sceneWidget.delete)
 
         self.model.signals.component_added.connect(self.sceneWidget.add_component)
+        self.model.signals.components_added.connect(
+            self._update_3d_view_with_component_shapes
+        )
         self.model.signals.component_removed.connect(self.sceneWidget.delete_component)
+        self.model.signals.changes_committed.connect(self._update_3d_view_with_changes)
         self.component_tree_view_tab.set_up_model(self.model)
+        self.sceneWidget.component_picked.connect(
+            self.component_tree_view_tab.select_component
+        )
         self.model.signals.transformation_changed.connect(
             self._update_transformations_3d_view
         )
 
+        self.undo_history = UndoHistory(self.model)
+        self.undo_action.triggered.connect(self.undo_history.undo)
+        self.redo_action.triggered.connect(self.undo_history.redo)
+        self.undo_history.signals.history_changed.connect(self._update_undo_actions)
+        self._update_undo_actions()
+        self.autosave: Optional[Autosave] = None
+
         self._set_up_file_writer_control_window(main_window)
         self.file_writer_control_window = None
         self._update_views()
@@ -108,6 +134,12 @@ class MainWindow(Ui_MainWindow, QMainWindow):
             Qt.ToolButtonTextUnderIcon if value else Qt.ToolButtonIconOnly
         )
 
+    def on_batch_components(self, value):
+        self.sceneWidget.set_batching_enabled(value)
+        self.sceneWidget.clear_all_transformations()
+        self.sceneWidget.clear_all_components()
+        self._update_3d_view_with_component_shapes()
+
     def show_control_file_writer_window(self):
         if self.file_writer_control_window is None:
             from nexus_constructor.file_writer_ctrl_window import FileWriterCtrl
@@ -125,7 +157,8 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
     def save_to_nexus_file(self):
         filename = file_dialog(True, "Save Nexus File", NEXUS_FILE_TYPES)
-        self.model.signals.save_file(filename)
+        if filename:
+            write_nexus_file(self.model, filename)
 
     def open_idf_file(self):
         filename = file_dialog(False, "Open IDF file", {"IDF files": ["xml"]})
@@ -133,15 +166,9 @@ class MainWindow(Ui_MainWindow, QMainWindow):
 
     def _load_idf(self, filename):
         try:
-            builder = NexusBuilder(
-                str(uuid.uuid4()),
-                idf_file=filename,
-                file_in_memory=True,
-                nx_entry_name="entry",
-            )
-            builder.add_instrument_geometry_from_idf()
-            self.model.signals.load_nexus_file(builder.target_file)
-            self._update_views()
+            reader = JSONReader()
+            reader.load_model_from_dict(idf_to_json_dict(filename))
+            self._replace_entry(reader.entry)
             QMessageBox.warning(
                 self,
                 "Mantid IDF loaded",
@@ -191,13 +218,54 @@ class MainWindow(Ui_MainWindow, QMainWindow):
                     parent=self,
                 )
             if success:
-                self.model.entry = reader.entry
-                self._update_views()
+                self._replace_entry(reader.entry)
+
+    def set_up_autosave(self, directory: str):
+        """
+        Saves the model whenever it changes until the application exits, then offers to restore the work left in an
+        autosave by an instance of the application which stopped without exiting normally.
+        :param directory: The directory which every instance of the application saves its model in a directory in.
+        """
+        self.autosave = Autosave(self.model, new_autosave_directory(directory))
+        QApplication.instance().aboutToQuit.connect(
+            lambda: self.autosave.close(discard=True)
+        )
+        orphaned_autosave = claim_orphaned_autosave(directory)
+        if orphaned_autosave is None:
+            return
+        orphaned_directory, lock = orphaned_autosave
+        model_dict = load_autosave(orphaned_directory)
+        if (
+            model_dict is not None
+            and QMessageBox.question(
+                self,
+                "Restore unsaved work",
+                "The NeXus Constructor didn't exit normally last time. Restore the work which wasn't saved?",
+            )
+            == QMessageBox.Yes
+        ):
+            reader = JSONReader()
+            if reader.load_model_from_dict(model_dict):
+                self._replace_entry(reader.entry)
+        discard_autosave(orphaned_directory, lock)
+
+    def _replace_entry(self, entry: Entry):
+        self.model.entry = entry
+        self.undo_history.clear()
+        if self.autosave is not None:
+            self.autosave.checkpoint()
+        self._update_views()
+
+    def _update_undo_actions(self):
+        self.undo_action.setEnabled(self.undo_history.can_undo)
+        self.redo_action.setEnabled(self.undo_history.can_redo)
 
     def _update_transformations_3d_view(self):
         self.sceneWidget.clear_all_transformations()
         for component in self.model.entry.instrument.component_list:
-            self.sceneWidget.add_transformation(component.name, component.qtransform)
+            self.sceneWidget.add_transformation(
+                component.name, component.transform_matrix
+            )
 
     def _update_views(self):
         self.sceneWidget.clear_all_transformations()
@@ -205,11 +273,33 @@ class MainWindow(Ui_MainWindow, QMainWindow):
         self.component_tree_view_tab.set_up_model(self.model)
         self._update_3d_view_with_component_shapes()
 
-    def _update_3d_view_with_component_shapes(self):
-        for component in self.model.entry.instrument.component_list:
+    def _update_3d_view_with_changes(self, changes: ChangeSet):
+        """
+        Updates the 3D view with the changes made in a transaction, or by an undo or redo, only adding again the
+        components which changed. Everything is only added again when the whole entry has been replaced.
+        """
+        if changes.entry_replaced and not changes.only_components_changed:
+            self._update_views()
+            return
+        for name in changes.removed + changes.previous_names:
+            self.sceneWidget.delete_component(name)
+        self._update_3d_view_with_component_shapes(changes.added + changes.changed)
+
+    def _update_3d_view_with_component_shapes(
+        self, components: Optional[List[Component]] = None
+    ):
+        """
+        Adds components to the 3D view.
+        :param components: The components to add, defaults to every component in the instrument.
+        """
+        if components is None:
+            components = self.model.entry.instrument.component_list
+        for component in components:
             shape, positions = component.shape
             self.sceneWidget.add_component(component.name, shape, positions)
-            self.sceneWidget.add_transformation(component.name, component.qtransform)
+            self.sceneWidget.add_transformation(
+                component.name, component.transform_matrix
+            )
 
     def show_add_component_window(self, component: Optional[Component] = None):
         self.add_component_window = QDialogCustom()
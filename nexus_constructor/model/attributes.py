@@ -6,11 +6,15 @@ import numpy as np
 from nexus_constructor.common_attrs import CommonKeys
 from nexus_constructor.model.helpers import _get_item, _set_item
 from nexus_constructor.model.value_type import ValueType, ValueTypes
+from nexus_constructor.model.versioning import mark_changed
 
 
 class Attributes(list):
     """Abstract class used for common functionality between a group and dataset. """
 
+    # The group or dataset the attributes belong to
+    owner: Any = None
+
     def set_attribute_value(
         self,
         attribute_name: str,
@@ -25,6 +29,7 @@ class Attributes(list):
                 name=attribute_name, values=attribute_value, type=attribute_type
             ),
         )
+        mark_changed(self.owner)
 
     def get_attribute_value(self, attribute_name: str):
         return _get_item(self, attribute_name).values
@@ -3,9 +3,6 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import attr
 import numpy as np
-from PySide2.Qt3DCore import Qt3DCore
-from PySide2.QtGui import QMatrix4x4, QTransform, QVector3D
-from PySide2.QtWidgets import QListWidget
 
 from nexus_constructor.common_attrs import (
     CYLINDRICAL_GEOMETRY_NX_CLASS,
@@ -24,12 +21,13 @@ from nexus_constructor.geometry.pixel_data_utils import (
     get_detector_faces_from_pixel_mapping,
     get_detector_ids_from_pixel_grid,
     get_detector_number_from_pixel_mapping,
+    get_pixel_offsets_from_pixel_grid,
     get_x_offsets_from_pixel_grid,
     get_y_offsets_from_pixel_grid,
-    get_z_offsets_from_pixel_grid,
 )
-from nexus_constructor.geometry.utils import validate_nonzero_qvector
-from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.geometry.utils import validate_nonzero_vector
+from nexus_constructor.geometry.vector_math import VectorLike, normalise
+from nexus_constructor.model.dataset import Dataset, GeneratedDataset
 from nexus_constructor.model.geometry import (
     CYLINDERS,
     DETECTOR_NUMBER,
@@ -42,30 +40,15 @@ from nexus_constructor.model.geometry import (
     OFFGeometryNexus,
 )
 from nexus_constructor.model.group import TRANSFORMS_GROUP_NAME, Group
-from nexus_constructor.model.helpers import _generate_incremental_name
+from nexus_constructor.model.shape_pool import intern_shape
 from nexus_constructor.model.transformation import Transformation
 from nexus_constructor.model.value_type import ValueTypes
 from nexus_constructor.transformations_list import TransformationsList
-from nexus_constructor.ui_utils import show_warning_dialog
 
 if TYPE_CHECKING:
     from nexus_constructor.component_tree_model import ComponentInfo  # noqa: F401
 
 
-def _normalise(input_vector: QVector3D) -> Tuple[QVector3D, float]:
-    """
-    Normalise to unit vector
-
-    :param input_vector: Input vector
-    :return: Unit vector, magnitude
-    """
-    magnitude = input_vector.length()
-    if magnitude == 0:
-        return QVector3D(0.0, 0.0, 0.0), 0.0
-
-    return input_vector.normalized(), magnitude
-
-
 def _get_shape_group_for_pixel_data(pixel_data: PixelData) -> str:
     """
     Determines which group the geometry should be placed in based on the type of PixelData.
@@ -85,8 +68,26 @@ class Component(Group):
 
     _depends_on = attr.ib(type=Transformation, default=None)
     has_link = attr.ib(type=bool, default=None)
+    # Objects the pixel offsets were last created from, and the resulting array
+    _pixel_offsets_cache = attr.ib(
+        type=Optional[Tuple[Tuple, np.ndarray]],
+        default=None,
+        init=False,
+        eq=False,
+        repr=False,
+    )
+    # Incremented whenever the component, or anything in it, is changed
+    _version = attr.ib(type=int, default=0, init=False, eq=False, repr=False)
+    # What the dictionary was last created from, and the dictionary
+    _as_dict_cache = attr.ib(
+        type=Optional[Tuple[Tuple, Dict[str, Any]]],
+        default=None,
+        init=False,
+        eq=False,
+        repr=False,
+    )
     component_info: "ComponentInfo" = None
-    stored_transforms: list = None
+    stored_transforms: Optional[TransformationsList] = None
 
     @property
     def depends_on(self) -> "Transformation":
@@ -116,21 +117,19 @@ class Component(Group):
         )
 
     @property
-    def qtransform(self) -> QTransform:
+    def transform_matrix(self) -> np.ndarray:
         """
-        Creates a QTransform based on the full chain of transforms this component points to.
+        Creates a 4x4 matrix based on the full chain of transforms this component points to.
         Where T_1 depends on T_2 which depends on T_3:
         the final transformation T_f = T_3*T_2*T_1
 
-        :return: QTransform of final transformation
+        :return: 4x4 matrix of final transformation
         """
-        transform_matrix = QMatrix4x4()  # Identity matrix
+        transform_matrix = np.identity(4)
         for transform in self.transforms_full_chain:
             # Left multiply each new matrix
-            transform_matrix = transform.qmatrix * transform_matrix
-        transformation = Qt3DCore.QTransform()
-        transformation.setMatrix(transform_matrix)
-        return transformation
+            transform_matrix = transform.matrix @ transform_matrix
+        return transform_matrix
 
     @property
     def transforms(self) -> TransformationsList:
@@ -191,7 +190,7 @@ class Component(Group):
 
     def add_translation(
         self,
-        vector: QVector3D,
+        vector: VectorLike,
         name: str = None,
         depends_on: Transformation = None,
         values: Dataset = Dataset(name="", values=0, type=ValueTypes.DOUBLE, size="1"),
@@ -203,7 +202,7 @@ class Component(Group):
         :param depends_on: existing transformation which the new one depends on (otherwise relative to origin)
         :param values: The translation distance information.
         """
-        unit_vector, _ = _normalise(vector)
+        unit_vector, _ = normalise(vector)
         return self._create_and_add_transform(
             name,
             TransformationType.TRANSLATION,
@@ -216,7 +215,7 @@ class Component(Group):
 
     def add_rotation(
         self,
-        axis: QVector3D,
+        axis: VectorLike,
         angle: float,
         name: str = None,
         depends_on: Transformation = None,
@@ -246,12 +245,14 @@ class Component(Group):
         transformation_type: str,
         angle_or_magnitude: float,
         units: str,
-        vector: QVector3D,
+        vector: VectorLike,
         depends_on: Transformation,
         values: Dataset,
     ) -> Transformation:
         if name is None:
-            name = _generate_incremental_name(transformation_type, self.transforms)
+            name = self.get_transforms_group().children.names.next_incremental_name(
+                transformation_type
+            )
         transform = Transformation(
             name=name,
             parent_node=self.get_transforms_group(),
@@ -293,12 +294,12 @@ class Component(Group):
         self,
     ) -> Tuple[
         Union[NoShapeGeometry, CylindricalGeometry, OFFGeometryNexus],
-        Optional[List[QVector3D]],
+        Optional[np.ndarray],
     ]:
         if PIXEL_SHAPE_GROUP_NAME in self:
             return (
                 self[PIXEL_SHAPE_GROUP_NAME],
-                self._create_transformation_vectors_for_pixel_offsets(),
+                self._get_pixel_offsets(),
             )
         if SHAPE_GROUP_NAME in self:
             return self[SHAPE_GROUP_NAME], None
@@ -329,19 +330,19 @@ class Component(Group):
         if isinstance(pixel_data, PixelMapping):
             geometry.detector_faces = get_detector_faces_from_pixel_mapping(pixel_data)
 
-        self[shape_group] = geometry
+        self[shape_group] = intern_shape(geometry)
         return geometry
 
     def set_cylinder_shape(
         self,
-        axis_direction: QVector3D = QVector3D(0.0, 0.0, 1.0),
+        axis_direction: VectorLike = (0.0, 0.0, 1.0),
         height: float = 1.0,
         radius: float = 1.0,
         units: Union[str, bytes] = "m",
         pixel_data=None,
     ) -> CylindricalGeometry:
         self.remove_shape()
-        validate_nonzero_qvector(axis_direction)
+        validate_nonzero_vector(axis_direction)
         shape_group = _get_shape_group_for_pixel_data(pixel_data)
         geometry = CylindricalGeometry(shape_group)
         geometry.nx_class = CYLINDRICAL_GEOMETRY_NX_CLASS
@@ -362,7 +363,7 @@ class Component(Group):
                 pixel_data
             )
 
-        self[shape_group] = geometry
+        self[shape_group] = intern_shape(geometry)
         return geometry
 
     def clear_pixel_data(self):
@@ -374,23 +375,40 @@ class Component(Group):
 
     def record_pixel_grid(self, pixel_grid: PixelGrid):
         """
-        Records the pixel grid data to the NeXus file.
+        Records the pixel grid data to the NeXus file. Only the parameters of the grid are kept, the offset and
+        detector number arrays are generated from them when they are needed. The z offsets are all zero so are
+        omitted.
         :param pixel_grid: The PixelGrid created from the input provided to the Add/Edit Component Window.
         """
-        self.set_field_value(
-            X_PIXEL_OFFSET, get_x_offsets_from_pixel_grid(pixel_grid), ValueTypes.FLOAT
-        )
-        self.set_field_value(
-            Y_PIXEL_OFFSET, get_y_offsets_from_pixel_grid(pixel_grid), ValueTypes.FLOAT
-        )
-        self.set_field_value(
-            Z_PIXEL_OFFSET, get_z_offsets_from_pixel_grid(pixel_grid), ValueTypes.FLOAT
-        )
-        self.set_field_value(
-            DETECTOR_NUMBER,
-            np.array(get_detector_ids_from_pixel_grid(pixel_grid)),
-            ValueTypes.INT,
-        )
+        for name, generator, dtype in [
+            (X_PIXEL_OFFSET, get_x_offsets_from_pixel_grid, ValueTypes.FLOAT),
+            (Y_PIXEL_OFFSET, get_y_offsets_from_pixel_grid, ValueTypes.FLOAT),
+            (DETECTOR_NUMBER, get_detector_ids_from_pixel_grid, ValueTypes.INT),
+        ]:
+            self[name] = GeneratedDataset(
+                name=name,
+                values=None,
+                type=dtype,
+                size=(pixel_grid.rows, pixel_grid.columns),
+                source=pixel_grid,
+                generator=generator,
+            )
+        if Z_PIXEL_OFFSET in self:
+            del self[Z_PIXEL_OFFSET]
+
+    @property
+    def pixel_grid(self) -> Optional[PixelGrid]:
+        """
+        The parameters of the component's pixel grid, if it was recorded from them rather than read as arrays.
+        """
+        if X_PIXEL_OFFSET not in self:
+            return None
+        dataset = self[X_PIXEL_OFFSET]
+        if isinstance(dataset, GeneratedDataset) and isinstance(
+            dataset.source, PixelGrid
+        ):
+            return dataset.source
+        return None
 
     def record_pixel_mapping(self, pixel_mapping: PixelMapping):
         """
@@ -399,16 +417,50 @@ class Component(Group):
         """
         self.set_field_value(
             DETECTOR_NUMBER,
-            np.array(get_detector_number_from_pixel_mapping(pixel_mapping)),
+            get_detector_number_from_pixel_mapping(pixel_mapping),
             ValueTypes.INT,
         )
 
-    def _create_transformation_vectors_for_pixel_offsets(
-        self,
-    ) -> Optional[List[QVector3D]]:
+    def _pixel_offset_sources(self) -> Tuple:
+        """
+        The objects that the pixel offsets are created from, for each offset dataset the PixelGrid it is generated from
+        or its values. These are replaced rather than modified when the offsets change.
+        """
+        sources: List[Any] = []
+        for name in [X_PIXEL_OFFSET, Y_PIXEL_OFFSET, Z_PIXEL_OFFSET]:
+            if name not in self:
+                sources.append(None)
+                continue
+            dataset = self[name]
+            if isinstance(dataset, GeneratedDataset) and dataset.source is not None:
+                sources.append(dataset.source)
+            else:
+                sources.append(dataset.values)
+        return tuple(sources)
+
+    def _get_pixel_offsets(self) -> Optional[np.ndarray]:
+        """
+        The (N, 3) array of pixel offsets, which is only created again when the offset datasets or their values have
+        been replaced since it was last created. It is shared by every caller so is read-only.
+        """
+        sources = self._pixel_offset_sources()
+        if self._pixel_offsets_cache is not None and all(
+            source is cached_source
+            for source, cached_source in zip(sources, self._pixel_offsets_cache[0])
+        ):
+            return self._pixel_offsets_cache[1]
+        offsets = self._create_transformation_vectors_for_pixel_offsets()
+        if offsets is not None:
+            offsets.flags.writeable = False
+        self._pixel_offsets_cache = (sources, offsets)
+        return offsets
+
+    def _create_transformation_vectors_for_pixel_offsets(self,) -> Optional[np.ndarray]:
         """
-        Construct a transformation (as a QVector3D) for each pixel offset
+        Construct a transformation (as an (N, 3) float32 array of vectors) for each pixel offset
         """
+        if self.pixel_grid is not None:
+            return get_pixel_offsets_from_pixel_grid(self.pixel_grid).astype(np.float32)
         try:
             x_offsets = self.get_field_value(X_PIXEL_OFFSET)
             y_offsets = self.get_field_value(Y_PIXEL_OFFSET)
@@ -422,24 +474,50 @@ class Component(Group):
         except AttributeError:
             z_offsets = np.zeros_like(x_offsets)
         # offsets datasets can be 2D to match dimensionality of detector, so flatten to 1D
-        return [
-            QVector3D(x, y, z)
-            for x, y, z in zip(
-                x_offsets.flatten(), y_offsets.flatten(), z_offsets.flatten()
+        return np.column_stack(
+            (
+                np.asarray(x_offsets, dtype=np.float32).flatten(),
+                np.asarray(y_offsets, dtype=np.float32).flatten(),
+                np.asarray(z_offsets, dtype=np.float32).flatten(),
             )
-        ]
+        )
 
     def as_dict(self) -> Dict[str, Any]:
+        """
+        The dictionary is kept until the component is changed, so that exporting the model again only creates the
+        dictionaries of the components which have changed. The dictionaries inside it are shared between exports, so
+        must not be modified.
+        :return: The component in the file-writer JSON format.
+        """
+        transforms = self.transforms
+        # The paths of other components' transformations which this component's depend on can change without this
+        # component changing
+        key = (
+            self._version,
+            tuple(
+                getattr(node.depends_on, "absolute_path", None)
+                for node in [self, *transforms]
+            ),
+        )
+        if self._as_dict_cache is None or self._as_dict_cache[0] != key:
+            self._as_dict_cache = (key, self._create_dict(transforms))
+        dictionary = self._as_dict_cache[1]
+        return {
+            **dictionary,
+            CommonKeys.CHILDREN: list(dictionary[CommonKeys.CHILDREN]),
+        }
+
+    def _create_dict(self, transforms: TransformationsList) -> Dict[str, Any]:
         dictionary = super(Component, self).as_dict()
 
-        if self.transforms:
+        if transforms:
             # Add transformations in a child group
             dictionary[CommonKeys.CHILDREN].append(
                 {
                     CommonKeys.TYPE: NodeType.GROUP,
                     CommonKeys.NAME: TRANSFORMS_GROUP_NAME,
                     CommonKeys.CHILDREN: [
-                        transform.as_dict() for transform in self.transforms
+                        transform.as_dict() for transform in transforms
                     ],
                     CommonKeys.ATTRIBUTES: [
                         {
@@ -461,22 +539,3 @@ class Component(Group):
         except AttributeError:
             pass
         return dictionary
-
-
-def add_fields_to_component(component: Component, fields_widget: QListWidget):
-    """
-    Adds fields from a list widget to a component.
-    :param component: Component to add the field to.
-    :param fields_widget: The field list widget to extract field information such the name and value of each field.
-    """
-    for i in range(fields_widget.count()):
-        widget = fields_widget.itemWidget(fields_widget.item(i))
-        try:
-            component[widget.name] = widget.value
-        except ValueError as error:
-            show_warning_dialog(
-                f"Warning: field {widget.name} not added",
-                title="Field invalid",
-                additional_info=str(error),
-                parent=fields_widget.parent().parent(),
-            )
@@ -0,0 +1,267 @@
+"""
+Creating many placed copies of a component in one operation, such as the tubes of a detector bank arranged on an arc.
+
+A placement describes where each copy goes as transformations added to the end of the copy's depends_on chain, after
+the transformations copied from the template. The values of the transformations for all of the copies are calculated
+together as arrays, and the copies share the template's shape rather than each holding its own arrays.
+"""
+from typing import Any, List, Optional
+
+import attr
+import numpy as np
+
+from nexus_constructor.common_attrs import TransformationType
+from nexus_constructor.geometry.vector_math import VectorLike, normalise, to_vector
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.dataset import Dataset, GeneratedDataset
+from nexus_constructor.model.group import TRANSFORMS_GROUP_NAME, Group
+from nexus_constructor.model.link import Link
+from nexus_constructor.model.name_registry import NameRegistry
+from nexus_constructor.model.shape_pool import SHAPE_GROUP_NAMES, intern_shape
+from nexus_constructor.model.transformation import Transformation
+from nexus_constructor.model.value_type import ValueTypes
+
+TRANSFORMATION_UNITS = {
+    TransformationType.TRANSLATION: "m",
+    TransformationType.ROTATION: "degrees",
+}
+
+
+@attr.s(frozen=True, eq=False)
+class PlacementTransformations:
+    """
+    A transformation of each copy, with the vector and the distance or angle of each copy in arrays.
+    """
+
+    transformation_type = attr.ib(type=str)
+    vectors = attr.ib(type=np.ndarray)
+    values = attr.ib(type=np.ndarray)
+
+
+def _translations(positions: np.ndarray) -> PlacementTransformations:
+    """
+    :param positions: The (N, 3) array of the position of each copy.
+    :return: A translation of each copy to its position, along the unit vector towards it.
+    """
+    distances = np.linalg.norm(positions, axis=1)
+    vectors = np.tile([0.0, 0.0, 1.0], (len(positions), 1))
+    moved = distances > 0
+    vectors[moved] = positions[moved] / distances[moved, np.newaxis]
+    return PlacementTransformations(TransformationType.TRANSLATION, vectors, distances)
+
+
+def _repeat(vector: VectorLike, count: int) -> np.ndarray:
+    unit_vector, _ = normalise(vector)
+    return np.tile(unit_vector, (count, 1))
+
+
+@attr.s(frozen=True, eq=False)
+class LinearPlacement:
+    """
+    Copies a fixed step apart along a line, with the first at the start.
+    """
+
+    step = attr.ib(converter=to_vector)
+    start = attr.ib(converter=to_vector, default=(0.0, 0.0, 0.0))
+
+    def transformations(self, count: int) -> List[PlacementTransformations]:
+        positions = self.start + np.arange(count)[:, np.newaxis] * self.step
+        return [_translations(positions)]
+
+
+@attr.s(frozen=True, eq=False)
+class ArcPlacement:
+    """
+    Copies on an arc around an axis, each moved out along the direction by the radius and then rotated around the axis
+    by a fixed step in angle from the one before it, in degrees.
+    """
+
+    radius = attr.ib(type=float)
+    angle_step = attr.ib(type=float)
+    start_angle = attr.ib(type=float, default=0.0)
+    axis = attr.ib(converter=to_vector, default=(0.0, 1.0, 0.0))
+    direction = attr.ib(converter=to_vector, default=(0.0, 0.0, 1.0))
+
+    def transformations(self, count: int) -> List[PlacementTransformations]:
+        return [
+            PlacementTransformations(
+                TransformationType.TRANSLATION,
+                _repeat(self.direction, count),
+                np.full(count, float(self.radius)),
+            ),
+            PlacementTransformations(
+                TransformationType.ROTATION,
+                _repeat(self.axis, count),
+                self.start_angle + np.arange(count) * float(self.angle_step),
+            ),
+        ]
+
+
+def _to_float_array(values: Any) -> np.ndarray:
+    return np.asarray(values, dtype=float)
+
+
+@attr.s(frozen=True, eq=False)
+class TablePlacement:
+    """
+    Copies at the positions in a table, each optionally rotated in place around an axis by its angle in degrees first.
+    """
+
+    positions = attr.ib(converter=_to_float_array)
+    angles = attr.ib(default=None)
+    axis = attr.ib(converter=to_vector, default=(0.0, 0.0, 1.0))
+
+    def transformations(self, count: int) -> List[PlacementTransformations]:
+        positions = self.positions.reshape(-1, 3)
+        if len(positions) != count:
+            raise ValueError(
+                f"Expected a position for each of the {count} copies but found {len(positions)}"
+            )
+        transformations = []
+        if self.angles is not None:
+            angles = np.asarray(self.angles, dtype=float).reshape(-1)
+            if len(angles) != count:
+                raise ValueError(
+                    f"Expected an angle for each of the {count} copies but found {len(angles)}"
+                )
+            transformations.append(
+                PlacementTransformations(
+                    TransformationType.ROTATION, _repeat(self.axis, count), angles
+                )
+            )
+        transformations.append(_translations(positions))
+        return transformations
+
+
+Placement = Any
+
+
+def create_component_array(
+    template: Component,
+    count: int,
+    placement: Placement,
+    names: NameRegistry,
+    name_stem: Optional[str] = None,
+    parent: Optional[Group] = None,
+) -> List[Component]:
+    """
+    Creates copies of a component, each with the template's fields, shape and transformations, followed by the
+    transformations placing it. The copies are not added to the instrument.
+    :param template: The component to copy, which is not changed.
+    :param count: The number of copies.
+    :param placement: A LinearPlacement, ArcPlacement or TablePlacement.
+    :param names: The names already in use, which the names of the copies are added to.
+    :param name_stem: The start of the name of each copy, which is followed by its number. Defaults to the name of the
+    template.
+    :param parent: The group the copies are to be added to. Defaults to the parent of the template.
+    :return: The copies.
+    :raises ValueError: If the count isn't positive or doesn't match the placement.
+    """
+    if count < 1:
+        raise ValueError(f"Expected at least one copy but found {count}")
+    placement_transformations = placement.transformations(count)
+    stem = template.name if name_stem is None else name_stem
+    parent = template.parent_node if parent is None else parent
+    transforms = list(template.transforms)
+    # The transformation in another component which the template's chain ends with, if any
+    depends_on = transforms[-1].depends_on if transforms else template.depends_on
+    copies = []
+    for index in range(count):
+        name = names.next_incremental_name(stem)
+        names.add(name)
+        copy = _copy_component(template, name, parent)
+        chain = _copy_transforms(transforms, copy)
+        for transformations in placement_transformations:
+            value = float(transformations.values[index])
+            placed = copy._create_and_add_transform(
+                None,
+                transformations.transformation_type,
+                value,
+                TRANSFORMATION_UNITS[transformations.transformation_type],
+                transformations.vectors[index],
+                None,
+                Dataset(name="", values=value, type=ValueTypes.DOUBLE, size=[1]),
+            )
+            chain.append(placed)
+        # The template's transformations, followed by the ones placing the copy
+        _chain(copy, chain, depends_on)
+        copies.append(copy)
+    return copies
+
+
+def _chain(
+    component: Component,
+    transformations: List[Transformation],
+    depends_on: Optional[Transformation],
+):
+    for transformation, next_transformation in zip(
+        transformations, transformations[1:] + [depends_on]
+    ):
+        transformation.depends_on = next_transformation
+    component.depends_on = transformations[0] if transformations else depends_on
+
+
+def _copy_component(
+    template: Component, name: str, parent: Optional[Group]
+) -> Component:
+    copy = Component(name, parent_node=parent)
+    _copy_attributes(template, copy)
+    for child in template.children:
+        if getattr(child, "name", None) == TRANSFORMS_GROUP_NAME:
+            continue
+        child_copy = _copy_node(child, copy)
+        if getattr(child, "name", None) in SHAPE_GROUP_NAMES:
+            child_copy = intern_shape(child_copy)
+        copy.children.append(child_copy)
+    return copy
+
+
+def _copy_transforms(
+    transforms: List[Transformation], component: Component
+) -> List[Transformation]:
+    return [
+        component._create_and_add_transform(
+            transform.name,
+            transform.transform_type,
+            transform.ui_value,
+            transform.units,
+            transform.vector,
+            None,
+            _copy_node(transform.values, None),
+        )
+        for transform in transforms
+    ]
+
+
+def _copy_node(node: Any, parent: Optional[Group]) -> Any:
+    """
+    Copies a group, dataset, link or stream and everything in it. Values are shared rather than copied, as they are
+    replaced rather than changed in place.
+    """
+    if isinstance(node, Group):
+        group_copy = type(node)(name=node.name, parent_node=parent)
+        _copy_attributes(node, group_copy)
+        for child in node.children:
+            group_copy.children.append(_copy_node(child, group_copy))
+        return group_copy
+    if isinstance(node, Dataset):
+        values = node.values
+        if isinstance(node, GeneratedDataset):
+            # Keep the description the values are generated from, rather than generating them
+            values = node.__dict__["_values"]
+        dataset_copy = attr.evolve(node, parent_node=parent, values=values)
+        _copy_attributes(node, dataset_copy)
+        return dataset_copy
+    if isinstance(node, Link):
+        return Link(name=node.name, target=node.target)
+    if attr.has(type(node)):
+        # Streams
+        return attr.evolve(node)
+    return node
+
+
+def _copy_attributes(node: Any, copy: Any):
+    for attribute in node.attributes:
+        copy.attributes.set_attribute_value(
+            attribute.name, attribute.values, attribute.type
+        )
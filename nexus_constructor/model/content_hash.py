@@ -0,0 +1,187 @@
+"""
+Hashes of the contents of groups, datasets and links, for telling whether two models, or two parts of one, are the
+same without comparing them, and for finding where they differ.
+
+The hash of a group combines the names and hashes of its children, so a subtree which is the same in two models has
+the same hash, and differences can be found by only descending into the children whose hashes differ. The hash of a
+node does not include its own name, so that nodes with the same contents under different names can be recognised.
+Hashes are cached on each node until it, or anything in it, is changed. The hashes of nodes containing depends_on
+paths, which change when the transformation they point to is moved, are also recalculated when any path in the model changes.
+"""
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.common_attrs import CommonAttrs
+from nexus_constructor.model.path_index import paths_version
+from nexus_constructor.model.versioning import CONTENT_HASH_CACHE
+
+DIGEST_SIZE = 16
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+@attr.s(frozen=True)
+class Difference:
+    """
+    A node which is in one model and not the other, or whose own contents differ between them.
+    """
+
+    path = attr.ib(type=str)
+    kind = attr.ib(type=str)
+
+
+def content_hash(node: Any) -> bytes:
+    """
+    :param node: A group, dataset or link.
+    :return: The hash of everything in the node other than its name.
+    """
+    return _get_hashes(node)[1]
+
+
+def diff(old_node: Any, new_node: Any) -> List[Difference]:
+    """
+    Finds the differences between two versions of a group, only descending into the children whose hashes differ.
+    :param old_node: The group, dataset or link in one model.
+    :param new_node: The corresponding node in the other model.
+    :return: The differences, with paths in the old model for nodes which were removed or changed, and in the new model
+    for nodes which were added.
+    """
+    differences: List[Difference] = []
+    _diff(
+        old_node, new_node, old_node.absolute_path, new_node.absolute_path, differences
+    )
+    return differences
+
+
+def _diff(
+    old_node: Any,
+    new_node: Any,
+    old_path: str,
+    new_path: str,
+    differences: List[Difference],
+):
+    old_own_hash, old_hash, _ = _get_hashes(old_node)
+    new_own_hash, new_hash, _ = _get_hashes(new_node)
+    if old_hash == new_hash:
+        return
+    if old_own_hash != new_own_hash:
+        differences.append(Difference(old_path, CHANGED))
+    old_children = _named_children(old_node)
+    new_children = _named_children(new_node)
+    for name, old_child in old_children.items():
+        new_child = new_children.get(name)
+        if new_child is None:
+            differences.append(Difference(f"{old_path}/{name}", REMOVED))
+        else:
+            _diff(
+                old_child,
+                new_child,
+                f"{old_path}/{name}",
+                f"{new_path}/{name}",
+                differences,
+            )
+    for name in new_children.keys() - old_children.keys():
+        differences.append(Difference(f"{new_path}/{name}", ADDED))
+
+
+def _named_children(node: Any) -> Dict[str, Any]:
+    children = list(getattr(node, "children", None) or ())
+    # Components are held in the instrument's component list rather than its children
+    children.extend(getattr(node, "component_list", None) or ())
+    return {child.name: child for child in children if getattr(child, "name", None)}
+
+
+def _get_hashes(node: Any) -> Tuple[bytes, bytes, bool]:
+    """
+    :return: The hash of the node's own contents, without its children, the hash including its children, and whether
+    the hashes include any depends_on paths.
+    """
+    node_dict = node.__dict__
+    cached_hashes = node_dict.get(CONTENT_HASH_CACHE)
+    if cached_hashes is not None and cached_hashes[0] in (None, paths_version(node)):
+        return cached_hashes[1], cached_hashes[2], cached_hashes[0] is not None
+
+    depends_on_path = getattr(getattr(node, "depends_on", None), "absolute_path", None)
+    uses_paths = depends_on_path is not None
+    own_hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    _update_hash(own_hasher, type(node).__name__)
+    for attribute in ("target", "type", "size"):
+        _update_hash(own_hasher, getattr(node, attribute, None))
+    values = getattr(node, "values", None)
+    if hasattr(values, "absolute_path"):
+        # A dataset held as the value of a node, such as the dataset of a transformation
+        _, values_hash, values_use_paths = _get_hashes(values)
+        own_hasher.update(values_hash)
+        uses_paths |= values_use_paths
+    else:
+        _update_hash(own_hasher, values)
+    # The transformation a depends_on attribute holds is hashed by its path
+    _update_hash(
+        own_hasher,
+        [
+            (attribute.name, attribute.type, attribute.values)
+            for attribute in getattr(node, "attributes", None) or ()
+            if attribute.name != CommonAttrs.DEPENDS_ON
+        ],
+    )
+    _update_hash(own_hasher, depends_on_path)
+    # Streams don't have names, so are part of the group's own contents
+    _update_hash(
+        own_hasher,
+        [
+            child
+            for child in getattr(node, "children", None) or ()
+            if not getattr(child, "name", None)
+        ],
+    )
+    own_hash = own_hasher.digest()
+
+    hasher = hashlib.blake2b(own_hash, digest_size=DIGEST_SIZE)
+    for name, child in sorted(_named_children(node).items()):
+        _update_hash(hasher, name)
+        _, child_hash, child_uses_paths = _get_hashes(child)
+        hasher.update(child_hash)
+        uses_paths |= child_uses_paths
+    node_hash = hasher.digest()
+
+    node_dict[CONTENT_HASH_CACHE] = (
+        paths_version(node) if uses_paths else None,
+        own_hash,
+        node_hash,
+    )
+    return own_hash, node_hash, uses_paths
+
+
+def _update_hash(hasher: Any, value: Any):
+    """
+    Adds a value to a hash, with its type so that values such as 1 and "1" have different hashes. Arrays are hashed
+    from their buffers rather than being converted to lists.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (np.ndarray, np.generic)):
+        array = np.ascontiguousarray(value)
+        hasher.update(f"ndarray:{array.dtype.str}:{array.shape};".encode())
+        if array.dtype.hasobject:
+            _update_hash(hasher, array.tolist())
+        else:
+            hasher.update(array.reshape(-1).view(np.uint8))
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"list:{len(value)};".encode())
+        for item in value:
+            _update_hash(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"dict:{len(value)};".encode())
+        for key, item in sorted(value.items(), key=lambda pair: repr(pair[0])):
+            _update_hash(hasher, key)
+            _update_hash(hasher, item)
+    elif attr.has(type(value)):
+        hasher.update(f"{type(value).__name__};".encode())
+        _update_hash(hasher, attr.asdict(value, recurse=False))
+    else:
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Union
 
 import attr
 import numpy as np
@@ -6,6 +6,7 @@ import numpy as np
 from nexus_constructor.common_attrs import CommonAttrs, CommonKeys, NodeType
 from nexus_constructor.model.attributes import Attributes
 from nexus_constructor.model.helpers import get_absolute_path
+from nexus_constructor.model.name_registry import NamedItem
 from nexus_constructor.model.value_type import ValueType
 
 if TYPE_CHECKING:
@@ -13,13 +14,14 @@ if TYPE_CHECKING:
 
 
 @attr.s
-class Dataset:
+class Dataset(NamedItem):
     name = attr.ib(type=str)
     values = attr.ib(type=Union[List[ValueType], ValueType])
     type = attr.ib(type=str)
     size = attr.ib(factory=tuple)
     parent_node = attr.ib(type="Group", default=None)
     attributes = attr.ib(type=Attributes, factory=Attributes, init=False)
+    _name_registries = attr.ib(factory=list, init=False, eq=False, repr=False)
 
     @property
     def absolute_path(self):
@@ -49,3 +51,26 @@ class Dataset:
             values = values.tolist()
         return_dict[CommonKeys.VALUES] = values
         return return_dict
+
+
+@attr.s
+class GeneratedDataset(Dataset):
+    """
+    A dataset whose values are generated from a compact description, such as the parameters of a pixel grid, each time
+    they are needed rather than being held in the model. Setting the values replaces the description with them.
+    """
+
+    source = attr.ib(type=Any, default=None)
+    generator = attr.ib(type=Optional[Callable[[Any], np.ndarray]], default=None)
+
+    @property  # type: ignore
+    def values(self):
+        if self._values is None and self.source is not None:
+            return self.generator(self.source)
+        return self._values
+
+    @values.setter
+    def values(self, new_values):
+        self._values = new_values
+        if new_values is not None:
+            self.source = None
@@ -1,18 +1,19 @@
 from abc import ABC, abstractmethod
-from math import acos, cos, degrees, pi, sin
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
-from PySide2.QtGui import QMatrix4x4, QVector3D
 
 from nexus_constructor.common_attrs import CommonAttrs
 from nexus_constructor.geometry.utils import get_an_orthogonal_unit_vector
+from nexus_constructor.geometry.vector_math import (
+    VectorLike,
+    normalise,
+    rotation_matrix_between,
+    transform_points,
+    vector_length,
+)
 from nexus_constructor.model.group import Group
 from nexus_constructor.model.value_type import ValueTypes
-from nexus_constructor.ui_utils import (
-    numpy_array_to_qvector3d,
-    qvector3d_to_numpy_array,
-)
 from nexus_constructor.unit_utils import METRES, calculate_unit_conversion_factor
 
 WINDING_ORDER = "winding_order"
@@ -25,6 +26,14 @@ Z_PIXEL_OFFSET = "z_pixel_offset"
 DETECTOR_FACES = "detector_faces"
 
 
+def _to_vertex_array(vertices: np.ndarray) -> np.ndarray:
+    """
+    :param vertices: Any nested sequence of vertex coordinates.
+    :return: The vertices as an (N, 3) float array.
+    """
+    return np.asarray(vertices, dtype=float).reshape(-1, 3)
+
+
 class OFFGeometry(ABC):
     _units: str = ""
     _file_path: str = ""
@@ -69,12 +78,15 @@ class OFFGeometry(ABC):
 
     @property  # type: ignore
     @abstractmethod
-    def vertices(self) -> List[QVector3D]:
+    def vertices(self) -> np.ndarray:
+        """
+        (N, 3) array of the coordinates of each vertex
+        """
         pass
 
     @vertices.setter  # type: ignore
     @abstractmethod
-    def vertices(self, new_vertices: List[QVector3D]):
+    def vertices(self, new_vertices: np.ndarray):
         pass
 
     @property  # type: ignore
@@ -97,19 +109,19 @@ class OFFGeometryNoNexus(OFFGeometry, Group):
 
     def __init__(
         self,
-        vertices: List[QVector3D] = None,
+        vertices: np.ndarray = None,
         faces: List[List[int]] = None,
         name: str = "",
     ):
         """
-        :param vertices: list of Vector objects used as corners of polygons in the geometry
+        :param vertices: (N, 3) array of points used as corners of polygons in the geometry
         :param faces: list of integer lists. Each sublist is a winding path around the corners of a polygon.
             Each sublist item is an index into the vertices list to identify a specific point in 3D space
         """
         Group.__init__(self, name)
         OFFGeometry.__init__(self)
         self.name = name
-        self._vertices = vertices
+        self._vertices = _to_vertex_array(vertices) if vertices is not None else None
         self._faces = faces
 
     @property
@@ -126,12 +138,12 @@ class OFFGeometryNoNexus(OFFGeometry, Group):
         return self
 
     @property
-    def vertices(self) -> List[QVector3D]:
+    def vertices(self) -> np.ndarray:
         return self._vertices
 
     @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
-        self._vertices = new_vertices
+    def vertices(self, new_vertices: np.ndarray):
+        self._vertices = _to_vertex_array(new_vertices)
 
     @property
     def faces(self) -> List[List[int]]:
@@ -160,10 +172,9 @@ class CylindricalGeometry(Group):
     @property
     def height(self) -> float:
         base_centre, _, top_centre = self._get_cylinder_vertices()
-        cylinder_axis = top_centre - base_centre
-        return cylinder_axis.length()
+        return vector_length(top_centre - base_centre)
 
-    def _get_cylinder_vertices(self) -> Tuple[QVector3D, QVector3D, QVector3D]:
+    def _get_cylinder_vertices(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         Get the three points defining the cylinder
         We define "base" as the end of the cylinder in the -ve axis direction
@@ -172,16 +183,16 @@ class CylindricalGeometry(Group):
         # flatten cylinders in case there are multiple cylinders defined, we'll take the first three elements,
         # so effectively any cylinder after the first one is ignored
         cylinders = self.cylinders.flatten()
-        vertices = self.get_field_value(CommonAttrs.VERTICES)
+        vertices = np.asarray(self.get_field_value(CommonAttrs.VERTICES), dtype=float)
         return (
-            numpy_array_to_qvector3d(vertices[cylinders[0], :]),
-            numpy_array_to_qvector3d(vertices[cylinders[1], :]),
-            numpy_array_to_qvector3d(vertices[cylinders[2], :]),
+            vertices[cylinders[0], :],
+            vertices[cylinders[1], :],
+            vertices[cylinders[2], :],
         )
 
     @staticmethod
     def calculate_vertices(
-        axis_direction: QVector3D, height: float, radius: float
+        axis_direction: VectorLike, height: float, radius: float
     ) -> np.ndarray:
         """
         Given cylinder axis, height and radius, calculate the base centre, base edge and top centre vertices
@@ -190,18 +201,12 @@ class CylindricalGeometry(Group):
         :param radius: radius of the cylinder
         :return: base centre, base edge and top centre vertices as a numpy array
         """
-        axis_direction = axis_direction.normalized()
+        axis_direction, _ = normalise(axis_direction)
         top_centre = axis_direction * height / 2.0
         base_centre = axis_direction * height / -2.0
-        radial_direction = get_an_orthogonal_unit_vector(axis_direction).normalized()
+        radial_direction = get_an_orthogonal_unit_vector(axis_direction)
         base_edge = base_centre + (radius * radial_direction)
-        vertices = np.vstack(
-            (
-                qvector3d_to_numpy_array(base_centre),
-                qvector3d_to_numpy_array(base_edge),
-                qvector3d_to_numpy_array(top_centre),
-            )
-        )
+        vertices = np.vstack((base_centre, base_edge, top_centre))
         return vertices
 
     @property
@@ -211,11 +216,10 @@ class CylindricalGeometry(Group):
     @property
     def radius(self) -> float:
         base_centre, base_edge, _ = self._get_cylinder_vertices()
-        cylinder_radius = base_edge - base_centre
-        return cylinder_radius.length()
+        return vector_length(base_edge - base_centre)
 
     @property
-    def axis_direction(self) -> QVector3D:
+    def axis_direction(self) -> np.ndarray:
         """
         Finds the axis direction using the base centre and top centre if the height is non-zero, otherwise it just
         returns a default value of (0,0,1).
@@ -223,33 +227,30 @@ class CylindricalGeometry(Group):
         """
         if self.height != 0:
             base_centre, _, top_centre = self._get_cylinder_vertices()
-            cylinder_axis = top_centre - base_centre
-            return cylinder_axis.normalized()
+            return normalise(top_centre - base_centre)[0]
 
-        return QVector3D(0, 0, 1)
+        return np.array([0.0, 0.0, 1.0])
 
     @property
     def off_geometry(self) -> OFFGeometry:
         steps: int = 10
         unit_conversion_factor = calculate_unit_conversion_factor(self.units, METRES)
 
-        # A list of vertices describing the circle at the bottom of the cylinder
-        bottom_circle = [
-            QVector3D(sin(2 * pi * i / steps), cos(2 * pi * i / steps), 0) * self.radius
-            for i in range(steps)
-        ]
+        # The vertices describing the circle at the bottom of the cylinder
+        angles = 2 * np.pi * np.arange(steps) / steps
+        bottom_circle = (
+            np.column_stack((np.sin(angles), np.cos(angles), np.zeros(steps)))
+            * self.radius
+        )
 
         # The top of the cylinder is the bottom shifted upwards
-        top_circle = [vector + QVector3D(0, 0, self.height) for vector in bottom_circle]
+        top_circle = bottom_circle + np.array([0.0, 0.0, self.height])
 
         # The true cylinder are all vertices from the unit cylinder multiplied by the conversion factor
-        vertices = [
-            vector * unit_conversion_factor for vector in bottom_circle + top_circle
-        ]
+        vertices = np.vstack((bottom_circle, top_circle)) * unit_conversion_factor
 
         # rotate each vertex to produce the desired cylinder mesh
-        rotate_matrix = self._rotation_matrix()
-        vertices = [vector * rotate_matrix for vector in vertices]
+        vertices = transform_points(self._rotation_matrix(), vertices)
 
         def vertex_above(vertex):
             """
@@ -280,17 +281,11 @@ class CylindricalGeometry(Group):
             vertices=vertices, faces=rectangle_faces + top_bottom_faces
         )
 
-    def _rotation_matrix(self) -> QMatrix4x4:
+    def _rotation_matrix(self) -> np.ndarray:
         """
-        :return: A QMatrix4x4 describing the rotation from the Z axis to the cylinder's axis
+        :return: A 4x4 matrix describing the rotation from the Z axis to the cylinder's axis
         """
-        default_axis = QVector3D(0, 0, 1)
-        desired_axis = self.axis_direction.normalized()
-        rotate_axis = QVector3D.crossProduct(desired_axis, default_axis)
-        rotate_radians = acos(QVector3D.dotProduct(desired_axis, default_axis))
-        rotate_matrix = QMatrix4x4()
-        rotate_matrix.rotate(degrees(rotate_radians), rotate_axis)
-        return rotate_matrix
+        return rotation_matrix_between((0.0, 0.0, 1.0), self.axis_direction)
 
 
 class OFFGeometryNexus(OFFGeometry, Group):
@@ -300,16 +295,25 @@ class OFFGeometryNexus(OFFGeometry, Group):
     """
 
     @property
-    def detector_faces(self) -> List[Tuple[int, int]]:
-        return self.get_field_value(DETECTOR_FACES).tolist()
+    def detector_faces(self) -> np.ndarray:
+        """
+        :return: An (M, 2) array of the index of each face which is part of a detector, followed by its detector ID.
+        """
+        return np.asarray(self.get_field_value(DETECTOR_FACES), dtype=np.int64).reshape(
+            -1, 2
+        )
 
     @detector_faces.setter
-    def detector_faces(self, detector_faces: List[Tuple[int, int]]):
+    def detector_faces(self, detector_faces: Union[np.ndarray, List[List[int]]]):
         """
         Records the detector faces in the NXoff_geometry as a numpy array.
-        :param detector_faces: The PixelMapping object containing IDs the user provided through the Add/Edit Component window.
+        :param detector_faces: The face index and detector ID of each face which is part of a detector.
         """
-        self.set_field_value(DETECTOR_FACES, np.array(detector_faces), ValueTypes.INT)
+        self.set_field_value(
+            DETECTOR_FACES,
+            np.asarray(detector_faces, dtype=np.int64).reshape(-1, 2),
+            ValueTypes.INT,
+        )
 
     @property
     def winding_order(self) -> List[int]:
@@ -325,16 +329,11 @@ class OFFGeometryNexus(OFFGeometry, Group):
         return OFFGeometryNoNexus(self.vertices, self.faces)
 
     @property
-    def vertices(self) -> List[QVector3D]:
-        vertices_from_file = self.get_field_value(CommonAttrs.VERTICES)
-        number_of_vertices = vertices_from_file.shape[0]
-        return [
-            numpy_array_to_qvector3d(vertices_from_file[vertex_number][:])
-            for vertex_number in range(number_of_vertices)
-        ]
+    def vertices(self) -> np.ndarray:
+        return _to_vertex_array(self.get_field_value(CommonAttrs.VERTICES))
 
     @vertices.setter
-    def vertices(self, new_vertices: List[QVector3D]):
+    def vertices(self, new_vertices: np.ndarray):
         self.record_vertices(new_vertices)
 
     @property
@@ -374,14 +373,12 @@ class OFFGeometryNexus(OFFGeometry, Group):
         faces_start_indices = np.cumsum(faces_length)
         self.set_field_value(FACES, faces_start_indices, ValueTypes.INT)
 
-    def record_vertices(self, new_vertices: List[QVector3D]):
+    def record_vertices(self, new_vertices: np.ndarray):
         """
         Record vertex data in file
-        :param new_vertices: The new vertices data, list of cartesian coords for each vertex
+        :param new_vertices: The new vertices data, cartesian coords for each vertex
         """
-        vertices = np.array(
-            [qvector3d_to_numpy_array(vertex) for vertex in new_vertices]
-        )
+        vertices = _to_vertex_array(new_vertices)
         self.set_field_value(CommonAttrs.VERTICES, vertices, ValueTypes.FLOAT)
         self[CommonAttrs.VERTICES].attributes.set_attribute_value(
             CommonAttrs.UNITS, "m"
@@ -390,16 +387,18 @@ class OFFGeometryNexus(OFFGeometry, Group):
 
 __half_side_length = 0.05
 OFFCube = OFFGeometryNoNexus(
-    vertices=[
-        QVector3D(-__half_side_length, -__half_side_length, __half_side_length),
-        QVector3D(__half_side_length, -__half_side_length, __half_side_length),
-        QVector3D(-__half_side_length, __half_side_length, __half_side_length),
-        QVector3D(__half_side_length, __half_side_length, __half_side_length),
-        QVector3D(-__half_side_length, __half_side_length, -__half_side_length),
-        QVector3D(__half_side_length, __half_side_length, -__half_side_length),
-        QVector3D(-__half_side_length, -__half_side_length, -__half_side_length),
-        QVector3D(__half_side_length, -__half_side_length, -__half_side_length),
-    ],
+    vertices=np.array(
+        [
+            [-__half_side_length, -__half_side_length, __half_side_length],
+            [__half_side_length, -__half_side_length, __half_side_length],
+            [-__half_side_length, __half_side_length, __half_side_length],
+            [__half_side_length, __half_side_length, __half_side_length],
+            [-__half_side_length, __half_side_length, -__half_side_length],
+            [__half_side_length, __half_side_length, -__half_side_length],
+            [-__half_side_length, -__half_side_length, -__half_side_length],
+            [__half_side_length, -__half_side_length, -__half_side_length],
+        ]
+    ),
     faces=[
         [0, 1, 3, 2],
         [2, 3, 5, 4],
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Union
+from typing import TYPE_CHECKING, Any, Dict, Union
 
 import attr
 
@@ -12,6 +12,7 @@ from nexus_constructor.model.helpers import (
     get_absolute_path,
 )
 from nexus_constructor.model.link import Link
+from nexus_constructor.model.name_registry import NamedItem, NamedList, as_named_list
 
 if TYPE_CHECKING:
     from nexus_constructor.model.stream import StreamGroup
@@ -23,19 +24,26 @@ CHILD_EXCLUDELIST = [TRANSFORMS_GROUP_NAME]
 
 
 @attr.s
-class Group:
+class Group(NamedItem):
     """
     Base class for any group which has a set of children and an nx_class attribute.
     """
 
     name = attr.ib(type=str)
     parent_node = attr.ib(type="Group", default=None)
-    children: List[Union[Dataset, Link, "StreamGroup"]] = attr.ib(
-        factory=list, init=False
+    children: NamedList[Union[Dataset, Link, "StreamGroup"]] = attr.ib(
+        factory=NamedList, init=False
     )
     attributes = attr.ib(type=Attributes, factory=Attributes, init=False)
+    # Registries of the names in the lists this group is in, kept up to date when it is renamed
+    _name_registries = attr.ib(factory=list, init=False, eq=False, repr=False)
     values = None
 
+    def __setattr__(self, key: str, value: Any):
+        if key == "children":
+            value = as_named_list(value)
+        super().__setattr__(key, value)
+
     def __getitem__(self, key: str):
         return _get_item(self.children, key)
 
@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Any, List, Union
 
+from nexus_constructor.model.path_index import paths_version
+
 if TYPE_CHECKING:
     from nexus_constructor.model.attributes import Attributes
     from nexus_constructor.model.dataset import Dataset
@@ -63,15 +65,22 @@ def _set_item(
 
 
 def get_absolute_path(node: Any):
-    path = f"/{node.name}"
-    while node.parent_node is not None:
-        path = f"/{node.parent_node.name}{path}"
-        node = node.parent_node
-    return path
+    """
+    :return: The path of the node from the root of the model. Paths are cached until any node in the same model is
+    renamed or moved.
+    """
+    return _get_absolute_path(node, paths_version(node))
 
 
-def _generate_incremental_name(base_name, transforms_list):
-    number = 1
-    while _get_item(transforms_list, f"{base_name}_{number}") is not None:
-        number += 1
-    return f"{base_name}_{number}"
+def _get_absolute_path(node: Any, version: object) -> str:
+    cached_path = getattr(node, "_absolute_path_cache", None)
+    if cached_path is not None and cached_path[0] is version:
+        return cached_path[1]
+    parent_path = (
+        ""
+        if node.parent_node is None
+        else _get_absolute_path(node.parent_node, version)
+    )
+    path = f"{parent_path}/{node.name}"
+    node._absolute_path_cache = (version, path)
+    return path
@@ -1,8 +1,11 @@
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 from nexus_constructor.common_attrs import INSTRUMENT_NAME, CommonKeys
 from nexus_constructor.model.component import Component
+from nexus_constructor.model.component_array import Placement, create_component_array
 from nexus_constructor.model.group import Group
+from nexus_constructor.model.name_registry import NamedList, NameRegistry
+from nexus_constructor.model.path_index import PathIndex
 
 SAMPLE_NAME = "sample"
 
@@ -14,7 +17,26 @@ class Instrument(Group):
 
         self.sample = Component(SAMPLE_NAME, parent_node=self)
         self.sample.nx_class = "NXsample"
-        self.component_list = [self.sample]
+        self.component_list = NamedList([self.sample])
+        # The components and everything in them, by absolute path
+        self.path_index = PathIndex(self)
+
+    def create_component_array(
+        self,
+        template: Component,
+        count: int,
+        placement: Placement,
+        name_stem: Optional[str] = None,
+    ) -> List[Component]:
+        """
+        Creates placed copies of a component, named so that they don't clash with the components in the instrument or
+        each other. The copies are not added to the component list, see ComponentTreeModel.add_components.
+        See create_component_array.
+        """
+        names = NameRegistry(component.name for component in self.component_list)
+        return create_component_array(
+            template, count, placement, names, name_stem, parent=self
+        )
 
     def as_dict(self) -> Dict[str, Any]:
         dictionary = super(Instrument, self).as_dict()
@@ -1,14 +1,16 @@
 import attr
 
 from nexus_constructor.common_attrs import CommonKeys, NodeType
+from nexus_constructor.model.name_registry import NamedItem
 
 TARGET = "target"
 
 
 @attr.s
-class Link:
+class Link(NamedItem):
     name = attr.ib(type=str)
     target = attr.ib(type=str)
+    _name_registries = attr.ib(factory=list, init=False, eq=False, repr=False)
     parent_node = None
     attributes = None
     values = None
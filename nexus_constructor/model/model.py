@@ -1,10 +1,19 @@
-from typing import Any, Dict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
 
 from PySide2.QtCore import QObject, Signal
 
 from nexus_constructor.common_attrs import CommonKeys
 from nexus_constructor.model.entry import Entry
 from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.shape_pool import SHAPE_GROUP_NAMES, link_identical_shapes
+from nexus_constructor.model.transaction import (
+    ChangeSet,
+    component_states,
+    copy_entry,
+    find_changes,
+    restore_entry,
+)
 
 
 class Signals(QObject):
@@ -15,9 +24,13 @@ class Signals(QObject):
     file_changed = Signal("QVariant")
     file_opened = Signal("QVariant")
     component_added = Signal(str, "QVariant", "QVariant")
+    # Several components added at once, such as the copies in a component array
+    components_added = Signal("QVariant")
     component_removed = Signal(str)
     transformation_changed = Signal()
     show_entries_dialog = Signal("QVariant", "QVariant")
+    # The ChangeSet of a transaction, emitted when it ends in place of the signals blocked during it
+    changes_committed = Signal("QVariant")
 
 
 class Model:
@@ -25,6 +38,78 @@ class Model:
         self.signals = Signals()
         self.entry = Entry()
         self.entry.instrument = Instrument()
+        self._transaction_depth = 0
 
-    def as_dict(self) -> Dict[str, Any]:
-        return {CommonKeys.CHILDREN: [self.entry.as_dict()]}
+    @property
+    def in_transaction(self) -> bool:
+        return self._transaction_depth > 0
+
+    @contextmanager
+    def transaction(self, rollback: bool = True) -> Iterator["Model"]:
+        """
+        Groups changes to the model so that the views are only updated once, when the transaction ends. Signals are
+        blocked during the transaction, after which changes_committed is emitted with the components which were added,
+        removed or changed, followed by transformation_changed if there were any. A transaction opened inside another
+        is part of the outer one.
+        :param rollback: Whether to put the model back how it was if an exception is raised, which means keeping a copy
+        of it during the transaction. The entry is replaced when the model is put back, so components from before the
+        rollback are no longer part of the model.
+        """
+        if self._transaction_depth:
+            self._transaction_depth += 1
+            try:
+                yield self
+            finally:
+                self._transaction_depth -= 1
+            return
+
+        states = component_states(self.entry.instrument.component_list)
+        entry_copy = copy_entry(self.entry) if rollback else None
+        changes = ChangeSet()
+        were_blocked = self.signals.blockSignals(True)
+        self._transaction_depth = 1
+        try:
+            yield self
+        except BaseException:
+            if entry_copy is not None:
+                self.entry = restore_entry(entry_copy)
+                changes = ChangeSet(entry_replaced=True)
+            else:
+                changes = find_changes(states, self.entry.instrument.component_list)
+            raise
+        else:
+            changes = find_changes(states, self.entry.instrument.component_list)
+        finally:
+            self._transaction_depth = 0
+            self.signals.blockSignals(were_blocked)
+            if changes and not were_blocked:
+                self.signals.changes_committed.emit(changes)
+                if not changes.entry_replaced:
+                    self.signals.transformation_changed.emit()
+
+    def as_dict(self, link_shared_shapes: bool = False) -> Dict[str, Any]:
+        """
+        :param link_shared_shapes: Whether to write each shape which is the same as the shape of a component before it
+        as a link to that shape, rather than writing out its arrays again.
+        :return: The model in the file-writer JSON format.
+        """
+        dictionary = {CommonKeys.CHILDREN: [self.entry.as_dict()]}
+        if link_shared_shapes:
+            link_identical_shapes(dictionary, self._shapes_by_exported_path())
+        return dictionary
+
+    def _shapes_by_exported_path(self) -> Dict[str, Any]:
+        instrument = self.entry.instrument
+        shapes = {}
+        for component in instrument.component_list:
+            # The sample is written in the entry rather than in the instrument, see Entry.as_dict
+            component_path = (
+                f"{self.entry.absolute_path}/{component.name}"
+                if component is instrument.sample
+                else component.absolute_path
+            )
+            for shape_name in SHAPE_GROUP_NAMES:
+                shape = component[shape_name]
+                if shape is not None:
+                    shapes[f"{component_path}/{shape_name}"] = shape
+        return shapes
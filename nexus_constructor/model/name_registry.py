@@ -0,0 +1,252 @@
+"""
+Indexes of the names in use in a scope, such as the components of an instrument or the children of a group, so that
+names can be checked for uniqueness and new names generated without searching every item.
+"""
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Set, TypeVar
+
+from nexus_constructor.model.path_index import (
+    add_paths,
+    invalidate_paths,
+    remove_paths,
+    rename_paths,
+    replace_paths,
+)
+from nexus_constructor.model.versioning import (
+    is_unchanged,
+    is_versioned_attribute,
+    mark_changed,
+)
+
+DIGITS = "0123456789"
+
+_INCREMENTAL_NAME_PATTERN = re.compile(r"(.*)_(\d+)")
+
+T = TypeVar("T")
+
+# Attributes holding lists which mark the item as changed when they are changed
+_OWNED_LISTS = ("children", "attributes", "component_list")
+# Attributes holding lists of the nodes under the item, see path_index
+_INDEXED_LISTS = ("children", "component_list")
+
+_MISSING = object()
+
+
+class NameRegistry:
+    def __init__(self, names: Iterable[str] = ()):
+        """
+        Counts the items with each name in a scope. Names may be used more than once, such as when a list is being
+        rearranged, so a name is only free once every item with it has been removed.
+        :param names: The names already in use.
+        """
+        self._counts: Counter = Counter()
+        # Names grouped by what is left once their trailing digits are removed
+        self._names_by_stem: Dict[str, Set[str]] = {}
+        # The lowest suffix which might be free for each base name given to next_incremental_name
+        self._next_suffixes: Dict[str, int] = {}
+        for name in names:
+            self.add(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self._counts[name] > 0
+
+    def __len__(self) -> int:
+        return sum(self._counts.values())
+
+    def count(self, name: str) -> int:
+        return self._counts[name]
+
+    def add(self, name: str):
+        self._counts[name] += 1
+        if self._counts[name] == 1:
+            self._names_by_stem.setdefault(name.rstrip(DIGITS), set()).add(name)
+
+    def remove(self, name: str):
+        """
+        :raises KeyError: If no item has the name.
+        """
+        if self._counts[name] == 0:
+            del self._counts[name]
+            raise KeyError(name)
+        self._counts[name] -= 1
+        if self._counts[name] > 0:
+            return
+        del self._counts[name]
+        stem = name.rstrip(DIGITS)
+        self._names_by_stem[stem].discard(name)
+        if not self._names_by_stem[stem]:
+            del self._names_by_stem[stem]
+        match = _INCREMENTAL_NAME_PATTERN.fullmatch(name)
+        if match is not None:
+            base, suffix = match.group(1), int(match.group(2))
+            if suffix < self._next_suffixes.get(base, 0):
+                self._next_suffixes[base] = suffix
+
+    def rename(self, old_name: str, new_name: str):
+        self.remove(old_name)
+        self.add(new_name)
+
+    def next_incremental_name(self, base: str) -> str:
+        """
+        :param base: The start of the name.
+        :return: The base followed by an underscore and the lowest number from 1 which gives a free name.
+        """
+        suffix = self._next_suffixes.get(base, 1)
+        while f"{base}_{suffix}" in self:
+            suffix += 1
+        self._next_suffixes[base] = suffix
+        return f"{base}_{suffix}"
+
+    def unique_name(self, base: str) -> str:
+        """
+        :param base: The start of the name.
+        :return: The base if it is free, otherwise the base followed by one more than the highest number which follows
+        it in a name already in use.
+        """
+        if base not in self:
+            return base
+        numbered_names = [
+            name
+            for name in self._names_by_stem.get(base.rstrip(DIGITS), ())
+            if name != base and name.startswith(base) and name[len(base) :].isdecimal()
+        ]
+        if not numbered_names:
+            return base + "1"
+        return base + str(max(int(name[len(base) :]) for name in numbered_names) + 1)
+
+
+class NamedItem:
+    """
+    Base for model classes which keep the registries of the names in the lists they are in up to date when they are
+    renamed, update cached paths when they are renamed or moved, and mark the component they are in as changed
+    when any of their attributes are set. Subclasses must have a _name_registries list.
+    """
+
+    name: str
+
+    def __setattr__(self, key: str, value: Any):
+        old_value = self.__dict__.get(key, _MISSING)
+        if key == "name":
+            for registry in getattr(self, "_name_registries", ()):
+                registry.rename(self.name, value)
+        elif key == "parent_node":
+            # The paths of the nodes in the tree the item is moved out of, which it may also be moved into
+            invalidate_paths(self)
+        elif key in _OWNED_LISTS and hasattr(value, "owner"):
+            value.owner = self
+        changed = is_versioned_attribute(key) and not is_unchanged(old_value, value)
+        super().__setattr__(key, value)
+        if key == "name" and isinstance(old_value, str) and old_value != value:
+            rename_paths(self, old_value)
+        elif (
+            key in _INDEXED_LISTS
+            and old_value is not _MISSING
+            and old_value is not value
+        ):
+            replace_paths(self)
+        if changed:
+            mark_changed(self)
+
+
+class NamedList(List[T]):
+    """
+    A list of named items which keeps a NameRegistry of the names of its items. Items which have a _name_registries
+    list, such as NamedItems, also keep it up to date when they are renamed. Adding or removing items updates the
+    index of paths the owner of the list is in, and marks the owner as changed.
+    """
+
+    # The group the list holds the children of
+    owner: Any = None
+
+    def __init__(self, items: Iterable[T] = ()):
+        super().__init__(items)
+        self.names = NameRegistry()
+        for item in self:
+            self._register(item)
+
+    def _register(self, item: Any):
+        add_paths(self.owner, item)
+        mark_changed(self.owner)
+        name = getattr(item, "name", None)
+        if name is None or "names" not in self.__dict__:
+            # Items are added before the registry is restored when unpickling, and the registry already has them
+            return
+        self.names.add(name)
+        registries = getattr(item, "_name_registries", None)
+        if registries is not None:
+            registries.append(self.names)
+
+    def _deregister(self, item: Any):
+        remove_paths(self.owner, item)
+        mark_changed(self.owner)
+        name = getattr(item, "name", None)
+        if name is None:
+            return
+        self.names.remove(name)
+        registries: List[NameRegistry] = getattr(item, "_name_registries", None)
+        if registries is not None:
+            for index, registry in enumerate(registries):
+                if registry is self.names:
+                    del registries[index]
+                    break
+
+    def append(self, item: Any):
+        super().append(item)
+        self._register(item)
+
+    def extend(self, items: Iterable[Any]):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._register(item)
+
+    def __iadd__(self, items: Iterable[T]) -> "NamedList[T]":
+        self.extend(items)
+        return self
+
+    def insert(self, index: int, item: Any):
+        super().insert(index, item)
+        self._register(item)
+
+    def remove(self, item: Any):
+        index = self.index(item)
+        del self[index]
+
+    def pop(self, index: int = -1) -> Any:
+        item = super().pop(index)
+        self._deregister(item)
+        return item
+
+    def clear(self):
+        for item in self:
+            self._deregister(item)
+        super().clear()
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            old_items = self[index]
+            value = list(value)
+            super().__setitem__(index, value)
+            new_items = value
+        else:
+            old_items = [self[index]]
+            super().__setitem__(index, value)
+            new_items = [value]
+        for item in old_items:
+            self._deregister(item)
+        for item in new_items:
+            self._register(item)
+
+    def __delitem__(self, index):
+        old_items = self[index] if isinstance(index, slice) else [self[index]]
+        super().__delitem__(index)
+        for item in old_items:
+            self._deregister(item)
+
+
+def as_named_list(items: Iterable[T]) -> NamedList[T]:
+    """
+    :return: The items if they are already in a NamedList, otherwise a NamedList of them.
+    """
+    return items if isinstance(items, NamedList) else NamedList(items)
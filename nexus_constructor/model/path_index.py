@@ -0,0 +1,266 @@
+"""
+Looking up the nodes of the model by their absolute paths, such as the transformations depends_on paths and link
+targets point to, without walking the tree for each path.
+
+Absolute paths are cached until a node in the same tree is renamed or moved, each of which replaces the paths version
+held by the root of the tree, so a change to one model, or to a node outside of any model, doesn't invalidate the paths
+of another. Indexes are kept up to date as nodes are renamed, added and removed, by only updating the paths of the
+nodes under the node which changed.
+"""
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from nexus_constructor.model.versioning import PATHS_VERSION
+
+# The attribute of a group which holds the index of the nodes under it
+_PATH_INDEX = "path_index"
+
+
+def _root(node: Any) -> Any:
+    parent = getattr(node, "parent_node", None)
+    # Only followed while it is a node, rather than None or something standing in for a parent
+    while hasattr(parent, "__dict__"):
+        node, parent = parent, getattr(parent, "parent_node", None)
+    return node
+
+
+def invalidate_paths(node: Any):
+    """
+    Called whenever a change to the tree a node is in may change the path of any node in it, such as before the node
+    is moved.
+    """
+    _root(node).__dict__[PATHS_VERSION] = object()
+
+
+def paths_version(node: Any) -> object:
+    """
+    :return: An object which is replaced whenever the paths in the tree the node is in are invalidated, so is only the
+    same object while no paths in it have changed.
+    """
+    root_dict = _root(node).__dict__
+    version = root_dict.get(PATHS_VERSION)
+    if version is None:
+        version = root_dict[PATHS_VERSION] = object()
+    return version
+
+
+def rename_paths(node: Any, old_name: str):
+    """
+    Called when a node has been renamed. Invalidates the paths in the tree the node is in, and updates the index it is
+    in with the paths of the nodes under it.
+    """
+    invalidate_paths(node)
+    index = _index_of(getattr(node, "parent_node", None))
+    if index is not None:
+        index._rename(node, old_name)
+
+
+def add_paths(group: Any, node: Any):
+    """
+    Called when a node has been added to the children or component list of a group.
+    """
+    index = _index_of(group)
+    if index is not None:
+        index._add_child(group, node)
+
+
+def remove_paths(group: Any, node: Any):
+    """
+    Called when a node has been removed from the children or component list of a group.
+    """
+    index = _index_of(group)
+    if index is not None:
+        index._remove_child(group, node)
+
+
+def replace_paths(group: Any):
+    """
+    Called when the children or component list of a group have been replaced.
+    """
+    index = _index_of(group)
+    if index is not None:
+        index._replace(group)
+
+
+def _index_of(group: Any) -> Optional["PathIndex"]:
+    """
+    :return: The index of the nodes under the group, or under a group above it, if the index has been built.
+    """
+    while group is not None:
+        index = getattr(group, "__dict__", {}).get(_PATH_INDEX)
+        if isinstance(index, PathIndex):
+            return index if index._is_built() else None
+        group = getattr(group, "parent_node", None)
+    return None
+
+
+def join_path(base: str, path: str) -> str:
+    """
+    Resolves a path in the same way as HDF5, with "." meaning the current group and ".." its parent.
+    :param base: The absolute path of the group to resolve relative paths from.
+    :param path: An absolute path, or a path relative to the base.
+    :return: The normalised absolute path.
+    """
+    parts = (
+        path.split("/") if path.startswith("/") else base.split("/") + path.split("/")
+    )
+    resolved: List[str] = []
+    for part in parts:
+        if part in ("", "."):
+            continue
+        if part == "..":
+            if resolved:
+                resolved.pop()
+            continue
+        resolved.append(part)
+    return "/" + "/".join(resolved)
+
+
+class PathIndex:
+    def __init__(self, root: Any):
+        """
+        The nodes under a group, keyed by their absolute paths. The index is built the first time it is used, so a
+        bulk change such as loading a file only builds it once, and is then updated as nodes under the group are
+        renamed, added and removed.
+        :param root: The group to index, together with its children and its component list, if it has one.
+        """
+        self._root = root
+        self._nodes: Dict[str, Any] = {}
+        # The paths of the nodes directly under each path, for removing the paths under a node
+        self._child_paths: Dict[str, Set[str]] = {}
+        # The path of the root when the index was built, as the index is built again once it changes
+        self._root_path: Optional[str] = None
+
+    def _is_built(self) -> bool:
+        return (
+            self._root_path is not None and self._root_path == self._root.absolute_path
+        )
+
+    def _update(self):
+        if self._is_built():
+            return
+        self._nodes = {}
+        self._child_paths = {}
+        self._root_path = self._root.absolute_path
+        self._add(self._root, self._root_path)
+
+    def _add(self, node: Any, path: str):
+        """
+        Adds a node and the nodes under it. Where nodes have the same path, such as while a list is being rearranged,
+        the one already in the index, or else the first, is kept.
+        """
+        stack = [(node, path)]
+        while stack:
+            node, path = stack.pop()
+            if path in self._nodes:
+                continue
+            self._nodes[path] = node
+            self._child_paths[path] = set()
+            self._child_paths.setdefault(_parent_path(path), set()).add(path)
+            for child in reversed(_child_nodes(node)):
+                name = getattr(child, "name", None)
+                if name is not None:
+                    stack.append((child, f"{path}/{name}"))
+
+    def _remove(self, path: str):
+        """
+        Removes the node at a path and the nodes under it.
+        """
+        self._child_paths.get(_parent_path(path), set()).discard(path)
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            self._nodes.pop(path, None)
+            stack.extend(self._child_paths.pop(path, ()))
+
+    def _path_of(self, group: Any) -> Optional[str]:
+        """
+        :return: The path of a group if it is in the index, otherwise None.
+        """
+        if group is None:
+            return None
+        path = group.absolute_path
+        return path if self._nodes.get(path) is group else None
+
+    def _add_same_named(self, group: Any, group_path: str, name: str, node: Any):
+        """
+        Adds the first child of a group other than the node which has the name, as the node was at its path.
+        """
+        for child in _child_nodes(group):
+            if child is not node and getattr(child, "name", None) == name:
+                self._add(child, f"{group_path}/{name}")
+                return
+
+    def _rename(self, node: Any, old_name: str):
+        parent = node.parent_node
+        parent_path = self._path_of(parent)
+        if parent_path is None:
+            return
+        old_path = f"{parent_path}/{old_name}"
+        if self._nodes.get(old_path) is not node:
+            # Not in the index, so neither are the nodes under it
+            return
+        self._remove(old_path)
+        self._add_same_named(parent, parent_path, old_name, node)
+        self._add(node, f"{parent_path}/{node.name}")
+
+    def _add_child(self, group: Any, node: Any):
+        name = getattr(node, "name", None)
+        group_path = self._path_of(group)
+        if name is not None and group_path is not None:
+            self._add(node, f"{group_path}/{name}")
+
+    def _remove_child(self, group: Any, node: Any):
+        name = getattr(node, "name", None)
+        group_path = self._path_of(group)
+        if name is None or group_path is None:
+            return
+        path = f"{group_path}/{name}"
+        if self._nodes.get(path) is node:
+            self._remove(path)
+            self._add_same_named(group, group_path, name, node)
+
+    def _replace(self, group: Any):
+        path = self._path_of(group)
+        if path is not None:
+            self._remove(path)
+            self._add(group, path)
+
+    def __contains__(self, path: str) -> bool:
+        self._update()
+        return path in self._nodes
+
+    def __len__(self) -> int:
+        self._update()
+        return len(self._nodes)
+
+    def get(self, path: str) -> Optional[Any]:
+        """
+        :param path: An absolute path.
+        :return: The node at the path, or None if there isn't one.
+        """
+        self._update()
+        return self._nodes.get(path)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        self._update()
+        return iter(list(self._nodes.items()))
+
+    def resolve(self, path: str, relative_to: Any = None) -> Optional[Any]:
+        """
+        :param path: An absolute path, or a path relative to a group.
+        :param relative_to: The group relative paths start from. Defaults to the root of the index.
+        :return: The node at the path, or None if there isn't one.
+        """
+        base = self._root if relative_to is None else relative_to
+        return self.get(join_path(base.absolute_path, path))
+
+
+def _parent_path(path: str) -> str:
+    return path[: path.rindex("/")]
+
+
+def _child_nodes(node: Any) -> List[Any]:
+    children = list(getattr(node, "children", None) or ())
+    # Components are held in the instrument's component list rather than its children
+    children.extend(getattr(node, "component_list", None) or ())
+    return children
@@ -0,0 +1,111 @@
+"""
+Sharing the shapes of components which are the same, such as the identical pixels or tubes of many detector banks.
+
+The arrays of a shape which is the same as one already in the pool are replaced by the arrays of that shape, so that
+identical shapes only hold one copy of their vertices and faces. Shapes are identified by their content hashes, so
+only shapes with exactly the same contents are shared. Shared arrays are made read-only, as changing one in place
+would change every shape using it.
+
+On export, the shape of a component which is the same as the shape of a component before it can be written as a link
+to that shape, rather than writing out its arrays again.
+"""
+from typing import Any, Dict, List, Tuple
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+from nexus_constructor.common_attrs import (
+    PIXEL_SHAPE_GROUP_NAME,
+    SHAPE_GROUP_NAME,
+    CommonKeys,
+    NodeType,
+)
+from nexus_constructor.model.content_hash import content_hash
+from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.link import TARGET
+
+SHAPE_GROUP_NAMES = (SHAPE_GROUP_NAME, PIXEL_SHAPE_GROUP_NAME)
+
+# The first shape added with each content hash, for as long as it exists
+_shapes: "WeakValueDictionary[bytes, Group]" = WeakValueDictionary()
+
+
+def intern_shape(shape: Group) -> Group:
+    """
+    Makes the datasets of a shape share the values of an identical shape already in the pool, or adds the shape to the
+    pool if there isn't one.
+    :param shape: A shape group which has been created but not yet added to a component.
+    :return: The shape.
+    """
+    key = content_hash(shape)
+    pooled_shape = _shapes.get(key)
+    # The pooled shape may have been changed since it was added, after which it is replaced
+    if pooled_shape is None or content_hash(pooled_shape) != key:
+        _shapes[key] = shape
+        return shape
+    if pooled_shape is shape:
+        return shape
+    for child in shape.children:
+        if not isinstance(child, Dataset):
+            continue
+        pooled_child = pooled_shape[child.name]
+        if not isinstance(pooled_child, Dataset):
+            continue
+        values = pooled_child.values
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+        # The values are equal to the ones they replace, so the version and content hash of the shape are unchanged
+        object.__setattr__(child, "values", values)
+    return shape
+
+
+def pooled_shape_count() -> int:
+    """
+    :return: The number of distinct shapes in the pool.
+    """
+    return len(_shapes)
+
+
+def link_identical_shapes(dictionary: Dict[str, Any], shapes: Dict[str, Any]) -> int:
+    """
+    Replaces each shape in an exported model which is the same as a shape before it with a link to that shape.
+    :param dictionary: The model in the file-writer JSON format, in which the lists of children of the groups containing
+    the shapes must not be shared with anything else.
+    :param shapes: The shape groups in the model, keyed by their paths in the exported model.
+    :return: The number of shapes replaced by links.
+    """
+    # Shapes are only linked to shapes with the same name, so a pixel shape is never replaced by a link to a shape
+    first_shape_paths: Dict[Tuple[str, bytes], str] = {}
+    linked = 0
+    # Walked in the order the groups are written, so that links always point to a shape written before them
+    stack: List[Any] = [(dictionary, "")]
+    while stack:
+        node, path = stack.pop()
+        children = node.get(CommonKeys.CHILDREN) or []
+        child_groups = []
+        for index, child in enumerate(children):
+            if not isinstance(child, dict) or CommonKeys.NAME not in child:
+                continue
+            child_path = f"{path}/{child[CommonKeys.NAME]}"
+            shape = (
+                shapes.get(child_path)
+                if child[CommonKeys.NAME] in SHAPE_GROUP_NAMES
+                else None
+            )
+            if shape is None:
+                if child.get(CommonKeys.TYPE) == NodeType.GROUP:
+                    child_groups.append((child, child_path))
+                continue
+            key = (child[CommonKeys.NAME], content_hash(shape))
+            if key not in first_shape_paths:
+                first_shape_paths[key] = child_path
+                continue
+            children[index] = {
+                CommonKeys.NAME: child[CommonKeys.NAME],
+                CommonKeys.TYPE: NodeType.LINK,
+                TARGET: first_shape_paths[key],
+            }
+            linked += 1
+        stack.extend(reversed(child_groups))
+    return linked
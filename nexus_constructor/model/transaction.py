@@ -0,0 +1,132 @@
+"""
+Grouping many changes to a model, such as the changes made by a script, so that the views are updated once for all of
+them rather than once for each.
+
+While a transaction is open the model's signals are blocked. When it ends, the components which were added, removed
+or changed are found by comparing the component list and the versions of the components with how they were when it
+started, and are emitted as one change set. The path index is already only rebuilt when it is next used, so it is
+rebuilt at most once after the transaction rather than after each change.
+
+A copy of the entry is kept while the transaction is open so that, if an exception is raised, the model can be put
+back how it was. Arrays are shared with the copy rather than copied, as they are replaced rather than changed in place.
+"""
+import io
+import pickle
+from typing import Any, List, Tuple
+
+import attr
+import numpy as np
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.versioning import VERSION
+
+# Attributes of a component which hold the state of the views rather than being part of the model, which are not kept
+# in the copy as the views are created again after a rollback
+VIEW_STATE_ATTRIBUTES = ("component_info", "stored_transforms")
+_VIEW_STATE = "view state"
+
+
+@attr.s(frozen=True)
+class ChangeSet:
+    """
+    The changes made to the components of a model during a transaction.
+    """
+
+    added = attr.ib(factory=list, type=List[Component])
+    # The names of the components which were removed, as they were before the transaction
+    removed = attr.ib(factory=list, type=List[str])
+    # Components which were there before and after, but were changed
+    changed = attr.ib(factory=list, type=List[Component])
+    # The names of the changed components before the transaction, as they may have been renamed
+    previous_names = attr.ib(factory=list, type=List[str])
+    # Whether the entry was replaced, in which case everything showing the model must be created again
+    entry_replaced = attr.ib(default=False, type=bool)
+    # Whether the replaced entry only differs from the one before in the components above, such as after an undo, so
+    # that what is saved of the model can be updated with just them
+    only_components_changed = attr.ib(default=False, type=bool)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed or self.entry_replaced)
+
+
+ComponentState = Tuple[Component, str, int]
+
+
+def component_states(components: List[Component]) -> List[ComponentState]:
+    """
+    :return: Each component with its name and version, to find what changes later with find_changes.
+    """
+    return [
+        (component, component.name, component.__dict__.get(VERSION, 0))
+        for component in components
+    ]
+
+
+def find_changes(
+    states: List[ComponentState], components: List[Component]
+) -> ChangeSet:
+    """
+    :param states: The states of the components before the changes, from component_states.
+    :param components: The components after the changes.
+    :return: The components which were added, removed or changed.
+    """
+    # Components are compared by identity, as they aren't hashable
+    previous = {id(component): (name, version) for component, name, version in states}
+    current_ids = {id(component) for component in components}
+    changes = ChangeSet(
+        removed=[
+            name for component, name, _ in states if id(component) not in current_ids
+        ]
+    )
+    for component in components:
+        state = previous.get(id(component))
+        if state is None:
+            changes.added.append(component)
+        elif state != (component.name, component.__dict__.get(VERSION, 0)):
+            changes.changed.append(component)
+            changes.previous_names.append(state[0])
+    return changes
+
+
+def copy_entry(entry: Entry) -> Tuple[bytes, List[Any]]:
+    """
+    Copies an entry, sharing its arrays with the copy rather than copying them.
+    :return: The entry, without its arrays, and the arrays, to create it again with restore_entry.
+    """
+    view_state_ids = {
+        id(getattr(component, attribute))
+        for component in entry.instrument.component_list
+        for attribute in VIEW_STATE_ATTRIBUTES
+        if getattr(component, attribute) is not None
+    }
+    shared: List[Any] = []
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj: Any) -> Any:
+            if isinstance(obj, np.ndarray):
+                shared.append(obj)
+                return len(shared) - 1
+            if id(obj) in view_state_ids:
+                return _VIEW_STATE
+            return None
+
+    file = io.BytesIO()
+    _Pickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump(entry)
+    return file.getvalue(), shared
+
+
+def restore_entry(copy: Tuple[bytes, List[Any]]) -> Entry:
+    """
+    :param copy: An entry copied with copy_entry.
+    :return: A new entry the same as the one which was copied, when it was copied.
+    """
+    data, shared = copy
+
+    class _Unpickler(pickle.Unpickler):
+        def persistent_load(self, pid: Any) -> Any:
+            if pid == _VIEW_STATE:
+                return None
+            return shared[pid]
+
+    return _Unpickler(io.BytesIO(data)).load()
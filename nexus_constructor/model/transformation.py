@@ -2,8 +2,6 @@ from typing import TYPE_CHECKING, Any, Dict, List, Union
 
 import attr
 import numpy as np
-from PySide2.Qt3DCore import Qt3DCore
-from PySide2.QtGui import QMatrix4x4, QVector3D
 
 from nexus_constructor.common_attrs import (
     CommonAttrs,
@@ -11,6 +9,13 @@ from nexus_constructor.common_attrs import (
     NodeType,
     TransformationType,
 )
+from nexus_constructor.geometry.vector_math import (
+    VectorLike,
+    normalise,
+    rotation_matrix,
+    to_vector,
+    translation_matrix,
+)
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.value_type import ValueTypes
 
@@ -43,16 +48,13 @@ class Transformation(Dataset):
         self.attributes.set_attribute_value(CommonAttrs.TRANSFORMATION_TYPE, new_type)
 
     @property
-    def vector(self) -> QVector3D:
+    def vector(self) -> np.ndarray:
         vector = self.attributes.get_attribute_value(CommonAttrs.VECTOR)
-        return (
-            QVector3D(vector[0], vector[1], vector[2]) if vector is not None else None
-        )
+        return to_vector(vector) if vector is not None else None
 
     @vector.setter
-    def vector(self, new_vector: QVector3D):
-        vector_as_np_array = np.array([new_vector.x(), new_vector.y(), new_vector.z()])
-        self.attributes.set_attribute_value(CommonAttrs.VECTOR, vector_as_np_array)
+    def vector(self, new_vector: VectorLike):
+        self.attributes.set_attribute_value(CommonAttrs.VECTOR, to_vector(new_vector))
 
     @property
     def ui_value(self) -> float:
@@ -87,25 +89,22 @@ class Transformation(Dataset):
             self._ui_value = 0.0
 
     @property
-    def qmatrix(self) -> QMatrix4x4:
+    def matrix(self) -> np.ndarray:
         """
-        Get a Qt3DCore.QTransform describing the transformation
+        Get a 4x4 matrix describing the transformation
         for use in the 3D view
         """
-        transform = Qt3DCore.QTransform()
-        transform.matrix()
         if self.transform_type == TransformationType.ROTATION:
             # Changing sign of angle so that it describes a passive transformation
-            quaternion = transform.fromAxisAndAngle(self.vector, -1 * self.ui_value)
-            transform.setRotation(quaternion)
+            return rotation_matrix(self.vector, -1 * self.ui_value)
         elif self.transform_type == TransformationType.TRANSLATION:
             # Changing sign of distance so that it describes a passive transformation
-            transform.setTranslation(self.vector.normalized() * -1 * self.ui_value)
+            unit_vector, _ = normalise(self.vector)
+            return translation_matrix(unit_vector * -1 * self.ui_value)
         else:
             raise (
                 RuntimeError(f'Unknown transformation of type "{self.transform_type}".')
             )
-        return transform.matrix()
 
     @property
     def units(self):
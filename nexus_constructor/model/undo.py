@@ -0,0 +1,520 @@
+"""
+Undoing and redoing changes to a model.
+
+The history holds a snapshot of the model after each change. Each component is pickled on its own together with its
+transformations, with the components, transformations and groups outside of it which it refers to replaced by keys,
+and with its arrays shared with the model rather than copied. A component which hasn't changed since the last snapshot
+isn't pickled again, its snapshot is shared with the snapshots before, so taking a snapshot costs time and memory in
+proportion to what has changed. The groups above the components are pickled with each snapshot, with the components
+replaced by keys.
+
+Restoring a snapshot creates a new entry, so components from before an undo or redo are no longer part of the model.
+The caches of a restored component, such as its JSON, are taken from the component it replaces if that is still at the
+version in the snapshot, and the components which differ are emitted with the new entry so that the autosave only
+saves them. The history keeps as many of the most recent snapshots as fit within its memory limit.
+"""
+import io
+import itertools
+import pickle
+import weakref
+from typing import Any, Dict, FrozenSet, List, Set, Tuple
+
+import attr
+import numpy as np
+from PySide2.QtCore import QObject, Signal
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.group import TRANSFORMS_GROUP_NAME
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.name_registry import NamedList
+from nexus_constructor.model.path_index import PathIndex
+from nexus_constructor.model.transaction import VIEW_STATE_ATTRIBUTES, ChangeSet
+from nexus_constructor.model.transformation import Transformation
+from nexus_constructor.model.versioning import (
+    CACHE_SUFFIX,
+    PATHS_VERSION,
+    SNAPSHOT_KEY,
+    VERSION,
+)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_keys = itertools.count()
+
+_NODE = "node"
+_PATH_INDEX = "path index"
+# Built again from the restored components, so that the registry of their names is the one the components update
+_COMPONENT_LIST = "component_list"
+
+
+@attr.s(frozen=True, eq=False)
+class ComponentSnapshot:
+    """
+    A component and its transformations, as they were at one version of the component.
+    """
+
+    key = attr.ib(type=int)
+    version = attr.ib(type=int)
+    # The classes of the component and its transformations, keyed by their keys
+    classes = attr.ib(type=Dict[int, type])
+    # The attributes of the component and its transformations, keyed by their keys
+    payload = attr.ib(type=bytes)
+    arrays = attr.ib(type=List[np.ndarray])
+    # The keys of the nodes outside of the component which it refers to
+    references = attr.ib(type=FrozenSet[int])
+
+
+@attr.s(frozen=True, eq=False)
+class ModelSnapshot:
+    entry_key = attr.ib(type=int)
+    # The classes of the groups above the components, keyed by their keys
+    classes = attr.ib(type=Dict[int, type])
+    # The attributes of the groups above the components, keyed by their keys
+    payload = attr.ib(type=bytes)
+    arrays = attr.ib(type=List[np.ndarray])
+    components = attr.ib(type=List[ComponentSnapshot])
+
+    def parts(self) -> List[Any]:
+        """
+        :return: What the snapshot holds, which may be shared with other snapshots.
+        """
+        return [self.payload, *self.arrays, *self.components] + [
+            array for component in self.components for array in component.arrays
+        ]
+
+    def is_same_as(self, other: "ModelSnapshot") -> bool:
+        return (
+            self.payload == other.payload
+            and len(self.components) == len(other.components)
+            and all(
+                component is other_component
+                for component, other_component in zip(self.components, other.components)
+            )
+            and _same_arrays(self.arrays, other.arrays)
+        )
+
+
+def _same_arrays(arrays: List[np.ndarray], other_arrays: List[np.ndarray]) -> bool:
+    return len(arrays) == len(other_arrays) and all(
+        array is other_array for array, other_array in zip(arrays, other_arrays)
+    )
+
+
+def _size(part: Any) -> int:
+    if isinstance(part, bytes):
+        return len(part)
+    if isinstance(part, np.ndarray):
+        return part.nbytes
+    return len(part.payload)
+
+
+def _key(node: Any) -> int:
+    node_dict = node.__dict__
+    if SNAPSHOT_KEY not in node_dict:
+        node_dict[SNAPSHOT_KEY] = next(_keys)
+    return node_dict[SNAPSHOT_KEY]
+
+
+def _owned_transformations(component: Component) -> List[Transformation]:
+    transforms_group = component[TRANSFORMS_GROUP_NAME]
+    if transforms_group is None:
+        return []
+    return [
+        child
+        for child in transforms_group.children
+        if isinstance(child, Transformation)
+    ]
+
+
+def _state(node: Any) -> Dict[str, Any]:
+    """
+    :return: The attributes of a node, without the state of the views and with caches emptied.
+    """
+    state = {
+        key: None if key.endswith(CACHE_SUFFIX) else value
+        for key, value in node.__dict__.items()
+        # A tree's paths version is created again when it is next needed
+        if key not in VIEW_STATE_ATTRIBUTES and key != PATHS_VERSION
+    }
+    if isinstance(node, Component):
+        state["_name_registries"] = []
+    elif isinstance(node, Instrument):
+        del state[_COMPONENT_LIST]
+    if isinstance(node, Transformation):
+        # Dependents are registered again from the depends_on of each node when a snapshot is restored, so that
+        # a snapshot of a component doesn't change when something comes to depend on it
+        state["_dependents"] = []
+    return state
+
+
+def _copy_caches(node: Any, restored_node: Any):
+    for key, value in node.__dict__.items():
+        if key.endswith(CACHE_SUFFIX):
+            restored_node.__dict__[key] = value
+
+
+def _copy_component_caches(component: Component, restored_component: Component):
+    _copy_caches(component, restored_component)
+    restored_transformations = {
+        _key(transformation): transformation
+        for transformation in _owned_transformations(restored_component)
+    }
+    for transformation in _owned_transformations(component):
+        restored_transformation = restored_transformations.get(_key(transformation))
+        if restored_transformation is not None:
+            _copy_caches(transformation, restored_transformation)
+
+
+def _is_at_snapshot(
+    component: Component,
+    component_snapshot: ComponentSnapshot,
+    component_snapshots: Dict[int, Tuple[Any, ComponentSnapshot]],
+) -> bool:
+    """
+    :return: Whether a component is the one a snapshot was taken of, and hasn't changed since.
+    """
+    cached = component_snapshots.get(component_snapshot.key)
+    return (
+        cached is not None
+        and cached[0]() is component
+        and cached[1] is component_snapshot
+        and component.__dict__.get(VERSION, 0) == component_snapshot.version
+    )
+
+
+def _dumps(
+    obj: Any, keys_by_id: Dict[int, int]
+) -> Tuple[bytes, List[np.ndarray], Set[int]]:
+    """
+    Pickles an object, with the nodes which have keys replaced by them and arrays left out.
+    :return: The pickled object, its arrays and the keys of the nodes it refers to.
+    """
+    arrays: List[np.ndarray] = []
+    references: Set[int] = set()
+
+    class _Pickler(pickle.Pickler):
+        def persistent_id(self, obj: Any) -> Any:
+            if isinstance(obj, np.ndarray):
+                arrays.append(obj)
+                return len(arrays) - 1
+            if isinstance(obj, PathIndex):
+                # Built again from the nodes when it is next used
+                return _PATH_INDEX, keys_by_id[id(obj._root)]
+            key = keys_by_id.get(id(obj))
+            if key is not None:
+                references.add(key)
+                return _NODE, key
+            return None
+
+    file = io.BytesIO()
+    _Pickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return file.getvalue(), arrays, references
+
+
+def _loads(data: bytes, arrays: List[np.ndarray], nodes: Dict[int, Any]) -> Any:
+    class _Unpickler(pickle.Unpickler):
+        def persistent_load(self, pid: Any) -> Any:
+            if isinstance(pid, int):
+                return arrays[pid]
+            kind, key = pid
+            if kind == _PATH_INDEX:
+                return PathIndex(nodes[key])
+            return nodes[key]
+
+    return _Unpickler(io.BytesIO(data)).load()
+
+
+class UndoSignals(QObject):
+    # Emitted when whether there is anything to undo or redo may have changed
+    history_changed = Signal()
+
+
+class UndoHistory:
+    def __init__(self, model: Model, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        The snapshots of a model to undo and redo changes with. A snapshot is recorded whenever the model's signals
+        say it has changed, and can be recorded after other changes with record.
+        :param model: The model, whose current state is the first snapshot.
+        :param max_bytes: The most memory the snapshots can take up, beyond which the oldest are forgotten. The
+        snapshot the model is at is always kept.
+        """
+        self.model = model
+        self.max_bytes = max_bytes
+        self._undo_snapshots: List[ModelSnapshot] = []
+        self._redo_snapshots: List[ModelSnapshot] = []
+        # The latest snapshot of each component, keyed by the component's key
+        self._component_snapshots: Dict[int, Tuple[Any, ComponentSnapshot]] = {}
+        # How many of the snapshots hold each part, keyed by the part's id, and the part
+        self._part_counts: Dict[int, Tuple[int, Any]] = {}
+        self._bytes = 0
+        self._restoring = False
+        self._current = self._take_snapshot()
+        self._hold(self._current)
+        self.signals = UndoSignals()
+
+        signals = model.signals
+        signals.component_added.connect(self.record)
+        signals.components_added.connect(self.record)
+        signals.component_removed.connect(self.record)
+        signals.transformation_changed.connect(self.record)
+        signals.changes_committed.connect(self.record)
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo_snapshots)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo_snapshots)
+
+    @property
+    def memory_used(self) -> int:
+        """
+        :return: The number of bytes the snapshots take up, counting the parts shared between them once.
+        """
+        return self._bytes
+
+    def record(self, *args: Any) -> bool:
+        """
+        Records the model as it is now, after a change, as the snapshot to undo back to. Redoing isn't possible after
+        recording a change.
+        :param args: Ignored, so that the history can be connected to any of the model's signals.
+        :return: Whether the model had changed since the last snapshot.
+        """
+        if self._restoring or self.model.in_transaction:
+            return False
+        snapshot = self._take_snapshot()
+        if snapshot.is_same_as(self._current):
+            return False
+        self._hold(snapshot)
+        self._undo_snapshots.append(self._current)
+        self._current = snapshot
+        for redo_snapshot in self._redo_snapshots:
+            self._release(redo_snapshot)
+        self._redo_snapshots.clear()
+        while self._bytes > self.max_bytes and self._undo_snapshots:
+            self._release(self._undo_snapshots.pop(0))
+        self.signals.history_changed.emit()
+        return True
+
+    def clear(self):
+        """
+        Forgets the snapshots, such as when a file is opened, leaving the model as it is now as the first snapshot.
+        """
+        for snapshot in self._undo_snapshots + self._redo_snapshots:
+            self._release(snapshot)
+        self._undo_snapshots.clear()
+        self._redo_snapshots.clear()
+        self._release(self._current)
+        self._current = self._take_snapshot()
+        self._hold(self._current)
+        self.signals.history_changed.emit()
+
+    def undo(self) -> bool:
+        """
+        Puts the model back to the snapshot before the current one.
+        :return: Whether there was a snapshot to undo back to.
+        """
+        if not self._undo_snapshots:
+            return False
+        self._redo_snapshots.append(self._current)
+        self._current = self._undo_snapshots.pop()
+        self._restore(self._current, self._redo_snapshots[-1])
+        self.signals.history_changed.emit()
+        return True
+
+    def redo(self) -> bool:
+        """
+        Puts the model forward to the snapshot which was last undone.
+        :return: Whether there was a snapshot to redo.
+        """
+        if not self._redo_snapshots:
+            return False
+        self._undo_snapshots.append(self._current)
+        self._current = self._redo_snapshots.pop()
+        self._restore(self._current, self._undo_snapshots[-1])
+        self.signals.history_changed.emit()
+        return True
+
+    def _hold(self, snapshot: ModelSnapshot):
+        for part in snapshot.parts():
+            count, _ = self._part_counts.get(id(part), (0, part))
+            if not count:
+                self._bytes += _size(part)
+            self._part_counts[id(part)] = (count + 1, part)
+
+    def _release(self, snapshot: ModelSnapshot):
+        for part in snapshot.parts():
+            count, _ = self._part_counts.pop(id(part))
+            if count > 1:
+                self._part_counts[id(part)] = (count - 1, part)
+            else:
+                self._bytes -= _size(part)
+
+    def _take_snapshot(self) -> ModelSnapshot:
+        entry = self.model.entry
+        components = list(entry.instrument.component_list)
+        keys_by_id: Dict[int, int] = {}
+        nodes_by_key: Dict[int, Any] = {}
+        keys_reassigned = False
+
+        def add_node(node: Any):
+            nonlocal keys_reassigned
+            if id(node) in keys_by_id:
+                return
+            key = _key(node)
+            if key in nodes_by_key:
+                # A copy of a node, made by pickling it, which has the key of the original
+                key = node.__dict__[SNAPSHOT_KEY] = next(_keys)
+                keys_reassigned = True
+            keys_by_id[id(node)] = key
+            nodes_by_key[key] = node
+
+        ancestors: List[Any] = []
+        for component in components:
+            add_node(component)
+            for transformation in _owned_transformations(component):
+                add_node(transformation)
+            parent = component.parent_node
+            while parent is not None and id(parent) not in keys_by_id:
+                add_node(parent)
+                ancestors.append(parent)
+                parent = parent.parent_node
+        if id(entry) not in keys_by_id:
+            add_node(entry)
+            ancestors.append(entry)
+
+        if keys_reassigned:
+            # Snapshots of components from before may refer to the nodes by their old keys
+            self._component_snapshots.clear()
+        component_snapshots = [
+            self._snapshot_component(component, keys_by_id, nodes_by_key)
+            for component in components
+        ]
+        self._component_snapshots = {
+            snapshot.key: self._component_snapshots[snapshot.key]
+            for snapshot in component_snapshots
+        }
+
+        payload, arrays, _ = _dumps(
+            {keys_by_id[id(node)]: _state(node) for node in ancestors}, keys_by_id
+        )
+        return ModelSnapshot(
+            entry_key=keys_by_id[id(entry)],
+            classes={keys_by_id[id(node)]: type(node) for node in ancestors},
+            payload=payload,
+            arrays=arrays,
+            components=component_snapshots,
+        )
+
+    def _snapshot_component(
+        self,
+        component: Component,
+        keys_by_id: Dict[int, int],
+        nodes_by_key: Dict[int, Any],
+    ) -> ComponentSnapshot:
+        key = keys_by_id[id(component)]
+        version = component.__dict__.get(VERSION, 0)
+        cached = self._component_snapshots.get(key)
+        if cached is not None:
+            component_ref, snapshot = cached
+            if (
+                component_ref() is component
+                and snapshot.version == version
+                and snapshot.references.issubset(nodes_by_key)
+            ):
+                return snapshot
+
+        nodes = [component, *_owned_transformations(component)]
+        own_keys = {keys_by_id[id(node)] for node in nodes}
+        payload, arrays, references = _dumps(
+            {keys_by_id[id(node)]: _state(node) for node in nodes}, keys_by_id
+        )
+        snapshot = ComponentSnapshot(
+            key=key,
+            version=version,
+            classes={keys_by_id[id(node)]: type(node) for node in nodes},
+            payload=payload,
+            arrays=arrays,
+            references=frozenset(references - own_keys),
+        )
+        self._component_snapshots[key] = (weakref.ref(component), snapshot)
+        return snapshot
+
+    def _restore(self, snapshot: ModelSnapshot, previous_snapshot: ModelSnapshot):
+        nodes: Dict[int, Any] = {}
+        for key, node_class in snapshot.classes.items():
+            nodes[key] = object.__new__(node_class)
+        for component_snapshot in snapshot.components:
+            for key, node_class in component_snapshot.classes.items():
+                nodes[key] = object.__new__(node_class)
+        # Every node is created before any are filled in, as they refer to each other
+        for key, state in _loads(snapshot.payload, snapshot.arrays, nodes).items():
+            nodes[key].__dict__.update(state)
+        for component_snapshot in snapshot.components:
+            for key, state in _loads(
+                component_snapshot.payload, component_snapshot.arrays, nodes
+            ).items():
+                nodes[key].__dict__.update(state)
+
+        changes = ChangeSet(
+            entry_replaced=True,
+            only_components_changed=snapshot.payload == previous_snapshot.payload
+            and _same_arrays(snapshot.arrays, previous_snapshot.arrays),
+        )
+        previous_components = list(self.model.entry.instrument.component_list)
+        previous_by_key = {
+            component.__dict__.get(SNAPSHOT_KEY): component
+            for component in previous_components
+        }
+        kept_ids: Set[int] = set()
+        previous_snapshots = self._component_snapshots
+        self._component_snapshots = {}
+        for component_snapshot in snapshot.components:
+            component = nodes[component_snapshot.key]
+            previous_component = previous_by_key.get(component_snapshot.key)
+            if previous_component is None:
+                changes.added.append(component)
+            else:
+                kept_ids.add(id(previous_component))
+                if _is_at_snapshot(
+                    previous_component, component_snapshot, previous_snapshots
+                ):
+                    _copy_component_caches(previous_component, component)
+                else:
+                    changes.changed.append(component)
+                    changes.previous_names.append(previous_component.name)
+            if component.depends_on is not None:
+                component.depends_on.register_dependent(component)
+            for transformation in _owned_transformations(component):
+                if transformation.depends_on is not None:
+                    transformation.depends_on.register_dependent(transformation)
+            self._component_snapshots[component_snapshot.key] = (
+                weakref.ref(component),
+                component_snapshot,
+            )
+
+        changes.removed.extend(
+            component.name
+            for component in previous_components
+            if id(component) not in kept_ids
+        )
+
+        entry: Entry = nodes[snapshot.entry_key]
+        component_list = NamedList(
+            nodes[component_snapshot.key] for component_snapshot in snapshot.components
+        )
+        component_list.owner = entry.instrument
+        entry.instrument.__dict__[_COMPONENT_LIST] = component_list
+        self._restoring = True
+        try:
+            self.model.entry = entry
+            self.model.signals.changes_committed.emit(changes)
+            if changes.only_components_changed:
+                # As after a transaction, as components which didn't change may depend on the transformations of
+                # those which did
+                self.model.signals.transformation_changed.emit()
+        finally:
+            self._restoring = False
@@ -0,0 +1,72 @@
+"""
+Tracking which components have changed, so that what is derived from a component, such as its JSON, is only created
+again once it has changed.
+
+Each component has a version which is incremented whenever an attribute of the component, or of a group, dataset or
+link in it, is set, and whenever a child or attribute is added to or removed from one of them. Changes made to the
+contents of a value in place, such as to an element of a numpy array, are not tracked.
+
+Content hashes are cached on each node, so a change also removes the cached hashes of the node and of every group
+above it.
+"""
+from typing import Any
+
+VERSION = "_version"
+# Identifies a node between the snapshots of an undo history
+SNAPSHOT_KEY = "_snapshot_key"
+# Held by the root of a tree of nodes, see path_index.paths_version
+PATHS_VERSION = "_paths_version"
+
+# Attributes which hold what is derived from the model, or the state of its views, rather than being part of it
+UNVERSIONED_ATTRIBUTES = frozenset(
+    [
+        VERSION,
+        SNAPSHOT_KEY,
+        PATHS_VERSION,
+        "_name_registries",
+        "component_info",
+        "stored_transforms",
+    ]
+)
+CACHE_SUFFIX = "_cache"
+CONTENT_HASH_CACHE = "_content_hash_cache"
+
+_SIMPLE_TYPES = (str, int, float, bool)
+
+
+def is_versioned_attribute(key: str) -> bool:
+    return key not in UNVERSIONED_ATTRIBUTES and not key.endswith(CACHE_SUFFIX)
+
+
+def is_unchanged(old_value: Any, new_value: Any) -> bool:
+    """
+    :return: Whether setting an attribute to the new value would leave it as it was. Only simple values are compared,
+    as comparing arrays would cost as much as what the versions avoid.
+    """
+    if old_value is new_value:
+        return True
+    return (
+        type(old_value) is type(new_value)
+        and isinstance(old_value, _SIMPLE_TYPES)
+        and old_value == new_value
+    )
+
+
+def mark_changed(node: Any):
+    """
+    Increments the version of the component containing the node, or of the node itself if it is a component, and
+    removes the content hashes of the node and the groups above it.
+    :param node: A group, dataset or link, or None.
+    """
+    version_incremented = False
+    while node is not None:
+        # The instance dictionary is used rather than getattr so that class defaults, and objects which create
+        # attributes on demand, are not followed
+        node_dict = getattr(node, "__dict__", None)
+        if node_dict is None:
+            return
+        node_dict.pop(CONTENT_HASH_CACHE, None)
+        if not version_incremented and VERSION in node_dict:
+            node_dict[VERSION] += 1
+            version_incremented = True
+        node = node_dict.get("parent_node")
@@ -0,0 +1,170 @@
+"""
+Conversion between the file-writer JSON structure produced by the model and NeXus (HDF5) files.
+
+Writing goes via Model.as_dict so that the NeXus file contains exactly what the File Writer would be sent, minus the
+streams which can only be populated by the File Writer itself. Reading produces a dictionary in the file-writer JSON
+format so that it can be loaded into the model with JSONReader.
+"""
+import logging
+import uuid
+from typing import Any, Dict, List, Union
+
+import h5py
+import numpy as np
+from nexusutils.nexusbuilder import NexusBuilder
+
+from nexus_constructor.common_attrs import CommonKeys, NodeType
+from nexus_constructor.model.link import TARGET
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.value_type import VALUE_TYPE_TO_NP, ValueTypes
+
+NP_KIND_AND_SIZE_TO_VALUE_TYPE = {
+    ("i", 1): ValueTypes.BYTE,
+    ("u", 1): ValueTypes.UBYTE,
+    ("i", 2): ValueTypes.SHORT,
+    ("u", 2): ValueTypes.USHORT,
+    ("i", 4): ValueTypes.INT,
+    ("u", 4): ValueTypes.UINT,
+    ("i", 8): ValueTypes.LONG,
+    ("u", 8): ValueTypes.ULONG,
+    ("f", 4): ValueTypes.FLOAT,
+    ("f", 8): ValueTypes.DOUBLE,
+}
+
+
+def write_nexus_file(model: Model, filename: str, link_shared_shapes: bool = False):
+    """
+    Writes the model to a NeXus file. Any existing file with the same name is overwritten.
+    :param model: The model to write.
+    :param filename: The name of the NeXus file to create.
+    :param link_shared_shapes: Whether to write shapes which are the same as an earlier shape as links to it.
+    """
+    with h5py.File(filename, "w") as nexus_file:
+        for child in model.as_dict(link_shared_shapes)[CommonKeys.CHILDREN]:
+            _write_node(nexus_file, child)
+
+
+def _write_node(parent: h5py.Group, node: Dict[str, Any]):
+    node_type = node.get(CommonKeys.TYPE)
+    if node_type == NodeType.STREAM:
+        # Streams are only populated by the File Writer, there is nothing to write for them offline
+        logging.debug(f"Skipping stream in {parent.name} when writing NeXus file")
+        return
+    name = node[CommonKeys.NAME]
+    if node_type == NodeType.GROUP:
+        group = parent.create_group(name)
+        for child in node.get(CommonKeys.CHILDREN, []):
+            _write_node(group, child)
+        _write_attributes(group, node.get(CommonKeys.ATTRIBUTES, []))
+    elif node_type == NodeType.LINK:
+        parent[name] = h5py.SoftLink(node[TARGET])
+    else:
+        # Datasets, and the depends_on fields which are output with the type of their value
+        dataset_info = node.get(CommonKeys.DATASET, {})
+        dtype = dataset_info.get(CommonKeys.TYPE, node_type)
+        dataset = parent.create_dataset(
+            name, data=_to_numpy(node[CommonKeys.VALUES], dtype)
+        )
+        _write_attributes(dataset, node.get(CommonKeys.ATTRIBUTES, []))
+
+
+def _write_attributes(
+    node: Union[h5py.Group, h5py.Dataset], attributes: List[Dict[str, Any]]
+):
+    for attribute in attributes:
+        dtype = attribute.get(CommonKeys.TYPE, ValueTypes.STRING)
+        node.attrs[attribute[CommonKeys.NAME]] = _to_numpy(
+            attribute[CommonKeys.VALUES], dtype
+        )
+
+
+def _to_numpy(values: Any, dtype: str) -> Any:
+    if dtype != ValueTypes.STRING and dtype in VALUE_TYPE_TO_NP:
+        return np.array(values, dtype=VALUE_TYPE_TO_NP[dtype])
+    if isinstance(values, str):
+        return values
+    # Attributes such as vector are recorded with the default string type, so infer their type from the values
+    array = np.array(values)
+    if array.dtype.kind in "US":
+        return array.astype(h5py.string_dtype())
+    return array
+
+
+def nexus_file_to_json_dict(nexus_file: h5py.File) -> Dict[str, Any]:
+    """
+    Converts the contents of a NeXus file to a dictionary in the file-writer JSON format.
+    :param nexus_file: An open NeXus file.
+    :return: A dictionary which can be loaded with JSONReader.
+    """
+    return {
+        CommonKeys.CHILDREN: [
+            _read_node(nexus_file, name) for name in nexus_file.keys()
+        ]
+    }
+
+
+def _read_node(parent: h5py.Group, name: str) -> Dict[str, Any]:
+    link = parent.get(name, getlink=True)
+    if isinstance(link, h5py.SoftLink):
+        return {
+            CommonKeys.NAME: name,
+            CommonKeys.TYPE: NodeType.LINK,
+            TARGET: link.path,
+        }
+    node = parent[name]
+    if isinstance(node, h5py.Group):
+        return {
+            CommonKeys.NAME: name,
+            CommonKeys.TYPE: NodeType.GROUP,
+            CommonKeys.ATTRIBUTES: _read_attributes(node),
+            CommonKeys.CHILDREN: [_read_node(node, child) for child in node.keys()],
+        }
+    return {
+        CommonKeys.NAME: name,
+        CommonKeys.TYPE: NodeType.DATASET,
+        CommonKeys.DATASET: {
+            CommonKeys.TYPE: _value_type_of(node.dtype),
+            CommonKeys.SIZE: list(node.shape) if node.shape else [1],
+        },
+        CommonKeys.VALUES: _from_numpy(node[()]),
+        CommonKeys.ATTRIBUTES: _read_attributes(node),
+    }
+
+
+def _read_attributes(node: Union[h5py.Group, h5py.Dataset]) -> List[Dict[str, Any]]:
+    return [
+        {CommonKeys.NAME: name, CommonKeys.VALUES: _from_numpy(value)}
+        for name, value in node.attrs.items()
+    ]
+
+
+def _value_type_of(dtype: np.dtype) -> str:
+    return NP_KIND_AND_SIZE_TO_VALUE_TYPE.get(
+        (dtype.kind, dtype.itemsize), ValueTypes.STRING
+    )
+
+
+def _from_numpy(value: Any) -> Any:
+    if isinstance(value, (np.ndarray, np.generic)):
+        value = value.tolist()
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    if isinstance(value, list) and value and not isinstance(value[0], (int, float)):
+        return [_from_numpy(item) for item in value]
+    return value
+
+
+def idf_to_json_dict(filename: str) -> Dict[str, Any]:
+    """
+    Converts a Mantid instrument definition file to a dictionary in the file-writer JSON format.
+    :param filename: The name of the IDF file.
+    :return: A dictionary which can be loaded with JSONReader.
+    """
+    builder = NexusBuilder(
+        str(uuid.uuid4()),
+        idf_file=filename,
+        file_in_memory=True,
+        nx_entry_name="entry",
+    )
+    builder.add_instrument_geometry_from_idf()
+    return nexus_file_to_json_dict(builder.target_file)
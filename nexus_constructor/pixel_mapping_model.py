@@ -0,0 +1,246 @@
+"""
+Editing the pixel ID of each face of a mesh, or of each cylinder.
+
+The IDs are kept in an integer array rather than in a widget per face, so that meshes with tens of thousands of faces
+can be mapped. The table view only draws the rows which are visible, and only creates an editor for the cell being
+edited.
+"""
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from PySide2.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PySide2.QtWidgets import QLineEdit, QStyledItemDelegate
+
+from nexus_constructor.validators import NullableIntValidator
+
+# Stored for faces or cylinders which have not been given a pixel ID
+NO_PIXEL_ID = -1
+
+LABEL_COLUMN = 0
+ID_COLUMN = 1
+
+
+def validate_pixel_ids(pixel_ids: np.ndarray):
+    """
+    :param pixel_ids: Array of pixel IDs, where NO_PIXEL_ID means no ID.
+    :raises ValueError: If any of the IDs are negative, other than NO_PIXEL_ID.
+    """
+    if np.any(pixel_ids < NO_PIXEL_ID):
+        raise ValueError("Pixel IDs must be zero or greater.")
+
+
+def load_pixel_ids(filename: str) -> np.ndarray:
+    """
+    Reads a pixel ID for each face or cylinder from a numpy .npy file or a comma separated text file. The IDs are read
+    in row order, empty fields in a text file and NO_PIXEL_ID mean that the face or cylinder has no ID.
+    :param filename: The file to read.
+    :return: The pixel IDs as a 1D integer array.
+    :raises ValueError: If the file does not contain whole numbers, or any of them are negative.
+    """
+    try:
+        if filename.lower().endswith(".npy"):
+            values = np.asarray(np.load(filename, allow_pickle=False), dtype=float)
+        else:
+            values = _read_comma_separated_values(filename)
+    except (TypeError, ValueError):
+        raise ValueError(f"{filename} does not contain pixel IDs.")
+    values = values.ravel()
+
+    missing = np.isnan(values)
+    present = values[~missing]
+    if np.any(np.isinf(present)) or np.any(present != np.round(present)):
+        raise ValueError(f"{filename} contains pixel IDs which are not whole numbers.")
+    pixel_ids = np.where(missing, NO_PIXEL_ID, values).astype(np.int64)
+    validate_pixel_ids(pixel_ids)
+    return pixel_ids
+
+
+def _read_comma_separated_values(filename: str) -> np.ndarray:
+    """
+    :return: The values in the file in row order, NaN for empty fields. Blank lines are an empty field.
+    """
+    with open(filename) as file:
+        fields = np.array(
+            [
+                field.strip()
+                for line in file.read().splitlines()
+                for field in line.split(",")
+            ]
+        )
+    if len(fields) and fields[-1] == "":
+        # A blank last line is the end of the file rather than a missing ID
+        fields = fields[:-1]
+    values = np.full(len(fields), np.nan)
+    present = fields != ""
+    values[present] = fields[present].astype(float)
+    return values
+
+
+class PixelMappingModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        """
+        A table of the faces or cylinders of a shape, and the pixel ID given to each of them.
+        :param parent: The parent of the model.
+        """
+        super().__init__(parent)
+        self._pixel_ids = np.empty(0, dtype=np.int64)
+        self._text = "face"
+
+    def reset(self, n_items: int, text: str):
+        """
+        Replaces the table with one without any pixel IDs.
+        :param n_items: The number of faces or cylinders.
+        :param text: The name of the items, either "face" or "cylinder".
+        """
+        self.beginResetModel()
+        self._pixel_ids = np.full(n_items, NO_PIXEL_ID, dtype=np.int64)
+        self._text = text
+        self.endResetModel()
+
+    def get_masked_pixel_ids(self) -> np.ma.MaskedArray:
+        """
+        :return: A copy of the pixel ID of each item, masked where there isn't one.
+        """
+        return np.ma.masked_equal(self._pixel_ids, NO_PIXEL_ID)
+
+    def get_pixel_ids(self) -> List[Optional[int]]:
+        """
+        :return: The pixel ID of each item, None where there isn't one.
+        """
+        return np.where(
+            self._pixel_ids == NO_PIXEL_ID, None, self._pixel_ids.astype(object)
+        ).tolist()
+
+    def set_pixel_ids(
+        self, pixel_ids: Union[Sequence[Optional[int]], np.ndarray], first_row: int = 0,
+    ):
+        """
+        Sets the pixel IDs of a range of items.
+        :param pixel_ids: The ID of each item, None, NO_PIXEL_ID or masked to remove its ID. IDs beyond the last item
+        are ignored.
+        :param first_row: The item to give the first ID to.
+        :raises ValueError: If any of the IDs are negative.
+        """
+        if isinstance(pixel_ids, np.ma.MaskedArray):
+            values = pixel_ids.astype(np.int64).filled(NO_PIXEL_ID)
+        elif isinstance(pixel_ids, np.ndarray):
+            values = pixel_ids.astype(np.int64)
+        else:
+            values = np.array(
+                [
+                    NO_PIXEL_ID if pixel_id is None else pixel_id
+                    for pixel_id in pixel_ids
+                ],
+                dtype=np.int64,
+            )
+        validate_pixel_ids(values)
+        values = values[: max(len(self._pixel_ids) - first_row, 0)]
+        if len(values):
+            self._pixel_ids[first_row : first_row + len(values)] = values
+            self._emit_ids_changed(first_row, first_row + len(values) - 1)
+
+    def fill(
+        self,
+        first_id: int,
+        stride: int = 1,
+        first_row: int = 0,
+        last_row: Optional[int] = None,
+    ):
+        """
+        Numbers a range of items, the first with first_id and each following item with an ID stride greater.
+        :param first_id: The ID of the first item in the range.
+        :param stride: The difference between the IDs of consecutive items.
+        :param first_row: The first item in the range.
+        :param last_row: The last item in the range, inclusive. Defaults to the last item.
+        :raises ValueError: If any of the IDs would be negative.
+        """
+        if last_row is None:
+            last_row = len(self._pixel_ids) - 1
+        last_row = min(last_row, len(self._pixel_ids) - 1)
+        if last_row < first_row:
+            return
+        values = first_id + stride * np.arange(last_row - first_row + 1)
+        if np.any(values < 0):
+            raise ValueError("Pixel IDs must be zero or greater.")
+        self._pixel_ids[first_row : last_row + 1] = values
+        self._emit_ids_changed(first_row, last_row)
+
+    def clear_ids(self, first_row: int = 0, last_row: Optional[int] = None):
+        """
+        Removes the pixel IDs of a range of items.
+        :param first_row: The first item in the range.
+        :param last_row: The last item in the range, inclusive. Defaults to the last item.
+        """
+        if last_row is None:
+            last_row = len(self._pixel_ids) - 1
+        if last_row < first_row:
+            return
+        self._pixel_ids[first_row : last_row + 1] = NO_PIXEL_ID
+        self._emit_ids_changed(first_row, last_row)
+
+    def has_pixel_ids(self) -> bool:
+        """
+        :return: Whether at least one item has been given a pixel ID.
+        """
+        return bool(np.any(self._pixel_ids != NO_PIXEL_ID))
+
+    def _emit_ids_changed(self, first_row: int, last_row: int):
+        self.dataChanged.emit(
+            self.index(first_row, ID_COLUMN),
+            self.index(last_row, ID_COLUMN),
+            [Qt.DisplayRole, Qt.EditRole],
+        )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._pixel_ids)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else 2
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        row = index.row()
+        if index.column() == LABEL_COLUMN:
+            return f"Pixel ID for {self._text} #{row}:"
+        pixel_id = self._pixel_ids[row]
+        return "" if pixel_id == NO_PIXEL_ID else str(pixel_id)
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        if not index.isValid() or index.column() != ID_COLUMN or role != Qt.EditRole:
+            return False
+        if value is None or value == "":
+            pixel_id = NO_PIXEL_ID
+        else:
+            try:
+                pixel_id = int(value)
+            except ValueError:
+                return False
+            if pixel_id < 0:
+                return False
+        self._pixel_ids[index.row()] = pixel_id
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.column() == ID_COLUMN:
+            return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def headerData(self, section: int, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return [self._text.capitalize(), "Pixel ID"][section]
+        return None
+
+
+class PixelIDDelegate(QStyledItemDelegate):
+    """
+    Edits pixel IDs with a line edit which only accepts nothing, or a value of zero or greater.
+    """
+
+    def createEditor(self, parent, option, index):
+        editor = QLineEdit(parent)
+        editor.setValidator(NullableIntValidator(bottom=0))
+        return editor
@@ -2,7 +2,7 @@ from typing import List, Optional, Tuple
 
 import numpy as np
 from PySide2.QtCore import QObject, Signal
-from PySide2.QtWidgets import QDoubleSpinBox, QListWidgetItem, QSpinBox
+from PySide2.QtWidgets import QDoubleSpinBox, QHeaderView, QSpinBox
 
 from nexus_constructor.geometry.geometry_loader import load_geometry
 from nexus_constructor.geometry.pixel_data import (
@@ -19,7 +19,13 @@ from nexus_constructor.model.geometry import (
     Y_PIXEL_OFFSET,
     OFFGeometryNexus,
 )
-from nexus_constructor.pixel_mapping_widget import PixelMappingWidget
+from nexus_constructor.pixel_mapping_model import (
+    NO_PIXEL_ID,
+    PixelIDDelegate,
+    PixelMappingModel,
+    load_pixel_ids,
+)
+from nexus_constructor.ui_utils import file_dialog, show_warning_dialog
 from nexus_constructor.validators import PixelValidator
 from ui.pixel_options import Ui_PixelOptionsWidget
 
@@ -28,6 +34,8 @@ BOTTOM_RIGHT_TEXT = "Bottom Right"
 TOP_LEFT_TEXT = "Top Left"
 TOP_RIGHT_TEXT = "Top Right"
 
+PIXEL_ID_FILE_TYPES = {"Numpy Files": ["npy"], "CSV Files": ["csv", "txt"]}
+
 PIXEL_GRID_STACK_INDEX = 0
 PIXEL_MAPPING_STACK_INDEX = 1
 
@@ -44,6 +52,10 @@ COLUMNS_TEXT = "Columns"
 COUNT_DIRECTION = {ROWS_TEXT: CountDirection.ROW, COLUMNS_TEXT: CountDirection.COLUMN}
 
 
+def _find_key(dictionary: dict, value) -> str:
+    return next(key for key, item in dictionary.items() if item == value)
+
+
 def data_is_an_array_with_more_than_one_element(data) -> bool:
     """
     At the moment it appears as though a scalar can still be returned as an array when using `get_field_value` (though
@@ -63,7 +75,7 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
 
         QObject.__init__(self)
 
-        self.pixel_mapping_widgets = []
+        self.pixel_mapping_model = PixelMappingModel()
 
         self._pixel_validator = None
         self.current_mapping_filename = None
@@ -89,6 +101,8 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         # Setup the pixel grid behaviour
         self.setup_pixel_grid_options()
 
+        self.setup_pixel_mapping_options()
+
         # Cause the overall Pixel Options validity to change when a different type of Pixel Layout has been selected
         self.single_pixel_radio_button.clicked.connect(self.update_pixel_input_validity)
         self.entire_shape_radio_button.clicked.connect(self.update_pixel_input_validity)
@@ -129,6 +143,11 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         Fill the "single pixel" fields of a component that's being edited and contains pixel information.
         :param component_to_edit: The component that's being edited.
         """
+        pixel_grid = component_to_edit.pixel_grid
+        if pixel_grid is not None:
+            self._fill_pixel_grid_fields(pixel_grid)
+            return
+
         # Retrieve the pixel offsets and detector number from the component
         x_pixel_offset = component_to_edit.get_field_value(X_PIXEL_OFFSET)
         y_pixel_offset = component_to_edit.get_field_value(Y_PIXEL_OFFSET)
@@ -161,6 +180,23 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
             # If the pixel offset information represents a single pixel
             pass
 
+    def _fill_pixel_grid_fields(self, pixel_grid: PixelGrid):
+        """
+        Fill the "single pixel" fields from the parameters of a pixel grid, without generating its arrays.
+        :param pixel_grid: The pixel grid of the component that's being edited.
+        """
+        self.row_count_spin_box.setValue(pixel_grid.rows)
+        self.row_height_spin_box.setValue(pixel_grid.row_height)
+        self.column_count_spin_box.setValue(pixel_grid.columns)
+        self.column_width_spin_box.setValue(pixel_grid.col_width)
+        self.first_id_spin_box.setValue(pixel_grid.first_id)
+        self.start_counting_combo_box.setCurrentText(
+            _find_key(INITIAL_COUNT_CORNER, pixel_grid.initial_count_corner)
+        )
+        self.count_first_combo_box.setCurrentText(
+            _find_key(COUNT_DIRECTION, pixel_grid.count_direction)
+        )
+
     @staticmethod
     def _get_row_information(y_pixel_offset: np.ndarray) -> Tuple[int, Optional[float]]:
         """
@@ -272,26 +308,27 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
 
             else:
                 self.create_pixel_mapping_list(n_cylinders, "cylinder")
-                self.pixel_mapping_widgets[0].id = detector_number[0]
+                self.pixel_mapping_model.set_pixel_ids(detector_number[:1])
 
     def _fill_off_geometry_pixel_mapping(self, shape: OFFGeometryNexus):
         """
         Fill in the pixel mapping information from an OFFGeometry component.
         :param shape: The shape data from the NeXus file.
         """
-        # Retrieve the detector face information from the shape and use this to create the required number of pixel
-        # mapping widgets
+        # Retrieve the detector face information from the shape and use this to create the required number of rows
+        # in the pixel mapping
         n_faces, detector_faces = self._get_detector_face_information(shape)
         self.create_pixel_mapping_list(n_faces, "face")
 
-        # Populate the pixel mapping widgets based on the contents of the detector_faces array
-        for detector_face in detector_faces:
-            self.pixel_mapping_widgets[detector_face[0]].id = detector_face[1]
+        # Populate the pixel mapping based on the contents of the detector_faces array
+        pixel_ids = np.full(n_faces, NO_PIXEL_ID, dtype=np.int64)
+        pixel_ids[detector_faces[:, 0]] = detector_faces[:, 1]
+        self.pixel_mapping_model.set_pixel_ids(pixel_ids)
 
     @staticmethod
     def _get_detector_face_information(
         shape: OFFGeometryNexus,
-    ) -> Tuple[int, List[Tuple[int, int]]]:
+    ) -> Tuple[int, np.ndarray]:
         return len(shape.faces), shape.detector_faces
 
     def get_current_mapping_filename(self) -> str:
@@ -315,6 +352,28 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         )
         self.no_pixels_button.clicked.connect(self.hide_pixel_options_stack)
 
+    def setup_pixel_mapping_options(self):
+        """
+        Shows the pixel mapping model in the table, and connects the bulk fill and import buttons.
+        """
+        self.pixel_mapping_table_view.setModel(self.pixel_mapping_model)
+        self.pixel_mapping_table_view.setItemDelegate(
+            PixelIDDelegate(self.pixel_mapping_table_view)
+        )
+        # A fixed row height means the view doesn't need to measure every row of a large mesh
+        self.pixel_mapping_table_view.verticalHeader().setSectionResizeMode(
+            QHeaderView.Fixed
+        )
+        # Only the visible rows are measured when sizing the label column to its contents
+        self.pixel_mapping_table_view.horizontalHeader().setResizeContentsPrecision(0)
+        self.pixel_mapping_table_view.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeToContents
+        )
+        self.pixel_mapping_model.dataChanged.connect(self.update_pixel_mapping_validity)
+        self.pixel_mapping_model.modelReset.connect(self.update_pixel_mapping_validity)
+        self.fill_pixel_mapping_button.clicked.connect(self.fill_pixel_mapping)
+        self.import_pixel_mapping_button.clicked.connect(self.import_pixel_mapping)
+
     def setup_pixel_grid_options(self):
         """
         Deals with connecting the pixel grid's signals to methods that check for validity or enforce certain rules about
@@ -356,7 +415,7 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         AddComponentDialog will call the method for populating the pixel mapping list. If these conditions are not meant
         then the list will remain empty.
         """
-        if self.pixel_mapping_list_widget.count() == 0:
+        if self.pixel_mapping_model.rowCount() == 0:
             self.pixel_mapping_button_pressed.emit()
 
     @staticmethod
@@ -446,19 +505,17 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
 
     def get_pixel_mapping_ids(self) -> List[int]:
         """
-        :return: A list of the IDs for the current PixelMappingWidgets.
+        :return: A list of the IDs in the current pixel mapping, None for faces or cylinders without an ID.
         """
-        return [
-            pixel_mapping_widget.id
-            for pixel_mapping_widget in self.pixel_mapping_widgets
-        ]
+        return self.pixel_mapping_model.get_pixel_ids()
 
     def update_pixel_mapping_validity(self):
         """
         Checks that at least one ID has been given in the Pixel Mapping and then updates the PixelValidator.
         """
-        nonempty_ids = [widget.id is not None for widget in self.pixel_mapping_widgets]
-        self._pixel_validator.set_pixel_mapping_valid(any(nonempty_ids))
+        self._pixel_validator.set_pixel_mapping_valid(
+            self.pixel_mapping_model.has_pixel_ids()
+        )
 
     def generate_pixel_data(self) -> PixelData:
         """
@@ -485,7 +542,7 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
             )
 
         if self.entire_shape_radio_button.isChecked():
-            return PixelMapping(self.get_pixel_mapping_ids())
+            return PixelMapping(self.pixel_mapping_model.get_masked_pixel_ids())
 
         return None
 
@@ -515,36 +572,46 @@ class PixelOptions(Ui_PixelOptionsWidget, QObject):
         when the number of cylinders change in the case of NXcylindrical_geometry, or when the user switches between
         mesh and cylinder.
         """
-        self.pixel_mapping_widgets = []
-        self.pixel_mapping_list_widget.clear()
+        self.create_pixel_mapping_list(0, "face")
         self.current_mapping_filename = None
 
     def create_pixel_mapping_list(self, n_items: int, text: str):
         """
-        Creates a list of pixel mapping widgets.
-        :param n_items: The number of widgets to create.
-        :param text: The label to be displayed next to the line edit. This is either faces or cylinders.
+        Replaces the pixel mapping with one for a new number of faces or cylinders, without any IDs.
+        :param n_items: The number of faces or cylinders.
+        :param text: The label to be displayed next to the IDs. This is either faces or cylinders.
         """
-        self.reset_pixel_mapping_list()
-
-        for i in range(n_items):
-            pixel_mapping_widget = PixelMappingWidget(
-                self.pixel_mapping_list_widget, i, text
-            )
-            pixel_mapping_widget.pixelIDLineEdit.textEdited.connect(
-                self.update_pixel_mapping_validity
-            )
+        self.pixel_mapping_model.reset(n_items, text)
+        last_row = max(n_items - 1, 0)
+        self.fill_first_row_spin_box.setMaximum(last_row)
+        self.fill_last_row_spin_box.setMaximum(last_row)
+        self.fill_first_row_spin_box.setValue(0)
+        self.fill_last_row_spin_box.setValue(last_row)
 
-            # Make sure the list item is as large as the widget
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(pixel_mapping_widget.sizeHint())
-
-            self.pixel_mapping_list_widget.addItem(list_item)
-            self.pixel_mapping_list_widget.setItemWidget(
-                list_item, pixel_mapping_widget
-            )
+    def fill_pixel_mapping(self):
+        """
+        Numbers the faces or cylinders in the range chosen in the fill options, starting from the chosen ID.
+        """
+        self.pixel_mapping_model.fill(
+            self.fill_first_id_spin_box.value(),
+            self.fill_stride_spin_box.value(),
+            self.fill_first_row_spin_box.value(),
+            self.fill_last_row_spin_box.value(),
+        )
 
-            # Keep the PixelMappingWidget so that its ID can be retrieved easily when making a PixelMapping object.
-            self.pixel_mapping_widgets.append(pixel_mapping_widget)
+    def import_pixel_mapping(self):
+        """
+        Asks the user for a file of pixel IDs and uses them for the faces or cylinders, in order.
+        """
+        filename = file_dialog(False, "Import Pixel IDs", PIXEL_ID_FILE_TYPES)
+        if not filename:
+            return
+        try:
+            pixel_ids = load_pixel_ids(filename)
+        except (OSError, ValueError) as error:
+            show_warning_dialog(str(error), "Unable to import pixel IDs")
+            return
+        self.pixel_mapping_model.clear_ids()
+        self.pixel_mapping_model.set_pixel_ids(pixel_ids)
 
     pixel_mapping_button_pressed = Signal()
@@ -0,0 +1,133 @@
+"""
+Timing of the phases of application startup, from the first import to the first frame rendered by the 3D view.
+
+Timings are always recorded as it only costs a call to the clock per phase. They are written out, in the Chrome trace
+event format, if the STARTUP_TRACE_ENV_VAR environment variable or the --startup-trace command line argument gives an
+output filename. The file can be opened with chrome://tracing or https://ui.perfetto.dev.
+
+This module must only import from the standard library so that it can be imported, and start the clock, before
+anything else.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+STARTUP_TRACE_ENV_VAR = "NEXUS_CONSTRUCTOR_STARTUP_TRACE"
+
+IMPORTS_PHASE = "imports"
+DEFINITIONS_PHASE = "definitions"
+MODEL_PHASE = "model"
+UI_SETUP_PHASE = "ui_setup"
+FIRST_FRAME_EVENT = "first_frame"
+
+SECONDS_TO_MICROSECONDS = 1e6
+
+
+class TraceEvent:
+    def __init__(self, name: str, start: float, duration: Optional[float] = None):
+        """
+        A phase of startup, or an instant in it if there is no duration.
+        :param name: The name of the phase or instant.
+        :param start: Seconds since the tracer was created.
+        :param duration: Length of the phase in seconds, or None for an instant.
+        """
+        self.name = name
+        self.start = start
+        self.duration = duration
+
+    def as_dict(self) -> Dict[str, Any]:
+        event = {
+            "name": self.name,
+            "ts": self.start * SECONDS_TO_MICROSECONDS,
+            "pid": os.getpid(),
+            "tid": 0,
+        }
+        if self.duration is None:
+            event["ph"] = "i"
+            event["s"] = "g"
+        else:
+            event["ph"] = "X"
+            event["dur"] = self.duration * SECONDS_TO_MICROSECONDS
+        return event
+
+
+class StartupTracer:
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        """
+        Records the phases of startup relative to when it was created.
+        :param clock: Monotonic clock returning seconds.
+        """
+        self._clock = clock
+        self._origin = clock()
+        self.events: List[TraceEvent] = []
+        self.output_filename: Optional[str] = os.environ.get(STARTUP_TRACE_ENV_VAR)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.output_filename)
+
+    def _now(self) -> float:
+        return self._clock() - self._origin
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Records how long the body of the with statement takes. Phases can be nested.
+        :param name: The name of the phase.
+        """
+        start = self._now()
+        try:
+            yield
+        finally:
+            event = TraceEvent(name, start, self._now() - start)
+            self.events.append(event)
+            if self.enabled:
+                logging.info(
+                    f"Startup phase {name} took {event.duration * 1000:.1f} ms"
+                )
+
+    def mark(self, name: str):
+        """
+        Records an instant in startup, for example the first frame being rendered.
+        :param name: The name of the instant.
+        """
+        event = TraceEvent(name, self._now())
+        self.events.append(event)
+        if self.enabled:
+            logging.info(f"Startup reached {name} after {event.start * 1000:.1f} ms")
+
+    def durations(self) -> Dict[str, float]:
+        """
+        :return: The duration in seconds of each recorded phase, by phase name.
+        """
+        return {
+            event.name: event.duration
+            for event in self.events
+            if event.duration is not None
+        }
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        return {
+            "traceEvents": [event.as_dict() for event in self.events],
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self):
+        """
+        Writes the recorded events to the output file, if there is one.
+        """
+        if not self.enabled:
+            return
+        try:
+            with open(self.output_filename, "w") as trace_file:
+                json.dump(self.to_chrome_trace(), trace_file, indent=1)
+        except OSError as error:
+            logging.warning(
+                f"Unable to write startup trace to {self.output_filename}: {error}"
+            )
+
+
+startup_tracer = StartupTracer()
@@ -1,6 +1,5 @@
 from typing import TYPE_CHECKING
 
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QFrame, QGroupBox, QWidget
 
 from nexus_constructor.common_attrs import TransformationType
@@ -36,9 +35,9 @@ class EditTransformation(QGroupBox):
 
     def _fill_in_existing_fields(self, current_vector):
         self.transformation_frame.name_line_edit.setText(self.transformation.name)
-        self.transformation_frame.x_spinbox.setValue(current_vector.x())
-        self.transformation_frame.y_spinbox.setValue(current_vector.y())
-        self.transformation_frame.z_spinbox.setValue(current_vector.z())
+        self.transformation_frame.x_spinbox.setValue(current_vector[0])
+        self.transformation_frame.y_spinbox.setValue(current_vector[1])
+        self.transformation_frame.z_spinbox.setValue(current_vector[2])
         update_function = find_field_type(self.transformation.values)
         if update_function is not None:
             update_function(
@@ -80,9 +79,9 @@ class EditTransformation(QGroupBox):
         self.transformation.values = self.transformation_frame.magnitude_widget.value
         if self.transformation_frame.name_line_edit.text() != self.transformation.name:
             self.transformation.name = self.transformation_frame.name_line_edit.text()
-        self.transformation.vector = QVector3D(
-            *[spinbox.value() for spinbox in self.transformation_frame.spinboxes[:-1]]
-        )
+        self.transformation.vector = [
+            spinbox.value() for spinbox in self.transformation_frame.spinboxes[:-1]
+        ]
         self.transformation.units = self.transformation_frame.magnitude_widget.units
         self.model.signals.transformation_changed.emit()
 
@@ -1,10 +1,9 @@
-import re
 from typing import Optional
 
-import numpy as np
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QFileDialog, QMessageBox
 
+from nexus_constructor.model.name_registry import NameRegistry
+
 FILE_DIALOG_NATIVE = QFileDialog.DontUseNativeDialog
 
 
@@ -61,33 +60,18 @@ def validate_line_edit(
     )
 
 
-def qvector3d_to_numpy_array(input_vector: QVector3D) -> np.ndarray:
-    return np.array([input_vector.x(), input_vector.y(), input_vector.z()]).astype(
-        float
-    )
-
-
-def numpy_array_to_qvector3d(input_array: np.ndarray) -> QVector3D:
-    return QVector3D(input_array[0], input_array[1], input_array[2])
-
-
 def generate_unique_name(base: str, items: list):
     """
     Generates a unique name for a new item using a common base string
 
     :param base: The generated name will be the base string, followed by a number if required
-    :param items: The named items to avoid generating a matching name with. Each must have a 'name' attribute
+    :param items: The named items to avoid generating a matching name with. Each must have a 'name' attribute. If it is
+    a NamedList its names are looked up rather than searched for.
     """
-    regex = f"^{re.escape(base)}\\d*$"
-    similar_names = [item.name for item in items if re.match(regex, item.name)]
-
-    if len(similar_names) == 0 or base not in similar_names:
-        return base
-    if similar_names == [base]:
-        return base + "1"
-    # find the highest number in use, and go one higher
-    tailing_numbers = [int(name[len(base) :]) for name in similar_names if name != base]
-    return base + str(max(tailing_numbers) + 1)
+    names = getattr(items, "names", None)
+    if names is None:
+        names = NameRegistry(item.name for item in items)
+    return names.unique_name(base)
 
 
 def show_warning_dialog(
@@ -1,11 +1,98 @@
 import logging
+from functools import lru_cache
+from tokenize import TokenError
+from typing import TYPE_CHECKING, Optional
 
-import pint
+import attr
+
+if TYPE_CHECKING:
+    import pint  # noqa: F401
 
 RADIANS = "radians"
 METRES = "metres"
 
-ureg = pint.UnitRegistry()
+# Unit fields are validated on every keystroke, and files repeat the same few units many times, so the results of
+# parsing this many different unit strings are kept
+UNIT_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=None)
+def get_unit_registry() -> "pint.UnitRegistry":
+    """
+    Creating the pint registry takes a noticeable part of the application's startup time, so it is only created when
+    units are first used.
+    :return: The registry shared by the whole application.
+    """
+    import pint
+
+    return pint.UnitRegistry()
+
+
+@attr.s(frozen=True)
+class ParsedUnits:
+    """
+    What is known about a units string once pint has parsed it. Everything other than recognised is None if pint
+    doesn't recognise the units.
+    """
+
+    recognised = attr.ib(type=bool)
+    dimensionality = attr.ib(default=None, type=Optional[str])
+    magnitude = attr.ib(default=None, type=Optional[float])
+    # None if the units can't be converted to metres or radians
+    factor_to_metres = attr.ib(default=None, type=Optional[float])
+    factor_to_radians = attr.ib(default=None, type=Optional[float])
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def parse_units(units: str) -> ParsedUnits:
+    """
+    Parses a units string with pint. The result is cached, so it must not be modified.
+    :param units: The units string.
+    :return: The parsed units.
+    """
+    import pint
+
+    try:
+        quantity = get_unit_registry()(units)
+    except (
+        pint.errors.UndefinedUnitError,
+        AttributeError,
+        TokenError,
+    ):
+        return ParsedUnits(recognised=False)
+
+    if not isinstance(quantity, pint.Quantity):
+        # A plain number, such as "2", is parsed as a number rather than a quantity
+        return ParsedUnits(
+            recognised=True, dimensionality="dimensionless", magnitude=quantity
+        )
+    return ParsedUnits(
+        recognised=True,
+        dimensionality=str(quantity.dimensionality),
+        magnitude=quantity.magnitude,
+        factor_to_metres=_conversion_factor(units, METRES),
+        factor_to_radians=_conversion_factor(units, RADIANS),
+    )
+
+
+@lru_cache(maxsize=UNIT_CACHE_SIZE)
+def _conversion_factor(original_units: str, desired_units: str) -> Optional[float]:
+    """
+    :return: The factor for converting values from the original units to the desired units, or None if they can't be
+    converted.
+    """
+    import pint
+
+    try:
+        return get_unit_registry()(original_units).to(desired_units).magnitude
+    except (
+        pint.errors.DimensionalityError,
+        pint.errors.UndefinedUnitError,
+        TokenError,
+        ValueError,
+        AttributeError,
+    ):
+        return None
 
 
 def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> bool:
@@ -17,13 +104,7 @@ def units_are_recognised_by_pint(input: str, emit_logging_msg: bool = True) -> b
         `units_are_recognised_by_pint` returns false.
     :return: True if the unit is contained in the pint registry, False otherwise.
     """
-    try:
-        ureg(input)
-    except (
-        pint.errors.UndefinedUnitError,
-        AttributeError,
-        pint.compat.tokenize.TokenError,
-    ):
+    if not parse_units(input).recognised:
         if emit_logging_msg:
             logging.info(f"Unit input {input} is not recognised.")
         return False
@@ -39,9 +120,14 @@ def units_are_expected_dimensionality(
     :param input: The units string.
     :return: True if the conversion was successful, False otherwise.
     """
-    try:
-        ureg(input).to(expected_unit_type)
-    except (pint.errors.DimensionalityError, ValueError, AttributeError):
+    parsed_units = parse_units(input)
+    if expected_unit_type == METRES:
+        factor = parsed_units.factor_to_metres
+    elif expected_unit_type == RADIANS:
+        factor = parsed_units.factor_to_radians
+    else:
+        factor = _conversion_factor(input, expected_unit_type)
+    if factor is None:
         if emit_logging_msg:
             logging.info(
                 f"Unit input {input} has wrong type. Expected something that could be converted to {expected_unit_type}."
@@ -58,7 +144,7 @@ def units_have_magnitude_of_one(input: str, emit_logging_msg=True) -> bool:
     :param input: The units string.
     :return: True if the unit has a magnitude of one, False otherwise.
     """
-    if ureg(input).magnitude != 1:
+    if parse_units(input).magnitude != 1:
         if emit_logging_msg:
             logging.info(
                 f"Unit input {input} has wrong magnitude. The input should have a magnitude of one."
@@ -74,4 +160,8 @@ def calculate_unit_conversion_factor(original_units: str, desired_units: str) ->
     :param desired_units: The units that the original units are to be converted to.
     :return: A float value for converting from the original units and the desired units.
     """
-    return ureg(original_units).to(desired_units).magnitude
+    factor = _conversion_factor(original_units, desired_units)
+    if factor is None:
+        # Convert again without the cache so that the reason the units can't be converted is raised
+        return get_unit_registry()(original_units).to(desired_units).magnitude
+    return factor
@@ -4,7 +4,6 @@ from enum import Enum
 from typing import List
 
 import numpy as np
-import pint
 from nexusutils.readwriteoff import parse_off_file
 from PySide2.QtCore import QObject, Signal
 from PySide2.QtGui import QIntValidator, QValidator
@@ -12,6 +11,7 @@ from PySide2.QtWidgets import QComboBox, QRadioButton, QWidget
 from stl import mesh
 
 from nexus_constructor.common_attrs import SCALAR
+from nexus_constructor.model.name_registry import NameRegistry
 from nexus_constructor.model.value_type import VALUE_TYPE_TO_NP
 from nexus_constructor.unit_utils import (
     units_are_expected_dimensionality,
@@ -48,7 +48,6 @@ class UnitValidator(QValidator):
 
     def __init__(self, expected_dimensionality=None):
         super().__init__()
-        self.ureg = pint.UnitRegistry()
         self.expected_dimensionality = expected_dimensionality
 
     def validate(self, input: str, pos: int):
@@ -80,20 +79,28 @@ class NameValidator(QValidator):
     The validationFailed signal is emitted if an entered name is not unique.
     """
 
-    def __init__(self, list_model: List, invalid_names=None):
+    def __init__(self, list_model: List, invalid_names=None, current_name=None):
+        """
+        :param list_model: The named items. If it is a NamedList its names are looked up rather than searched for.
+        :param invalid_names: Names which can't be used even if no item has them.
+        :param current_name: The name of the item being edited, which it can keep.
+        """
         super().__init__()
         if invalid_names is None:
             invalid_names = []
         self.list_model = list_model
         self.invalid_names = invalid_names
+        self.current_name = current_name
 
     def validate(self, input: str, pos: int):
         if not input or input in self.invalid_names:
             self.is_valid.emit(False)
             return QValidator.Intermediate
 
-        names_in_list = [item.name for item in self.list_model]
-        if input in names_in_list:
+        names = getattr(self.list_model, "names", None)
+        if names is None:
+            names = NameRegistry(item.name for item in self.list_model)
+        if names.count(input) > (1 if input == self.current_name else 0):
             self.is_valid.emit(False)
             return QValidator.Intermediate
 
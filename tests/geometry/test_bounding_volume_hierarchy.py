@@ -0,0 +1,195 @@
+import numpy as np
+import pytest
+from pytest import approx
+
+from benchmarks.generators import plane_mesh
+from nexus_constructor.geometry.bounding_volume_hierarchy import (
+    LEAF_SIZE,
+    NO_HIT,
+    BoundingVolumeHierarchy,
+    ComponentSpatialIndex,
+    RepeatedMeshIndex,
+    TriangleMeshIndex,
+    ray_box_distances,
+    ray_triangle_distances,
+    transform_bounds,
+)
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.geometry.vector_math import rotation_matrix, translation_matrix
+from nexus_constructor.model.geometry import OFFCube
+
+TOWARDS_NEGATIVE_Z = np.array([0.0, 0.0, -1.0])
+
+
+def test_GIVEN_ray_WHEN_testing_against_boxes_THEN_entry_distance_or_infinity_is_returned():
+    distances = ray_box_distances(
+        np.array([0.0, 0.0, 10.0]),
+        TOWARDS_NEGATIVE_Z,
+        np.array([[-1, -1, -1], [2, 2, -1], [-1, -1, 9]]),
+        np.array([[1, 1, 1], [3, 3, 1], [1, 1, 11]]),
+    )
+    assert distances == approx([9, np.inf, 0])
+
+
+def test_GIVEN_ray_WHEN_testing_against_triangles_THEN_hits_from_either_side_are_found():
+    first = np.array([[-1, -1, 0], [-1, -1, 2], [5, 5, 1]], dtype=float)
+    second = np.array([[1, -1, 0], [-1, 1, 2], [6, 5, 1]], dtype=float)
+    third = np.array([[0, 1, 0], [1, -1, 2], [5, 6, 1]], dtype=float)
+    distances = ray_triangle_distances(
+        np.array([0.0, 0.0, 10.0]), TOWARDS_NEGATIVE_Z, first, second, third
+    )
+    assert distances == approx([10, 8, np.inf])
+
+
+def test_GIVEN_many_primitives_WHEN_building_tree_THEN_every_leaf_is_small_and_contains_its_primitives():
+    lower = np.random.default_rng(0).uniform(-10, 10, (1000, 3))
+    upper = lower + 0.5
+    tree = BoundingVolumeHierarchy(lower, upper)
+
+    leaves = np.flatnonzero(tree.node_children[:, 0] == -1)
+    assert sorted(
+        np.concatenate([tree.leaf_primitives(leaf) for leaf in leaves])
+    ) == list(range(1000))
+    for leaf in leaves:
+        primitives = tree.leaf_primitives(leaf)
+        assert len(primitives) <= LEAF_SIZE
+        assert np.all(tree.node_lower[leaf] <= lower[primitives])
+        assert np.all(tree.node_upper[leaf] >= upper[primitives])
+
+
+def test_GIVEN_moved_primitive_WHEN_updating_it_THEN_nodes_containing_it_are_refitted():
+    lower = np.arange(100)[:, np.newaxis] * np.ones(3)
+    tree = BoundingVolumeHierarchy(lower, lower + 1)
+
+    tree.update_primitive(5, np.array([200, 0, 0]), np.array([201, 1, 1]))
+
+    assert tree.node_upper[0] == approx([201, 100, 100])
+    node = tree.primitive_leaves[5]
+    while node != -1:
+        assert tree.node_upper[node][0] >= 201
+        node = tree.node_parents[node]
+
+
+def test_GIVEN_empty_tree_WHEN_casting_ray_THEN_nothing_is_hit():
+    tree = BoundingVolumeHierarchy(np.empty((0, 3)), np.empty((0, 3)))
+    assert tree.ray_cast(np.zeros(3), TOWARDS_NEGATIVE_Z, None) == NO_HIT
+
+
+def test_GIVEN_dense_mesh_WHEN_casting_rays_THEN_distances_match_testing_every_triangle():
+    vertices, faces = plane_mesh(50)
+    triangles = np.array(convert_faces_into_triangles(faces))
+    vertices = vertices + np.array([0, 0, 1]) * np.sin(vertices[:, :1] * 5)
+    index = TriangleMeshIndex(vertices, triangles)
+    corners = vertices[triangles].transpose(1, 0, 2)
+
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        origin = np.append(rng.uniform(-0.6, 0.6, 2), 5.0)
+        direction = np.append(rng.uniform(-0.2, 0.2, 2), -1.0)
+        expected = ray_triangle_distances(origin, direction, *corners).min()
+        assert index.ray_cast(origin, direction) == approx(expected)
+
+
+def test_GIVEN_mesh_repeated_at_positions_WHEN_casting_rays_THEN_distances_match_testing_every_copy():
+    vertices = OFFCube.vertices * 10
+    triangles = np.array(convert_faces_into_triangles(OFFCube.faces))
+    rng = np.random.default_rng(2)
+    positions = rng.uniform(-5, 5, (200, 3))
+    index = RepeatedMeshIndex(vertices, triangles, positions)
+    corners = positions[:, np.newaxis, np.newaxis, :] + vertices[triangles]
+    corners = corners.reshape(-1, 3, 3).transpose(1, 0, 2)
+
+    # The shape is indexed once rather than for each copy
+    assert len(index.mesh_index.tree) == len(triangles)
+    hits = 0
+    for _ in range(20):
+        origin = np.append(rng.uniform(-5, 5, 2), 10.0)
+        direction = np.append(rng.uniform(-0.2, 0.2, 2), -1.0)
+        expected = ray_triangle_distances(origin, direction, *corners).min()
+        hits += np.isfinite(expected)
+        assert index.ray_cast(origin, direction) == approx(expected)
+    assert hits
+
+
+def test_GIVEN_components_in_a_row_WHEN_picking_THEN_nearest_component_is_returned():
+    index = ComponentSpatialIndex()
+    for name, z in [("far", -10), ("near", 0)]:
+        index.set_mesh(name, OFFCube.vertices, OFFCube.faces)
+        index.set_transform(name, translation_matrix((0, 0, z)))
+
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) == "near"
+    assert index.pick(np.array([5, 0, 10]), TOWARDS_NEGATIVE_Z) is None
+
+
+def test_GIVEN_component_moved_WHEN_picking_THEN_ray_hits_it_at_its_new_position():
+    index = ComponentSpatialIndex()
+    index.set_mesh("near", OFFCube.vertices, OFFCube.faces)
+    index.set_mesh("far", OFFCube.vertices, OFFCube.faces)
+    index.set_transform("far", translation_matrix((0, 0, -10)))
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) == "near"
+
+    index.set_transform(
+        "near", translation_matrix((5, 0, 0)) @ rotation_matrix((0, 1, 0), 45)
+    )
+
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) == "far"
+    assert index.pick(np.array([5, 0, 10]), TOWARDS_NEGATIVE_Z) == "near"
+
+
+def test_GIVEN_shape_repeated_over_positions_WHEN_picking_between_and_on_copies_THEN_only_copies_are_hit():
+    index = ComponentSpatialIndex()
+    index.set_mesh(
+        "detector", OFFCube.vertices, OFFCube.faces, np.array([[-2, 0, 0], [2, 0, 0]])
+    )
+
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) is None
+    assert index.pick(np.array([2, 0, 10]), TOWARDS_NEGATIVE_Z) == "detector"
+
+
+@pytest.mark.parametrize(
+    "remove", [lambda index: index.remove("cube"), ComponentSpatialIndex.clear]
+)
+def test_GIVEN_component_removed_WHEN_picking_THEN_it_is_not_hit(remove):
+    index = ComponentSpatialIndex()
+    index.set_mesh("cube", OFFCube.vertices, OFFCube.faces)
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) == "cube"
+
+    remove(index)
+
+    assert "cube" not in index
+    assert index.pick(np.array([0, 0, 10]), TOWARDS_NEGATIVE_Z) is None
+
+
+def test_GIVEN_rotated_box_WHEN_transforming_bounds_THEN_box_contains_rotated_corners():
+    lower, upper = transform_bounds(
+        rotation_matrix((0, 0, 1), 45), np.array([-1, -1, 0]), np.array([1, 1, 2])
+    )
+    assert lower == approx([-np.sqrt(2), -np.sqrt(2), 0])
+    assert upper == approx([np.sqrt(2), np.sqrt(2), 2])
+
+
+def test_GIVEN_component_moved_WHEN_getting_bounds_THEN_only_world_bounds_change():
+    index = ComponentSpatialIndex()
+    index.set_mesh("cube", OFFCube.vertices, OFFCube.faces)
+
+    index.set_transform("cube", translation_matrix((10, 0, 0)))
+
+    assert index.local_bounds("cube")[0] == approx([-0.05, -0.05, -0.05])
+    assert index.world_bounds("cube")[0] == approx([9.95, -0.05, -0.05])
+    assert index.world_bounds("missing") is None
+
+
+def test_GIVEN_components_WHEN_getting_scene_bounds_THEN_bounds_contain_them_all_after_moves():
+    index = ComponentSpatialIndex()
+    assert index.scene_bounds() is None
+    index.set_mesh(
+        "detector", OFFCube.vertices, OFFCube.faces, np.array([[0, 0, 0], [0, 4, 0]])
+    )
+    index.set_mesh("monitor", OFFCube.vertices, OFFCube.faces)
+    assert index.scene_bounds()[1] == approx([0.05, 4.05, 0.05])
+
+    index.set_transform("monitor", translation_matrix((0, 0, -20)))
+
+    lower, upper = index.scene_bounds()
+    assert lower == approx([-0.05, -0.05, -20.05])
+    assert upper == approx([0.05, 4.05, 0.05])
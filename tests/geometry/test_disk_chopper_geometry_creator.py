@@ -101,13 +101,11 @@ def test_GIVEN_non_integer_id_WHEN_setting_id_THEN_id_is_rejected(point):
     assert point.id is None
 
 
-def test_GIVEN_point_WHEN_calling_point_to_qvector3d_THEN_expected_vector_is_created(
+def test_GIVEN_point_WHEN_calling_point_to_numpy_array_THEN_expected_vector_is_created(
     point,
 ):
-    vector = point.point_to_qvector3d()
-    assert vector.x() == pytest.approx(POINT_X)
-    assert vector.y() == pytest.approx(POINT_Y)
-    assert vector.z() == pytest.approx(POINT_Z)
+    vector = point.point_to_numpy_array()
+    assert vector == pytest.approx([POINT_X, POINT_Y, POINT_Z])
 
 
 def test_GIVEN_chopper_details_WHEN_initialising_geometry_creator_THEN_geometry_creator_is_initialised_with_expected_values(
@@ -707,5 +705,5 @@ def test_GIVEN_completed_mesh_WHEN_creating_off_geometry_THEN_off_geometry_has_e
 
     assert geometry_creator.faces == off_geometry.faces
 
-    for point, qvector in zip(geometry_creator.points, off_geometry.vertices):
-        assert point.point_to_qvector3d() == qvector
+    for point, vertex in zip(geometry_creator.points, off_geometry.vertices):
+        assert np.array_equal(point.point_to_numpy_array(), vertex)
@@ -0,0 +1,69 @@
+import numpy as np
+
+from benchmarks.generators import plane_mesh
+from nexus_constructor.geometry.level_of_detail import (
+    MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL,
+    create_levels_of_detail,
+    decimate_by_vertex_clustering,
+)
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.model.geometry import OFFCube, OFFGeometryNoNexus
+
+
+def test_GIVEN_vertices_in_same_cell_WHEN_clustering_THEN_they_are_merged_at_their_mean_and_collapsed_triangles_removed():
+    vertices = [(0.0, 0.0, 0.0), (0.1, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 2.0, 0.0)]
+    triangles = [[0, 2, 3], [1, 2, 3], [0, 1, 2]]
+
+    new_vertices, new_triangles = decimate_by_vertex_clustering(
+        vertices, triangles, cell_size=1.0
+    )
+
+    assert np.allclose(
+        new_vertices, [(0.05, 0.0, 0.0), (2.0, 0.0, 0.0), (2.0, 2.0, 0.0)]
+    )
+    # The first two triangles become the same triangle and the third collapses to a line
+    assert np.array_equal(new_triangles, [[0, 1, 2]])
+
+
+def test_GIVEN_cells_smaller_than_mesh_detail_WHEN_clustering_THEN_mesh_is_unchanged():
+    vertices = np.array(OFFCube.vertices)
+    triangles = convert_faces_into_triangles(OFFCube.faces)
+
+    new_vertices, new_triangles = decimate_by_vertex_clustering(
+        vertices, triangles, cell_size=0.1
+    )
+
+    assert np.allclose(new_vertices[new_triangles], vertices[triangles])
+
+
+def test_GIVEN_small_mesh_WHEN_creating_levels_of_detail_THEN_there_are_none():
+    assert not create_levels_of_detail(OFFCube)
+
+
+def test_GIVEN_dense_mesh_WHEN_creating_levels_of_detail_THEN_levels_get_coarser_with_distance():
+    geometry = OFFGeometryNoNexus(*plane_mesh(200))
+    assert len(geometry.faces) * 2 >= MIN_TRIANGLES_FOR_LEVELS_OF_DETAIL
+
+    levels = create_levels_of_detail(geometry)
+
+    assert levels
+    triangle_counts = [2 * len(geometry.faces)] + [
+        len(level.triangles) for level in levels
+    ]
+    distances = [level.min_distance for level in levels]
+    assert triangle_counts == sorted(triangle_counts, reverse=True)
+    assert distances == sorted(distances)
+    for level in levels:
+        # The extent of the mesh is kept
+        assert np.allclose(level.vertices.min(axis=0), (0, 0, 0), atol=0.05)
+        assert np.allclose(level.vertices.max(axis=0), (1, 1, 0), atol=0.05)
+
+
+def test_GIVEN_dense_mesh_WHEN_creating_levels_of_detail_THEN_original_mesh_is_not_modified():
+    vertices, faces = plane_mesh(200)
+    geometry = OFFGeometryNoNexus(vertices.copy(), [list(face) for face in faces])
+
+    create_levels_of_detail(geometry)
+
+    assert np.array_equal(geometry.vertices, vertices)
+    assert geometry.faces == faces
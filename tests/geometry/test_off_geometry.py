@@ -1,16 +1,17 @@
-from PySide2.QtGui import QVector3D
+import numpy as np
 from pytest import approx
 
+from nexus_constructor.geometry.pixel_data import PixelMapping
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import OFFGeometryNexus, OFFGeometryNoNexus
 
 
 def test_GIVEN_faces_WHEN_calling_winding_order_on_OFF_THEN_order_is_correct():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        (0, 0, 1),
+        (0, 1, 0),
+        (0, 0, 0),
+        (0, 1, 1),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -23,10 +24,10 @@ def test_GIVEN_faces_WHEN_calling_winding_order_on_OFF_THEN_order_is_correct():
 
 def test_GIVEN_faces_WHEN_calling_winding_order_indices_on_OFF_THEN_order_is_correct():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        (0, 0, 1),
+        (0, 1, 0),
+        (0, 0, 0),
+        (0, 1, 1),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -40,17 +41,17 @@ def test_GIVEN_faces_WHEN_calling_winding_order_indices_on_OFF_THEN_order_is_cor
 
 def test_GIVEN_off_geometry_WHEN_calling_off_geometry_on_offGeometry_THEN_original_geometry_is_returned():
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 1),
+        (0, 0, 1),
+        (0, 1, 0),
+        (0, 0, 0),
+        (0, 1, 1),
     ]
 
     faces = [[0, 1, 2, 3]]
     geom = OFFGeometryNoNexus(vertices, faces)
 
     assert geom.faces == faces
-    assert geom.vertices == vertices
+    assert np.array_equal(geom.vertices, vertices)
     assert geom.off_geometry == geom
 
 
@@ -62,10 +63,10 @@ def test_can_get_off_geometry_properties():
     vertex_3_z = 1.0
 
     vertices = [
-        QVector3D(0, 0, 1),
-        QVector3D(0, 1, 0),
-        QVector3D(0, 0, 0),
-        QVector3D(vertex_3_x, vertex_3_y, vertex_3_z),
+        (0, 0, 1),
+        (0, 1, 0),
+        (0, 0, 0),
+        (vertex_3_x, vertex_3_y, vertex_3_z),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -77,19 +78,19 @@ def test_can_get_off_geometry_properties():
     nexus_shape, _ = component.shape
     assert isinstance(nexus_shape, OFFGeometryNexus)
     assert nexus_shape.faces == faces
-    assert nexus_shape.vertices[3].x() == approx(vertex_3_x)
-    assert nexus_shape.vertices[3].y() == approx(vertex_3_y)
-    assert nexus_shape.vertices[3].z() == approx(vertex_3_z)
+    assert nexus_shape.vertices[3][0] == approx(vertex_3_x)
+    assert nexus_shape.vertices[3][1] == approx(vertex_3_y)
+    assert nexus_shape.vertices[3][2] == approx(vertex_3_z)
 
 
 def test_can_set_off_geometry_properties():
     component = Component("test")
 
     vertices = [
-        QVector3D(0.0, 0.0, 1.0),
-        QVector3D(0.0, 1.0, 0.0),
-        QVector3D(0.0, 0.0, 0.0),
-        QVector3D(0.0, 1.0, 1.0),
+        (0.0, 0.0, 1.0),
+        (0.0, 1.0, 0.0),
+        (0.0, 0.0, 0.0),
+        (0.0, 1.0, 1.0),
     ]
 
     faces = [[0, 1, 2, 3]]
@@ -104,9 +105,9 @@ def test_can_set_off_geometry_properties():
     vertex_2_y = -0.5
     vertex_2_z = 0
     new_vertices = [
-        QVector3D(-0.5, -0.5, 0),
-        QVector3D(0, 0.5, 0),
-        QVector3D(vertex_2_x, vertex_2_y, vertex_2_z),
+        (-0.5, -0.5, 0),
+        (0, 0.5, 0),
+        (vertex_2_x, vertex_2_y, vertex_2_z),
     ]
     triangle = [0, 1, 2]
     new_faces = [triangle]
@@ -114,6 +115,18 @@ def test_can_set_off_geometry_properties():
     nexus_shape.faces = new_faces
 
     assert nexus_shape.faces == new_faces
-    assert nexus_shape.vertices[2].x() == approx(vertex_2_x)
-    assert nexus_shape.vertices[2].y() == approx(vertex_2_y)
-    assert nexus_shape.vertices[2].z() == approx(vertex_2_z)
+    assert nexus_shape.vertices[2][0] == approx(vertex_2_x)
+    assert nexus_shape.vertices[2][1] == approx(vertex_2_y)
+    assert nexus_shape.vertices[2][2] == approx(vertex_2_z)
+
+
+def test_GIVEN_pixel_mapping_WHEN_setting_off_shape_THEN_detector_faces_are_an_array_of_face_and_id():
+    component = Component("test")
+    shape = OFFGeometryNoNexus(
+        [(0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)], [[0, 1, 2], [1, 3, 2]]
+    )
+
+    nexus_shape = component.set_off_shape(shape, pixel_data=PixelMapping([None, 7]))
+
+    assert isinstance(nexus_shape.detector_faces, np.ndarray)
+    assert nexus_shape.detector_faces.tolist() == [[1, 7]]
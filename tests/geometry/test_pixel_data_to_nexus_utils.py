@@ -11,6 +11,7 @@ from nexus_constructor.geometry.pixel_data_utils import (
     get_detector_faces_from_pixel_mapping,
     get_detector_ids_from_pixel_grid,
     get_detector_number_from_pixel_mapping,
+    get_pixel_offsets_from_pixel_grid,
     get_x_offsets_from_pixel_grid,
     get_y_offsets_from_pixel_grid,
     get_z_offsets_from_pixel_grid,
@@ -56,13 +57,15 @@ def pixel_mapping():
 def test_GIVEN_list_of_ids_WHEN_calling_detector_faces_THEN_correct_detector_faces_list_is_returned(
     pixel_mapping,
 ):
+    pixel_ids = pixel_mapping.pixel_ids.tolist()
     expected_faces = [
-        (i, pixel_mapping.pixel_ids[i])
-        for i in range(len(pixel_mapping.pixel_ids))
-        if pixel_mapping.pixel_ids[i] is not None
+        (i, pixel_ids[i]) for i in range(len(pixel_ids)) if pixel_ids[i] is not None
     ]
 
-    assert get_detector_faces_from_pixel_mapping(pixel_mapping) == expected_faces
+    detector_faces = get_detector_faces_from_pixel_mapping(pixel_mapping)
+
+    assert detector_faces.dtype == np.int64
+    assert np.array_equal(detector_faces, expected_faces)
 
 
 def test_GIVEN_single_id_WHEN_calling_detector_faces_THEN_list_is_not_returned(
@@ -71,16 +74,28 @@ def test_GIVEN_single_id_WHEN_calling_detector_faces_THEN_list_is_not_returned(
 
     pixel_id = 3
     pixel_mapping.pixel_ids = [pixel_id]
-    assert get_detector_faces_from_pixel_mapping(pixel_mapping) == [(0, pixel_id)]
+    assert np.array_equal(
+        get_detector_faces_from_pixel_mapping(pixel_mapping), [(0, pixel_id)]
+    )
+
+
+def test_GIVEN_no_ids_WHEN_calling_detector_faces_THEN_empty_two_column_array_is_returned(
+    pixel_mapping,
+):
+
+    pixel_mapping.pixel_ids = [None, None]
+    assert get_detector_faces_from_pixel_mapping(pixel_mapping).shape == (0, 2)
 
 
 def test_GIVEN_list_of_ids_WHEN_calling_detector_number_THEN_correct_detector_number_list_is_returned(
     pixel_mapping,
 ):
 
-    expected_numbers = [id for id in pixel_mapping.pixel_ids if id is not None]
+    expected_numbers = [id for id in pixel_mapping.pixel_ids.tolist() if id is not None]
 
-    assert get_detector_number_from_pixel_mapping(pixel_mapping) == expected_numbers
+    assert get_detector_number_from_pixel_mapping(pixel_mapping).tolist() == (
+        expected_numbers
+    )
 
 
 def test_GIVEN_single_id_WHEN_calling_detector_number_THEN_list_is_not_returned(
@@ -89,7 +104,7 @@ def test_GIVEN_single_id_WHEN_calling_detector_number_THEN_list_is_not_returned(
 
     pixel_id = 3
     pixel_mapping.pixel_ids = [pixel_id]
-    assert get_detector_number_from_pixel_mapping(pixel_mapping) == [pixel_id]
+    assert get_detector_number_from_pixel_mapping(pixel_mapping).tolist() == [pixel_id]
 
 
 @pytest.mark.parametrize("rows", ROW_COL_VALS)
@@ -173,3 +188,44 @@ def test_GIVEN_one_by_one_pixel_grid_when_calling_offset_functions_THEN_offsets_
     assert get_z_offsets_from_pixel_grid(pixel_grid) == 0
 
     assert get_detector_ids_from_pixel_grid(pixel_grid) == pixel_grid.first_id
+
+
+@pytest.mark.parametrize("rows", ROW_COL_VALS)
+@pytest.mark.parametrize("columns", ROW_COL_VALS)
+def test_GIVEN_pixel_grid_WHEN_calling_pixel_grid_offsets_THEN_they_match_flattened_offset_arrays(
+    pixel_grid, rows, columns
+):
+    pixel_grid.rows = rows
+    pixel_grid.columns = columns
+    pixel_grid.row_height = 0.3
+    pixel_grid.col_width = 0.2
+
+    offsets = get_pixel_offsets_from_pixel_grid(pixel_grid)
+
+    assert offsets.shape == (rows * columns, 3)
+    assert np.allclose(
+        offsets[:, 0], get_x_offsets_from_pixel_grid(pixel_grid).flatten()
+    )
+    assert np.allclose(
+        offsets[:, 1], get_y_offsets_from_pixel_grid(pixel_grid).flatten()
+    )
+    assert not np.any(offsets[:, 2])
+
+
+def test_GIVEN_list_of_ids_with_none_WHEN_creating_pixel_mapping_THEN_ids_are_masked_where_none():
+    pixel_mapping = PixelMapping([None, 4, 5, None])
+
+    assert pixel_mapping.pixel_ids.dtype == np.int64
+    assert np.ma.getmaskarray(pixel_mapping.pixel_ids).tolist() == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    assert pixel_mapping.pixel_ids.tolist() == [None, 4, 5, None]
+
+
+def test_GIVEN_masked_array_WHEN_creating_pixel_mapping_THEN_mask_is_kept():
+    pixel_mapping = PixelMapping(np.ma.array([1, 2, 3], mask=[False, True, False]))
+
+    assert pixel_mapping.pixel_ids.tolist() == [1, None, 3]
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from pytest import approx
+
+from nexus_constructor.geometry.vector_math import (
+    normalise,
+    quaternion_from_axis_and_angle,
+    ray_through_screen_point,
+    rotation_matrix,
+    rotation_matrix_between,
+    transform_points,
+    translation_matrix,
+    triangle_normals,
+)
+
+
+def test_GIVEN_zero_vector_WHEN_normalising_THEN_zero_vector_and_magnitude_are_returned():
+    unit_vector, magnitude = normalise((0, 0, 0))
+    assert np.array_equal(unit_vector, [0, 0, 0])
+    assert magnitude == 0
+
+
+def test_GIVEN_vector_WHEN_normalising_THEN_unit_vector_and_magnitude_are_returned():
+    unit_vector, magnitude = normalise((3, 0, 4))
+    assert unit_vector == approx([0.6, 0, 0.8])
+    assert magnitude == approx(5)
+
+
+def test_GIVEN_axis_and_angle_WHEN_creating_quaternion_THEN_quaternion_is_unit_length():
+    quaternion = quaternion_from_axis_and_angle((1, 2, 3), 73)
+    assert np.linalg.norm(quaternion) == approx(1)
+
+
+def test_GIVEN_rotation_about_z_WHEN_rotating_x_axis_THEN_result_is_y_axis():
+    rotated = transform_points(rotation_matrix((0, 0, 1), 90), [[1, 0, 0]])
+    assert rotated[0] == approx([0, 1, 0])
+
+
+def test_GIVEN_translation_WHEN_transforming_points_THEN_points_are_shifted():
+    points = np.array([[0, 0, 0], [1, 2, 3]])
+    translated = transform_points(translation_matrix((1, -1, 2)), points)
+    assert np.allclose(translated, [[1, -1, 2], [2, 1, 5]])
+
+
+@pytest.mark.parametrize(
+    "target", [(1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, -1), (2, 3, -8)]
+)
+def test_GIVEN_two_directions_WHEN_creating_rotation_between_them_THEN_first_is_rotated_onto_second(
+    target,
+):
+    matrix = rotation_matrix_between((0, 0, 1), target)
+    rotated = transform_points(matrix, [[0, 0, 1]])[0]
+    assert rotated == approx(normalise(target)[0])
+    assert np.linalg.det(matrix[:3, :3]) == approx(1)
+
+
+def test_GIVEN_anticlockwise_triangle_WHEN_calculating_normals_THEN_normal_follows_right_hand_rule():
+    vertices = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (0, 0, 1)]
+    normals = triangle_normals(vertices, [[0, 1, 2], [0, 2, 1], [0, 3, 1]])
+    assert np.allclose(normals, [[0, 0, 1], [0, 0, -1], [0, 1, 0]])
+
+
+def test_GIVEN_camera_looking_down_z_WHEN_casting_ray_through_screen_point_THEN_ray_starts_on_near_plane():
+    projection = np.array(
+        [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, -101 / 99, -200 / 99], [0, 0, -1, 0]]
+    )
+    view = translation_matrix((0, 0, -10))
+
+    origin, direction = ray_through_screen_point(view, projection, 0, 0)
+    assert origin == approx([0, 0, 9])
+    assert direction == approx([0, 0, -1])
+
+    origin, direction = ray_through_screen_point(view, projection, 1, 0)
+    assert origin == approx([1, 0, 9])
+    assert direction == approx(normalise((1, 0, -1))[0])
@@ -0,0 +1,155 @@
+import numpy as np
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DRender import Qt3DRender
+
+from nexus_constructor.geometry.vector_math import translation_matrix
+from nexus_constructor.instrument_view.batched_mesh import ComponentBatch, MeshBatch
+from nexus_constructor.model.geometry import OFFCube
+
+TRIANGLE_VERTICES = np.array([(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)])
+TRIANGLE = [[0, 1, 2]]
+
+
+def _batch_of_two_triangles() -> MeshBatch:
+    batch = MeshBatch()
+    batch.add("first", TRIANGLE_VERTICES, TRIANGLE)
+    batch.add("second", TRIANGLE_VERTICES, TRIANGLE)
+    return batch
+
+
+def test_GIVEN_components_WHEN_building_batch_THEN_each_component_has_its_own_index_range():
+    batch = _batch_of_two_triangles()
+
+    positions, normals, indices = batch.build()
+
+    assert len(positions) == len(normals) == 2 * len(TRIANGLE_VERTICES)
+    assert batch.index_ranges == {"first": (0, 3), "second": (3, 3)}
+    assert np.array_equal(positions[indices[:3]], TRIANGLE_VERTICES)
+    assert np.array_equal(positions[indices[3:]], TRIANGLE_VERTICES)
+
+
+def test_GIVEN_transformation_WHEN_building_batch_THEN_only_that_component_is_moved_into_world_coordinates():
+    batch = _batch_of_two_triangles()
+    batch.set_transform("second", translation_matrix((0.0, 0.0, 5.0)))
+
+    positions, _, indices = batch.build()
+
+    assert np.array_equal(positions[indices[:3]], TRIANGLE_VERTICES)
+    assert np.array_equal(
+        positions[indices[3:]], TRIANGLE_VERTICES + np.array([0.0, 0.0, 5.0])
+    )
+
+
+def test_GIVEN_rotation_WHEN_building_batch_THEN_normals_are_rotated():
+    batch = MeshBatch()
+    batch.add("component", TRIANGLE_VERTICES, TRIANGLE)
+    # Rotate 180 degrees about the x axis
+    batch.set_transform("component", np.diag([1.0, -1.0, -1.0, 1.0]))
+
+    _, normals, _ = batch.build()
+
+    assert np.allclose(normals, [(0.0, 0.0, -1.0)] * 3)
+
+
+def test_GIVEN_hidden_component_WHEN_building_batch_THEN_its_indices_are_zeroed():
+    batch = _batch_of_two_triangles()
+    batch.set_visible("first", False)
+
+    positions, _, indices = batch.build()
+
+    assert batch.index_ranges == {"first": (0, 3), "second": (3, 3)}
+    assert np.array_equal(indices[:3], [0, 0, 0])
+    assert np.array_equal(positions[indices[3:]], TRIANGLE_VERTICES)
+
+    batch.set_visible("first", True)
+
+    assert batch.update_visibility() == [(0, 3)]
+    assert np.array_equal(positions[indices[:3]], TRIANGLE_VERTICES)
+
+
+def test_GIVEN_built_batch_WHEN_component_moves_THEN_only_its_vertices_are_transformed():
+    batch = _batch_of_two_triangles()
+    positions, _, indices = batch.build()
+    first_positions = positions[:3].copy()
+
+    batch.set_transform("second", translation_matrix((0.0, 0.0, 5.0)))
+
+    assert not batch.needs_build
+    assert batch.update_transforms() == [(3, 3)]
+    assert np.array_equal(positions[:3], first_positions)
+    assert np.array_equal(
+        positions[indices[3:]], TRIANGLE_VERTICES + np.array([0.0, 0.0, 5.0])
+    )
+
+
+def test_GIVEN_all_components_moved_WHEN_updating_THEN_their_vertex_ranges_are_joined():
+    batch = _batch_of_two_triangles()
+    batch.build()
+
+    batch.reset_transforms()
+
+    assert batch.update_transforms() == [(0, 6)]
+
+
+def test_GIVEN_removed_component_WHEN_building_batch_THEN_it_is_not_included():
+    batch = _batch_of_two_triangles()
+    batch.remove("first")
+
+    batch.build()
+
+    assert "first" not in batch
+    assert batch.index_ranges == {"second": (0, 3)}
+
+
+def test_GIVEN_no_visible_components_WHEN_building_batch_THEN_buffers_are_empty():
+    batch = MeshBatch()
+
+    positions, normals, indices = batch.build()
+
+    assert len(positions) == len(normals) == len(indices) == 0
+
+
+def test_GIVEN_several_changes_WHEN_event_loop_runs_THEN_component_batch_is_updated_once(
+    qtbot,
+):
+    root = Qt3DCore.QEntity()
+    batch = ComponentBatch(root, Qt3DRender.QMaterial(root))
+    updates = []
+    build = batch.mesh_batch.build
+
+    def count_builds():
+        updates.append(None)
+        return build()
+
+    batch.mesh_batch.build = count_builds
+
+    batch.add_component("cube", OFFCube, None)
+    batch.add_component("pixels", OFFCube, np.array([(0, 0, 0), (2, 0, 0)]))
+    batch.set_transform("cube", translation_matrix((0.0, 3.0, 0.0)))
+    qtbot.waitUntil(lambda: len(updates) > 0)
+
+    assert len(updates) == 1
+    # 12 triangles in each of the 3 cubes
+    assert batch.geometry.vertex_count == 3 * 12 * 3
+    assert batch.renderer.vertexCount() == batch.geometry.vertex_count
+    assert batch.entity.isEnabled()
+
+
+def test_GIVEN_built_component_batch_WHEN_component_is_hidden_THEN_buffers_are_not_rebuilt(
+    qtbot,
+):
+    root = Qt3DCore.QEntity()
+    batch = ComponentBatch(root, Qt3DRender.QMaterial(root))
+    batch.add_component("cube", OFFCube, None)
+    batch.update()
+    builds = []
+    batch.mesh_batch.build = lambda: builds.append(None)
+
+    batch.set_visible("cube", False)
+    batch.update()
+
+    assert not builds
+    assert not any(
+        np.frombuffer(batch.geometry.index_attribute.buffer().data(), np.uint32)
+    )
+    assert not batch.entity.isEnabled()
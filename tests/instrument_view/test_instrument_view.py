@@ -1,6 +1,16 @@
-from mock import Mock
+import numpy as np
+from mock import Mock, patch
+from PySide2.QtGui import QVector3D
+from pytest import approx
 
-from nexus_constructor.instrument_view.instrument_view import InstrumentView
+from nexus_constructor.instrument_view.instrument_view import (
+    DEFAULT_FAR_PLANE,
+    DEFAULT_NEAR_PLANE,
+    InstrumentView,
+)
+from nexus_constructor.model.geometry import OFFCube
+from nexus_constructor.model.instrument import SAMPLE_NAME
+from nexus_constructor.startup_trace import FIRST_FRAME_EVENT
 
 
 def test_GIVEN_cube_dimensions_WHEN_calling_set_cube_mesh_dimesions_THEN_dimensions_set():
@@ -47,3 +57,191 @@ def test_GIVEN_entity_and_camera_WHEN_zooming_to_component_THEN_camera_zooms_to_
 
     InstrumentView.zoom_to_component(mock_entity, mock_camera)
     mock_camera.viewEntity.assert_called_once()
+
+
+def test_GIVEN_first_frame_WHEN_frame_action_triggers_THEN_startup_trace_is_marked_and_written_once():
+    mock_view = Mock()
+
+    with patch(
+        "nexus_constructor.instrument_view.instrument_view.startup_tracer"
+    ) as tracer:
+        InstrumentView._on_first_frame(mock_view, 0.016)
+
+    tracer.mark.assert_called_once_with(FIRST_FRAME_EVENT)
+    tracer.write.assert_called_once()
+    mock_view.first_frame_action.triggered.disconnect.assert_called_once()
+    mock_view.first_frame_action.setEnabled.assert_called_once_with(False)
+
+
+def test_GIVEN_components_removed_or_replaced_since_levels_of_detail_requested_WHEN_levels_are_ready_THEN_they_are_ignored():
+    mock_view = Mock()
+    mock_view._level_of_detail_requests = {b"mesh": {"detector"}}
+    mock_view._levels_of_detail = {}
+    mock_view.geometry_pool = set()
+    mock_view._component_geometry_keys = {"detector": b"replaced"}
+
+    with patch(
+        "nexus_constructor.instrument_view.instrument_view.create_level_geometries"
+    ) as create_geometries:
+        InstrumentView._add_levels_of_detail(mock_view, b"mesh", [Mock()])
+        mock_view.geometry_pool = {b"mesh"}
+        mock_view._level_of_detail_requests = {b"mesh": {"detector"}}
+        InstrumentView._add_levels_of_detail(mock_view, b"mesh", [Mock()])
+
+    create_geometries.assert_called_once()
+    mock_view._add_levels_to_component.assert_not_called()
+    assert not mock_view._level_of_detail_requests
+
+
+def test_GIVEN_components_with_same_mesh_WHEN_levels_of_detail_are_ready_THEN_they_are_added_to_each_component():
+    mock_view = Mock()
+    mock_view._level_of_detail_requests = {b"mesh": {"first", "second"}}
+    mock_view._levels_of_detail = {}
+    mock_view.geometry_pool = {b"mesh"}
+    mock_view._component_geometry_keys = {"first": b"mesh", "second": b"mesh"}
+    levels = [Mock()]
+
+    with patch(
+        "nexus_constructor.instrument_view.instrument_view.create_level_geometries"
+    ) as create_geometries:
+        InstrumentView._add_levels_of_detail(mock_view, b"mesh", levels)
+
+    create_geometries.assert_called_once()
+    assert mock_view._levels_of_detail[b"mesh"] == (
+        levels,
+        create_geometries.return_value,
+    )
+    assert sorted(
+        call.args[0] for call in mock_view._add_levels_to_component.call_args_list
+    ) == ["first", "second"]
+
+
+def test_GIVEN_levels_of_detail_of_mesh_WHEN_requesting_them_for_another_component_THEN_they_are_reused():
+    mock_view = Mock()
+    mock_view._levels_of_detail = {b"mesh": ([Mock()], [Mock()])}
+    mock_view._level_of_detail_requests = {}
+
+    with patch(
+        "nexus_constructor.instrument_view.instrument_view.QThreadPool"
+    ) as thread_pool:
+        InstrumentView._request_levels_of_detail(mock_view, "second", b"mesh", Mock())
+
+    mock_view._add_levels_to_component.assert_called_once_with("second", b"mesh")
+    thread_pool.globalInstance().start.assert_not_called()
+
+
+def test_GIVEN_request_for_mesh_in_progress_WHEN_requesting_levels_of_detail_THEN_component_waits_for_it():
+    mock_view = Mock()
+    mock_view._levels_of_detail = {}
+    mock_view._level_of_detail_requests = {}
+
+    with patch(
+        "nexus_constructor.instrument_view.instrument_view.QThreadPool"
+    ) as thread_pool:
+        InstrumentView._request_levels_of_detail(mock_view, "first", b"mesh", Mock())
+        InstrumentView._request_levels_of_detail(mock_view, "second", b"mesh", Mock())
+
+    thread_pool.globalInstance().start.assert_called_once()
+    assert mock_view._level_of_detail_requests == {b"mesh": {"first", "second"}}
+
+
+def test_GIVEN_batching_enabled_WHEN_adding_small_component_THEN_it_is_added_to_a_batch():
+    mock_view = Mock()
+    mock_view.batching_enabled = True
+    mock_view.component_entities = {}
+
+    InstrumentView.add_component(mock_view, "monitor", OFFCube)
+
+    mock_view._add_component_to_batch.assert_called_once()
+    assert "monitor" not in mock_view.component_entities
+
+
+def test_GIVEN_batching_enabled_WHEN_adding_sample_THEN_it_is_not_batched():
+    mock_view = Mock()
+    mock_view.batching_enabled = True
+    mock_view.component_entities = {}
+    mock_view._component_meshes = {}
+    mock_view._level_of_detail_requests = {}
+    mock_view._component_geometry_keys = {}
+
+    with patch("nexus_constructor.instrument_view.instrument_view.OffMesh"), patch(
+        "nexus_constructor.instrument_view.instrument_view.create_qentity"
+    ):
+        InstrumentView.add_component(mock_view, SAMPLE_NAME, OFFCube)
+
+    mock_view._add_component_to_batch.assert_not_called()
+    assert SAMPLE_NAME in mock_view.component_entities
+
+
+def test_GIVEN_ray_hits_component_WHEN_picking_THEN_component_name_is_emitted():
+    mock_view = Mock()
+    mock_view.spatial_index.pick.return_value = "detector"
+
+    InstrumentView.pick_component(mock_view, np.zeros(3), np.array([0, 0, -1]))
+
+    mock_view.component_picked.emit.assert_called_once_with("detector")
+
+
+def test_GIVEN_ray_misses_components_WHEN_picking_THEN_nothing_is_emitted():
+    mock_view = Mock()
+    mock_view.spatial_index.pick.return_value = None
+
+    InstrumentView.pick_component(mock_view, np.zeros(3), np.array([0, 0, -1]))
+
+    mock_view.component_picked.emit.assert_not_called()
+
+
+def test_GIVEN_component_bounds_WHEN_zooming_to_component_THEN_camera_views_sphere_around_bounds():
+    mock_view = Mock()
+    mock_view.spatial_index.world_bounds.return_value = (
+        np.array([0, 0, 0]),
+        np.array([2, 2, 2]),
+    )
+
+    InstrumentView.zoom_to_component_by_name(mock_view, "detector")
+
+    mock_view._frame_bounds.assert_called_once()
+    mock_view.get_entity.assert_not_called()
+
+
+def test_GIVEN_bounds_WHEN_framing_them_THEN_camera_views_sphere_containing_them():
+    mock_view = Mock()
+
+    InstrumentView._frame_bounds(mock_view, np.array([0, 0, 0]), np.array([2, 2, 2]))
+
+    mock_view.view.camera().viewSphere.assert_called_once_with(
+        QVector3D(1, 1, 1), approx(np.sqrt(3))
+    )
+    mock_view.fit_clipping_planes.assert_called_once()
+
+
+def test_GIVEN_components_beyond_default_far_plane_WHEN_fitting_clipping_planes_THEN_far_plane_contains_them():
+    mock_view = Mock()
+    mock_view.spatial_index.scene_bounds.return_value = (
+        np.array([-1, -1, -5000]),
+        np.array([1, 1, 0]),
+    )
+    mock_view.view.camera().position.return_value = QVector3D(0, 0, 10)
+
+    InstrumentView.fit_clipping_planes(mock_view)
+
+    far_plane = mock_view.view.camera().setFarPlane.call_args[0][0]
+    near_plane = mock_view.view.camera().setNearPlane.call_args[0][0]
+    assert far_plane > 5010
+    assert near_plane / far_plane == approx(DEFAULT_NEAR_PLANE / DEFAULT_FAR_PLANE)
+
+
+def test_GIVEN_components_within_default_far_plane_WHEN_fitting_clipping_planes_THEN_default_planes_are_used():
+    mock_view = Mock()
+    mock_view.spatial_index.scene_bounds.return_value = (
+        np.array([-1, -1, -1]),
+        np.array([1, 1, 1]),
+    )
+    mock_view.view.camera().position.return_value = QVector3D(0, 0, 10)
+
+    InstrumentView.fit_clipping_planes(mock_view)
+
+    mock_view.view.camera().setFarPlane.assert_called_once_with(DEFAULT_FAR_PLANE)
+    mock_view.view.camera().setNearPlane.assert_called_once_with(
+        approx(DEFAULT_NEAR_PLANE)
+    )
@@ -0,0 +1,95 @@
+import sys
+
+import numpy as np
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.Qt3DRender import Qt3DRender
+
+from benchmarks.generators import plane_mesh
+from nexus_constructor.geometry.level_of_detail import SimplifiedMesh
+from nexus_constructor.instrument_view.level_of_detail import (
+    LevelOfDetailSignals,
+    LevelOfDetailWorker,
+    add_levels_of_detail,
+    create_level_geometries,
+)
+from nexus_constructor.instrument_view.off_renderer import OffMesh
+from nexus_constructor.instrument_view.qentity_utils import create_qentity
+from nexus_constructor.model.geometry import OFFCube, OFFGeometryNoNexus
+
+
+def _child_entities(entity):
+    return [
+        child for child in entity.childNodes() if isinstance(child, Qt3DCore.QEntity)
+    ]
+
+
+def test_GIVEN_dense_mesh_WHEN_worker_runs_THEN_levels_are_emitted_with_key_of_mesh(
+    qtbot,
+):
+    signals = LevelOfDetailSignals()
+    worker = LevelOfDetailWorker(
+        "detector", b"mesh", OFFGeometryNoNexus(*plane_mesh(200)), signals
+    )
+
+    with qtbot.waitSignal(signals.levels_ready) as blocker:
+        worker.run()
+
+    key, levels = blocker.args
+    assert key == b"mesh"
+    assert levels
+
+
+def test_GIVEN_small_mesh_WHEN_worker_runs_THEN_nothing_is_emitted(qtbot):
+    signals = LevelOfDetailSignals()
+    worker = LevelOfDetailWorker("sample", b"cube", OFFCube, signals)
+
+    with qtbot.assertNotEmitted(signals.levels_ready):
+        worker.run()
+
+
+def test_GIVEN_levels_WHEN_adding_them_to_entity_THEN_entity_switches_between_a_child_entity_per_level():
+    root = Qt3DCore.QEntity()
+    mesh = OffMesh(OFFCube, root)
+    material = Qt3DRender.QMaterial(root)
+    entity = create_qentity([mesh, material], root)
+    camera = Qt3DRender.QCamera(root)
+    levels = [
+        SimplifiedMesh(
+            np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0)]), np.array([[0, 1, 2]]), 10.0
+        ),
+        SimplifiedMesh(
+            np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0)]), np.array([[0, 1, 2]]), 100.0
+        ),
+    ]
+
+    switch = add_levels_of_detail(entity, mesh, material, levels, camera)
+
+    assert mesh not in entity.components()
+    children = _child_entities(entity)
+    assert len(children) == 1 + len(levels)
+    assert mesh in children[0].components()
+    assert all(material in child.components() for child in children)
+    assert switch in entity.components()
+    assert switch.camera() == camera
+    assert switch.thresholds() == [10.0, 100.0, sys.float_info.max]
+
+
+def test_GIVEN_level_geometries_WHEN_adding_levels_to_two_entities_THEN_both_draw_the_same_buffers():
+    root = Qt3DCore.QEntity()
+    material = Qt3DRender.QMaterial(root)
+    camera = Qt3DRender.QCamera(root)
+    levels = [
+        SimplifiedMesh(
+            np.array([(0, 0, 0), (1, 0, 0), (0, 1, 0)]), np.array([[0, 1, 2]]), 10.0
+        )
+    ]
+    level_geometries = create_level_geometries(levels, root)
+
+    level_meshes = []
+    for _ in range(2):
+        mesh = OffMesh(OFFCube, root)
+        entity = create_qentity([mesh, material], root)
+        add_levels_of_detail(entity, mesh, material, levels, camera, level_geometries)
+        level_meshes.append(_child_entities(entity)[1].components()[-1])
+
+    assert all(mesh.geometry() == level_geometries[0] for mesh in level_meshes)
@@ -1,101 +1,132 @@
-import itertools
-
-from PySide2.QtGui import QVector3D
+import numpy as np
+from PySide2.Qt3DCore import Qt3DCore
 
+from nexus_constructor.geometry.utils import convert_faces_into_triangles
+from nexus_constructor.geometry.vector_math import triangle_normals
 from nexus_constructor.instrument_view.off_renderer import (
+    GeometryPool,
     OffMesh,
     QtOFFGeometry,
-    create_normal_buffer,
-    create_vertex_buffer,
+    create_indexed_buffers,
+    create_repeated_indexed_buffers,
+    geometry_key,
 )
 from nexus_constructor.model.geometry import OFFCube, OFFGeometryNoNexus
 
 TRIANGLES_IN_SQUARE = 2
 VERTICES_IN_TRIANGLE = 3
-POINTS_IN_VERTEX = 3
-VERTICES_IN_CUBE = 6
+VERTICES_IN_SQUARE = 4
+FACES_IN_CUBE = 6
 
 
-def test_GIVEN_a_single_triangle_face_WHEN_creating_vertex_buffer_THEN_output_is_correct():
-    vertices = [QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)]
+def test_GIVEN_a_single_triangle_face_WHEN_creating_indexed_buffers_THEN_output_is_correct():
+    vertices = [(0, 0, 0), (0, 1, 0), (1, 1, 0)]
     faces = [[0, 1, 2]]
 
-    vertex_buffer = create_vertex_buffer(vertices, faces)
-
-    expected_output = itertools.chain.from_iterable([v.toTuple() for v in vertices])
+    positions, normals, indices = create_indexed_buffers(vertices, faces)
 
-    assert list(vertex_buffer) == list(expected_output)
+    assert np.array_equal(positions[indices], vertices)
+    assert np.array_equal(normals, [[0.0, 0.0, -1.0]] * VERTICES_IN_TRIANGLE)
+    assert indices.dtype == np.uint32
 
 
-def test_GIVEN_a_set_of_triangle_faces_WHEN_creating_vertex_buffer_THEN_length_is_total_points_in_all_faces():
+def test_GIVEN_a_square_WHEN_creating_indexed_buffers_THEN_triangles_share_vertices():
     vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 1),
+        (0, 0, 0),
+        (0, 1, 0),
+        (1, 1, 0),
+        (1, 0, 0),
     ]
-    faces = [[0, 1, 2], [3, 2, 0], [2, 3, 1]]
-
-    vertex_buffer = create_vertex_buffer(vertices, faces)
+    # 2 triangles make up the square
+    triangles = [[0, 1, 2], [2, 3, 0]]
 
-    NUM_OF_TRIANGLES = len(faces)
+    positions, normals, indices = create_indexed_buffers(vertices, triangles)
 
-    assert (
-        len(list(vertex_buffer))
-        == NUM_OF_TRIANGLES * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
-    )
+    assert len(positions) == len(vertices)
+    assert len(indices) == TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE
+    assert np.array_equal(positions[indices], np.array(vertices)[np.ravel(triangles)])
+    assert np.array_equal(normals, [[0.0, 0.0, -1.0]] * len(vertices))
 
 
-def test_GIVEN_a_square_WHEN_creating_vertex_buffer_THEN_length_is_correct():
+def test_GIVEN_triangles_facing_different_directions_WHEN_creating_indexed_buffers_THEN_shared_vertices_are_repeated_for_flat_shading():
     vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(1, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
+        (0, 0, 0),
+        (0, 1, 0),
+        (1, 1, 0),
+        (1, 0, 1),
     ]
-    # 2 triangles make up the square
-    triangles = [[0, 1, 2], [2, 3, 0]]
+    faces = [[0, 1, 2], [3, 2, 0], [2, 3, 1]]
 
-    vertex_buffer = create_vertex_buffer(vertices, triangles)
+    positions, normals, indices = create_indexed_buffers(vertices, faces)
 
-    assert (
-        len(list(vertex_buffer))
-        == TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE * POINTS_IN_VERTEX
+    expected_normals = triangle_normals(vertices, faces)
+    assert len(positions) == len(faces) * VERTICES_IN_TRIANGLE
+    assert np.array_equal(positions[indices], np.array(vertices)[np.ravel(faces)])
+    assert np.allclose(
+        normals[indices], np.repeat(expected_normals, VERTICES_IN_TRIANGLE, axis=0)
     )
 
 
-def test_GIVEN_a_single_triangle_face_WHEN_creating_normal_buffer_THEN_output_is_correct():
-    vertices = [QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)]
-    faces = [[0, 1, 2]]
-
-    normal = create_normal_buffer(vertices, faces)
+def test_GIVEN_cube_WHEN_creating_indexed_buffers_THEN_each_face_has_its_own_vertices():
+    triangles = convert_faces_into_triangles(OFFCube.faces)
 
-    expected_output = [0.0, 0.0, -1.0] * 3
+    positions, _, indices = create_indexed_buffers(OFFCube.vertices, triangles)
 
-    assert list(normal) == expected_output
+    assert len(positions) == VERTICES_IN_SQUARE * FACES_IN_CUBE
+    assert len(indices) == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * FACES_IN_CUBE
 
 
-def test_GIVEN_a_square_face_WHEN_creating_normal_buffer_THEN_output_is_correct():
-    vertices = [
-        QVector3D(0, 0, 0),
-        QVector3D(0, 1, 0),
-        QVector3D(1, 1, 0),
-        QVector3D(1, 0, 0),
-    ]
-    # 2 triangles make up the square
-    triangles = [[0, 1, 2], [2, 3, 0]]
-
-    normal = create_normal_buffer(vertices, triangles)
+def test_GIVEN_faceted_curved_surface_WHEN_creating_indexed_buffers_THEN_each_facet_is_shaded_flat():
+    segments = 36
+    angles = np.linspace(0.0, 2 * np.pi, segments, endpoint=False)
+    vertices = np.concatenate(
+        [
+            np.column_stack((np.cos(angles), np.sin(angles), np.full(segments, z)))
+            for z in (0.0, 1.0)
+        ]
+    )
+    triangles = []
+    for segment in range(segments):
+        next_segment = (segment + 1) % segments
+        triangles.append([segment, next_segment, next_segment + segments])
+        triangles.append([segment, next_segment + segments, segment + segments])
+
+    positions, normals, indices = create_indexed_buffers(vertices, triangles)
+
+    # The two triangles of each facet share its four corners, which are not shared with the neighbouring facets
+    assert len(positions) == 4 * segments
+    assert np.array_equal(positions[indices], vertices[np.ravel(triangles)])
+    corner_normals = normals[indices].reshape(-1, 3, 3)
+    assert np.allclose(corner_normals, corner_normals[:, :1])
+
+
+def test_GIVEN_positions_WHEN_creating_repeated_indexed_buffers_THEN_each_copy_is_the_mesh_moved_to_its_position():
+    positions = np.array([[0, 0, 0], [2, 0, 0], [0, 0, 5]], dtype=np.float32)
+    triangles = convert_faces_into_triangles(OFFCube.faces)
+    cube_positions, cube_normals, cube_indices = create_indexed_buffers(
+        OFFCube.vertices, triangles
+    )
 
-    expected_output = [0.0, 0.0, -1.0] * TRIANGLES_IN_SQUARE * VERTICES_IN_TRIANGLE
+    (
+        repeated_positions,
+        repeated_normals,
+        repeated_indices,
+    ) = create_repeated_indexed_buffers(OFFCube, positions)
 
-    assert list(normal) == expected_output
+    assert len(repeated_indices) == len(positions) * len(cube_indices)
+    for copy, position in enumerate(positions):
+        indices = repeated_indices[
+            copy * len(cube_indices) : (copy + 1) * len(cube_indices)
+        ]
+        assert np.allclose(
+            repeated_positions[indices], cube_positions[cube_indices] + position
+        )
+        assert np.allclose(repeated_normals[indices], cube_normals[cube_indices])
 
 
 def test_GIVEN_a_triangle_WHEN_creating_off_geometry_with_no_pixel_data_THEN_vertex_count_equals_3():
     off_geometry = OFFGeometryNoNexus(
-        vertices=[QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)],
-        faces=[[0, 1, 2]],
+        vertices=[(0, 0, 0), (0, 1, 0), (1, 1, 0)], faces=[[0, 1, 2]],
     )
 
     qt_geometry = QtOFFGeometry(off_geometry, None)
@@ -107,16 +138,58 @@ def test_WHEN_creating_off_mesh_with_cube_THEN_geometry_contains_cube():
     off_mesh = OffMesh(OFFCube, None)
     assert (
         off_mesh.geometry().vertex_count
-        == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * VERTICES_IN_CUBE
+        == VERTICES_IN_TRIANGLE * TRIANGLES_IN_SQUARE * FACES_IN_CUBE
     )
 
 
 def test_GIVEN_geometry_WHEN_creating_off_mesh_THEN_geometry_contains_original_geometry():
     off_output = OFFGeometryNoNexus(
-        vertices=[QVector3D(0, 0, 0), QVector3D(0, 1, 0), QVector3D(1, 1, 0)],
-        faces=[[0, 1, 2]],
+        vertices=[(0, 0, 0), (0, 1, 0), (1, 1, 0)], faces=[[0, 1, 2]],
     )
 
     off_mesh = OffMesh(off_output, None)
 
     assert off_mesh.geometry().vertex_count == VERTICES_IN_TRIANGLE
+
+
+def test_GIVEN_geometry_WHEN_creating_off_geometry_THEN_it_is_drawn_with_an_index_attribute():
+    qt_geometry = QtOFFGeometry(OFFCube, None)
+
+    index_attributes = [
+        attribute
+        for attribute in qt_geometry.attributes()
+        if attribute.attributeType() == attribute.IndexAttribute
+    ]
+
+    assert len(index_attributes) == 1
+    assert index_attributes[0].vertexBaseType() == index_attributes[0].UnsignedInt
+    assert index_attributes[0].count() == qt_geometry.vertex_count
+
+
+def test_GIVEN_identical_shapes_WHEN_getting_geometries_from_pool_THEN_buffers_are_shared():
+    pool = GeometryPool(Qt3DCore.QEntity())
+    other_cube = OFFGeometryNoNexus(OFFCube.vertices, OFFCube.faces)
+    cube_key = geometry_key(OFFCube)
+    assert geometry_key(other_cube) == cube_key
+    assert geometry_key(OFFCube, np.zeros((2, 3))) != cube_key
+
+    first_mesh = OffMesh(OFFCube, None, qt_geometry=pool.acquire(cube_key, OFFCube))
+    second_mesh = OffMesh(
+        other_cube, None, qt_geometry=pool.acquire(cube_key, other_cube)
+    )
+
+    assert first_mesh.geometry() is second_mesh.geometry()
+    assert len(pool) == 1
+
+
+def test_GIVEN_geometry_used_by_two_meshes_WHEN_releasing_it_THEN_it_is_deleted_after_the_last_release():
+    pool = GeometryPool(Qt3DCore.QEntity())
+    key = geometry_key(OFFCube)
+    pool.acquire(key, OFFCube)
+    pool.acquire(key, OFFCube)
+
+    pool.release(key)
+    assert len(pool) == 1
+
+    pool.release(key)
+    assert len(pool) == 0
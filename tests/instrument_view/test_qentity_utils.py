@@ -1,6 +1,9 @@
 from mock import Mock, call, patch
+from PySide2.Qt3DCore import Qt3DCore
+from PySide2.QtGui import QColor
 
 from nexus_constructor.instrument_view.qentity_utils import (
+    MaterialPool,
     create_material,
     create_qentity,
 )
@@ -68,3 +71,13 @@ def test_GIVEN_components_WHEN_calling_add_components_to_entity_THEN_components_
     mock_entity.addComponent.assert_has_calls(calls)
 
     mock.assert_called_once_with(mock_parent)
+
+
+def test_GIVEN_same_properties_WHEN_getting_material_from_pool_THEN_material_is_shared():
+    pool = MaterialPool(Qt3DCore.QEntity())
+
+    material = pool.get_material(QColor("black"), QColor("grey"))
+
+    assert pool.get_material(QColor("black"), QColor("grey")) is material
+    assert pool.get_material(QColor("red"), QColor("grey")) is not material
+    assert pool.get_material(QColor("black"), QColor("grey"), alpha=0.5) is not material
@@ -0,0 +1,30 @@
+import numpy as np
+from PySide2.QtGui import QMatrix4x4, QVector3D
+
+from nexus_constructor.geometry.vector_math import rotation_matrix, translation_matrix
+from nexus_constructor.instrument_view.qt_conversions import (
+    numpy_matrix_to_qmatrix,
+    numpy_matrix_to_qtransform,
+    qmatrix_to_numpy_matrix,
+)
+
+
+def test_GIVEN_rotation_matrix_WHEN_converting_to_qmatrix_THEN_it_matches_qt_rotation():
+    expected = QMatrix4x4()
+    expected.rotate(30, QVector3D(1, 2, 3))
+
+    converted = numpy_matrix_to_qmatrix(rotation_matrix((1, 2, 3), 30))
+
+    assert np.allclose(converted.data(), expected.data(), atol=1e-6)
+
+
+def test_GIVEN_translation_matrix_WHEN_converting_to_qtransform_THEN_translation_is_kept():
+    transform = numpy_matrix_to_qtransform(translation_matrix((1, 2, 3)))
+
+    assert transform.translation() == QVector3D(1, 2, 3)
+
+
+def test_GIVEN_matrix_WHEN_converting_to_qmatrix_and_back_THEN_it_is_unchanged():
+    matrix = translation_matrix((1, 2, 3)) @ rotation_matrix((1, 2, 3), 30)
+
+    assert np.allclose(qmatrix_to_numpy_matrix(numpy_matrix_to_qmatrix(matrix)), matrix)
@@ -4,11 +4,11 @@ from typing import Type
 import numpy as np
 import pytest
 from mock import mock_open, patch
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.json.json_warnings import (
     JsonWarning,
     JsonWarningsContainer,
+    LinkTargetMissing,
     TransformDependencyMissing,
 )
 from nexus_constructor.json.load_from_json import (
@@ -22,6 +22,7 @@ from nexus_constructor.model.attributes import FieldAttribute
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.group import Group
+from nexus_constructor.model.model import Model
 from nexus_constructor.model.value_type import VALUE_TYPE_TO_NP, ValueTypes
 
 
@@ -338,7 +339,7 @@ def component_with_transformation() -> Component:
     transformation = comp.add_rotation(
         name="Transformation",
         angle=90,
-        axis=QVector3D(1, 0, 0),
+        axis=(1, 0, 0),
         depends_on=None,
         values=Dataset(name="test", values=123, type=ValueTypes.DOUBLE),
     )
@@ -480,6 +481,60 @@ def test_GIVEN_json_with_transformation_depending_on_non_existent_transform_WHEN
     ), "Expected a warning due to depends_on pointing to a non-existent transform"
 
 
+def _get_test_component_children(json_dict):
+    return json_dict["children"][0]["children"][0]["children"][0]["children"]
+
+
+@pytest.mark.parametrize(
+    "depends_on_path",
+    [
+        "transformations/location",
+        "./transformations/../transformations/location",
+        "/entry/test_component/transformations/location",
+    ],
+)
+def test_GIVEN_component_with_relative_or_moved_depends_on_path_WHEN_loaded_THEN_component_depends_on_transform(
+    json_dict_with_component_and_transform, json_reader, depends_on_path
+):
+    _get_test_component_children(json_dict_with_component_and_transform)[0][
+        "values"
+    ] = depends_on_path
+
+    json_reader._load_from_json_dict(json_dict_with_component_and_transform)
+
+    component = json_reader.entry.instrument.path_index.get(
+        "/entry/instrument/test_component"
+    )
+    assert component.depends_on.name == "location"
+    assert not contains_warning_of_type(
+        json_reader.warnings, TransformDependencyMissing
+    )
+
+
+@pytest.mark.parametrize(
+    "target,expect_warning",
+    [
+        ("/entry/instrument/test_component/missing", True),
+        ("/entry/instrument/test_component/transformations/location", False),
+        ("transformations/location", False),
+        ("/entry/elsewhere", False),
+    ],
+)
+def test_GIVEN_link_WHEN_loaded_THEN_warning_is_added_only_if_target_in_instrument_is_missing(
+    json_dict_with_component_and_transform, json_reader, target, expect_warning
+):
+    _get_test_component_children(json_dict_with_component_and_transform).append(
+        {"name": "link", "type": "link", "target": target}
+    )
+
+    json_reader._load_from_json_dict(json_dict_with_component_and_transform)
+
+    assert (
+        contains_warning_of_type(json_reader.warnings, LinkTargetMissing)
+        == expect_warning
+    )
+
+
 @pytest.mark.parametrize(
     "test_input",
     ({}, {"type": "dataset", "values": 0,}, {"attributes": []},),  # noqa E231
@@ -569,3 +624,37 @@ def test_GIVEN_dataset_with_array_value_WHEN_adding_dataset_THEN_dataset_object_
     assert np.array_equal(ds.values, np_array)
     assert ds.parent_node == parent
     assert ds.type == dtype
+
+
+def test_GIVEN_shape_exported_as_link_to_identical_shape_WHEN_loaded_THEN_component_has_the_same_shape(
+    json_reader,
+):
+    model = Model()
+    for name in ["first", "second"]:
+        component = Component(name, parent_node=model.entry.instrument)
+        component.nx_class = "NXmonitor"
+        component.set_cylinder_shape(height=2.0, radius=0.5)
+        model.entry.instrument.component_list.append(component)
+
+    json_reader.load_model_from_dict(model.as_dict(link_shared_shapes=True))
+
+    first, second = [
+        json_reader.entry.instrument.path_index.get(f"/entry/instrument/{name}")
+        for name in ["first", "second"]
+    ]
+    assert second.shape[0].radius == pytest.approx(0.5)
+    assert second.shape[0].height == pytest.approx(2.0)
+    assert second.shape[0]["vertices"].values is first.shape[0]["vertices"].values
+    assert not contains_warning_of_type(json_reader.warnings, LinkTargetMissing)
+
+
+def test_GIVEN_shape_link_to_missing_shape_WHEN_loaded_THEN_warning_is_added(
+    json_dict_with_component_and_transform, json_reader
+):
+    _get_test_component_children(json_dict_with_component_and_transform).append(
+        {"name": "shape", "type": "link", "target": "/entry/instrument/other/shape"}
+    )
+
+    json_reader._load_from_json_dict(json_dict_with_component_and_transform)
+
+    assert contains_warning_of_type(json_reader.warnings, LinkTargetMissing)
@@ -1,9 +1,9 @@
+from copy import deepcopy
 from typing import List
 
 import numpy as np
 import pytest
 from mock import Mock, call
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.common_attrs import (
     CYLINDRICAL_GEOMETRY_NX_CLASS,
@@ -469,9 +469,7 @@ def test_GIVEN_off_shape_json_WHEN_reading_shape_THEN_geometry_object_has_expect
     vertices_dataset = off_shape_reader._get_shape_dataset_from_list(
         CommonAttrs.VERTICES, children
     )
-    vertices = list(
-        map(lambda vertex: QVector3D(*vertex), vertices_dataset[CommonKeys.VALUES])
-    )
+    vertices = vertices_dataset[CommonKeys.VALUES]
     faces = off_shape_reader._get_shape_dataset_from_list("faces", children)[
         CommonKeys.VALUES
     ]
@@ -490,7 +488,7 @@ def test_GIVEN_off_shape_json_WHEN_reading_shape_THEN_geometry_object_has_expect
     assert shape.name == name
     assert shape.units == units
     assert shape.get_field_value("faces") == faces
-    assert shape.vertices == vertices
+    assert np.array_equal(shape.vertices, vertices)
     assert shape.winding_order == winding_order
 
 
@@ -739,3 +737,26 @@ def test_GIVEN_valid_pixel_mapping_and_cylindrical_shape_WHEN_reading_pixel_data
         DETECTOR_NUMBER, detector_number, detector_number_dtype
     )
     assert mock_cylindrical_shape.detector_number == detector_number
+
+
+def test_GIVEN_all_zero_z_offsets_WHEN_reading_pixel_data_THEN_z_offsets_are_not_added_to_component(
+    off_shape_reader, pixel_grid_list, mock_component, mock_off_shape
+):
+    x_offset_dataset = off_shape_reader._get_shape_dataset_from_list(
+        X_PIXEL_OFFSET, pixel_grid_list
+    )
+    z_offset_dataset = deepcopy(x_offset_dataset)
+    z_offset_dataset[CommonKeys.NAME] = Z_PIXEL_OFFSET
+    z_offset_dataset[CommonKeys.VALUES] = [0.0] * len(
+        x_offset_dataset[CommonKeys.VALUES]
+    )
+    pixel_grid_list.append(z_offset_dataset)
+
+    off_shape_reader.shape = mock_off_shape
+    off_shape_reader.shape_info[CommonKeys.NAME] = PIXEL_SHAPE_GROUP_NAME
+    off_shape_reader.add_pixel_data_to_component(pixel_grid_list)
+
+    assert Z_PIXEL_OFFSET not in [
+        field_call.args[0]
+        for field_call in mock_component.set_field_value.call_args_list
+    ]
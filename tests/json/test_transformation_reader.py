@@ -3,7 +3,6 @@ from typing import Dict, Tuple
 
 import pytest
 from mock import Mock
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.json.transform_id import TransformId
 from nexus_constructor.json.transformation_reader import (
@@ -293,7 +292,7 @@ def test_GIVEN_all_information_present_WHEN_attempting_to_create_translation_THE
         transformation_type=TRANSFORMATION_MAP[transformation_type],
         angle_or_magnitude=angle_or_magnitude,
         units=units,
-        vector=QVector3D(*vector),
+        vector=vector,
         depends_on=depends_on,
         values=values,
     )
@@ -358,10 +357,11 @@ def test_GIVEN_transformation_has_depends_on_WHEN_creating_transformations_THEN_
     transformation_json["children"][0]["attributes"][3]["values"] = depends_on_path
     transformation_reader._create_transformations(transformation_json["children"])
 
-    assert transformation_reader._transforms_with_dependencies[
-        TransformId(PARENT_COMPONENT_NAME, transformation_name)
-    ][1] == TransformId(
-        depends_on_component_name, depends_on_transform_name
+    assert (
+        transformation_reader._transforms_with_dependencies[
+            TransformId(PARENT_COMPONENT_NAME, transformation_name)
+        ][1]
+        == depends_on_path
     ), "Expected to find details of dependency stored in dictionary"
 
 
@@ -1,8 +1,30 @@
+import os
+import pickle
+import subprocess
+import sys
+
 import numpy as np
 import pytest
-from PySide2.QtGui import QVector3D
 
+from nexus_constructor.common_attrs import (
+    PIXEL_SHAPE_GROUP_NAME,
+    CommonAttrs,
+    CommonKeys,
+)
+from nexus_constructor.geometry.pixel_data import Corner, PixelGrid
+from nexus_constructor.geometry.pixel_data_utils import (
+    get_detector_ids_from_pixel_grid,
+    get_x_offsets_from_pixel_grid,
+)
 from nexus_constructor.model.component import TRANSFORMS_GROUP_NAME, Component
+from nexus_constructor.model.dataset import GeneratedDataset
+from nexus_constructor.model.geometry import (
+    DETECTOR_NUMBER,
+    X_PIXEL_OFFSET,
+    Y_PIXEL_OFFSET,
+    Z_PIXEL_OFFSET,
+)
+from nexus_constructor.model.group import Group
 from nexus_constructor.model.link import Link
 from nexus_constructor.model.stream import NS10Stream
 from nexus_constructor.model.value_type import ValueTypes
@@ -71,12 +93,10 @@ def test_component_as_dict_contains_transformations():
     test_component = Component(name="test_component")
 
     first_transform = test_component.add_translation(
-        name=first_transform_name, vector=QVector3D(1, 0, 0)
+        name=first_transform_name, vector=(1, 0, 0)
     )
     zeroth_transform = test_component.add_translation(
-        name=zeroth_transform_name,
-        vector=QVector3D(0, 0, 1),
-        depends_on=first_transform,
+        name=zeroth_transform_name, vector=(0, 0, 1), depends_on=first_transform,
     )
     test_component.depends_on = zeroth_transform
     dictionary_output = test_component.as_dict()
@@ -115,3 +135,167 @@ def test_component_as_dict_contains_links():
     assert dictionary_output["children"][0]["type"] == "link"
     assert dictionary_output["children"][0]["name"] == name
     assert dictionary_output["children"][0]["target"] == target
+
+
+def test_GIVEN_component_with_transformations_WHEN_pickling_THEN_transform_matrix_is_kept():
+    component = Component("test")
+    translation = component.add_translation((0, 0, 1), name="translation")
+    translation.ui_value = 2.0
+    component.depends_on = translation
+
+    unpickled_component = pickle.loads(pickle.dumps(component))
+
+    assert np.allclose(unpickled_component.transform_matrix, component.transform_matrix)
+
+
+def test_importing_component_does_not_import_qt():
+    code = (
+        "import sys, nexus_constructor.model.component; "
+        "assert not any(m.startswith('PySide2') for m in sys.modules)"
+    )
+    subprocess.check_call(
+        [sys.executable, "-c", code],
+        cwd=os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", ".."),
+    )
+
+
+def test_GIVEN_pixel_grid_WHEN_recording_it_THEN_only_its_parameters_are_kept_and_z_offsets_are_omitted():
+    component = Component("detector")
+    component.set_field_value(Z_PIXEL_OFFSET, np.ones((2, 2)), ValueTypes.FLOAT)
+    pixel_grid = PixelGrid(
+        rows=3, columns=4, first_id=7, initial_count_corner=Corner.TOP_RIGHT
+    )
+
+    component.record_pixel_grid(pixel_grid)
+
+    for field in [X_PIXEL_OFFSET, Y_PIXEL_OFFSET, DETECTOR_NUMBER]:
+        assert isinstance(component[field], GeneratedDataset)
+        assert component[field].size == (3, 4)
+    assert Z_PIXEL_OFFSET not in component
+    assert component.pixel_grid is pixel_grid
+    assert np.array_equal(
+        component.get_field_value(X_PIXEL_OFFSET),
+        get_x_offsets_from_pixel_grid(pixel_grid),
+    )
+    assert np.array_equal(
+        component.get_field_value(DETECTOR_NUMBER),
+        get_detector_ids_from_pixel_grid(pixel_grid),
+    )
+
+
+def test_GIVEN_recorded_pixel_grid_WHEN_creating_pixel_positions_THEN_they_match_the_offset_arrays():
+    component = Component("detector")
+    pixel_grid = PixelGrid(rows=3, columns=4, row_height=0.5, col_width=0.25)
+    component.record_pixel_grid(pixel_grid)
+    from_grid = component._create_transformation_vectors_for_pixel_offsets()
+
+    component.set_field_value(
+        X_PIXEL_OFFSET, component.get_field_value(X_PIXEL_OFFSET), ValueTypes.FLOAT
+    )
+    component.set_field_value(
+        Y_PIXEL_OFFSET, component.get_field_value(Y_PIXEL_OFFSET), ValueTypes.FLOAT
+    )
+
+    assert component.pixel_grid is None
+    assert np.allclose(
+        from_grid, component._create_transformation_vectors_for_pixel_offsets()
+    )
+
+
+def test_GIVEN_unchanged_pixel_offsets_WHEN_getting_shape_again_THEN_same_read_only_array_is_returned():
+    component = Component("detector")
+    component.record_pixel_grid(PixelGrid(rows=3, columns=4))
+    component[PIXEL_SHAPE_GROUP_NAME] = Group(PIXEL_SHAPE_GROUP_NAME)
+
+    _, positions = component.shape
+
+    assert positions.shape == (12, 3)
+    assert positions.dtype == np.float32
+    assert not positions.flags.writeable
+    assert component.shape[1] is positions
+
+
+def test_GIVEN_pixel_offsets_replaced_WHEN_getting_shape_THEN_new_offsets_are_returned():
+    component = Component("detector")
+    component.record_pixel_grid(PixelGrid(rows=3, columns=4))
+    component[PIXEL_SHAPE_GROUP_NAME] = Group(PIXEL_SHAPE_GROUP_NAME)
+    _, grid_positions = component.shape
+
+    component.set_field_value(X_PIXEL_OFFSET, np.arange(2.0), ValueTypes.FLOAT)
+    component.set_field_value(Y_PIXEL_OFFSET, np.zeros(2), ValueTypes.FLOAT)
+
+    _, positions = component.shape
+    assert np.array_equal(positions, [[0, 0, 0], [1, 0, 0]])
+
+    component.set_field_value(Z_PIXEL_OFFSET, np.ones(2), ValueTypes.FLOAT)
+
+    _, positions = component.shape
+    assert np.array_equal(positions, [[0, 0, 1], [1, 0, 1]])
+    assert len(grid_positions) == 12
+
+
+def test_GIVEN_unnamed_transformations_outside_depends_on_chain_WHEN_adding_THEN_names_are_unique():
+    component = Component("component")
+    first = component.add_translation((0, 0, 1))
+    second = component.add_translation((0, 0, 1))
+
+    assert (first.name, second.name) == ("Translation_1", "Translation_2")
+    assert len(component.get_transforms_group().children) == 2
+
+
+def test_GIVEN_unchanged_component_WHEN_getting_dict_again_THEN_fragments_are_reused():
+    component = Component("component")
+    component.set_field_value("field", np.arange(5), ValueTypes.INT)
+
+    first_dict = component.as_dict()
+    second_dict = component.as_dict()
+
+    assert second_dict == first_dict
+    assert second_dict[CommonKeys.CHILDREN][0] is first_dict[CommonKeys.CHILDREN][0]
+
+
+def test_GIVEN_dict_of_component_is_modified_WHEN_getting_dict_again_THEN_dict_is_unchanged():
+    component = Component("component")
+    component.as_dict()[CommonKeys.CHILDREN].append({})
+
+    assert component.as_dict()[CommonKeys.CHILDREN] == []
+
+
+def test_GIVEN_field_value_changed_WHEN_getting_dict_THEN_dict_has_new_value():
+    component = Component("component")
+    component.set_field_value("field", 1, ValueTypes.INT)
+    component.as_dict()
+
+    component["field"].values = 2
+
+    assert component.as_dict()[CommonKeys.CHILDREN][0][CommonKeys.VALUES] == 2
+
+
+def test_GIVEN_transformation_changed_WHEN_getting_dict_THEN_dict_has_new_transformation():
+    component = Component("component")
+    transformation = component.add_translation((0, 0, 1), name="translation")
+    component.depends_on = transformation
+    component.as_dict()
+
+    transformation.vector = (1, 0, 0)
+
+    transforms_dict = component.as_dict()[CommonKeys.CHILDREN][0]
+    vector = next(
+        attribute[CommonKeys.VALUES]
+        for attribute in transforms_dict[CommonKeys.CHILDREN][0][CommonKeys.ATTRIBUTES]
+        if attribute[CommonKeys.NAME] == CommonAttrs.VECTOR
+    )
+    assert vector == [1, 0, 0]
+
+
+def test_GIVEN_component_depends_on_renamed_component_WHEN_getting_dict_THEN_depends_on_path_is_updated():
+    other_component = Component("other")
+    transformation = other_component.add_translation((0, 0, 1), name="translation")
+    component = Component("component")
+    component.depends_on = transformation
+    component.as_dict()
+
+    other_component.name = "renamed"
+
+    depends_on = component.as_dict()[CommonKeys.CHILDREN][-1]
+    assert depends_on[CommonKeys.VALUES] == "/renamed/transformations/translation"
@@ -0,0 +1,160 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.common_attrs import CommonAttrs, TransformationType
+from nexus_constructor.geometry.pixel_data import PixelGrid
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.component_array import (
+    ArcPlacement,
+    LinearPlacement,
+    TablePlacement,
+)
+from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.value_type import ValueTypes
+
+SQUARE = OFFGeometryNoNexus(
+    vertices=np.array(
+        [[0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0], [1.0, 0.0, 0.0]]
+    ),
+    faces=[[0, 1, 2, 3]],
+)
+
+
+@pytest.fixture
+def instrument() -> Instrument:
+    entry = Entry()
+    entry.instrument = Instrument()
+    return entry.instrument
+
+
+@pytest.fixture
+def template(instrument) -> Component:
+    template = Component("tube", parent_node=instrument)
+    template.nx_class = "NXdetector"
+    template.description = "A tube"
+    template.set_off_shape(SQUARE)
+    template.depends_on = template.add_translation(
+        (0, 1, 0),
+        name="offset",
+        values=Dataset(name="", values=0.5, type=ValueTypes.DOUBLE, size=[1]),
+    )
+    instrument.component_list.append(template)
+    return template
+
+
+def position(component: Component) -> np.ndarray:
+    # The transformations are passive, so the matrix moves the component's surroundings rather than the component
+    return -component.transform_matrix[:3, 3]
+
+
+def test_GIVEN_linear_placement_WHEN_creating_array_THEN_copies_are_a_step_apart(
+    instrument, template
+):
+    copies = instrument.create_component_array(
+        template, 3, LinearPlacement(step=(2.0, 0.0, 0.0))
+    )
+
+    assert [copy.name for copy in copies] == ["tube_1", "tube_2", "tube_3"]
+    assert np.allclose(
+        [position(copy) for copy in copies],
+        [[0.0, 0.5, 0.0], [2.0, 0.5, 0.0], [4.0, 0.5, 0.0]],
+    )
+    assert [copy.name for copy in instrument.component_list] == ["sample", "tube"]
+
+
+def test_GIVEN_arc_placement_WHEN_creating_array_THEN_copies_are_on_the_arc(
+    instrument, template
+):
+    copies = instrument.create_component_array(
+        template, 4, ArcPlacement(radius=2.0, angle_step=90.0), name_stem="arc"
+    )
+
+    assert [copy.name for copy in copies] == ["arc_1", "arc_2", "arc_3", "arc_4"]
+    distances = [np.linalg.norm(position(copy)[[0, 2]]) for copy in copies]
+    assert np.allclose(distances, 2.0)
+    rotations = [copy.transforms[-1] for copy in copies]
+    assert [rotation.transform_type for rotation in rotations] == [
+        TransformationType.ROTATION
+    ] * 4
+    assert [rotation.ui_value for rotation in rotations] == [0.0, 90.0, 180.0, 270.0]
+
+
+def test_GIVEN_table_placement_WHEN_creating_array_THEN_copies_are_at_positions_in_table(
+    instrument, template
+):
+    positions = np.array([[1.0, 2.0, 3.0], [0.0, 0.0, 0.0]])
+
+    copies = instrument.create_component_array(template, 2, TablePlacement(positions))
+
+    assert np.allclose([position(copy) for copy in copies], positions + [0.0, 0.5, 0.0])
+
+
+def test_GIVEN_table_with_wrong_number_of_positions_WHEN_creating_array_THEN_error_is_raised(
+    instrument, template
+):
+    with pytest.raises(ValueError):
+        instrument.create_component_array(
+            template, 3, TablePlacement([[0.0, 0.0, 0.0]])
+        )
+
+
+def test_GIVEN_template_WHEN_creating_array_THEN_copies_have_its_fields_and_share_its_shape(
+    instrument, template
+):
+    copies = instrument.create_component_array(
+        template, 2, LinearPlacement(step=(1.0, 0.0, 0.0))
+    )
+
+    template_vertices = template.shape[0][CommonAttrs.VERTICES].values
+    for copy in copies:
+        assert copy.nx_class == "NXdetector"
+        assert copy.description == "A tube"
+        assert copy.parent_node is instrument
+        assert copy.shape[0][CommonAttrs.VERTICES].values is template_vertices
+        assert copy.transforms[0].name == "offset"
+        assert copy.transforms[0] is not template.transforms[0]
+    assert template.transforms[0].depends_on is None
+
+
+def test_GIVEN_template_depending_on_other_component_WHEN_creating_array_THEN_copies_are_placed_relative_to_it(
+    instrument, template
+):
+    other = Component("other", parent_node=instrument)
+    other.depends_on = other.add_translation(
+        (0, 0, 1),
+        values=Dataset(name="", values=10.0, type=ValueTypes.DOUBLE, size=[1]),
+    )
+    template.transforms[-1].depends_on = other.depends_on
+
+    copy = instrument.create_component_array(
+        template, 1, LinearPlacement(step=(1.0, 0.0, 0.0), start=(1.0, 0.0, 0.0))
+    )[0]
+
+    assert copy.transforms[-1].depends_on is other.depends_on
+    assert np.allclose(position(copy), [1.0, 0.5, 10.0])
+
+
+def test_GIVEN_pixel_grid_template_WHEN_creating_array_THEN_pixel_offsets_are_still_generated(
+    instrument,
+):
+    template = Component("detector", parent_node=instrument)
+    template.set_off_shape(SQUARE, pixel_data=PixelGrid(rows=2, columns=3))
+    template.record_pixel_grid(PixelGrid(rows=2, columns=3))
+
+    copy = instrument.create_component_array(
+        template, 1, LinearPlacement(step=(1.0, 0.0, 0.0))
+    )[0]
+
+    assert copy.pixel_grid is not None
+    assert copy.pixel_grid == template.pixel_grid
+    assert np.array_equal(copy.shape[1], template.shape[1])
+
+
+def test_GIVEN_no_copies_WHEN_creating_array_THEN_error_is_raised(instrument, template):
+    with pytest.raises(ValueError):
+        instrument.create_component_array(
+            template, 0, LinearPlacement(step=(1.0, 0.0, 0.0))
+        )
@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.content_hash import (
+    ADDED,
+    CHANGED,
+    REMOVED,
+    Difference,
+    content_hash,
+    diff,
+)
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.value_type import ValueTypes
+
+
+def create_instrument(offsets=np.arange(6.0)) -> Instrument:
+    entry = Entry()
+    entry.instrument = Instrument()
+    component = Component("detector", parent_node=entry.instrument)
+    component.nx_class = "NXdetector"
+    component.set_field_value("x_pixel_offset", offsets, ValueTypes.DOUBLE)
+    component.depends_on = component.add_translation((0, 0, 1), name="translation")
+    entry.instrument.component_list.append(component)
+    return entry.instrument
+
+
+def get_detector(instrument: Instrument) -> Component:
+    return instrument.path_index.get("/entry/instrument/detector")
+
+
+def test_GIVEN_models_with_same_contents_WHEN_hashing_THEN_hashes_are_equal():
+    assert content_hash(create_instrument()) == content_hash(create_instrument())
+
+
+def test_GIVEN_groups_with_same_contents_and_different_names_WHEN_hashing_THEN_hashes_are_equal():
+    assert content_hash(Group("first")) == content_hash(Group("second"))
+
+
+@pytest.mark.parametrize(
+    "offsets",
+    [np.arange(6.0) + 1, np.arange(6.0).astype(np.float32), np.arange(6.0)[:5]],
+)
+def test_GIVEN_different_array_WHEN_hashing_THEN_hashes_differ(offsets):
+    assert content_hash(create_instrument()) != content_hash(create_instrument(offsets))
+
+
+def test_GIVEN_hashed_model_WHEN_changing_dataset_THEN_hashes_of_groups_above_it_change():
+    instrument = create_instrument()
+    detector = get_detector(instrument)
+    instrument_hash, detector_hash = content_hash(instrument), content_hash(detector)
+
+    detector["x_pixel_offset"].values = np.zeros(6)
+
+    assert content_hash(detector) != detector_hash
+    assert content_hash(instrument) != instrument_hash
+
+
+def test_GIVEN_hashed_model_WHEN_renaming_dependency_THEN_hash_of_dependent_changes():
+    instrument = create_instrument()
+    other = Component("other", parent_node=instrument)
+    instrument.component_list.append(other)
+    detector = get_detector(instrument)
+    detector.transforms[0].depends_on = other.add_translation((1, 0, 0), name="offset")
+    detector_hash = content_hash(detector)
+
+    other.name = "renamed"
+
+    assert content_hash(detector) != detector_hash
+
+
+def test_GIVEN_same_models_WHEN_diffing_THEN_there_are_no_differences():
+    assert diff(create_instrument(), create_instrument()) == []
+
+
+def test_GIVEN_changed_model_WHEN_diffing_THEN_changed_added_and_removed_nodes_are_found():
+    old_instrument, new_instrument = create_instrument(), create_instrument()
+    new_detector = get_detector(new_instrument)
+    new_detector["x_pixel_offset"].values = np.zeros(6)
+    new_detector.set_field_value("y_pixel_offset", np.zeros(6), ValueTypes.DOUBLE)
+    del new_detector["transformations"]
+    new_detector.depends_on = None
+
+    assert sorted(diff(old_instrument, new_instrument)) == sorted(
+        [
+            Difference("/entry/instrument/detector", CHANGED),
+            Difference("/entry/instrument/detector/x_pixel_offset", CHANGED),
+            Difference("/entry/instrument/detector/y_pixel_offset", ADDED),
+            Difference("/entry/instrument/detector/transformations", REMOVED),
+        ]
+    )
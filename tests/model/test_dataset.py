@@ -1,4 +1,6 @@
-from nexus_constructor.model.dataset import Dataset
+import numpy as np
+
+from nexus_constructor.model.dataset import Dataset, GeneratedDataset
 from nexus_constructor.model.value_type import ValueTypes
 
 
@@ -12,3 +14,23 @@ def test_dataset_as_dict_contains_expected_keys():
         assert expected_key in dictionary_output.keys()
 
     assert dictionary_output["name"] == input_name
+
+
+def test_GIVEN_generated_dataset_WHEN_getting_values_THEN_they_are_generated_from_source():
+    dataset = GeneratedDataset(
+        name="ds", values=None, type=ValueTypes.INT, source=3, generator=np.arange
+    )
+
+    assert np.array_equal(dataset.values, [0, 1, 2])
+    assert dataset.as_dict()["values"] == [0, 1, 2]
+
+
+def test_GIVEN_generated_dataset_WHEN_setting_values_THEN_they_replace_source():
+    dataset = GeneratedDataset(
+        name="ds", values=None, type=ValueTypes.INT, source=3, generator=np.arange
+    )
+
+    dataset.values = [5]
+
+    assert dataset.values == [5]
+    assert dataset.source is None
@@ -0,0 +1,126 @@
+import pickle
+
+import pytest
+
+from nexus_constructor.model.dataset import Dataset
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.name_registry import NamedList, NameRegistry
+
+
+def test_GIVEN_names_WHEN_creating_registry_THEN_names_are_in_registry():
+    registry = NameRegistry(["a", "b", "a"])
+
+    assert "a" in registry
+    assert "c" not in registry
+    assert registry.count("a") == 2
+    assert len(registry) == 3
+
+
+def test_GIVEN_name_used_twice_WHEN_removing_it_once_THEN_name_is_still_in_registry():
+    registry = NameRegistry(["a", "a"])
+    registry.remove("a")
+
+    assert "a" in registry
+    registry.remove("a")
+    assert "a" not in registry
+
+
+def test_GIVEN_unused_name_WHEN_removing_it_THEN_raises_key_error():
+    with pytest.raises(KeyError):
+        NameRegistry().remove("a")
+
+
+def test_GIVEN_name_WHEN_renaming_THEN_only_new_name_is_in_registry():
+    registry = NameRegistry(["a"])
+    registry.rename("a", "b")
+
+    assert "a" not in registry
+    assert "b" in registry
+
+
+def test_GIVEN_numbered_names_WHEN_getting_next_incremental_name_THEN_lowest_free_number_is_used():
+    registry = NameRegistry(["translation_1", "translation_3"])
+
+    assert registry.next_incremental_name("translation") == "translation_2"
+    registry.add("translation_2")
+    assert registry.next_incremental_name("translation") == "translation_4"
+
+
+def test_GIVEN_numbered_name_removed_WHEN_getting_next_incremental_name_THEN_its_number_is_reused():
+    registry = NameRegistry(["rotation_1", "rotation_2", "rotation_3"])
+    registry.next_incremental_name("rotation")
+    registry.remove("rotation_2")
+
+    assert registry.next_incremental_name("rotation") == "rotation_2"
+
+
+@pytest.mark.parametrize(
+    "names,base,expected",
+    [
+        ([], "detector", "detector"),
+        (["detector"], "detector", "detector1"),
+        (["detector", "detector1", "detector7", "detectors"], "detector", "detector8"),
+        (["detector1", "detector2"], "detector1", "detector11"),
+        (["detector1", "detector11"], "detector1", "detector12"),
+    ],
+)
+def test_GIVEN_names_WHEN_getting_unique_name_THEN_name_is_not_in_registry(
+    names, base, expected
+):
+    assert NameRegistry(names).unique_name(base) == expected
+
+
+def test_GIVEN_named_list_WHEN_adding_and_removing_items_THEN_names_are_kept_up_to_date():
+    first, second, third = Group("first"), Group("second"), Group("third")
+    items = NamedList([first])
+    items.append(second)
+    items.insert(0, third)
+    items.remove(first)
+    assert items.pop() is second
+    items[0] = first
+
+    assert "first" in items.names
+    assert len(items.names) == 1
+
+
+def test_GIVEN_item_in_named_list_WHEN_renaming_item_THEN_names_are_kept_up_to_date():
+    group = Group("group")
+    dataset = Dataset(name="old", values=1, type="int32")
+    group.children.append(dataset)
+    dataset.name = "new"
+
+    assert "new" in group.children.names
+    assert "old" not in group.children.names
+
+
+def test_GIVEN_item_removed_from_named_list_WHEN_renaming_item_THEN_list_names_are_unchanged():
+    items = NamedList([Group("old")])
+    group = items.pop()
+    group.name = "new"
+
+    assert len(items.names) == 0
+
+
+def test_GIVEN_items_without_names_WHEN_adding_to_named_list_THEN_items_are_not_in_registry():
+    items = NamedList([object()])
+    items.append(object())
+
+    assert len(items.names) == 0
+
+
+def test_GIVEN_list_WHEN_setting_group_children_THEN_children_are_named_list():
+    group = Group("group")
+    group.children = [Group("child")]
+
+    assert "child" in group.children.names
+
+
+def test_GIVEN_group_with_children_WHEN_pickling_THEN_renaming_child_of_copy_updates_copy_names():
+    group = Group("group")
+    group["child"] = Group("child", parent_node=group)
+
+    copied_group = pickle.loads(pickle.dumps(group))
+    copied_group.children[0].name = "renamed"
+
+    assert "renamed" in copied_group.children.names
+    assert "child" in group.children.names
@@ -0,0 +1,154 @@
+import pytest
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.entry import Entry
+from nexus_constructor.model.group import Group
+from nexus_constructor.model.instrument import Instrument
+from nexus_constructor.model.path_index import join_path, paths_version
+
+
+@pytest.fixture
+def instrument() -> Instrument:
+    entry = Entry()
+    entry.instrument = Instrument()
+    return entry.instrument
+
+
+@pytest.fixture
+def component(instrument) -> Component:
+    component = Component("component", parent_node=instrument)
+    instrument.component_list.append(component)
+    return component
+
+
+@pytest.mark.parametrize(
+    "base,path,expected",
+    [
+        ("/entry", "/entry/instrument", "/entry/instrument"),
+        ("/entry", "instrument/sample", "/entry/instrument/sample"),
+        ("/entry/instrument", "./sample/../component", "/entry/instrument/component"),
+        ("/entry", "../../..", "/"),
+    ],
+)
+def test_GIVEN_path_WHEN_joining_to_base_THEN_path_is_normalised(base, path, expected):
+    assert join_path(base, path) == expected
+
+
+def test_GIVEN_transformation_WHEN_getting_by_absolute_path_THEN_transformation_is_found(
+    instrument, component
+):
+    transformation = component.add_translation((0, 0, 1), name="translation")
+
+    assert (
+        instrument.path_index.get(
+            "/entry/instrument/component/transformations/translation"
+        )
+        is transformation
+    )
+    assert instrument.path_index.get("/entry/instrument/sample") is instrument.sample
+
+
+def test_GIVEN_relative_path_WHEN_resolving_THEN_path_is_relative_to_group(
+    instrument, component
+):
+    transformation = component.add_translation((0, 0, 1), name="translation")
+
+    assert (
+        instrument.path_index.resolve(
+            "translation", relative_to=component.get_transforms_group()
+        )
+        is transformation
+    )
+    assert instrument.path_index.resolve("component") is component
+
+
+def test_GIVEN_indexed_component_WHEN_renaming_THEN_paths_are_updated(
+    instrument, component
+):
+    transformation = component.add_translation((0, 0, 1), name="translation")
+    assert "/entry/instrument/component" in instrument.path_index
+
+    component.name = "renamed"
+
+    assert "/entry/instrument/component" not in instrument.path_index
+    assert transformation.absolute_path == (
+        "/entry/instrument/renamed/transformations/translation"
+    )
+    assert instrument.path_index.get(transformation.absolute_path) is transformation
+
+
+def test_GIVEN_indexed_component_WHEN_removing_THEN_it_is_no_longer_indexed(
+    instrument, component
+):
+    assert "/entry/instrument/component" in instrument.path_index
+
+    instrument.component_list.remove(component)
+
+    assert "/entry/instrument/component" not in instrument.path_index
+
+
+def test_GIVEN_group_WHEN_moving_to_another_parent_THEN_absolute_path_is_updated():
+    first_parent, second_parent = Group("first"), Group("second")
+    child = Group("child", parent_node=first_parent)
+    assert child.absolute_path == "/first/child"
+
+    child.parent_node = second_parent
+
+    assert child.absolute_path == "/second/child"
+
+
+def test_GIVEN_node_in_another_model_WHEN_renaming_THEN_paths_of_model_are_not_invalidated(
+    instrument, component
+):
+    version = paths_version(component)
+    other_entry = Entry()
+    other_entry.instrument = Instrument()
+    other_component = Component("other", parent_node=other_entry.instrument)
+    other_entry.instrument.component_list.append(other_component)
+
+    other_component.name = "renamed"
+    Component("outside", parent_node=Group("group"))
+
+    assert paths_version(component) is version
+
+
+def test_GIVEN_components_with_same_name_WHEN_removing_one_THEN_other_is_indexed(
+    instrument, component
+):
+    duplicate = Component("component", parent_node=instrument)
+    instrument.component_list.append(duplicate)
+    assert instrument.path_index.get("/entry/instrument/component") is component
+
+    instrument.component_list.remove(component)
+
+    assert instrument.path_index.get("/entry/instrument/component") is duplicate
+
+
+def test_GIVEN_indexed_group_WHEN_moving_to_another_group_THEN_paths_are_updated(
+    instrument, component
+):
+    child = Group("child", parent_node=component)
+    component.children.append(child)
+    destination = Group("destination", parent_node=component)
+    component.children.append(destination)
+    assert "/entry/instrument/component/child" in instrument.path_index
+
+    component.children.remove(child)
+    destination["child"] = child
+
+    assert "/entry/instrument/component/child" not in instrument.path_index
+    assert (
+        instrument.path_index.get("/entry/instrument/component/destination/child")
+        is child
+    )
+
+
+def test_GIVEN_group_above_index_WHEN_renaming_THEN_index_has_new_paths(
+    instrument, component
+):
+    assert "/entry/instrument/component" in instrument.path_index
+
+    instrument.parent_node.name = "renamed"
+
+    assert instrument.path_index.get("/renamed/instrument/component") is component
+    assert "/entry/instrument/component" not in instrument.path_index
@@ -0,0 +1,125 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.common_attrs import (
+    PIXEL_SHAPE_GROUP_NAME,
+    SHAPE_GROUP_NAME,
+    CommonAttrs,
+    CommonKeys,
+    NodeType,
+)
+from nexus_constructor.geometry.pixel_data import PixelGrid
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.geometry import OFFGeometryNoNexus
+from nexus_constructor.model.link import TARGET
+from nexus_constructor.model.model import Model
+
+TRIANGLE = OFFGeometryNoNexus(
+    vertices=np.array([[0.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]]),
+    faces=[[0, 1, 2]],
+)
+
+
+@pytest.fixture
+def model() -> Model:
+    return Model()
+
+
+def add_component(model: Model, name: str) -> Component:
+    instrument = model.entry.instrument
+    component = Component(name, parent_node=instrument)
+    component.nx_class = "NXdetector"
+    instrument.component_list.append(component)
+    return component
+
+
+def get_exported_child(dictionary: dict, *names: str) -> dict:
+    for name in names:
+        dictionary = next(
+            child
+            for child in dictionary[CommonKeys.CHILDREN]
+            if child.get(CommonKeys.NAME) == name
+        )
+    return dictionary
+
+
+def test_GIVEN_identical_shapes_WHEN_setting_them_THEN_arrays_are_shared_and_read_only(
+    model,
+):
+    first = add_component(model, "first").set_off_shape(TRIANGLE)
+    second = add_component(model, "second").set_off_shape(TRIANGLE)
+
+    first_vertices = first[CommonAttrs.VERTICES].values
+    assert second[CommonAttrs.VERTICES].values is first_vertices
+    assert not first_vertices.flags.writeable
+
+
+def test_GIVEN_different_shapes_WHEN_setting_them_THEN_arrays_are_not_shared(model):
+    first = add_component(model, "first").set_cylinder_shape(radius=1.0)
+    second = add_component(model, "second").set_cylinder_shape(radius=2.0)
+
+    assert second[CommonAttrs.VERTICES].values is not first[CommonAttrs.VERTICES].values
+
+
+def test_GIVEN_pooled_shape_changed_WHEN_setting_shape_it_was_the_same_as_THEN_arrays_are_not_shared(
+    model,
+):
+    first = add_component(model, "first").set_cylinder_shape(height=3.0)
+    first.detector_number = [1]
+
+    second = add_component(model, "second").set_cylinder_shape(height=3.0)
+
+    assert second[CommonAttrs.VERTICES].values is not first[CommonAttrs.VERTICES].values
+
+
+def test_GIVEN_identical_shapes_WHEN_exporting_with_linked_shapes_THEN_later_shapes_are_links_to_first(
+    model,
+):
+    add_component(model, "first").set_off_shape(TRIANGLE)
+    add_component(model, "second").set_off_shape(TRIANGLE)
+    add_component(model, "third").set_cylinder_shape()
+
+    dictionary = model.as_dict(link_shared_shapes=True)
+
+    instrument = get_exported_child(dictionary, "entry", "instrument")
+    assert get_exported_child(instrument, "second", SHAPE_GROUP_NAME) == {
+        CommonKeys.NAME: SHAPE_GROUP_NAME,
+        CommonKeys.TYPE: NodeType.LINK,
+        TARGET: "/entry/instrument/first/shape",
+    }
+    for name in ["first", "third"]:
+        shape = get_exported_child(instrument, name, SHAPE_GROUP_NAME)
+        assert shape[CommonKeys.TYPE] == NodeType.GROUP
+
+
+def test_GIVEN_identical_shapes_WHEN_exporting_without_linked_shapes_THEN_every_shape_is_written(
+    model,
+):
+    add_component(model, "first").set_off_shape(TRIANGLE)
+    add_component(model, "second").set_off_shape(TRIANGLE)
+
+    dictionary = model.as_dict()
+
+    instrument = get_exported_child(dictionary, "entry", "instrument")
+    assert get_exported_child(
+        instrument, "second", SHAPE_GROUP_NAME
+    ) == get_exported_child(instrument, "first", SHAPE_GROUP_NAME)
+    # Exporting with links doesn't change what is exported afterwards without them
+    model.as_dict(link_shared_shapes=True)
+    assert model.as_dict() == dictionary
+
+
+def test_GIVEN_shape_and_identical_pixel_shape_WHEN_exporting_with_linked_shapes_THEN_pixel_shape_is_not_a_link(
+    model,
+):
+    add_component(model, "first").set_off_shape(TRIANGLE)
+    add_component(model, "second").set_off_shape(
+        TRIANGLE, pixel_data=PixelGrid(),
+    )
+
+    dictionary = model.as_dict(link_shared_shapes=True)
+
+    pixel_shape = get_exported_child(
+        dictionary, "entry", "instrument", "second", PIXEL_SHAPE_GROUP_NAME
+    )
+    assert pixel_shape[CommonKeys.TYPE] == NodeType.GROUP
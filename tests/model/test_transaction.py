@@ -0,0 +1,154 @@
+from typing import List
+
+import numpy as np
+import pytest
+from mock import Mock
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.transaction import ChangeSet
+
+
+@pytest.fixture
+def model() -> Model:
+    return Model()
+
+
+def add_component(model: Model, name: str) -> Component:
+    instrument = model.entry.instrument
+    component = Component(name, parent_node=instrument)
+    instrument.component_list.append(component)
+    return component
+
+
+def committed_changes(model: Model) -> List[ChangeSet]:
+    changes: List[ChangeSet] = []
+    model.signals.changes_committed.connect(changes.append)
+    return changes
+
+
+def test_GIVEN_changes_in_transaction_WHEN_committed_THEN_one_change_set_is_emitted(
+    model,
+):
+    unchanged = add_component(model, "unchanged")
+    moved = add_component(model, "moved")
+    removed = add_component(model, "removed")
+    changes = committed_changes(model)
+    transformation_changed = Mock()
+    model.signals.transformation_changed.connect(transformation_changed)
+
+    with model.transaction():
+        for index in range(10):
+            add_component(model, f"added_{index}")
+            model.signals.transformation_changed.emit()
+        moved.add_translation(np.array([1.0, 0.0, 0.0]), name="position")
+        model.entry.instrument.component_list.remove(removed)
+        assert not changes
+
+    assert len(changes) == 1
+    assert [component.name for component in changes[0].added] == [
+        f"added_{index}" for index in range(10)
+    ]
+    assert changes[0].removed == ["removed"]
+    assert changes[0].changed == [moved]
+    assert unchanged not in changes[0].changed
+    transformation_changed.assert_called_once()
+
+
+def test_GIVEN_renamed_component_WHEN_committed_THEN_change_set_has_previous_name(
+    model,
+):
+    component = add_component(model, "before")
+    changes = committed_changes(model)
+
+    with model.transaction():
+        component.name = "after"
+
+    assert changes[0].changed == [component]
+    assert changes[0].previous_names == ["before"]
+
+
+def test_GIVEN_no_changes_WHEN_committed_THEN_nothing_is_emitted(model):
+    add_component(model, "component")
+    changes = committed_changes(model)
+
+    with model.transaction():
+        pass
+
+    assert not changes
+
+
+def test_GIVEN_nested_transactions_WHEN_committed_THEN_only_outer_transaction_emits(
+    model,
+):
+    changes = committed_changes(model)
+
+    with model.transaction():
+        with model.transaction():
+            add_component(model, "inner")
+        assert model.in_transaction
+        assert not changes
+        add_component(model, "outer")
+
+    assert not model.in_transaction
+    assert [component.name for component in changes[0].added] == ["inner", "outer"]
+
+
+def test_GIVEN_exception_in_transaction_WHEN_rolled_back_THEN_model_is_as_it_was(
+    model,
+):
+    component = add_component(model, "component")
+    component.set_cylinder_shape(radius=2.0)
+    component.add_translation(np.array([0.0, 0.0, 1.0]), name="position")
+    before = model.as_dict()
+    changes = committed_changes(model)
+
+    with pytest.raises(RuntimeError):
+        with model.transaction():
+            add_component(model, "added")
+            component.name = "renamed"
+            component.set_cylinder_shape(radius=3.0)
+            raise RuntimeError("Script failed")
+
+    assert model.as_dict() == before
+    assert [component.name for component in model.entry.instrument.component_list] == [
+        "sample",
+        "component",
+    ]
+    assert changes[0].entry_replaced
+    assert not model.signals.signalsBlocked()
+
+
+def test_GIVEN_rollback_disabled_WHEN_exception_in_transaction_THEN_changes_are_kept_and_emitted(
+    model,
+):
+    changes = committed_changes(model)
+
+    with pytest.raises(RuntimeError):
+        with model.transaction(rollback=False):
+            add_component(model, "added")
+            raise RuntimeError("Script failed")
+
+    assert [component.name for component in model.entry.instrument.component_list] == [
+        "sample",
+        "added",
+    ]
+    assert [component.name for component in changes[0].added] == ["added"]
+
+
+def test_GIVEN_rollback_WHEN_restoring_THEN_arrays_are_shared_with_the_model_before(
+    model,
+):
+    component = add_component(model, "component")
+    component.set_cylinder_shape(radius=2.0)
+
+    with pytest.raises(RuntimeError):
+        with model.transaction():
+            raise RuntimeError("Script failed")
+
+    restored_component = model.entry.instrument.component_list[-1]
+    assert restored_component is not component
+    assert (
+        restored_component["shape"]["vertices"].values
+        is component["shape"]["vertices"].values
+    )
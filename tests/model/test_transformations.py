@@ -1,5 +1,4 @@
 import numpy as np
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
@@ -10,7 +9,7 @@ from nexus_constructor.model.value_type import ValueTypes
 def create_transform(
     name="test translation",
     ui_value=42.0,
-    vector=QVector3D(1.0, 0.0, 0.0),
+    vector=(1.0, 0.0, 0.0),
     type="Translation",
     values=Dataset(name="", values=None, type=ValueTypes.DOUBLE, size=[1]),
 ):
@@ -35,7 +34,7 @@ def test_can_get_transform_properties():
 
     test_name = "slartibartfast"
     test_ui_value = 42
-    test_vector = QVector3D(1.0, 0.0, 0.0)
+    test_vector = (1.0, 0.0, 0.0)
     test_type = "Translation"
     test_values = Dataset("test_dataset", None, [1])
 
@@ -49,8 +48,8 @@ def test_can_get_transform_properties():
     assert (
         transform.ui_value == test_ui_value
     ), "Expected the transform value to match what was in the NeXus file"
-    assert (
-        transform.vector == test_vector
+    assert np.array_equal(
+        transform.vector, test_vector
     ), "Expected the transform vector to match what was in the NeXus file"
     assert (
         transform.transform_type == test_type
@@ -87,7 +86,7 @@ def test_can_set_transform_properties():
 
     test_name = "beeblebrox"
     test_ui_value = 34.0
-    test_vector = QVector3D(0.0, 0.0, 1.0)
+    test_vector = (0.0, 0.0, 1.0)
     test_type = "Rotation"
     test_values = Dataset("valuedataset", None, [1, 2])
 
@@ -103,8 +102,8 @@ def test_can_set_transform_properties():
     assert (
         transform.ui_value == test_ui_value
     ), "Expected the transform value to match what was in the NeXus file"
-    assert (
-        transform.vector == test_vector
+    assert np.array_equal(
+        transform.vector, test_vector
     ), "Expected the transform vector to match what was in the NeXus file"
     assert (
         transform.transform_type == test_type
@@ -317,32 +316,32 @@ def test_can_get_translation_as_4_by_4_matrix():
 
     test_ui_value = 42.0
     # Note, it should not matter if this is not set to a unit vector
-    test_vector = QVector3D(2.0, 0.0, 0.0)
+    test_vector = (2.0, 0.0, 0.0)
     test_type = "Translation"
 
     transformation = create_transform(
         ui_value=test_ui_value, vector=test_vector, type=test_type
     )
 
-    test_matrix = transformation.qmatrix
+    test_matrix = transformation.matrix
     # NB, -1 * distance because the transformation in the UI is a passive transformation
     expected_matrix = np.array(
         (1, 0, 0, 0, 0, 1, 0, 0, 0, 0, 1, 0, -1 * test_ui_value, 0, 0, 1)
     )
-    assert np.allclose(expected_matrix, np.array(test_matrix.data()))
+    assert np.allclose(expected_matrix, test_matrix.flatten(order="F"))
 
 
 def test_can_get_rotation_as_4_by_4_matrix():
 
     test_ui_value = 15.0  # degrees
-    test_vector = QVector3D(0.0, 1.0, 0.0)  # around y-axis
+    test_vector = (0.0, 1.0, 0.0)  # around y-axis
     test_type = "Rotation"
 
     transformation = create_transform(
         ui_value=test_ui_value, vector=test_vector, type=test_type
     )
 
-    test_matrix = transformation.qmatrix
+    test_matrix = transformation.matrix
     # for a rotation around the y-axis:
     test_value_radians = np.deg2rad(test_ui_value)
     expected_matrix = np.array(
@@ -365,7 +364,7 @@ def test_can_get_rotation_as_4_by_4_matrix():
             1,
         )
     )
-    assert np.allclose(expected_matrix, np.array(test_matrix.data()), atol=1.0e-7)
+    assert np.allclose(expected_matrix, test_matrix.flatten(order="F"), atol=1.0e-7)
 
 
 def test_GIVEN_transformation_with_scalar_value_that_is_not_castable_to_int_WHEN_getting_ui_value_THEN_ui_placeholder_value_is_returned_instead():
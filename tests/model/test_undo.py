@@ -0,0 +1,263 @@
+import numpy as np
+import pytest
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.undo import UndoHistory
+
+
+@pytest.fixture
+def model() -> Model:
+    return Model()
+
+
+@pytest.fixture
+def history(model) -> UndoHistory:
+    return UndoHistory(model)
+
+
+def add_component(model: Model, name: str) -> Component:
+    instrument = model.entry.instrument
+    component = Component(name, parent_node=instrument)
+    instrument.component_list.append(component)
+    return component
+
+
+def component_names(model: Model):
+    return [component.name for component in model.entry.instrument.component_list]
+
+
+def test_GIVEN_no_changes_WHEN_recording_THEN_nothing_is_recorded(model, history):
+    assert not history.record()
+    assert not history.can_undo
+    assert not history.undo()
+
+
+def test_GIVEN_changes_WHEN_undoing_and_redoing_THEN_model_is_restored(model, history):
+    component = add_component(model, "component")
+    component.set_cylinder_shape(radius=2.0)
+    history.record()
+    first = model.as_dict()
+    component.name = "renamed"
+    component.add_translation(np.array([0.0, 0.0, 1.0]), name="position")
+    history.record()
+    second = model.as_dict()
+
+    assert history.undo()
+    assert model.as_dict() == first
+    assert history.can_redo
+    assert history.undo()
+    assert component_names(model) == ["sample"]
+
+    assert history.redo()
+    assert history.redo()
+    assert model.as_dict() == second
+    assert not history.redo()
+
+
+def test_GIVEN_transformations_depending_on_other_components_WHEN_undoing_THEN_dependencies_are_restored(
+    model, history
+):
+    first = add_component(model, "first")
+    position = first.add_translation(np.array([1.0, 0.0, 0.0]), name="position")
+    first.depends_on = position
+    second = add_component(model, "second")
+    offset = second.add_translation(np.array([0.0, 1.0, 0.0]), name="offset")
+    offset.depends_on = position
+    second.depends_on = offset
+    history.record()
+    second.name = "moved"
+    history.record()
+
+    history.undo()
+
+    restored_first, restored_second = model.entry.instrument.component_list[1:]
+    restored_offset = restored_second.depends_on
+    assert restored_offset.depends_on is restored_first.depends_on
+    assert restored_offset in restored_first.depends_on.dependents
+    assert restored_first in restored_first.depends_on.dependents
+    assert restored_second.parent_node is model.entry.instrument
+    assert np.allclose(restored_second.transform_matrix, second.transform_matrix)
+    assert model.entry.instrument.path_index.get("/entry/instrument/second")
+
+
+def test_GIVEN_unchanged_component_WHEN_recording_THEN_its_snapshot_is_shared(
+    model, history
+):
+    unchanged = add_component(model, "unchanged")
+    unchanged.set_cylinder_shape(radius=2.0)
+    changed = add_component(model, "changed")
+    history.record()
+    memory_used = history.memory_used
+
+    changed.name = "renamed"
+    history.record()
+
+    # Only the changed component and the groups above the components are pickled again
+    assert history.memory_used - memory_used < 4096
+
+
+def test_GIVEN_change_after_undo_WHEN_recording_THEN_redo_is_not_possible(
+    model, history
+):
+    add_component(model, "first")
+    history.record()
+    history.undo()
+
+    add_component(model, "second")
+    history.record()
+
+    assert not history.can_redo
+    history.undo()
+    assert component_names(model) == ["sample"]
+
+
+def test_GIVEN_memory_limit_WHEN_recording_THEN_oldest_snapshots_are_forgotten(model,):
+    history = UndoHistory(model, max_bytes=0)
+    add_component(model, "first")
+    history.record()
+
+    assert not history.can_undo
+
+
+def test_GIVEN_model_signal_WHEN_emitted_THEN_change_is_recorded(model, history):
+    add_component(model, "component")
+
+    model.signals.component_added.emit("component", None, None)
+
+    assert history.can_undo
+    history.undo()
+    assert component_names(model) == ["sample"]
+
+
+def test_GIVEN_transaction_WHEN_committed_THEN_one_snapshot_is_recorded(model, history):
+    with model.transaction():
+        add_component(model, "first")
+        model.signals.transformation_changed.emit()
+        add_component(model, "second")
+
+    history.undo()
+
+    assert component_names(model) == ["sample"]
+    assert not history.can_undo
+
+
+def test_GIVEN_shape_WHEN_undoing_THEN_arrays_are_shared_with_the_snapshot(
+    model, history
+):
+    component = add_component(model, "component")
+    component.set_cylinder_shape(radius=2.0)
+    history.record()
+    vertices = component["shape"]["vertices"].values
+    component.name = "renamed"
+    history.record()
+
+    history.undo()
+
+    restored_component = model.entry.instrument.component_list[-1]
+    assert restored_component is not component
+    assert restored_component["shape"]["vertices"].values is vertices
+
+
+def test_GIVEN_unchanged_component_WHEN_undoing_THEN_its_json_cache_is_kept(
+    model, history
+):
+    unchanged = add_component(model, "unchanged")
+    unchanged.set_cylinder_shape(radius=2.0)
+    changed = add_component(model, "changed")
+    history.record()
+    unchanged.as_dict()
+    changed.name = "renamed"
+    history.record()
+
+    history.undo()
+
+    restored_unchanged, restored_changed = model.entry.instrument.component_list[1:]
+    assert restored_unchanged._as_dict_cache is unchanged._as_dict_cache
+    assert restored_changed._as_dict_cache is None
+
+
+def test_GIVEN_restored_component_WHEN_renamed_THEN_component_names_are_updated(
+    model, history
+):
+    component = add_component(model, "component")
+    history.record()
+    component.name = "renamed"
+    history.record()
+    history.undo()
+
+    model.entry.instrument.component_list[-1].name = "after_undo"
+
+    names = model.entry.instrument.component_list.names
+    assert "after_undo" in names
+    assert "component" not in names
+
+
+def test_GIVEN_changed_component_WHEN_undoing_THEN_only_it_is_in_the_change_set(
+    model, history
+):
+    add_component(model, "unchanged")
+    changed = add_component(model, "changed")
+    history.record()
+    changed.name = "renamed"
+    added = add_component(model, "added")
+    history.record()
+    changes = []
+    model.signals.changes_committed.connect(changes.append)
+
+    history.undo()
+
+    assert changes[0].entry_replaced
+    assert changes[0].only_components_changed
+    assert [component.name for component in changes[0].changed] == ["changed"]
+    assert changes[0].previous_names == ["renamed"]
+    assert changes[0].removed == [added.name]
+    assert not changes[0].added
+
+
+def test_GIVEN_undone_change_WHEN_recording_without_changes_THEN_redo_is_still_possible(
+    model, history
+):
+    component = add_component(model, "component")
+    history.record()
+    component.name = "renamed"
+    history.record()
+    history.undo()
+
+    assert not history.record()
+    assert history.can_redo
+
+
+def test_GIVEN_history_WHEN_recording_undoing_redoing_and_clearing_THEN_history_changed_is_emitted(
+    model, history
+):
+    emitted = []
+    history.signals.history_changed.connect(lambda: emitted.append(None))
+
+    assert not history.record()
+    add_component(model, "component")
+    history.record()
+    history.undo()
+    history.redo()
+    history.clear()
+
+    assert len(emitted) == 4
+    assert not history.can_undo
+
+
+def test_GIVEN_changed_component_WHEN_undoing_THEN_transformations_are_updated(
+    model, history
+):
+    component = add_component(model, "component")
+    history.record()
+    component.name = "renamed"
+    history.record()
+    transformation_changed = []
+    model.signals.transformation_changed.connect(
+        lambda: transformation_changed.append(None)
+    )
+
+    history.undo()
+
+    assert len(transformation_changed) == 1
+    assert not history.record()
@@ -0,0 +1,220 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from nexus_constructor import autosave as autosave_module
+from nexus_constructor.autosave import (
+    CHECKPOINT_FILENAME,
+    COMPONENT,
+    JOURNAL_FILENAME,
+    Autosave,
+    JournalWriter,
+    claim_orphaned_autosave,
+    discard_autosave,
+    has_autosave,
+    load_autosave,
+    new_autosave_directory,
+)
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.undo import UndoHistory
+
+
+@pytest.fixture
+def model() -> Model:
+    return Model()
+
+
+@pytest.fixture
+def autosave(model, tmpdir):
+    autosave = Autosave(model, str(tmpdir))
+    yield autosave
+    autosave.close()
+
+
+def add_component(model: Model, name: str) -> Component:
+    instrument = model.entry.instrument
+    component = Component(name, parent_node=instrument)
+    instrument.component_list.append(component)
+    return component
+
+
+def as_saved(model: Model):
+    # As the model would be read back from JSON, with tuples turned into lists
+    return json.loads(json.dumps(model.as_dict()))
+
+
+def journal_lines(directory: str):
+    with open(os.path.join(directory, JOURNAL_FILENAME)) as file:
+        return file.readlines()
+
+
+def test_GIVEN_model_WHEN_starting_autosave_THEN_checkpoint_is_written(model, autosave):
+    autosave.flush()
+
+    assert has_autosave(autosave.directory)
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_changes_WHEN_recorded_THEN_journal_restores_model(model, autosave):
+    first = add_component(model, "first")
+    first.set_cylinder_shape(radius=2.0)
+    model.signals.component_added.emit("first", None, None)
+    second = add_component(model, "second")
+    model.signals.component_added.emit("second", None, None)
+    first.name = "renamed"
+    first.add_translation(np.array([0.0, 0.0, 1.0]), name="position")
+    model.signals.transformation_changed.emit()
+    model.entry.instrument.component_list.remove(second)
+    model.signals.component_removed.emit("second")
+    model.entry.instrument.sample.description = "changed"
+    model.signals.transformation_changed.emit()
+    autosave.flush()
+
+    assert len(journal_lines(autosave.directory)) == 5
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_no_changes_WHEN_recording_THEN_nothing_is_appended(model, autosave):
+    assert not autosave.record()
+    autosave.flush()
+
+    assert journal_lines(autosave.directory) == []
+
+
+def test_GIVEN_many_changes_WHEN_recorded_THEN_journal_is_compacted_into_checkpoint(
+    model, autosave, monkeypatch
+):
+    monkeypatch.setattr(autosave_module, "CHECKPOINT_INTERVAL", 3)
+    for index in range(4):
+        add_component(model, f"component_{index}")
+        autosave.record()
+    autosave.flush()
+
+    assert len(journal_lines(autosave.directory)) == 1
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_entry_replaced_WHEN_recording_THEN_checkpoint_is_written(
+    model, autosave
+):
+    add_component(model, "first")
+    autosave.record()
+    model.entry = Model().entry
+    add_component(model, "second")
+    autosave.record()
+    autosave.flush()
+
+    assert journal_lines(autosave.directory) == []
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_line_being_written_when_stopped_WHEN_loading_THEN_earlier_lines_are_applied(
+    model, autosave
+):
+    add_component(model, "first")
+    autosave.record()
+    expected = as_saved(model)
+    autosave.close()
+    with open(os.path.join(autosave.directory, JOURNAL_FILENAME), "a") as file:
+        file.write('{"generation": ')
+
+    assert load_autosave(autosave.directory) == expected
+
+
+def test_GIVEN_journal_from_before_checkpoint_WHEN_loading_THEN_journal_is_ignored(
+    model, autosave
+):
+    autosave.flush()
+    with open(os.path.join(autosave.directory, CHECKPOINT_FILENAME)) as file:
+        expected = json.load(file)["model"]
+    with open(os.path.join(autosave.directory, JOURNAL_FILENAME), "w") as file:
+        file.write(json.dumps({"generation": "earlier", "changes": [{"removed": "x"}]}))
+        file.write("\n")
+
+    assert load_autosave(autosave.directory) == expected
+
+
+def test_GIVEN_autosave_WHEN_discarded_THEN_there_is_nothing_to_load(model, autosave):
+    autosave.close(discard=True)
+
+    assert not has_autosave(autosave.directory)
+    assert load_autosave(autosave.directory) is None
+    discard_autosave(autosave.directory)
+
+
+def test_GIVEN_undo_WHEN_recording_THEN_only_changed_components_are_journaled(
+    model, autosave
+):
+    history = UndoHistory(model)
+    add_component(model, "first")
+    model.signals.component_added.emit("first", None, None)
+    second = add_component(model, "second")
+    model.signals.component_added.emit("second", None, None)
+    second.name = "renamed"
+    model.signals.transformation_changed.emit()
+    autosave.flush()
+    lines_before_undo = len(journal_lines(autosave.directory))
+
+    history.undo()
+    history.undo()
+    history.redo()
+    autosave.flush()
+
+    assert len(journal_lines(autosave.directory)) == lines_before_undo + 3
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_unchanged_components_WHEN_checkpointing_THEN_model_is_saved(
+    model, autosave
+):
+    add_component(model, "unchanged")
+    changed = add_component(model, "changed")
+    autosave.record()
+    autosave.checkpoint()
+    changed.set_cylinder_shape(radius=2.0)
+    autosave.record()
+    autosave.checkpoint()
+    autosave.flush()
+
+    assert journal_lines(autosave.directory) == []
+    assert load_autosave(autosave.directory) == as_saved(model)
+
+
+def test_GIVEN_error_writing_WHEN_flushing_THEN_writer_carries_on(tmpdir):
+    writer = JournalWriter(str(tmpdir))
+    writer.append("generation", [{COMPONENT: {"values": object()}}])
+    writer.append("generation", [{COMPONENT: {"values": 1}}])
+    writer.flush()
+    writer.close()
+
+    assert len(journal_lines(str(tmpdir))) == 1
+
+
+def test_GIVEN_autosave_of_running_process_WHEN_claiming_orphaned_autosave_THEN_it_is_not_claimed(
+    model, tmpdir
+):
+    directory = new_autosave_directory(str(tmpdir))
+    autosave = Autosave(model, directory)
+    autosave.flush()
+
+    assert claim_orphaned_autosave(str(tmpdir)) is None
+    with pytest.raises(ValueError):
+        Autosave(model, directory)
+    autosave.close(discard=True)
+
+
+def test_GIVEN_autosave_left_by_stopped_process_WHEN_claiming_THEN_it_is_claimed_and_can_be_discarded(
+    model, tmpdir
+):
+    directory = new_autosave_directory(str(tmpdir))
+    Autosave(model, directory).close()
+
+    claimed_directory, lock = claim_orphaned_autosave(str(tmpdir))
+    assert claimed_directory == directory
+    assert load_autosave(claimed_directory) == as_saved(model)
+
+    discard_autosave(claimed_directory, lock)
+    assert not os.path.exists(directory)
@@ -0,0 +1,170 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from streaming_data_types.forwarder_config_update_rf5k import deserialise_rf5k
+
+from nexus_constructor.batch import (
+    ConversionResult,
+    GeometryFile,
+    _parse_geometry_file,
+    convert_instrument,
+    load_model,
+    main,
+)
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.stream import F142Stream, StreamGroup
+
+BASE_PATH = os.path.dirname(os.path.realpath(__file__))
+CUBE_STL_FILE_PATH = os.path.join(BASE_PATH, "cube.stl")
+
+
+@pytest.fixture
+def instrument_json_file(tmp_path) -> str:
+    model = Model()
+    component = Component("monitor", parent_node=model.entry.instrument)
+    component.nx_class = "NXmonitor"
+    model.entry.instrument.component_list.append(component)
+    component.depends_on = component.add_translation((0, 0, 1), name="z")
+    stream_group = StreamGroup("data")
+    stream_group["stream"] = F142Stream("test_topic", "test_source", "double")
+    component["data"] = stream_group
+    filename = str(tmp_path / "instrument.json")
+    with open(filename, "w") as file:
+        json.dump(model.as_dict(), file)
+    return filename
+
+
+def test_GIVEN_json_file_WHEN_loading_model_THEN_components_are_loaded(
+    instrument_json_file,
+):
+    model, warnings = load_model(instrument_json_file)
+
+    component_names = [c.name for c in model.entry.instrument.component_list]
+    assert "monitor" in component_names
+    assert not warnings
+
+
+def test_GIVEN_json_file_WHEN_converting_to_all_formats_THEN_files_are_written(
+    instrument_json_file, tmp_path
+):
+    output_dir = tmp_path / "output"
+    output_dir.mkdir()
+
+    result = convert_instrument(
+        instrument_json_file, str(output_dir), ["json", "forwarder", "nexus"], "ca"
+    )
+
+    assert result.succeeded, result.error
+    assert sorted(os.path.basename(f) for f in result.output_filenames) == [
+        "instrument.flat",
+        "instrument.json",
+        "instrument.nxs",
+    ]
+    with open(output_dir / "instrument.flat", "rb") as flat_file:
+        assert len(deserialise_rf5k(flat_file.read()).streams) == 1
+    with open(output_dir / "instrument.json") as json_file:
+        assert json.load(json_file)["children"][0]["name"] == "entry"
+
+
+def test_GIVEN_nexus_file_written_by_batch_WHEN_loading_it_THEN_transformations_are_kept(
+    instrument_json_file, tmp_path
+):
+    result = convert_instrument(instrument_json_file, str(tmp_path), ["nexus"])
+
+    model, _ = load_model(result.output_filenames[0])
+
+    monitor = model.entry.instrument.component_list[1]
+    assert monitor.name == "monitor"
+    assert monitor.depends_on.name == "z"
+
+
+def test_GIVEN_geometry_file_WHEN_converting_THEN_component_has_off_shape(
+    instrument_json_file, tmp_path
+):
+    convert_instrument(
+        instrument_json_file,
+        str(tmp_path),
+        ["json"],
+        geometry_files=[GeometryFile("monitor", CUBE_STL_FILE_PATH, "cm")],
+    )
+
+    model, _ = load_model(str(tmp_path / "instrument.json"))
+    shape, _ = model.entry.instrument.component_list[1].shape
+    assert len(shape.faces) == 12
+
+
+def test_GIVEN_geometry_for_missing_component_WHEN_converting_THEN_error_is_reported(
+    instrument_json_file,
+):
+    result = convert_instrument(
+        instrument_json_file,
+        None,
+        ["json"],
+        geometry_files=[GeometryFile("not_a_component", CUBE_STL_FILE_PATH)],
+    )
+
+    assert not result.succeeded
+    assert "not_a_component" in result.error
+
+
+def test_GIVEN_invalid_json_WHEN_converting_THEN_error_is_reported_and_nothing_written(
+    tmp_path,
+):
+    filename = tmp_path / "broken.json"
+    filename.write_text("{ not json")
+
+    result = convert_instrument(str(filename), str(tmp_path), ["json"])
+
+    assert not result.succeeded
+    assert result.output_filenames == []
+
+
+def test_GIVEN_geometry_argument_with_units_WHEN_parsing_THEN_units_are_split_from_filename():
+    assert _parse_geometry_file("tube=tube.off:mm") == GeometryFile(
+        "tube", "tube.off", "mm"
+    )
+    assert _parse_geometry_file("tube=tube.off") == GeometryFile(
+        "tube", "tube.off", "m"
+    )
+
+
+def test_GIVEN_several_inputs_and_jobs_WHEN_running_main_THEN_all_are_converted(
+    instrument_json_file, tmp_path
+):
+    second_file = tmp_path / "second.json"
+    with open(instrument_json_file) as file:
+        second_file.write_text(file.read())
+    output_dir = tmp_path / "output"
+
+    exit_code = main(
+        [instrument_json_file, str(second_file), "-o", str(output_dir), "-j", "2"]
+    )
+
+    assert exit_code == 0
+    assert sorted(os.listdir(output_dir)) == ["instrument.json", "second.json"]
+
+
+def test_GIVEN_failing_input_WHEN_running_main_THEN_exit_code_is_nonzero(tmp_path):
+    filename = tmp_path / "broken.json"
+    filename.write_text("{ not json")
+
+    assert main([str(filename)]) == 1
+
+
+def test_conversion_result_succeeded_is_false_when_error_set():
+    assert ConversionResult("input.json").succeeded
+    assert not ConversionResult("input.json", error="bad").succeeded
+
+
+def test_importing_batch_does_not_import_qt_widgets():
+    code = (
+        "import sys, nexus_constructor.batch; "
+        "assert 'PySide2.QtWidgets' not in sys.modules"
+    )
+    subprocess.check_call(
+        [sys.executable, "-c", code], cwd=os.path.join(BASE_PATH, "..")
+    )
@@ -2,7 +2,6 @@ from typing import Any, List, Optional, Tuple
 
 import pytest
 from PySide2.QtCore import QModelIndex, Qt
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.component_tree_model import (
     ComponentInfo,
@@ -112,7 +111,7 @@ def test_transformation_list_has_0_rows():
 
 def test_transformation_list_has_1_rows():
     component = Component("test")
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation((1.0, 0.0, 0.0))
     component.depends_on = translation
     component.stored_transforms = component.transforms
     test_component_tree_model, _ = create_component_tree_model([component])
@@ -126,7 +125,7 @@ def test_transformation_list_has_1_rows():
 
 def test_transformation_has_0_rows():
     component = Component("test")
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation((1.0, 0.0, 0.0))
     component.depends_on = translation
     component.stored_transforms = component.transforms
     test_component_tree_model, _ = create_component_tree_model([component])
@@ -140,7 +139,7 @@ def test_transformation_has_0_rows():
 
 def test_transformation_link_has_0_rows():
     component = Component("test")
-    translation = component.add_translation(QVector3D(1.0, 0.0, 0.0))
+    translation = component.add_translation((1.0, 0.0, 0.0))
     component.depends_on = translation
     component.stored_transforms = component.transforms
     test_component_tree_model, _ = create_component_tree_model([component])
@@ -538,3 +537,122 @@ def test_remove_link(model):
     assert len(transformation_list_index.internalPointer()) == 0
     test_component_tree_model.remove_node(transformation_index)
     assert test_component_tree_model.rowCount(transformation_list_index) == 0
+
+
+def test_GIVEN_component_name_WHEN_finding_its_index_THEN_index_of_its_row_is_returned():
+    component = Component("second")
+    test_component_tree_model, _ = create_component_tree_model(
+        [Component("first"), component]
+    )
+
+    index = test_component_tree_model.index_of_component("second")
+
+    assert index.row() == 1
+    assert index.internalPointer() is component
+    assert not test_component_tree_model.index_of_component("missing").isValid()
+
+
+def test_GIVEN_earlier_component_removed_WHEN_getting_parent_of_transformation_list_THEN_row_is_updated():
+    components = [Component(f"component_{i}") for i in range(3)]
+    test_component_tree_model, _ = create_component_tree_model(components)
+    last_component_index = test_component_tree_model.index(2, 0, QModelIndex())
+    transformation_list_index = test_component_tree_model.index(
+        1, 0, last_component_index
+    )
+
+    test_component_tree_model.remove_node(
+        test_component_tree_model.index(0, 0, QModelIndex())
+    )
+
+    parent = test_component_tree_model.parent(transformation_list_index)
+    assert parent.row() == 1
+    assert parent.internalPointer() is components[2]
+
+
+def test_GIVEN_component_list_changed_outside_model_WHEN_getting_row_of_component_THEN_row_is_found():
+    test_component_tree_model, instrument = create_component_tree_model(
+        [Component("first")]
+    )
+    component = Component("second")
+    instrument.component_list.insert(0, component)
+
+    assert test_component_tree_model.row_of_component(component) == 0
+    assert test_component_tree_model.row_of_component(instrument.component_list[1]) == (
+        1
+    )
+
+
+def test_GIVEN_component_not_in_tree_WHEN_getting_row_of_component_THEN_raises():
+    test_component_tree_model, _ = create_component_tree_model([Component("first")])
+
+    with pytest.raises(ValueError):
+        test_component_tree_model.row_of_component(Component("missing"))
+
+
+def test_GIVEN_unexpanded_component_WHEN_getting_index_of_its_transformations_THEN_they_are_found():
+    component = Component("test")
+    translation = component.add_translation((1.0, 0.0, 0.0))
+    component.depends_on = translation
+    test_component_tree_model, _ = create_component_tree_model([component])
+    component_index = test_component_tree_model.index(0, 0, QModelIndex())
+
+    assert component.stored_transforms is None
+
+    transformations_index = test_component_tree_model.index(1, 0, component_index)
+
+    assert transformations_index.internalPointer() is component.stored_transforms
+    assert list(component.stored_transforms) == [translation]
+
+
+def test_GIVEN_transformation_changed_WHEN_getting_linked_component_THEN_link_is_found_again(
+    model,
+):
+    test_component_tree_model = ComponentTreeModel(model)
+    linked_component = Component("linked")
+    linked_component.depends_on = linked_component.add_translation((1.0, 0, 0))
+    component = Component("component")
+    test_component_tree_model.add_component(linked_component)
+    test_component_tree_model.add_component(component)
+    component_index = test_component_tree_model.index(2, 0, QModelIndex())
+    test_component_tree_model.add_link(component_index)
+    link = component.stored_transforms.link
+    assert link.linked_component is None
+
+    component.depends_on = linked_component.depends_on
+    model.signals.transformation_changed.emit()
+
+    assert link.linked_component is linked_component
+
+
+def test_GIVEN_components_WHEN_adding_them_together_THEN_rows_are_inserted_once():
+    test_component_tree_model, instrument = create_component_tree_model(
+        [get_component()]
+    )
+    components = [Component("first"), Component("second")]
+    inserted = []
+    test_component_tree_model.rowsInserted.connect(
+        lambda parent, first, last: inserted.append((first, last))
+    )
+
+    test_component_tree_model.add_components(components)
+
+    assert inserted == [(1, 2)]
+    assert test_component_tree_model.rowCount(QModelIndex()) == 3
+    assert test_component_tree_model.row_of_component(components[1]) == 2
+
+
+def test_GIVEN_components_added_in_transaction_WHEN_committed_THEN_model_is_reset_once():
+    model = Model()
+    test_component_tree_model = ComponentTreeModel(model)
+    instrument = model.entry.instrument
+    resets = []
+    test_component_tree_model.modelReset.connect(lambda: resets.append(True))
+
+    with model.transaction():
+        for name in ["first", "second"]:
+            instrument.component_list.append(Component(name, parent_node=instrument))
+        assert not resets
+
+    assert resets == [True]
+    assert test_component_tree_model.rowCount(QModelIndex()) == 3
+    assert test_component_tree_model.row_of_component(instrument.component_list[2]) == 2
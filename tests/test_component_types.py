@@ -1,8 +1,15 @@
 import pytest
+from mock import patch
 
 from nexus_constructor.component_type import (
+    CLASS_DEFINITIONS_CACHE_FILE,
+    NXDL_EXTENSION,
+    NXDL_VERSION_FILE,
+    ClassDefinitions,
     __list_base_class_files,
-    _create_base_class_dict,
+    _parse_base_class,
+    build_class_definitions_cache,
+    make_dictionary_of_class_definitions,
 )
 
 
@@ -36,7 +43,16 @@ def test_GIVEN_list_of_files_some_ending_with_nxdl_WHEN_listing_base_class_files
         next(gen)
 
 
-def test_GIVEN_valid_base_class_containing_name_WHEN_creating_base_class_dict_THEN_dict_contains_base_class_with_name():
+def _class_definitions_from_xml(tmp_path, class_name, xml, black_list=None):
+    base_class_dir = tmp_path / "base_classes"
+    base_class_dir.mkdir()
+    (base_class_dir / f"{class_name}{NXDL_EXTENSION}").write_text(xml)
+    return ClassDefinitions(str(tmp_path), black_list=black_list)
+
+
+def test_GIVEN_valid_base_class_containing_name_WHEN_creating_class_definitions_THEN_definitions_contain_base_class_with_name(
+    tmp_path,
+):
     class_name = "NXtest"
     xml = f"""
     <definition
@@ -45,14 +61,14 @@ def test_GIVEN_valid_base_class_containing_name_WHEN_creating_base_class_dict_TH
     </definition>
     """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
+    base_classes = _class_definitions_from_xml(tmp_path, class_name, xml)
 
     assert class_name in base_classes.keys()
 
 
-def test_GIVEN_a_valid_base_class_containing_name_key_and_name_field_WHEN_creating_base_class_dict_THEN_dict_contains_base_class_with_name_as_key_and_name_field():
+def test_GIVEN_a_valid_base_class_containing_name_key_and_name_field_WHEN_creating_class_definitions_THEN_definitions_contain_base_class_with_name_as_key_and_name_field(
+    tmp_path,
+):
     class_name = "NXtest"
 
     xml = f"""<definition
@@ -64,14 +80,14 @@ def test_GIVEN_a_valid_base_class_containing_name_key_and_name_field_WHEN_creati
     </definition>
     """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
+    base_classes = _class_definitions_from_xml(tmp_path, class_name, xml)
     assert class_name in base_classes.keys()
     assert "name" in base_classes[class_name]
 
 
-def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_creating_base_class_dict_THEN_dict_contains_empty_list_for_value():
+def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_creating_class_definitions_THEN_definitions_contain_empty_list_for_value(
+    tmp_path,
+):
     class_name = "NXtest"
     xml = f"""
         <definition
@@ -80,14 +96,14 @@ def test_GIVEN_a_valid_base_class_with_no_fields_WHEN_creating_base_class_dict_T
         </definition>
         """
 
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, None, base_classes, component_base_classes)
+    base_classes = _class_definitions_from_xml(tmp_path, class_name, xml)
 
     assert not base_classes[class_name]
 
 
-def test_GIVEN_a_valid_base_class_that_is_in_excludelist_WHEN_creating_base_class_dict_THEN_dict_stays_empty():
+def test_GIVEN_a_valid_base_class_that_is_in_excludelist_WHEN_creating_class_definitions_THEN_definitions_stay_empty(
+    tmp_path,
+):
     class_name = "NXtest"
     xml = f"""
             <definition
@@ -95,8 +111,107 @@ def test_GIVEN_a_valid_base_class_that_is_in_excludelist_WHEN_creating_base_clas
             type="group" extends="NXobject">
             </definition>
             """
-    base_classes = dict()
-    component_base_classes = dict()
-    _create_base_class_dict(xml, [class_name], base_classes, component_base_classes)
+
+    base_classes = _class_definitions_from_xml(
+        tmp_path, class_name, xml, black_list=[class_name]
+    )
 
     assert not base_classes
+
+
+def _write_base_class(base_class_dir, class_name, field_names):
+    fields = "".join(f'<field name="{name}"/>' for name in field_names)
+    (base_class_dir / f"{class_name}{NXDL_EXTENSION}").write_text(
+        f'<definition name="{class_name}" type="group">{fields}</definition>'
+    )
+
+
+@pytest.fixture
+def definitions_dir(tmp_path):
+    base_class_dir = tmp_path / "base_classes"
+    base_class_dir.mkdir()
+    (tmp_path / NXDL_VERSION_FILE).write_text("v1\n")
+    _write_base_class(base_class_dir, "NXmonitor", ["mode", "data"])
+    _write_base_class(base_class_dir, "NXnot_a_component", ["something"])
+    return tmp_path
+
+
+def test_GIVEN_definitions_WHEN_making_dictionary_THEN_only_component_classes_are_parsed(
+    definitions_dir,
+):
+    with patch(
+        "nexus_constructor.component_type._parse_base_class", wraps=_parse_base_class,
+    ) as parse:
+        all_classes, component_classes = make_dictionary_of_class_definitions(
+            str(definitions_dir)
+        )
+        assert parse.call_count == 1
+        assert component_classes == {"NXmonitor": ["mode", "data"]}
+        assert set(all_classes.keys()) == {"NXmonitor", "NXnot_a_component"}
+
+        assert all_classes["NXnot_a_component"] == ["something"]
+        assert parse.call_count == 2
+
+
+def test_GIVEN_cache_written_WHEN_making_dictionary_again_THEN_nothing_is_parsed(
+    definitions_dir,
+):
+    make_dictionary_of_class_definitions(str(definitions_dir))
+    assert (definitions_dir / CLASS_DEFINITIONS_CACHE_FILE).exists()
+
+    with patch("nexus_constructor.component_type._parse_base_class") as parse:
+        _, component_classes = make_dictionary_of_class_definitions(
+            str(definitions_dir)
+        )
+
+    parse.assert_not_called()
+    assert component_classes == {"NXmonitor": ["mode", "data"]}
+
+
+def test_GIVEN_definition_changed_since_cache_written_WHEN_making_dictionary_THEN_changed_class_is_parsed(
+    definitions_dir,
+):
+    make_dictionary_of_class_definitions(str(definitions_dir))
+    _write_base_class(definitions_dir / "base_classes", "NXmonitor", ["mode"])
+
+    _, component_classes = make_dictionary_of_class_definitions(str(definitions_dir))
+
+    assert component_classes == {"NXmonitor": ["mode"]}
+
+
+def test_GIVEN_nxdl_version_changed_since_cache_written_WHEN_making_dictionary_THEN_cache_is_not_used(
+    definitions_dir,
+):
+    make_dictionary_of_class_definitions(str(definitions_dir))
+    (definitions_dir / NXDL_VERSION_FILE).write_text("v2\n")
+
+    with patch(
+        "nexus_constructor.component_type._parse_base_class", wraps=_parse_base_class,
+    ) as parse:
+        make_dictionary_of_class_definitions(str(definitions_dir))
+
+    assert parse.call_count == 1
+
+
+def test_GIVEN_built_cache_WHEN_looking_up_any_class_THEN_nothing_is_parsed(
+    definitions_dir,
+):
+    build_class_definitions_cache(str(definitions_dir))
+
+    with patch("nexus_constructor.component_type._parse_base_class") as parse:
+        all_classes, _ = make_dictionary_of_class_definitions(str(definitions_dir))
+        assert all_classes["NXnot_a_component"] == ["something"]
+
+    parse.assert_not_called()
+
+
+def test_GIVEN_black_listed_class_WHEN_making_dictionary_THEN_class_is_left_out(
+    definitions_dir,
+):
+    all_classes, component_classes = make_dictionary_of_class_definitions(
+        str(definitions_dir), black_list=["NXmonitor"], use_cache=False
+    )
+
+    assert "NXmonitor" not in all_classes
+    assert not component_classes
+    assert not (definitions_dir / CLASS_DEFINITIONS_CACHE_FILE).exists()
@@ -1,5 +1,3 @@
-from PySide2.QtGui import QVector3D
-
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
 from nexus_constructor.model.value_type import ValueTypes
@@ -16,12 +14,12 @@ def test_end_of_depends_on_chain_of_component_is_linked_to_other_component():
     values = Dataset(name="", type=ValueTypes.INT, size=[1], values=[42])
     transforms_2 = component.add_translation(
         name="transform2",
-        vector=QVector3D(0, 0, 1.0),  # default to beam direction
+        vector=(0, 0, 1.0),  # default to beam direction
         values=values,
     )
     transform_1 = component.add_translation(
         name="transform1",
-        vector=QVector3D(0, 0, 1.0),  # default to beam direction
+        vector=(0, 0, 1.0),  # default to beam direction
         values=values,
         depends_on=transforms_2,
     )
@@ -31,7 +29,7 @@ def test_end_of_depends_on_chain_of_component_is_linked_to_other_component():
     another_component = Component(name="another_test_component")
     transform_3 = another_component.add_translation(
         name="transform3",
-        vector=QVector3D(0, 0, 1.0),  # default to beam direction
+        vector=(0, 0, 1.0),  # default to beam direction
         values=values,
     )
     another_component.depends_on = transform_3
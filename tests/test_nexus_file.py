@@ -0,0 +1,78 @@
+import h5py
+import numpy as np
+import pytest
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.link import Link
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.value_type import ValueTypes
+from nexus_constructor.nexus_file import nexus_file_to_json_dict, write_nexus_file
+
+
+@pytest.fixture
+def model_with_fields() -> Model:
+    model = Model()
+    component = Component("detector", parent_node=model.entry.instrument)
+    component.nx_class = "NXdetector"
+    model.entry.instrument.component_list.append(component)
+    component.set_field_value(
+        "detector_number", np.array([[1, 2], [3, 4]]), ValueTypes.INT
+    )
+    component.set_field_value("distance", 1.5, ValueTypes.DOUBLE)
+    component["data_link"] = Link("data_link", "/entry/instrument/detector/distance")
+    return model
+
+
+def test_GIVEN_model_WHEN_writing_nexus_file_THEN_datasets_have_values_and_types(
+    model_with_fields, tmp_path
+):
+    filename = str(tmp_path / "test.nxs")
+
+    write_nexus_file(model_with_fields, filename)
+
+    with h5py.File(filename, "r") as nexus_file:
+        detector = nexus_file["entry/instrument/detector"]
+        assert detector.attrs["NX_class"] == "NXdetector"
+        assert detector["detector_number"].dtype == np.intc
+        assert np.array_equal(detector["detector_number"][()], [[1, 2], [3, 4]])
+        assert detector["distance"][()] == 1.5
+
+
+def test_GIVEN_model_with_link_WHEN_writing_nexus_file_THEN_link_is_soft_link(
+    model_with_fields, tmp_path
+):
+    filename = str(tmp_path / "test.nxs")
+
+    write_nexus_file(model_with_fields, filename)
+
+    with h5py.File(filename, "r") as nexus_file:
+        link = nexus_file["entry/instrument/detector"].get("data_link", getlink=True)
+        assert isinstance(link, h5py.SoftLink)
+        assert link.path == "/entry/instrument/detector/distance"
+
+
+def test_GIVEN_nexus_file_WHEN_converting_to_json_dict_THEN_structure_matches_file(
+    model_with_fields, tmp_path
+):
+    filename = str(tmp_path / "test.nxs")
+    write_nexus_file(model_with_fields, filename)
+
+    with h5py.File(filename, "r") as nexus_file:
+        json_dict = nexus_file_to_json_dict(nexus_file)
+
+    entry = json_dict["children"][0]
+    instrument = next(c for c in entry["children"] if c["name"] == "instrument")
+    detector = next(c for c in instrument["children"] if c["name"] == "detector")
+    children = {child["name"]: child for child in detector["children"]}
+    assert children["detector_number"]["values"] == [[1, 2], [3, 4]]
+    assert children["detector_number"]["dataset"] == {
+        "type": ValueTypes.INT,
+        "size": [2, 2],
+    }
+    assert children["distance"]["values"] == 1.5
+    assert children["data_link"] == {
+        "name": "data_link",
+        "type": "link",
+        "target": "/entry/instrument/detector/distance",
+    }
+    assert {"name": "NX_class", "values": "NXdetector"} in detector["attributes"]
@@ -0,0 +1,149 @@
+import numpy as np
+import pytest
+from PySide2.QtCore import Qt
+
+from nexus_constructor.pixel_mapping_model import (
+    ID_COLUMN,
+    LABEL_COLUMN,
+    NO_PIXEL_ID,
+    PixelMappingModel,
+    load_pixel_ids,
+)
+
+N_FACES = 10
+
+
+@pytest.fixture
+def model():
+    model = PixelMappingModel()
+    model.reset(N_FACES, "face")
+    return model
+
+
+def test_GIVEN_new_model_WHEN_getting_pixel_ids_THEN_no_item_has_an_id(model):
+    assert model.rowCount() == N_FACES
+    assert model.get_pixel_ids() == [None] * N_FACES
+    assert not model.has_pixel_ids()
+
+
+def test_GIVEN_model_WHEN_getting_label_THEN_label_contains_text_and_item_number(
+    model,
+):
+    assert model.data(model.index(3, LABEL_COLUMN)) == "Pixel ID for face #3:"
+
+
+def test_GIVEN_id_text_WHEN_setting_data_THEN_id_is_stored(model):
+    assert model.setData(model.index(2, ID_COLUMN), "7")
+
+    assert model.data(model.index(2, ID_COLUMN)) == "7"
+    assert model.get_pixel_ids()[2] == 7
+    assert model.has_pixel_ids()
+
+
+@pytest.mark.parametrize("text", ["abc", "-1"])
+def test_GIVEN_invalid_id_text_WHEN_setting_data_THEN_data_is_rejected(model, text):
+    assert not model.setData(model.index(2, ID_COLUMN), text)
+    assert not model.has_pixel_ids()
+
+
+def test_GIVEN_empty_text_WHEN_setting_data_THEN_id_is_removed(model):
+    model.setData(model.index(2, ID_COLUMN), "7")
+    model.setData(model.index(2, ID_COLUMN), "")
+
+    assert model.get_pixel_ids()[2] is None
+
+
+def test_GIVEN_model_WHEN_getting_flags_THEN_only_ids_are_editable(model):
+    assert model.flags(model.index(0, ID_COLUMN)) & Qt.ItemIsEditable
+    assert not model.flags(model.index(0, LABEL_COLUMN)) & Qt.ItemIsEditable
+
+
+def test_GIVEN_first_id_and_stride_WHEN_filling_range_THEN_range_is_numbered(model):
+    model.fill(100, stride=2, first_row=2, last_row=4)
+
+    assert model.get_pixel_ids() == [None, None, 100, 102, 104] + [None] * 5
+
+
+def test_GIVEN_no_range_WHEN_filling_THEN_every_item_is_numbered(model):
+    model.fill(5)
+
+    assert model.get_pixel_ids() == list(range(5, 5 + N_FACES))
+
+
+def test_GIVEN_fill_with_negative_ids_WHEN_filling_THEN_raises_and_ids_are_unchanged(
+    model,
+):
+    with pytest.raises(ValueError):
+        model.fill(2, stride=-1)
+
+    assert not model.has_pixel_ids()
+
+
+def test_GIVEN_fill_WHEN_filling_THEN_data_changed_is_emitted_once_for_range(
+    qtbot, model
+):
+    with qtbot.waitSignal(model.dataChanged) as blocker:
+        model.fill(0, first_row=1, last_row=8)
+
+    top_left, bottom_right, _ = blocker.args
+    assert (top_left.row(), bottom_right.row()) == (1, 8)
+
+
+def test_GIVEN_filled_range_WHEN_clearing_ids_THEN_range_has_no_ids(model):
+    model.fill(0)
+    model.clear_ids(0, N_FACES - 2)
+
+    assert model.get_pixel_ids() == [None] * (N_FACES - 1) + [N_FACES - 1]
+
+
+def test_GIVEN_ids_with_gaps_WHEN_setting_pixel_ids_THEN_ids_are_stored_from_first_row(
+    model,
+):
+    model.set_pixel_ids([1, None, 3], first_row=8)
+
+    assert model.get_pixel_ids()[7:] == [None, 1, None]
+
+
+def test_GIVEN_more_ids_than_items_WHEN_setting_pixel_ids_THEN_extra_ids_are_ignored(
+    model,
+):
+    model.set_pixel_ids(list(range(N_FACES + 5)))
+
+    assert model.get_pixel_ids() == list(range(N_FACES))
+
+
+def test_GIVEN_npy_file_WHEN_loading_pixel_ids_THEN_ids_match_array(tmp_path):
+    filename = str(tmp_path / "ids.npy")
+    np.save(filename, np.array([[1, 2], [3, NO_PIXEL_ID]]))
+
+    assert load_pixel_ids(filename).tolist() == [1, 2, 3, NO_PIXEL_ID]
+
+
+def test_GIVEN_csv_file_with_empty_fields_WHEN_loading_pixel_ids_THEN_empty_fields_have_no_id(
+    tmp_path,
+):
+    filename = tmp_path / "ids.csv"
+    filename.write_text("4,,6\n")
+
+    assert load_pixel_ids(str(filename)).tolist() == [4, NO_PIXEL_ID, 6]
+
+
+@pytest.mark.parametrize("contents", ["1.5\n2\n", "-3\n", "a,b\n"])
+def test_GIVEN_csv_file_without_valid_ids_WHEN_loading_pixel_ids_THEN_raises(
+    tmp_path, contents
+):
+    filename = tmp_path / "ids.csv"
+    filename.write_text(contents)
+
+    with pytest.raises(ValueError):
+        load_pixel_ids(str(filename))
+
+
+def test_GIVEN_ids_WHEN_getting_masked_pixel_ids_THEN_items_without_ids_are_masked(
+    model,
+):
+    model.fill(3, first_row=8)
+    masked_ids = model.get_masked_pixel_ids()
+    model.clear_ids()
+
+    assert masked_ids.tolist() == [None] * 8 + [3, 4]
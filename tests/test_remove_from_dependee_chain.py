@@ -1,5 +1,4 @@
 import pytest
-from PySide2.QtGui import QVector3D
 
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.dataset import Dataset
@@ -23,10 +22,7 @@ def instrument():
 def test_remove_from_beginning_1(instrument):
     component1 = Component("component1", instrument)
     rot = component1.add_rotation(
-        name="rotation1",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation1", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     component1.depends_on = rot
     assert len(rot.dependents) == 1
@@ -37,16 +33,10 @@ def test_remove_from_beginning_1(instrument):
 def test_remove_from_beginning_2(instrument):
     component1 = Component("component1", instrument)
     rot1 = component1.add_rotation(
-        name="rotation1",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation1", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     rot2 = component1.add_rotation(
-        name="rotation2",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation2", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     component1.depends_on = rot1
     rot1.depends_on = rot2
@@ -61,16 +51,10 @@ def test_remove_from_beginning_3(instrument):
     component1 = Component("component1", instrument)
     component2 = Component("component2", instrument)
     rot1 = component1.add_rotation(
-        name="rotation1",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation1", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     rot2 = component2.add_rotation(
-        name="rotation2",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation2", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     component1.depends_on = rot1
     component2.depends_on = rot2
@@ -89,22 +73,13 @@ def test_remove_from_middle():
     component2 = Component("component2", instrument)
     component3 = Component("component3", instrument)
     rot1 = component1.add_rotation(
-        name="rotation1",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation1", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     rot2 = component2.add_rotation(
-        name="rotation2",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation2", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     rot3 = component3.add_rotation(
-        name="rotation3",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation3", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     component1.depends_on = rot1
     component2.depends_on = rot2
@@ -122,21 +97,18 @@ def test_remove_from_middle():
 def test_remove_from_end():
     component1 = Component("component1", instrument)
     rot1 = component1.add_rotation(
-        name="rotation1",
-        axis=QVector3D(1.0, 0.0, 0.0),
-        angle=values.values,
-        values=values,
+        name="rotation1", axis=(1.0, 0.0, 0.0), angle=values.values, values=values,
     )
     rot2 = component1.add_rotation(
         name="rotation2",
-        axis=QVector3D(1.0, 0.0, 0.0),
+        axis=(1.0, 0.0, 0.0),
         angle=values.values,
         values=values,
         depends_on=rot1,
     )
     rot3 = component1.add_rotation(
         name="rotation3",
-        axis=QVector3D(1.0, 0.0, 0.0),
+        axis=(1.0, 0.0, 0.0),
         angle=values.values,
         values=values,
         depends_on=rot2,
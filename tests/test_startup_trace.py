@@ -0,0 +1,113 @@
+import json
+import os
+import subprocess
+import sys
+from itertools import count
+
+import pytest
+
+from nexus_constructor.startup_trace import (
+    DEFINITIONS_PHASE,
+    FIRST_FRAME_EVENT,
+    IMPORTS_PHASE,
+    MODEL_PHASE,
+    STARTUP_TRACE_ENV_VAR,
+    StartupTracer,
+)
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous budgets in seconds for the phases of startup that do not depend on Qt creating windows, so that only a
+# large regression fails the test on a slow CI machine
+NON_QT_PHASE_BUDGETS = {IMPORTS_PHASE: 10.0, DEFINITIONS_PHASE: 2.0, MODEL_PHASE: 0.5}
+
+# Runs the non-Qt phases of startup the same way as nexus-constructor.py, in a fresh interpreter so that imports are
+# not already cached. The class definition cache is not used so that the uncached parsing is measured.
+NON_QT_STARTUP_SCRIPT = f"""
+from nexus_constructor.startup_trace import startup_tracer
+
+with startup_tracer.phase("{IMPORTS_PHASE}"):
+    from nexus_constructor.component_type import make_dictionary_of_class_definitions
+    from nexus_constructor.model.model import Model
+
+with startup_tracer.phase("{DEFINITIONS_PHASE}"):
+    make_dictionary_of_class_definitions({os.path.join(REPO_ROOT, "definitions")!r}, use_cache=False)
+with startup_tracer.phase("{MODEL_PHASE}"):
+    Model()
+startup_tracer.write()
+"""
+
+
+@pytest.fixture
+def tracer():
+    # Each call to the clock advances it by one second
+    clock = count()
+    return StartupTracer(clock=lambda: float(next(clock)))
+
+
+def test_GIVEN_no_output_filename_WHEN_writing_THEN_nothing_is_written(
+    tracer, tmp_path
+):
+    tracer.output_filename = None
+    with tracer.phase(MODEL_PHASE):
+        pass
+
+    tracer.write()
+
+    assert not tracer.enabled
+    assert not list(tmp_path.iterdir())
+
+
+def test_GIVEN_nested_phases_WHEN_getting_durations_THEN_durations_of_all_phases_are_returned(
+    tracer,
+):
+    with tracer.phase("outer"):
+        with tracer.phase("inner"):
+            pass
+
+    assert tracer.durations() == {"inner": 1.0, "outer": 3.0}
+
+
+def test_GIVEN_phase_and_instant_WHEN_converting_to_chrome_trace_THEN_complete_and_instant_events_in_microseconds(
+    tracer,
+):
+    with tracer.phase(MODEL_PHASE):
+        pass
+    tracer.mark(FIRST_FRAME_EVENT)
+
+    phase_event, instant_event = tracer.to_chrome_trace()["traceEvents"]
+
+    assert phase_event["name"] == MODEL_PHASE
+    assert phase_event["ph"] == "X"
+    assert phase_event["ts"] == 1e6
+    assert phase_event["dur"] == 1e6
+    assert instant_event["name"] == FIRST_FRAME_EVENT
+    assert instant_event["ph"] == "i"
+    assert instant_event["ts"] == 3e6
+    assert "dur" not in instant_event
+
+
+def test_GIVEN_phase_raises_WHEN_tracing_THEN_phase_is_still_recorded(tracer):
+    with pytest.raises(ValueError):
+        with tracer.phase(DEFINITIONS_PHASE):
+            raise ValueError
+
+    assert DEFINITIONS_PHASE in tracer.durations()
+
+
+def test_GIVEN_startup_trace_env_var_WHEN_running_non_qt_startup_phases_THEN_phases_are_within_budget(
+    tmp_path,
+):
+    trace_filename = tmp_path / "startup_trace.json"
+    env = dict(os.environ, **{STARTUP_TRACE_ENV_VAR: str(trace_filename)})
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])
+    )
+
+    subprocess.run([sys.executable, "-c", NON_QT_STARTUP_SCRIPT], env=env, check=True)
+
+    with open(trace_filename) as trace_file:
+        events = json.load(trace_file)["traceEvents"]
+    durations = {event["name"]: event["dur"] / 1e6 for event in events}
+    for phase, budget in NON_QT_PHASE_BUDGETS.items():
+        assert durations[phase] < budget, f"{phase} phase exceeded its budget"
@@ -1,6 +1,17 @@
+import pytest
+from pint.errors import DimensionalityError
 from pytest import approx
 
-from nexus_constructor.unit_utils import METRES, calculate_unit_conversion_factor
+from nexus_constructor.unit_utils import (
+    METRES,
+    RADIANS,
+    ParsedUnits,
+    calculate_unit_conversion_factor,
+    parse_units,
+    units_are_expected_dimensionality,
+    units_are_recognised_by_pint,
+    units_have_magnitude_of_one,
+)
 
 
 def test_unit_conversion_factor():
@@ -11,3 +22,47 @@ def test_unit_conversion_factor():
     # Check that the unit conversion factor can correctly find the unit in terms of meters
     for unit in units:
         assert approx(calculate_unit_conversion_factor(unit[0], METRES)) == unit[1]
+
+
+def test_GIVEN_unit_conversion_factor_WHEN_units_cannot_be_converted_THEN_pint_error_is_raised():
+    with pytest.raises(DimensionalityError):
+        calculate_unit_conversion_factor("seconds", METRES)
+
+
+def test_GIVEN_length_units_WHEN_parsing_units_THEN_record_describes_units():
+    parsed_units = parse_units("cm")
+
+    assert parsed_units.recognised
+    assert parsed_units.dimensionality == "[length]"
+    assert parsed_units.magnitude == 1
+    assert parsed_units.factor_to_metres == approx(0.01)
+    assert parsed_units.factor_to_radians is None
+
+
+def test_GIVEN_unknown_units_WHEN_parsing_units_THEN_units_are_not_recognised():
+    assert parse_units("not_a_unit") == ParsedUnits(recognised=False)
+
+
+def test_GIVEN_same_units_WHEN_parsing_units_twice_THEN_cached_record_is_returned():
+    assert parse_units("degrees") is parse_units("degrees")
+
+
+def test_GIVEN_number_WHEN_checking_units_THEN_number_is_dimensionless_with_its_magnitude():
+    assert units_are_recognised_by_pint("2")
+    assert not units_are_expected_dimensionality("2", METRES)
+    assert not units_have_magnitude_of_one("2")
+
+
+@pytest.mark.parametrize(
+    "units,expected_unit_type,expected",
+    [("mm", METRES, True), ("deg", RADIANS, True), ("deg", METRES, False)],
+)
+def test_GIVEN_units_WHEN_checking_dimensionality_THEN_result_matches_conversion(
+    units, expected_unit_type, expected
+):
+    assert units_are_expected_dimensionality(units, expected_unit_type) == expected
+
+
+def test_GIVEN_other_expected_units_WHEN_checking_dimensionality_THEN_conversion_is_tried():
+    assert units_are_expected_dimensionality("ms", "seconds")
+    assert not units_are_expected_dimensionality("ms", "kg")
@@ -8,6 +8,7 @@ import pytest
 from mock import Mock
 from PySide2.QtGui import QValidator
 
+from nexus_constructor.model.name_registry import NamedList
 from nexus_constructor.model.value_type import ValueTypes
 from nexus_constructor.unit_utils import METRES
 from nexus_constructor.validators import (
@@ -100,6 +101,26 @@ def test_name_validator_set_to_duplicate_name():
     )
 
 
+def test_name_validator_current_name_is_valid():
+    """The item being edited should be able to keep its name"""
+    validator = NameValidator(
+        [ObjectWithName("foo"), ObjectWithName("bar")], current_name="foo"
+    )
+    assert validator.validate("foo", 0) == QValidator.Acceptable
+    assert validator.validate("bar", 0) == QValidator.Intermediate
+
+
+def test_name_validator_named_list_is_kept_up_to_date():
+    """Names added to a named list after the validator is created should not be valid"""
+    names = NamedList([ObjectWithName("foo")])
+    validator = NameValidator(names)
+    names.append(ObjectWithName("bar"))
+
+    assert validator.validate("bar", 0) == QValidator.Intermediate
+    names.pop()
+    assert validator.validate("bar", 0) == QValidator.Acceptable
+
+
 def test_unit_validator_with_metres_set_as_expected_dimensionality():
     validator = UnitValidator(expected_dimensionality=METRES)
 
@@ -2,7 +2,6 @@ from unittest.mock import Mock
 
 import pytest
 from PySide2.QtCore import QModelIndex, QPoint
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QFrame, QToolBar, QTreeView, QVBoxLayout, QWidget
 
 from nexus_constructor.common_attrs import TransformationType
@@ -587,7 +586,7 @@ def create_transformation(trans_type: TransformationType):
         name="transformation", type=ValueTypes.DOUBLE, size=[1], values=8
     )
     t.transform_type = trans_type
-    t.vector = QVector3D(1, 0, 0)
+    t.vector = (1, 0, 0)
     t.values = Dataset(name="", values=0, type=ValueTypes.DOUBLE)
     t.units = "m"
     return t
@@ -7,7 +7,6 @@ import pytest
 import pytestqt
 from mock import Mock, call, mock_open, patch
 from PySide2.QtCore import Qt
-from PySide2.QtGui import QVector3D
 from PySide2.QtWidgets import QMainWindow, QRadioButton
 from pytestqt.qtbot import QtBot
 
@@ -62,6 +61,9 @@ PIXEL_GRID_FIELDS = [
     "pixel_shape",
 ]
 
+# The z offsets of a pixel grid are all zero so are not recorded
+PIXEL_GRID_ARRAYS = ["x_pixel_offset", "y_pixel_offset", "detector_number"]
+
 COMPONENT_CLASS_PATH = "nexus_constructor.add_component_window.Component"
 CHOPPER_GEOMETRY_CREATOR_PATH = "nexus_constructor.geometry.disk_chopper.disk_chopper_geometry_creator.DiskChopperGeometryCreator.create_disk_chopper_geometry"
 
@@ -1714,7 +1716,7 @@ def test_UI_GIVEN_component_with_cylinder_shape_WHEN_editing_component_THEN_cyli
     component = Component(component_name)
     component.nx_class = "NXpinhole"
 
-    component.set_cylinder_shape(QVector3D(1, 1, 1), height=3, radius=4)
+    component.set_cylinder_shape((1, 1, 1), height=3, radius=4)
 
     with patch("nexus_constructor.validators.PixelValidator") as mock_pixel_validator:
         mock_pixel_validator.unacceptable_pixel_states = Mock(return_value=[])
@@ -1941,12 +1943,7 @@ def test_UI_GIVEN_component_with_off_shape_WHEN_editing_component_THEN_mesh_shap
 
     component.set_off_shape(
         OFFGeometryNoNexus(
-            [
-                QVector3D(0.0, 0.0, 1.0),
-                QVector3D(0.0, 1.0, 0.0),
-                QVector3D(0.0, 0.0, 0.0),
-            ],
-            [[0, 1, 2]],
+            [(0.0, 0.0, 1.0), (0.0, 1.0, 0.0), (0.0, 0.0, 0.0),], [[0, 1, 2]],
         ),
         units="m",
         filename=os.path.join(os.path.pardir, "cube.off"),
@@ -1982,12 +1979,7 @@ def test_UI_GIVEN_component_with_off_shape_WHEN_editing_component_THEN_mesh_data
     component.nx_class = "NXpinhole"
     component.set_off_shape(
         OFFGeometryNoNexus(
-            [
-                QVector3D(0.0, 0.0, 1.0),
-                QVector3D(0.0, 1.0, 0.0),
-                QVector3D(0.0, 0.0, 0.0),
-            ],
-            [[0, 1, 2]],
+            [(0.0, 0.0, 1.0), (0.0, 1.0, 0.0), (0.0, 0.0, 0.0),], [[0, 1, 2]],
         ),
         units=units,
         filename=filepath,
@@ -2395,7 +2387,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_mesh_component_with_grid_THEN_new_pixe
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (
             new_pixel_grid_size,
             new_pixel_grid_size,
@@ -2437,7 +2429,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_cylinder_component_with_grid_THEN_new_
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (
             new_pixel_grid_size,
             new_pixel_grid_size,
@@ -2712,7 +2704,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_mesh_component_with_pixel_mapping_THEN
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (grid_size, grid_size)
 
     shape, pixel_offsets = component_to_edit.shape
@@ -2755,7 +2747,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_cylinder_component_with_pixel_mapping_
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (grid_size, grid_size)
 
     shape, pixel_offsets = component_to_edit.shape
@@ -2860,7 +2852,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_mesh_component_with_no_pixel_data_THEN
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (grid_size, grid_size)
 
     assert isinstance(component_to_edit.shape[0], expected_geometry)
@@ -2891,7 +2883,7 @@ def test_UI_GIVEN_pixel_grid_WHEN_editing_cylinder_component_with_no_pixel_data_
     )
 
     # Check that the change in pixel data is now stored in the component
-    for field in PIXEL_GRID_FIELDS[:-1] + ["detector_number"]:
+    for field in PIXEL_GRID_ARRAYS:
         assert component_to_edit.get_field_value(field).shape == (grid_size, grid_size)
 
     assert isinstance(component_to_edit.shape[0], expected_geometry)
@@ -20,6 +20,7 @@ from nexus_constructor.geometry.pixel_data_utils import (
 )
 from nexus_constructor.model.component import Component
 from nexus_constructor.model.geometry import OFFGeometryNexus
+from nexus_constructor.pixel_mapping_model import ID_COLUMN
 from nexus_constructor.pixel_options import (
     COUNT_DIRECTION,
     INITIAL_COUNT_CORNER,
@@ -76,19 +77,21 @@ def widgets_match_pixel_mapping(
     pixel_mapping: PixelMapping, pixel_options: PixelOptions
 ) -> bool:
     """
-    Checks that the contents of the pixel mapping widgets match the contents of a PixelMapping object.
+    Checks that the contents of the pixel mapping table match the contents of a PixelMapping object.
     :param pixel_mapping: The Pixel Mapping object that is being edited via the PixelOptions interface.
     :param pixel_options: The PixelOptions widget.
     :return: True if the widget and PixelMapping match. False otherwise.
     """
-    for i in range(len(pixel_mapping.pixel_ids)):
-        id_in_interface = pixel_options.pixel_mapping_widgets[i].pixelIDLineEdit.text()
+    expected_ids = pixel_mapping.pixel_ids.tolist()
+    for i in range(len(expected_ids)):
+        model = pixel_options.pixel_mapping_model
+        id_in_interface = model.data(model.index(i, ID_COLUMN))
 
         if not id_in_interface:
-            if pixel_mapping.pixel_ids[i] is not None:
+            if expected_ids[i] is not None:
                 return False
         else:
-            if int(id_in_interface) != pixel_mapping.pixel_ids[i]:
+            if int(id_in_interface) != expected_ids[i]:
                 return False
 
     return True
@@ -165,6 +168,14 @@ def cylindrical_component_with_pixel_mapping(
     return component
 
 
+def enter_pixel_id(pixel_options: PixelOptions, row: int, text: str):
+    """
+    Enters text in the pixel ID cell of a row of the pixel mapping table, as the table's editor would.
+    """
+    model = pixel_options.pixel_mapping_model
+    model.setData(model.index(row, ID_COLUMN), text)
+
+
 def manually_create_pixel_mapping_list(
     pixel_options: PixelOptions,
     file_contents: str = VALID_CUBE_OFF_FILE,
@@ -284,7 +295,7 @@ def test_UI_GIVEN_invalid_pixel_grid_WHEN_entering_pixel_options_THEN_changing_t
     manually_create_pixel_mapping_list(pixel_options)
 
     # Make the pixel mapping valid
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "22")
+    enter_pixel_id(pixel_options, 0, "22")
 
     # Check the test for unacceptable pixel states gives False
     assert pixel_options._pixel_validator.unacceptable_pixel_states() == [False, False]
@@ -304,7 +315,7 @@ def test_UI_GIVEN_valid_pixel_mapping_WHEN_entering_pixel_options_THEN_changing_
     manually_create_pixel_mapping_list(pixel_options)
 
     # Make the pixel mapping invalid
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Check that test for unacceptable pixel states gives True
     assert pixel_options._pixel_validator.unacceptable_pixel_states() == [False, True]
@@ -320,7 +331,7 @@ def test_UI_GIVEN_invalid_pixel_mapping_WHEN_entering_pixel_options_THEN_changin
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give input that will be rejected by the validator
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Switch to pixel grid
     systematic_button_press(qtbot, template, pixel_options.single_pixel_radio_button)
@@ -339,7 +350,7 @@ def test_UI_GIVEN_valid_pixel_mapping_WHEN_entering_pixel_options_THEN_changing_
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give valid input
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "22")
+    enter_pixel_id(pixel_options, 0, "22")
 
     # Change to pixel grid
     systematic_button_press(qtbot, template, pixel_options.single_pixel_radio_button)
@@ -365,7 +376,7 @@ def test_UI_GIVEN_invalid_mapping_and_grid_WHEN_entering_pixel_options_THEN_chan
     manually_create_pixel_mapping_list(pixel_options)
 
     # Give invalid input
-    qtbot.keyClicks(pixel_options.pixel_mapping_widgets[0].pixelIDLineEdit, "abc")
+    enter_pixel_id(pixel_options, 0, "abc")
 
     # Change to no pixels
     systematic_button_press(qtbot, template, pixel_options.no_pixels_button)
@@ -424,7 +435,7 @@ def test_UI_GIVEN_user_provides_mesh_file_WHEN_entering_pixel_mapping_THEN_pixel
 
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     manually_create_pixel_mapping_list(pixel_options)
-    assert pixel_options.pixel_mapping_list_widget.count() == CORRECT_CUBE_FACES
+    assert pixel_options.pixel_mapping_model.rowCount() == CORRECT_CUBE_FACES
 
 
 def test_UI_GIVEN_mesh_file_changes_WHEN_entering_pxixel_mapping_THEN_pixel_mapping_list_changes(
@@ -434,7 +445,7 @@ def test_UI_GIVEN_mesh_file_changes_WHEN_entering_pxixel_mapping_THEN_pixel_mapp
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     manually_create_pixel_mapping_list(pixel_options)
     manually_create_pixel_mapping_list(pixel_options, VALID_OCTA_OFF_FILE)
-    assert pixel_options.pixel_mapping_list_widget.count() == CORRECT_OCTA_FACES
+    assert pixel_options.pixel_mapping_model.rowCount() == CORRECT_OCTA_FACES
 
 
 def test_UI_GIVEN_cylinder_number_WHEN_entering_pixel_mapping_THEN_pixel_mapping_list_is_populated_with_correct_number_of_widgets(
@@ -444,7 +455,7 @@ def test_UI_GIVEN_cylinder_number_WHEN_entering_pixel_mapping_THEN_pixel_mapping
     cylinder_number = 6
     systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(cylinder_number)
-    assert pixel_options.pixel_mapping_list_widget.count() == cylinder_number
+    assert pixel_options.pixel_mapping_model.rowCount() == cylinder_number
 
 
 def test_UI_GIVEN_cylinder_number_changes_WHEN_entering_pixel_mapping_THEN_pixel_mapping_list_changes(
@@ -460,7 +471,7 @@ def test_UI_GIVEN_cylinder_number_changes_WHEN_entering_pixel_mapping_THEN_pixel
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(
         second_cylinder_number
     )
-    assert pixel_options.pixel_mapping_list_widget.count() == second_cylinder_number
+    assert pixel_options.pixel_mapping_model.rowCount() == second_cylinder_number
 
 
 def test_UI_GIVEN_user_switches_to_pixel_mapping_WHEN_creating_component_THEN_pixel_mapping_signal_is_emitted(
@@ -522,10 +533,10 @@ def test_UI_GIVEN_entire_shape_button_is_not_selected_WHEN_calling_pixel_mapping
 ):
 
     manually_create_pixel_mapping_list(pixel_options)
-    assert pixel_options.pixel_mapping_list_widget.count() == 0
+    assert pixel_options.pixel_mapping_model.rowCount() == 0
 
     pixel_options.populate_pixel_mapping_list_with_cylinder_number(4)
-    assert pixel_options.pixel_mapping_list_widget.count() == 0
+    assert pixel_options.pixel_mapping_model.rowCount() == 0
 
 
 def test_UI_GIVEN_mapping_list_provided_by_user_WHEN_entering_pixel_data_THEN_calling_generate_pixel_data_returns_mapping_with_list_that_matches_user_input(
@@ -538,12 +549,51 @@ def test_UI_GIVEN_mapping_list_provided_by_user_WHEN_entering_pixel_data_THEN_ca
     manually_create_pixel_mapping_list(pixel_options)
 
     for i in range(num_faces):
-        qtbot.keyClicks(
-            pixel_options.pixel_mapping_widgets[i].pixelIDLineEdit,
-            str(expected_id_list[i]),
-        )
+        enter_pixel_id(pixel_options, i, str(expected_id_list[i]))
+
+    assert pixel_options.generate_pixel_data().pixel_ids.tolist() == expected_id_list
+
 
-    assert pixel_options.generate_pixel_data().pixel_ids == expected_id_list
+def test_UI_GIVEN_fill_options_WHEN_pressing_fill_button_THEN_range_of_faces_is_numbered(
+    qtbot, template, pixel_options
+):
+
+    systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
+    manually_create_pixel_mapping_list(pixel_options)
+    pixel_options.fill_first_id_spin_box.setValue(10)
+    pixel_options.fill_stride_spin_box.setValue(3)
+    pixel_options.fill_first_row_spin_box.setValue(1)
+    pixel_options.fill_last_row_spin_box.setValue(3)
+
+    systematic_button_press(qtbot, template, pixel_options.fill_pixel_mapping_button)
+
+    assert pixel_options.generate_pixel_data().pixel_ids.tolist() == [
+        None,
+        10,
+        13,
+        16,
+        None,
+        None,
+    ]
+    assert pixel_options._pixel_validator.unacceptable_pixel_states() == [False, False]
+
+
+def test_UI_GIVEN_file_of_pixel_ids_WHEN_importing_pixel_mapping_THEN_ids_replace_mapping(
+    qtbot, template, pixel_options, tmp_path
+):
+
+    systematic_button_press(qtbot, template, pixel_options.entire_shape_radio_button)
+    manually_create_pixel_mapping_list(pixel_options)
+    enter_pixel_id(pixel_options, 5, "1")
+    filename = tmp_path / "ids.csv"
+    filename.write_text("4\n\n6\n")
+
+    with patch(
+        "nexus_constructor.pixel_options.file_dialog", return_value=str(filename)
+    ):
+        pixel_options.import_pixel_mapping()
+
+    assert pixel_options.get_pixel_mapping_ids() == [4, None, 6, None, None, None]
 
 
 def test_UI_GIVEN_no_pixels_button_is_pressed_WHEN_entering_pixel_data_THEN_calling_generate_pixel_data_returns_none(
@@ -755,7 +805,7 @@ def test_GIVEN_component_with_pixel_mapping_WHEN_editing_pixel_data_THEN_correct
     pixel_options, pixel_mapping_with_six_pixels, off_component_with_pixel_mapping
 ):
     pixel_options.fill_existing_entries(off_component_with_pixel_mapping)
-    assert len(pixel_options.pixel_mapping_widgets) == len(
+    assert pixel_options.pixel_mapping_model.rowCount() == len(
         pixel_mapping_with_six_pixels.pixel_ids
     )
 
@@ -797,29 +847,27 @@ def test_GIVEN_cylindrical_geometry_WHEN_editing_pixel_mapping_with_single_pixel
     pixel_options.fill_existing_entries(cylindrical_component_with_pixel_mapping)
 
     n_cylinders = cylindrical_geometry.cylinders.size / 3
-    assert n_cylinders == len(pixel_options.pixel_mapping_widgets)
+    assert n_cylinders == pixel_options.pixel_mapping_model.rowCount()
     assert (
-        pixel_options.pixel_mapping_widgets[0].id
+        pixel_options.get_pixel_mapping_ids()[0]
         == pixel_mapping_with_single_pixel.pixel_ids[0]
     )
 
 
 @pytest.mark.parametrize("values", [(5, 15), (15, 5)])
-def test_GIVEN_call_to_create_pixel_mapping_widgets_WHEN_editing_a_component_THEN_previous_widgets_are_removed(
+def test_GIVEN_call_to_create_pixel_mapping_list_WHEN_editing_a_component_THEN_previous_ids_are_removed(
     pixel_options, values
 ):
     old_value = values[0]
     new_value = values[1]
 
     pixel_options.create_pixel_mapping_list(old_value, "")
-    widget_1 = pixel_options.pixel_mapping_widgets[0]
-    assert len(pixel_options.pixel_mapping_widgets) == old_value
+    enter_pixel_id(pixel_options, 0, "3")
+    assert pixel_options.pixel_mapping_model.rowCount() == old_value
 
     pixel_options.create_pixel_mapping_list(new_value, "")
-    widget_2 = pixel_options.pixel_mapping_widgets[0]
-    assert len(pixel_options.pixel_mapping_widgets) == new_value
-
-    assert widget_1 is not widget_2
+    assert pixel_options.pixel_mapping_model.rowCount() == new_value
+    assert pixel_options.get_pixel_mapping_ids() == [None] * new_value
 
 
 def test_GIVEN_pixel_grid_information_WHEN_creating_pixel_grid_THEN_calling_generate_pixel_data_returns_grid_that_matches_user_input(
@@ -3,7 +3,6 @@ from typing import Any
 import numpy as np
 import pytest
 from mock import Mock
-from PySide2.QtGui import QVector3D
 from pytestqt.qtbot import QtBot  # noqa: F401
 
 from nexus_constructor.field_attrs import _get_human_readable_type
@@ -42,7 +41,7 @@ def test_UI_GIVEN_scalar_vector_WHEN_creating_translation_view_THEN_ui_is_filled
     y = 0
     z = 0
     value = 0.0
-    transform = component.add_translation(QVector3D(x, y, z), name="transform")
+    transform = component.add_translation((x, y, z), name="transform")
     transform.values = create_corresponding_value_dataset(value)
 
     view = EditTranslation(parent=None, transformation=transform, model=model)
@@ -69,7 +68,7 @@ def test_UI_GIVEN_scalar_angle_WHEN_creating_rotation_view_THEN_ui_is_filled_cor
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=(x, y, z))
     transform.values = create_corresponding_value_dataset(angle)
 
     view = EditRotation(parent=None, transformation=transform, model=model)
@@ -96,7 +95,7 @@ def test_UI_GIVEN_array_dataset_as_magnitude_WHEN_creating_translation_THEN_ui_i
     x = 1
     y = 0
     z = 0
-    transform = component.add_translation(QVector3D(x, y, z), name="test")
+    transform = component.add_translation((x, y, z), name="test")
     transform.values = create_corresponding_value_dataset(array)
 
     view = EditTranslation(parent=None, transformation=transform, model=model)
@@ -122,7 +121,7 @@ def test_UI_GIVEN_stream_group_as_angle_WHEN_creating_rotation_THEN_ui_is_filled
     y = 0
     z = 0
 
-    transform = component.add_rotation(QVector3D(x, y, z), 0, name="test")
+    transform = component.add_rotation((x, y, z), 0, name="test")
 
     stream_group = StreamGroup("stream_group")
 
@@ -164,7 +163,7 @@ def test_UI_GIVEN_link_as_rotation_magnitude_WHEN_creating_rotation_view_THEN_ui
     z = 0
     path = "/entry"
 
-    transform = component.add_rotation(QVector3D(x, y, z), 0, name="test")
+    transform = component.add_rotation((x, y, z), 0, name="test")
     link = Link(name="test", target=path)
 
     transform.values = link
@@ -188,7 +187,7 @@ def test_UI_GIVEN_vector_updated_WHEN_saving_view_changes_THEN_model_is_updated(
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=(x, y, z))
     transform.values = create_corresponding_value_dataset(angle)
 
     view = EditRotation(parent=None, transformation=transform, model=model)
@@ -204,7 +203,7 @@ def test_UI_GIVEN_vector_updated_WHEN_saving_view_changes_THEN_model_is_updated(
 
     view.saveChanges()
 
-    assert transform.vector == QVector3D(new_x, new_y, new_z)
+    assert np.array_equal(transform.vector, (new_x, new_y, new_z))
 
 
 def test_UI_GIVEN_view_gains_focus_WHEN_transformation_view_exists_THEN_spinboxes_are_enabled(
@@ -215,7 +214,7 @@ def test_UI_GIVEN_view_gains_focus_WHEN_transformation_view_exists_THEN_spinboxe
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=(x, y, z))
     transform.values = create_corresponding_value_dataset(angle)
 
     view = EditRotation(parent=None, transformation=transform, model=model)
@@ -237,7 +236,7 @@ def test_UI_GIVEN_view_loses_focus_WHEN_transformation_view_exists_THEN_spinboxe
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=(x, y, z))
     transform.values = create_corresponding_value_dataset(angle)
 
     view = EditRotation(parent=None, transformation=transform, model=model)
@@ -259,7 +258,7 @@ def test_UI_GIVEN_new_values_are_provided_WHEN_save_changes_is_called_THEN_trans
     z = 3
     angle = 90
 
-    transform = component.add_rotation(angle=angle, axis=QVector3D(x, y, z))
+    transform = component.add_rotation(angle=angle, axis=(x, y, z))
     transform.values = create_corresponding_value_dataset(angle)
 
     view = EditRotation(parent=None, transformation=transform, model=model)
@@ -271,7 +270,7 @@ def test_UI_GIVEN_new_values_are_provided_WHEN_save_changes_is_called_THEN_trans
     view.transformation_frame.x_spinbox.setValue(new_x)
     view.saveChanges()
     model.signals.transformation_changed.emit.assert_called_once()
-    assert transform.vector == QVector3D(new_x, y, z)
+    assert np.array_equal(transform.vector, (new_x, y, z))
 
 
 def test_UI_GIVEN_scalar_value_WHEN_creating_new_transformation_THEN_ui_values_spinbox_is_disabled(
@@ -281,7 +280,7 @@ def test_UI_GIVEN_scalar_value_WHEN_creating_new_transformation_THEN_ui_values_s
     y = 0
     z = 0
     value = 0.0
-    transform = component.add_translation(QVector3D(x, y, z), name="transform")
+    transform = component.add_translation((x, y, z), name="transform")
     transform.values = create_corresponding_value_dataset(value)
 
     view = EditTranslation(parent=None, transformation=transform, model=model)
@@ -298,7 +297,7 @@ def test_UI_GIVEN_change_to_non_scalar_value_WHEN_creating_new_transformation_TH
     y = 0
     z = 0
     value = 0.0
-    transform = component.add_translation(QVector3D(x, y, z), name="transform")
+    transform = component.add_translation((x, y, z), name="transform")
     transform.values = create_corresponding_value_dataset(value)
 
     view = EditTranslation(parent=None, transformation=transform, model=model)
@@ -316,7 +315,7 @@ def test_UI_GIVEN_change_to_scalar_value_WHEN_creating_new_transformation_THEN_u
     z = 0
     value = np.array([1, 0, 2.0])
 
-    transform = component.add_translation(QVector3D(x, y, z), name="transform")
+    transform = component.add_translation((x, y, z), name="transform")
     transform.values = create_corresponding_value_dataset(value)
 
     view = EditTranslation(parent=None, transformation=transform, model=model)
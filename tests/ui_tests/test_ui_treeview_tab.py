@@ -0,0 +1,49 @@
+from mock import Mock
+from PySide2.QtCore import QModelIndex
+from PySide2.QtWidgets import QWidget
+
+from nexus_constructor.model.component import Component
+from nexus_constructor.model.model import Model
+from nexus_constructor.model.transaction import ChangeSet
+from nexus_constructor.model.undo import UndoHistory
+from ui.treeview_tab import ComponentTreeViewTab
+
+
+class MainWindowStub(QWidget):
+    def show_add_component_window(self):
+        pass
+
+    def show_edit_component_dialog(self):
+        pass
+
+
+def add_component(model: Model, name: str) -> Component:
+    instrument = model.entry.instrument
+    component = Component(name, parent_node=instrument)
+    instrument.component_list.append(component)
+    model.signals.changes_committed.emit(ChangeSet(added=[component]))
+    return component
+
+
+def test_GIVEN_expanded_component_WHEN_undoing_THEN_it_is_still_expanded(qtbot):
+    model = Model()
+    history = UndoHistory(model)
+    main_window = MainWindowStub()
+    qtbot.addWidget(main_window)
+    tab = ComponentTreeViewTab(Mock(), main_window)
+    tab.set_up_model(model)
+    add_component(model, "expanded")
+    add_component(model, "added")
+    view, tree_model = tab.component_tree_view, tab.component_model
+    component_index = tree_model.index(1, 0, QModelIndex())
+    view.expand(component_index)
+    view.expand(tree_model.index(1, 0, component_index))
+
+    history.undo()
+
+    component_index = tree_model.index(1, 0, QModelIndex())
+    assert component_index.internalPointer().name == "expanded"
+    assert len(tree_model.components) == 2
+    assert view.isExpanded(component_index)
+    assert view.isExpanded(tree_model.index(1, 0, component_index))
+    assert not view.isExpanded(tree_model.index(0, 0, QModelIndex()))
@@ -1,4 +1,5 @@
 from PySide2.QtCore import QMetaObject, QObject, QRect, QSize
+from PySide2.QtGui import QKeySequence
 from PySide2.QtWidgets import (
     QAction,
     QGridLayout,
@@ -71,14 +72,26 @@ class Ui_MainWindow(object):
         self.file_menu.addAction(self.export_to_filewriter_JSON_action)
         self.file_menu.addAction(self.export_to_forwarder_config_action)
 
+        self.edit_menu = QMenu(self.menu_bar)
+        self.undo_action = QAction(MainWindow)
+        self.undo_action.setShortcut(QKeySequence.Undo)
+        self.redo_action = QAction(MainWindow)
+        self.redo_action.setShortcut(QKeySequence.Redo)
+        self.edit_menu.addAction(self.undo_action)
+        self.edit_menu.addAction(self.redo_action)
+
         self.view_menu = QMenu(self.menu_bar)
         self.show_action_labels = QAction(MainWindow)
         self.show_action_labels.setCheckable(True)
+        self.batch_components_action = QAction(MainWindow)
+        self.batch_components_action.setCheckable(True)
         self.about_window = QAction(MainWindow)
         self.view_menu.addAction(self.about_window)
         self.view_menu.addAction(self.show_action_labels)
+        self.view_menu.addAction(self.batch_components_action)
 
         self.menu_bar.addAction(self.file_menu.menuAction())
+        self.menu_bar.addAction(self.edit_menu.menuAction())
         self.menu_bar.addAction(self.view_menu.menuAction())
         self._set_up_titles(MainWindow)
 
@@ -95,6 +108,10 @@ class Ui_MainWindow(object):
         self.export_to_nexus_file_action.setText("Export to NeXus file")
         self.export_to_filewriter_JSON_action.setText("Export to Filewriter JSON")
         self.export_to_forwarder_config_action.setText("Export to Forwarder FlatBuffer")
+        self.edit_menu.setTitle("Edit")
+        self.undo_action.setText("Undo")
+        self.redo_action.setText("Redo")
         self.view_menu.setTitle("View")
         self.show_action_labels.setText("Show Button Labels")
+        self.batch_components_action.setText("Batch Static Components in 3D View")
         self.about_window.setText("About")
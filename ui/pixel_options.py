@@ -71,11 +71,50 @@ class Ui_PixelOptionsWidget(object):
         self.pixel_mapping_label = QtWidgets.QLabel(self.pixel_mapping_page)
         self.pixel_mapping_label.setObjectName("pixelMappingLabel")
         self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_label)
-        self.pixel_mapping_list_widget = QtWidgets.QListWidget(self.pixel_mapping_page)
-        self.pixel_mapping_list_widget.setObjectName("pixelMappingListWidget")
-        self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_list_widget)
+        self.pixel_mapping_table_view = QtWidgets.QTableView(self.pixel_mapping_page)
+        self.pixel_mapping_table_view.setObjectName("pixelMappingTableView")
+        self.pixel_mapping_table_view.verticalHeader().setVisible(False)
+        self.pixel_mapping_table_view.horizontalHeader().setStretchLastSection(True)
+        self.pixel_mapping_page_layout.addWidget(self.pixel_mapping_table_view)
+        self._set_up_pixel_mapping_fill()
         self.pixel_options_stack.addWidget(self.pixel_mapping_page)
 
+    def _set_up_pixel_mapping_fill(self):
+        self.pixel_mapping_fill_layout = QtWidgets.QHBoxLayout()
+        self.pixel_mapping_fill_layout.setObjectName("pixelMappingFillLayout")
+        self.fill_first_id_label = QtWidgets.QLabel(self.pixel_mapping_page)
+        self.pixel_mapping_fill_layout.addWidget(self.fill_first_id_label)
+        self.fill_first_id_spin_box = QtWidgets.QSpinBox(self.pixel_mapping_page)
+        self.fill_first_id_spin_box.setMaximum(2147483647)
+        self.fill_first_id_spin_box.setObjectName("fillFirstIDSpinBox")
+        self.pixel_mapping_fill_layout.addWidget(self.fill_first_id_spin_box)
+        self.fill_stride_label = QtWidgets.QLabel(self.pixel_mapping_page)
+        self.pixel_mapping_fill_layout.addWidget(self.fill_stride_label)
+        self.fill_stride_spin_box = QtWidgets.QSpinBox(self.pixel_mapping_page)
+        self.fill_stride_spin_box.setMinimum(1)
+        self.fill_stride_spin_box.setMaximum(1000000)
+        self.fill_stride_spin_box.setObjectName("fillStrideSpinBox")
+        self.pixel_mapping_fill_layout.addWidget(self.fill_stride_spin_box)
+        self.fill_first_row_label = QtWidgets.QLabel(self.pixel_mapping_page)
+        self.pixel_mapping_fill_layout.addWidget(self.fill_first_row_label)
+        self.fill_first_row_spin_box = QtWidgets.QSpinBox(self.pixel_mapping_page)
+        self.fill_first_row_spin_box.setObjectName("fillFirstRowSpinBox")
+        self.pixel_mapping_fill_layout.addWidget(self.fill_first_row_spin_box)
+        self.fill_last_row_label = QtWidgets.QLabel(self.pixel_mapping_page)
+        self.pixel_mapping_fill_layout.addWidget(self.fill_last_row_label)
+        self.fill_last_row_spin_box = QtWidgets.QSpinBox(self.pixel_mapping_page)
+        self.fill_last_row_spin_box.setObjectName("fillLastRowSpinBox")
+        self.pixel_mapping_fill_layout.addWidget(self.fill_last_row_spin_box)
+        self.fill_pixel_mapping_button = QtWidgets.QPushButton(self.pixel_mapping_page)
+        self.fill_pixel_mapping_button.setObjectName("fillPixelMappingButton")
+        self.pixel_mapping_fill_layout.addWidget(self.fill_pixel_mapping_button)
+        self.import_pixel_mapping_button = QtWidgets.QPushButton(
+            self.pixel_mapping_page
+        )
+        self.import_pixel_mapping_button.setObjectName("importPixelMappingButton")
+        self.pixel_mapping_fill_layout.addWidget(self.import_pixel_mapping_button)
+        self.pixel_mapping_page_layout.addLayout(self.pixel_mapping_fill_layout)
+
     def _set_up_pixel_options_stack(self):
         self.pixel_options_stack = QtWidgets.QStackedWidget(
             self.pixel_options_group_box
@@ -295,3 +334,25 @@ class Ui_PixelOptionsWidget(object):
                 "PixelOptionsWidget", "Pixel mapping:", None, -1
             )
         )
+        self.fill_first_id_label.setText(
+            QtWidgets.QApplication.translate(
+                "PixelOptionsWidget", "First ID:", None, -1
+            )
+        )
+        self.fill_stride_label.setText(
+            QtWidgets.QApplication.translate("PixelOptionsWidget", "Step:", None, -1)
+        )
+        self.fill_first_row_label.setText(
+            QtWidgets.QApplication.translate("PixelOptionsWidget", "From:", None, -1)
+        )
+        self.fill_last_row_label.setText(
+            QtWidgets.QApplication.translate("PixelOptionsWidget", "To:", None, -1)
+        )
+        self.fill_pixel_mapping_button.setText(
+            QtWidgets.QApplication.translate("PixelOptionsWidget", "Fill", None, -1)
+        )
+        self.import_pixel_mapping_button.setText(
+            QtWidgets.QApplication.translate(
+                "PixelOptionsWidget", "Import...", None, -1
+            )
+        )
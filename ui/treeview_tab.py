@@ -1,3 +1,5 @@
+from typing import List, Optional, Tuple
+
 from PySide2.QtCore import QModelIndex
 from PySide2.QtWidgets import (
     QAbstractItemView,
@@ -95,6 +97,38 @@ class ComponentTreeViewTab(QWidget):
         )
         self.component_tree_view.setItemDelegate(self.component_delegate)
         self.component_tree_view.setModel(self.component_model)
+        self._expanded_rows: List[Tuple[str, Optional[int]]] = []
+        self.component_model.modelAboutToBeReset.connect(self._remember_expanded_rows)
+        self.component_model.modelReset.connect(self._expand_remembered_rows)
+
+    def _remember_expanded_rows(self):
+        """
+        Records which components, and which rows under them, are expanded, so that they are expanded again once the
+        components have been reset, such as after an undo.
+        """
+        view, model = self.component_tree_view, self.component_model
+        self._expanded_rows = []
+        for row in range(model.rowCount(QModelIndex())):
+            index = model.index(row, 0, QModelIndex())
+            if not view.isExpanded(index):
+                continue
+            name = index.internalPointer().name
+            self._expanded_rows.append((name, None))
+            for child_row in range(model.rowCount(index)):
+                if view.isExpanded(model.index(child_row, 0, index)):
+                    self._expanded_rows.append((name, child_row))
+
+    def _expand_remembered_rows(self):
+        view, model = self.component_tree_view, self.component_model
+        rows = {component.name: row for row, component in enumerate(model.components)}
+        for name, child_row in self._expanded_rows:
+            if name not in rows:
+                continue
+            index = model.index(rows[name], 0, QModelIndex())
+            if child_row is not None:
+                index = model.index(child_row, 0, index)
+            view.expand(index)
+        self._expanded_rows = []
 
     def _set_button_state(self):
         set_button_states(
@@ -131,6 +165,15 @@ class ComponentTreeViewTab(QWidget):
     def on_zoom_item(self):
         selected = self.component_tree_view.selectedIndexes()[0]
         component = selected.internalPointer()
-        self.sceneWidget.zoom_to_component(
-            self.sceneWidget.get_entity(component.name), self.sceneWidget.view.camera()
-        )
+        self.sceneWidget.zoom_to_component_by_name(component.name)
+
+    def select_component(self, name: str):
+        """
+        Selects the row of a component, for example when it is clicked on in the 3D view.
+        :param name: The name of the component.
+        """
+        index = self.component_model.index_of_component(name)
+        if index.isValid():
+            self.component_tree_view.setCurrentIndex(index)
+            self.component_tree_view.scrollTo(index)
+            self._set_button_state()